@@ -0,0 +1,122 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Measure local acoustic analytics against the remote pronunciation assessment they run beside.
+
+Builds the user's recording of sessions like benchmarks.pronunciation_session_length. The
+analytics' CPU cost is reported in seconds of audio per CPU second. Then the analytics and the
+assessment against the local fake Speech service, which takes time per second of audio, run
+concurrently as in the analyze endpoints, with the analytics on threads and in worker processes.
+For each, the time until the analytics and the assessment are ready is reported, along with the
+longest delay of a 5 ms timer on the event loop while they run.
+
+    python -m benchmarks.acoustic_analytics --minutes 1 5 --per-second-ms 50 --workers 2
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Dict, List
+
+from benchmarks.pronunciation_session_length import _build_session
+from src.services.acoustic_analytics import AcousticAnalyzer, analyze_session_acoustics
+from src.services.evaluation_cache import EvaluationCache
+from src.services.pronunciation_assessment import AUDIO_SAMPLE_RATE, AUDIO_SAMPLE_WIDTH, PronunciationAssessor
+from src.services.providers import DEFAULT_PROFILES, SERVICE_SPEECH, FakeBackend, FakeSpeechAssessor
+
+MIN_SILENCE_MS = 400
+LOOP_TICK_SECONDS = 0.005
+
+
+def _cpu(pcm: bytearray, turns: List[str]) -> Dict[str, Any]:
+    """Analyze the whole recording inline and report audio seconds per CPU second."""
+    start = time.process_time()
+    result = analyze_session_acoustics(pcm, turns, MIN_SILENCE_MS, AUDIO_SAMPLE_RATE)
+    cpu_seconds = time.process_time() - start
+    audio_seconds = len(pcm) / (AUDIO_SAMPLE_RATE * AUDIO_SAMPLE_WIDTH)
+    return {
+        "cpu_ms": round(cpu_seconds * 1000, 1),
+        "audio_s_per_cpu_s": round(audio_seconds / max(cpu_seconds, 1e-9)),
+        "turns_analyzed": len(result["turns"]) if result else 0,
+        "turns": len(turns),
+    }
+
+
+async def _concurrent(
+    analyzer: AcousticAnalyzer, assessor: PronunciationAssessor, pcm: bytearray, turns: List[str]
+) -> Dict[str, Any]:
+    """Run the analytics and the assessment together and time each, probing the event loop meanwhile."""
+    start = time.perf_counter()
+    ready: Dict[str, float] = {}
+    max_lag = 0.0
+    done = asyncio.Event()
+
+    async def timed(name: str, work: Any) -> None:
+        await work
+        ready[name] = time.perf_counter() - start
+
+    async def probe() -> None:
+        nonlocal max_lag
+        while not done.is_set():
+            tick = time.perf_counter()
+            await asyncio.sleep(LOOP_TICK_SECONDS)
+            max_lag = max(max_lag, time.perf_counter() - tick - LOOP_TICK_SECONDS)
+
+    probe_task = asyncio.ensure_future(probe())
+    await asyncio.gather(
+        timed("acoustics", analyzer.analyze(pcm, turns)),
+        timed("pronunciation", assessor.assess_pronunciation(pcm, None, turns)),
+    )
+    done.set()
+    await probe_task
+    return {
+        "acoustics_ms": round(ready["acoustics"] * 1000, 1),
+        "pronunciation_ms": round(ready["pronunciation"] * 1000, 1),
+        "max_loop_lag_ms": round(max_lag * 1000, 1),
+    }
+
+
+async def run_benchmark(minutes: List[float], per_second_ms: float, workers: int) -> List[Dict[str, Any]]:
+    """Measure the analytics alone and beside the assessment for sessions of each length."""
+    profile = {**DEFAULT_PROFILES[SERVICE_SPEECH], "per_unit_ms": per_second_ms}
+    # Repeated runs assess the same recording, keep them from hitting the result cache
+    assessor = PronunciationAssessor(
+        FakeSpeechAssessor(FakeBackend(SERVICE_SPEECH, profile)), EvaluationCache(max_memory_entries=0)
+    )
+    analyzers = {
+        "threads": AcousticAnalyzer(workers=0, min_silence_ms=MIN_SILENCE_MS),
+        f"processes_{workers}": AcousticAnalyzer(workers=workers, min_silence_ms=MIN_SILENCE_MS),
+    }
+
+    results = []
+    for session_minutes in minutes:
+        pcm, turns = _build_session(session_minutes, seed=int(session_minutes * 1000))
+        row: Dict[str, Any] = {"minutes": session_minutes, "inline": _cpu(pcm, turns)}
+        for mode, analyzer in analyzers.items():
+            # Start the worker processes before timing
+            await analyzer.analyze(pcm[: AUDIO_SAMPLE_RATE * AUDIO_SAMPLE_WIDTH], turns[:1])
+            row[mode] = await _concurrent(analyzer, assessor, pcm, turns)
+        results.append(row)
+
+    for analyzer in analyzers.values():
+        analyzer.shutdown()
+    return results
+
+
+def main() -> None:
+    """Parse arguments and print benchmark results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, nargs="+", default=[1, 5], help="Session lengths")
+    parser.add_argument("--per-second-ms", type=float, default=50, help="Fake Speech service time per second of audio")
+    parser.add_argument("--workers", type=int, default=2, help="Worker processes for the process pool run")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run_benchmark(args.minutes, args.per_second_ms, args.workers)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
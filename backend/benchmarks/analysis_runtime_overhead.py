@@ -0,0 +1,171 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Compare per-request overhead and connection reuse of a new event loop per request and the analysis runtime.
+
+Sends chat completions from synchronous worker threads, as Flask handlers do, to a local stand-in
+for Azure OpenAI that answers after a fixed delay. With a new loop per request every call creates
+its own client and connection; with the long-lived runtime calls share the loop's pooled client.
+Overhead is the request latency minus the stand-in's delay.
+
+    python -m benchmarks.analysis_runtime_overhead --requests 200 --concurrency 4 --loops 1
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List
+
+from src.services.analysis_runtime import AnalysisRuntime
+from src.services.metrics import metrics
+from src.services.openai_clients import CONNECTIONS_OPENED_METRIC, HTTP_REQUESTS_METRIC, openai_clients
+
+API_KEY = "benchmark-key"
+COMPLETION = json.dumps(
+    {
+        "id": "chatcmpl-benchmark",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4o",
+        "choices": [
+            {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": '{"overall_score": 80}'}}
+        ],
+        "usage": {"prompt_tokens": 100, "completion_tokens": 10, "total_tokens": 110},
+    }
+).encode("utf-8")
+
+
+def _start_stand_in(delay_seconds: float) -> ThreadingHTTPServer:
+    """Serve canned chat completions over keep-alive HTTP/1.1 after a fixed delay."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):  # pylint: disable=invalid-name
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(delay_seconds)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(COMPLETION)))
+            self.end_headers()
+            self.wfile.write(COMPLETION)
+
+        def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def _complete(endpoint: str) -> None:
+    """Make one evaluation-sized chat completion with the loop's shared client."""
+    client = openai_clients.get_client(endpoint, API_KEY)
+    assert client is not None
+    await client.chat.completions.create(model="gpt-4o", messages=[{"role": "user", "content": "Evaluate"}])
+
+
+def _new_loop_per_request(endpoint: str) -> None:
+    """Run the call the way handlers did before the runtime: a fresh loop and client each time."""
+
+    async def call_and_close():
+        try:
+            await _complete(endpoint)
+        finally:
+            await openai_clients.aclose()
+
+    asyncio.run(call_and_close())
+
+
+def _run_mode(
+    name: str, send: Callable[[], None], requests: int, concurrency: int, delay_seconds: float, endpoint: str
+) -> Dict[str, Any]:
+    """Send the requests from a pool of worker threads and summarize latency and connection reuse."""
+    metrics.reset()
+
+    def timed() -> float:
+        start = time.perf_counter()
+        send()
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies: List[float] = list(executor.map(lambda _: timed(), range(requests)))
+    elapsed = time.perf_counter() - start
+
+    counters = metrics.snapshot()["counters"]
+    labels = f"{{endpoint={endpoint}}}"
+    http_requests = counters.get(HTTP_REQUESTS_METRIC + labels, 0)
+    connections = counters.get(CONNECTIONS_OPENED_METRIC + labels, 0)
+    overheads = sorted((latency - delay_seconds) * 1000 for latency in latencies)
+    return {
+        "mode": name,
+        "requests": requests,
+        "throughput_rps": round(requests / elapsed, 1),
+        "overhead_mean_ms": round(statistics.mean(overheads), 2),
+        "overhead_p50_ms": round(overheads[len(overheads) // 2], 2),
+        "overhead_p95_ms": round(overheads[int(len(overheads) * 0.95) - 1], 2),
+        "connections_opened": connections,
+        "connection_reuse": round(1 - connections / http_requests, 3) if http_requests else None,
+    }
+
+
+def run_benchmark(requests: int, concurrency: int, loops: int, delay_seconds: float) -> List[Dict[str, Any]]:
+    """Compare a new loop per request with the long-lived runtime against the same stand-in."""
+    server = _start_stand_in(delay_seconds)
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}"
+    runtime = AnalysisRuntime(loops)
+    try:
+        # Warm up imports and the runtime's clients so only steady-state requests are measured
+        _new_loop_per_request(endpoint)
+        for _ in range(loops):
+            runtime.run(_complete(endpoint))
+
+        return [
+            _run_mode(
+                "new_loop_per_request",
+                lambda: _new_loop_per_request(endpoint),
+                requests,
+                concurrency,
+                delay_seconds,
+                endpoint,
+            ),
+            _run_mode(
+                "analysis_runtime",
+                lambda: runtime.run(_complete(endpoint)),
+                requests,
+                concurrency,
+                delay_seconds,
+                endpoint,
+            ),
+        ]
+    finally:
+        runtime.stop()
+        server.shutdown()
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4, help="Request handler threads")
+    parser.add_argument("--loops", type=int, default=1, help="Event loop threads of the runtime")
+    parser.add_argument("--delay", type=float, default=0.02, help="Stand-in response delay in seconds")
+    args = parser.parse_args()
+
+    for result in run_benchmark(args.requests, args.concurrency, args.loops, args.delay):
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
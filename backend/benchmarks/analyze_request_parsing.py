@@ -0,0 +1,121 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Compare peak memory and parse time of loading an analyze request body whole and streaming it.
+
+Writes the body the browser sends at the end of a session to a temporary file: the microphone
+recording in 100 ms user chunks for the whole session plus the assistant's audio deltas, as base64
+PCM16 at 24 kHz. Then it parses it the way the endpoint used to (read the body, json.loads, decode
+the user chunks) and with the streaming parser reading the file like a request stream.
+
+    python -m benchmarks.analyze_request_parsing --minutes 20 --assistant-share 0.5
+"""
+
+import argparse
+import base64
+import gc
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from src.services.analyze_request import parse_analyze_request
+
+SAMPLE_RATE = 24000
+BYTES_PER_SAMPLE = 2
+USER_CHUNK_SAMPLES = 2400
+ASSISTANT_CHUNK_SAMPLES = 4800
+
+
+def _write_body(path: str, minutes: float, assistant_share: float) -> int:
+    """Write a session's analyze request body and return its size in bytes."""
+    user_chunk = base64.b64encode(os.urandom(USER_CHUNK_SAMPLES * BYTES_PER_SAMPLE)).decode("ascii")
+    assistant_chunk = base64.b64encode(os.urandom(ASSISTANT_CHUNK_SAMPLES * BYTES_PER_SAMPLE)).decode("ascii")
+    user_chunks = int(minutes * 60 * SAMPLE_RATE / USER_CHUNK_SAMPLES)
+    assistant_chunks = int(minutes * 60 * SAMPLE_RATE * assistant_share / ASSISTANT_CHUNK_SAMPLES)
+    timestamp = "2025-01-01T00:00:00.000Z"
+
+    with open(path, "w", encoding="utf-8") as body:
+        body.write('{"scenario_id": "scenario1", "transcript": "user: Hello\\nassistant: Hi", "audio_data": [')
+        for index in range(user_chunks):
+            body.write("," if index else "")
+            body.write(json.dumps({"type": "user", "data": user_chunk, "timestamp": timestamp}))
+        for _ in range(assistant_chunks):
+            body.write("," + json.dumps({"type": "assistant", "data": assistant_chunk, "timestamp": timestamp}))
+        body.write('], "reference_text": "Hello", "session_id": null}')
+    return os.path.getsize(path)
+
+
+def _load_whole(path: str) -> int:
+    """Parse the body as the endpoint did before: the whole body, then all chunks as dicts."""
+    with open(path, "rb") as stream:
+        data = json.loads(stream.read())
+    combined = bytearray()
+    for chunk in data["audio_data"]:
+        if chunk.get("type") == "user":
+            combined.extend(base64.b64decode(chunk["data"]))
+    return len(combined)
+
+
+def _load_streaming(path: str) -> int:
+    """Parse the body with the streaming parser."""
+    with open(path, "rb") as stream:
+        _, user_audio = parse_analyze_request(stream)
+    return len(user_audio)
+
+
+def _measure(name: str, parse: Callable[[str], int], path: str, runs: int) -> Dict[str, Any]:
+    """Time the parser over several runs, then trace its peak allocation in one more."""
+    timings: List[float] = []
+    for _ in range(runs):
+        gc.collect()
+        start = time.perf_counter()
+        user_bytes = parse(path)
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    parse(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "parser": name,
+        "parse_ms": round(min(timings) * 1000, 1),
+        "peak_mb": round(peak / 1e6, 1),
+        "user_audio_mb": round(user_bytes / 1e6, 1),
+    }
+
+
+def run_benchmark(minutes: float, assistant_share: float, runs: int) -> Dict[str, Any]:
+    """Write the body once and measure both parsers on it."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "analyze.json")
+        size = _write_body(path, minutes, assistant_share)
+        return {
+            "minutes": minutes,
+            "body_mb": round(size / 1e6, 1),
+            "results": [
+                _measure("json_loads", _load_whole, path, runs),
+                _measure("streaming", _load_streaming, path, runs),
+            ],
+        }
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=20.0, help="Session length")
+    parser.add_argument("--assistant-share", type=float, default=0.5, help="Share of the session the assistant speaks")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args.minutes, args.assistant_share, args.runs), indent=2))
+
+
+if __name__ == "__main__":
+    main()
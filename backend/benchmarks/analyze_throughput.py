@@ -0,0 +1,106 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Measure concurrent /api/analyze throughput against a running backend.
+
+Run the backend (python src/app.py, or a multi-threaded WSGI server) and then:
+
+    python benchmarks/analyze_throughput.py --url http://localhost:8000 --concurrency 8 --requests 64
+
+Run it once on the previous commit and once on the current one to compare before and after.
+
+To benchmark offline, start the backend with the local fakes, e.g. LLM_PROVIDER=fake
+SPEECH_PROVIDER=fake EVALUATION_CACHE_ENABLED=false, and a FAKE_LLM_PROFILE with zero latency to
+measure the backend's own overhead.
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+DEFAULT_URL = "http://localhost:8000"
+DEFAULT_SCENARIO = "scenario1"
+DEFAULT_TRANSCRIPT = (
+    "user: Hi, thanks for taking the time today. What are your biggest challenges right now?\n"
+    "assistant: Our main concern is integrating new tools with our existing systems.\n"
+    "user: That makes sense. Could you tell me more about the systems you use today?"
+)
+
+
+def _post_analyze(url: str, payload: bytes, timeout: float) -> Tuple[float, bool]:
+    """Send one analyze request and return its latency in seconds and success flag."""
+    request = urllib.request.Request(
+        f"{url}/api/analyze", data=payload, headers={"Content-Type": "application/json"}, method="POST"
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            body = json.loads(response.read())
+            ok = response.status == 200 and body.get("ai_assessment") is not None
+    except Exception:
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+def _percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def run_benchmark(url: str, concurrency: int, total_requests: int, timeout: float, scenario: str) -> Dict[str, Any]:
+    """Run the benchmark and return summary statistics."""
+    payload = json.dumps({"scenario_id": scenario, "transcript": DEFAULT_TRANSCRIPT, "audio_data": []}).encode()
+    latencies: List[float] = []
+    failures = 0
+    lock = threading.Lock()
+
+    def worker(_: int) -> None:
+        nonlocal failures
+        latency, ok = _post_analyze(url, payload, timeout)
+        with lock:
+            latencies.append(latency)
+            failures += 0 if ok else 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, range(total_requests)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "concurrency": concurrency,
+        "requests": total_requests,
+        "failures": failures,
+        "elapsed_s": round(elapsed, 2),
+        "throughput_rps": round(total_requests / elapsed, 2),
+        "latency_mean_ms": round(statistics.mean(latencies) * 1000, 1),
+        "latency_p50_ms": round(_percentile(latencies, 50) * 1000, 1),
+        "latency_p90_ms": round(_percentile(latencies, 90) * 1000, 1),
+        "latency_p99_ms": round(_percentile(latencies, 99) * 1000, 1),
+    }
+
+
+def main() -> None:
+    """Parse arguments and print benchmark results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=DEFAULT_URL)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--scenario", default=DEFAULT_SCENARIO)
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args.url, args.concurrency, args.requests, args.timeout, args.scenario), indent=2))
+
+
+if __name__ == "__main__":
+    main()
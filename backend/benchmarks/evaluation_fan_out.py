@@ -0,0 +1,78 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Compare wall-clock evaluation latency of the single-call and parallel evaluation modes.
+
+Evaluates the same transcript against the configured Azure OpenAI deployment in both modes,
+alternating between them so both see the same service conditions.
+
+    python -m benchmarks.evaluation_fan_out --scenario scenario1 --runs 5
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Any, Dict, List
+
+from src.services.analyzers import ConversationAnalyzer
+from src.services.evaluation_cache import EvaluationCache
+from src.services.evaluation_groups import EVALUATION_MODE_KEY, EVALUATION_MODE_PARALLEL
+
+DEFAULT_SCENARIO = "scenario1"
+MODE_SINGLE = "single"
+TRANSCRIPT = """user: Hi, thanks for taking the time today. What are your biggest challenges right now?
+assistant: Integration, mostly. Our CRM and billing tools do not talk to each other.
+user: How much time does your team spend keeping those two in sync?
+assistant: A few hours every week, honestly.
+user: We have customers who cut that to minutes with our connectors.
+assistant: That sounds expensive to set up.
+user: Most teams are live in two weeks, and we handle the migration. Would Thursday work for a demo?
+assistant: Thursday works."""
+
+
+def _summarize(latencies: List[float]) -> Dict[str, Any]:
+    """Summarize latency samples in milliseconds."""
+    return {
+        "runs": len(latencies),
+        "mean_ms": round(statistics.mean(latencies), 1),
+        "median_ms": round(statistics.median(latencies), 1),
+        "max_ms": round(max(latencies), 1),
+    }
+
+
+async def run_benchmark(scenario: str, runs: int) -> Dict[str, Any]:
+    """Evaluate the transcript in both modes and return summary statistics."""
+    analyzer = ConversationAnalyzer(evaluation_cache=EvaluationCache(max_memory_entries=0))
+    evaluation_scenario = analyzer.evaluation_scenarios.get(scenario)
+    if evaluation_scenario is None:
+        raise SystemExit(f"No evaluation scenario named {scenario}")
+
+    latencies: Dict[str, List[float]] = {MODE_SINGLE: [], EVALUATION_MODE_PARALLEL: []}
+    for _ in range(runs):
+        for mode, samples in latencies.items():
+            evaluation_scenario[EVALUATION_MODE_KEY] = mode
+            start = time.perf_counter()
+            if await analyzer.analyze_conversation(scenario, TRANSCRIPT) is None:
+                raise SystemExit(f"Evaluation failed in {mode} mode")
+            samples.append((time.perf_counter() - start) * 1000)
+
+    return {mode: _summarize(samples) for mode, samples in latencies.items()}
+
+
+def main() -> None:
+    """Parse arguments and print benchmark results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", default=DEFAULT_SCENARIO)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run_benchmark(args.scenario, args.runs)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Compare evaluation latency against transcript length, in a single call versus chunked map-reduce.
+
+Evaluates synthetic transcripts of increasing length against the configured Azure OpenAI
+deployment, once with the token budget disabled and once with the configured budget.
+
+    python -m benchmarks.evaluation_transcript_length --scenario scenario1 --turns 10 50 200 400 --runs 3
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Any, Dict, List
+
+from src.services.analyzers import ConversationAnalyzer
+from src.services.evaluation_cache import EvaluationCache
+from src.services.token_budget import TOKEN_BUDGET_KEY, TokenBudget, estimate_tokens
+
+DEFAULT_SCENARIO = "scenario1"
+USER_TURN = "user: Could you walk me through how the rollout would work for our regional offices, {index}?"
+ASSISTANT_TURN = "assistant: Each office has its own billing setup, so we would need to plan it carefully, {index}."
+
+
+def _build_transcript(turns: int) -> str:
+    """Build a transcript with the given number of user and assistant turn pairs."""
+    return "\n".join(f"{USER_TURN.format(index=index)}\n{ASSISTANT_TURN.format(index=index)}" for index in range(turns))
+
+
+async def _time_evaluation(analyzer: ConversationAnalyzer, scenario: str, transcript: str, runs: int) -> float:
+    """Return the median evaluation latency in milliseconds."""
+    latencies: List[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        if await analyzer.analyze_conversation(scenario, transcript) is None:
+            raise SystemExit("Evaluation failed")
+        latencies.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(latencies), 1)
+
+
+async def run_benchmark(scenario: str, turn_counts: List[int], runs: int) -> List[Dict[str, Any]]:
+    """Evaluate each transcript length in both modes and return the latencies."""
+    analyzer = ConversationAnalyzer(evaluation_cache=EvaluationCache(max_memory_entries=0))
+    evaluation_scenario = analyzer.evaluation_scenarios.get(scenario)
+    if evaluation_scenario is None:
+        raise SystemExit(f"No evaluation scenario named {scenario}")
+    budget = TokenBudget.for_scenario(evaluation_scenario)
+
+    results = []
+    for turns in turn_counts:
+        transcript = _build_transcript(turns)
+        evaluation_scenario[TOKEN_BUDGET_KEY] = {"maxTranscriptTokens": 0}
+        single_ms = await _time_evaluation(analyzer, scenario, transcript, runs)
+        evaluation_scenario.pop(TOKEN_BUDGET_KEY)
+        budgeted_ms = await _time_evaluation(analyzer, scenario, transcript, runs)
+
+        tokens = estimate_tokens(transcript)
+        chunks = len(budget.split(transcript)) if budget.requires_chunking(tokens) else 1
+        results.append(
+            {"turns": turns, "tokens": tokens, "chunks": chunks, "single_ms": single_ms, "budgeted_ms": budgeted_ms}
+        )
+    return results
+
+
+def main() -> None:
+    """Parse arguments and print benchmark results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", default=DEFAULT_SCENARIO)
+    parser.add_argument("--turns", type=int, nargs="+", default=[10, 50, 200, 400], help="turn pairs per transcript")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run_benchmark(args.scenario, args.turns, args.runs)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Compare end-of-session-to-result latency of live and full pronunciation assessment.
+
+Replays a session's user turns as the voice proxy reports them: the microphone audio of each turn,
+its speech started and stopped events and its transcript, followed by the assistant's reply time.
+The local fake Speech service takes a fixed latency per call plus time per second of audio. Once
+the session ends, it measures how long the pronunciation report takes: combining the turn results
+assessed during the session versus assessing the whole recording, split into parallel segments.
+
+    python -m benchmarks.pronunciation_end_to_result --turns 10 --turn-seconds 6 --reply-seconds 4 --runs 3
+"""
+
+import argparse
+import array
+import asyncio
+import base64
+import json
+import math
+import statistics
+import time
+from typing import Any, Dict, List, Tuple
+
+from src.services.evaluation_cache import EvaluationCache
+from src.services.live_pronunciation import LivePronunciationAssessor
+from src.services.pronunciation_assessment import AUDIO_SAMPLE_RATE, PronunciationAssessor
+from src.services.providers import DEFAULT_PROFILES, SERVICE_SPEECH, FakeBackend, FakeSpeechAssessor
+
+SESSION_ID = "benchmark-session"
+TURN_TEXT = "we could roll this out to your regional offices over the next quarter"
+CHUNK_MS = 100
+TONE_AMPLITUDE = 8000
+
+
+def _pcm(seconds: float, amplitude: int) -> bytes:
+    """A tone, or silence at amplitude 0."""
+    samples = array.array(
+        "h",
+        (
+            int(amplitude * math.sin(2 * math.pi * 180 * index / AUDIO_SAMPLE_RATE))
+            for index in range(int(seconds * AUDIO_SAMPLE_RATE))
+        ),
+    )
+    return samples.tobytes()
+
+
+async def _replay_live(
+    live: LivePronunciationAssessor, turns: int, turn_seconds: float, reply_seconds: float
+) -> Tuple[float, bool, bytearray]:
+    """Replay the session through the live assessor and time the final report."""
+    speech, reply = _pcm(turn_seconds, TONE_AMPLITUDE), _pcm(reply_seconds, 0)
+    chunk_bytes = AUDIO_SAMPLE_RATE * 2 * CHUNK_MS // 1000
+    recording = bytearray()
+    live.start_session(SESSION_ID)
+
+    for index in range(turns):
+        start_ms = len(recording) * 1000 // (AUDIO_SAMPLE_RATE * 2)
+        for audio in (speech, reply):
+            for offset in range(0, len(audio), chunk_bytes):
+                live.record_audio(SESSION_ID, base64.b64encode(audio[offset : offset + chunk_bytes]))
+            recording += audio
+        item_id = f"item-{index}"
+        end_ms = start_ms + int(turn_seconds * 1000)
+        live.record_event(
+            SESSION_ID, {"type": "input_audio_buffer.speech_started", "item_id": item_id, "audio_start_ms": start_ms}
+        )
+        live.record_event(
+            SESSION_ID, {"type": "input_audio_buffer.speech_stopped", "item_id": item_id, "audio_end_ms": end_ms}
+        )
+        live.record_event(
+            SESSION_ID,
+            {
+                "type": "conversation.item.input_audio_transcription.completed",
+                "item_id": item_id,
+                "transcript": TURN_TEXT,
+            },
+        )
+        await asyncio.sleep(reply_seconds)
+
+    start = time.perf_counter()
+    result = await live.consolidate(SESSION_ID, turns)
+    return time.perf_counter() - start, result is not None, recording
+
+
+async def _assess_full(assessor: PronunciationAssessor, recording: bytearray, turns: int) -> Tuple[float, bool]:
+    """Time assessing the whole recording, as the analyze endpoint does without live results."""
+    start = time.perf_counter()
+    result = await assessor.assess_pronunciation(recording, TURN_TEXT, [TURN_TEXT] * turns)
+    return time.perf_counter() - start, result is not None
+
+
+def _summarize(samples: List[Tuple[float, bool]]) -> Dict[str, Any]:
+    """Summarize latency samples in milliseconds."""
+    latencies = [latency * 1000 for latency, _ in samples]
+    return {
+        "runs": len(samples),
+        "failures": sum(1 for _, ok in samples if not ok),
+        "mean_ms": round(statistics.mean(latencies), 1),
+        "median_ms": round(statistics.median(latencies), 1),
+        "max_ms": round(max(latencies), 1),
+    }
+
+
+async def run_benchmark(turns: int, turn_seconds: float, reply_seconds: float, runs: int) -> Dict[str, Any]:
+    """Run both flows and return summary statistics."""
+    # Repeated runs assess the same recording, keep them from hitting the result cache
+    assessor = PronunciationAssessor(
+        FakeSpeechAssessor(FakeBackend(SERVICE_SPEECH, DEFAULT_PROFILES[SERVICE_SPEECH])),
+        EvaluationCache(max_memory_entries=0),
+    )
+    live_samples: List[Tuple[float, bool]] = []
+    full_samples: List[Tuple[float, bool]] = []
+    for _ in range(runs):
+        live = LivePronunciationAssessor(assessor, asyncio.get_running_loop)
+        latency, ok, recording = await _replay_live(live, turns, turn_seconds, reply_seconds)
+        live_samples.append((latency, ok))
+        full_samples.append(await _assess_full(assessor, recording, turns))
+
+    return {
+        "turns": turns,
+        "session_s": round(turns * (turn_seconds + reply_seconds), 1),
+        "full": _summarize(full_samples),
+        "live": _summarize(live_samples),
+    }
+
+
+def main() -> None:
+    """Parse arguments and print benchmark results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=10, help="User turns in the session")
+    parser.add_argument("--turn-seconds", type=float, default=6.0, help="Length of each user turn")
+    parser.add_argument("--reply-seconds", type=float, default=4.0, help="Assistant reply time after each turn")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        json.dumps(asyncio.run(run_benchmark(args.turns, args.turn_seconds, args.reply_seconds, args.runs)), indent=2)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Measure the detail/latency tradeoff of planning pronunciation assessment settings under a budget.
+
+Uses a fixed corpus: the recordings of sessions built like benchmarks.pronunciation_session_length
+with fixed seeds. They are assessed against the local fake Speech service, where word granularity
+and turning prosody off take less time in proportion to their relative cost. Each session is
+assessed once without a budget, which also teaches the planner the service latency. It is then
+assessed with budgets set to fractions of that latency. For each run the report has:
+- the wall-clock time and whether it kept to the budget;
+- the share of the speech assessed at phoneme level and with prosody, as the quality measure;
+- the chosen settings.
+The fake's scores do not depend on the settings, so score differences are not measured.
+
+    python -m benchmarks.pronunciation_latency_budget --minutes 5 15 --fractions 0.9 0.8 0.7 --per-second-ms 300
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmarks.pronunciation_session_length import _build_session
+from src.services.assessment_planner import GRANULARITY_PHONEME
+from src.services.evaluation_cache import EvaluationCache
+from src.services.pronunciation_assessment import PronunciationAssessor
+from src.services.providers import DEFAULT_PROFILES, SERVICE_SPEECH, FakeBackend, FakeSpeechAssessor
+
+SEGMENT_CONCURRENCY = 4
+
+
+async def _assess(
+    assessor: PronunciationAssessor, pcm: bytearray, turns: List[str], budget_ms: Optional[float]
+) -> Dict[str, Any]:
+    """Assess the recording under the budget and summarize the latency and the detail kept."""
+    start = time.perf_counter()
+    result = await assessor.assess_pronunciation(pcm, None, turns, budget_ms)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if result is None:
+        raise SystemExit("Assessment failed")
+
+    plan = result["assessment_plan"]
+    speech_seconds = sum(entry["audio_seconds"] for entry in plan)
+    phoneme_seconds = sum(entry["audio_seconds"] for entry in plan if entry["granularity"] == GRANULARITY_PHONEME)
+    prosody_seconds = sum(entry["audio_seconds"] for entry in plan if entry["enable_prosody"])
+    return {
+        "budget_ms": round(budget_ms) if budget_ms else None,
+        "ms": round(elapsed_ms),
+        "within_budget": elapsed_ms <= budget_ms if budget_ms else None,
+        "phoneme_share": round(phoneme_seconds / speech_seconds, 3),
+        "prosody_share": round(prosody_seconds / speech_seconds, 3),
+        "plan": [
+            {
+                "granularity": entry["granularity"],
+                "prosody": entry["enable_prosody"],
+                "segments": entry["segments"],
+                "audio_seconds": round(entry["audio_seconds"], 1),
+            }
+            for entry in plan
+        ],
+    }
+
+
+async def run_benchmark(minutes: List[float], fractions: List[float], per_second_ms: float) -> List[Dict[str, Any]]:
+    """Assess each session without a budget and then under each fraction of that latency."""
+    profile = {**DEFAULT_PROFILES[SERVICE_SPEECH], "per_unit_ms": per_second_ms}
+    results = []
+    for session_minutes in minutes:
+        pcm, turns = _build_session(session_minutes, seed=int(session_minutes * 1000))
+        # Each session gets a fresh planner, and the same recording is kept from hitting the result cache
+        assessor = PronunciationAssessor(
+            FakeSpeechAssessor(FakeBackend(SERVICE_SPEECH, profile)), EvaluationCache(max_memory_entries=0)
+        )
+        assessor.segmentation_enabled = True
+        assessor.segment_concurrency = SEGMENT_CONCURRENCY
+
+        unbudgeted = await _assess(assessor, pcm, turns, None)
+        runs = [unbudgeted]
+        for fraction in fractions:
+            runs.append({"fraction": fraction, **await _assess(assessor, pcm, turns, unbudgeted["ms"] * fraction)})
+        results.append({"minutes": session_minutes, "runs": runs})
+    return results
+
+
+def main() -> None:
+    """Parse arguments and print benchmark results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, nargs="+", default=[5, 15], help="Session lengths")
+    parser.add_argument(
+        "--fractions", type=float, nargs="+", default=[0.9, 0.8, 0.7], help="Budgets as fractions of no budget"
+    )
+    parser.add_argument("--per-second-ms", type=float, default=300, help="Fake Speech service time per second of audio")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run_benchmark(args.minutes, args.fractions, args.per_second_ms)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
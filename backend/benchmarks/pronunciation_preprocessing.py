@@ -0,0 +1,106 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Measure audio preprocessing throughput and its effect on pronunciation assessment latency.
+
+Builds the user's recording of sessions like benchmarks.pronunciation_session_length, recorded
+quietly with a DC offset and background hiss. Preprocessing throughput is reported in seconds of
+audio per CPU second. Assessment latency against the local fake Speech service, which takes
+time per second of audio, is compared with preprocessing off and on, for the whole recording
+and for segments assessed four at a time.
+
+    python -m benchmarks.pronunciation_preprocessing --minutes 1 5 --per-second-ms 50
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+from benchmarks.pronunciation_session_length import _build_session
+from src.services.audio_preprocessing import preprocess_audio
+from src.services.evaluation_cache import EvaluationCache
+from src.services.pronunciation_assessment import AUDIO_SAMPLE_RATE, PronunciationAssessor
+from src.services.providers import DEFAULT_PROFILES, SERVICE_SPEECH, FakeBackend, FakeSpeechAssessor
+
+RECORDING_GAIN = 0.15
+DC_OFFSET = 400
+HISS_AMPLITUDE = 40
+SEGMENT_CONCURRENCY = 4
+
+
+def _record(minutes: float) -> Dict[str, Any]:
+    """A session recording with the level, offset and noise of a cheap microphone."""
+    pcm, turns = _build_session(minutes, seed=int(minutes * 1000))
+    rng = np.random.default_rng(int(minutes * 1000))
+    samples = np.frombuffer(pcm, dtype="<i2") * RECORDING_GAIN + DC_OFFSET
+    samples += rng.normal(0, HISS_AMPLITUDE, len(samples))
+    return {"pcm": bytearray(np.rint(samples).astype("<i2").tobytes()), "turns": turns}
+
+
+def _throughput(pcm: bytearray, max_pause_ms: int) -> Dict[str, Any]:
+    """Preprocess the whole recording and report audio seconds per CPU second."""
+    start = time.process_time()
+    result = preprocess_audio(memoryview(pcm), max_pause_ms, AUDIO_SAMPLE_RATE)
+    cpu_seconds = time.process_time() - start
+    audio_seconds = len(pcm) / (AUDIO_SAMPLE_RATE * 2)
+    return {
+        "cpu_ms": round(cpu_seconds * 1000, 1),
+        "audio_s_per_cpu_s": round(audio_seconds / max(cpu_seconds, 1e-9)),
+        "removed_s": round(result.removed_seconds, 1),
+    }
+
+
+async def _latency(assessor: PronunciationAssessor, recording: Dict[str, Any]) -> Dict[str, Any]:
+    """Assess the recording and return the wall-clock time and the audio preprocessing removed."""
+    start = time.perf_counter()
+    result = await assessor.assess_pronunciation(recording["pcm"], None, recording["turns"])
+    if result is None:
+        raise SystemExit("Assessment failed")
+    return {"ms": round((time.perf_counter() - start) * 1000, 1), "removed_s": result.get("removed_audio_seconds", 0.0)}
+
+
+async def run_benchmark(minutes: List[float], per_second_ms: float, max_pause_ms: int) -> List[Dict[str, Any]]:
+    """Measure preprocessing throughput and assessment latency for sessions of each length."""
+    profile = {**DEFAULT_PROFILES[SERVICE_SPEECH], "per_unit_ms": per_second_ms}
+    # Repeated runs assess the same recording, keep them from hitting the result cache
+    assessor = PronunciationAssessor(
+        FakeSpeechAssessor(FakeBackend(SERVICE_SPEECH, profile)), EvaluationCache(max_memory_entries=0)
+    )
+    assessor.max_pause_ms = max_pause_ms
+    assessor.segment_concurrency = SEGMENT_CONCURRENCY
+
+    results = []
+    for session_minutes in minutes:
+        recording = _record(session_minutes)
+        row: Dict[str, Any] = {
+            "minutes": session_minutes,
+            "preprocessing": _throughput(recording["pcm"], max_pause_ms),
+        }
+        for mode, segmented in (("whole", False), (f"segmented_c{SEGMENT_CONCURRENCY}", True)):
+            assessor.segmentation_enabled = segmented
+            for preprocessing in (False, True):
+                assessor.preprocessing_enabled = preprocessing
+                row[f"{mode}_{'preprocessed' if preprocessing else 'raw'}"] = await _latency(assessor, recording)
+        results.append(row)
+    return results
+
+
+def main() -> None:
+    """Parse arguments and print benchmark results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, nargs="+", default=[1, 5], help="Session lengths")
+    parser.add_argument("--per-second-ms", type=float, default=50, help="Fake Speech service time per second of audio")
+    parser.add_argument("--max-pause-ms", type=int, default=1000, help="Longer pauses are shortened to this")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run_benchmark(args.minutes, args.per_second_ms, args.max_pause_ms)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
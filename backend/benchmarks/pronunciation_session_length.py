@@ -0,0 +1,108 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Measure pronunciation assessment wall-clock time against session length, whole and segment-parallel.
+
+Builds a session's microphone recording: user turns of speech-like tone bursts with short pauses,
+separated by the silence of the assistant's replies. It is assessed by the local fake Speech
+service, which takes a fixed latency per call plus time per second of audio, once as a single
+recognition of the whole recording and then split into segments at different concurrencies.
+The Speech service's single recognition only covers the first utterance, so the whole mode
+understates the work needed to assess a full session that way.
+
+    python -m benchmarks.pronunciation_session_length --minutes 1 5 10 20 --concurrency 1 4 8
+"""
+
+import argparse
+import array
+import asyncio
+import json
+import math
+import random
+import time
+from typing import Any, Dict, List, Tuple
+
+from src.services.evaluation_cache import EvaluationCache
+from src.services.pronunciation_assessment import AUDIO_SAMPLE_RATE, PronunciationAssessor
+from src.services.providers import DEFAULT_PROFILES, SERVICE_SPEECH, FakeBackend, FakeSpeechAssessor
+
+WORDS = "we could roll this out to your regional offices over the next quarter".split()
+TONE_AMPLITUDE = 8000
+
+
+def _build_session(minutes: float, seed: int) -> Tuple[bytearray, List[str]]:
+    """Build the user's PCM recording of a session and the text of each user turn."""
+    rng = random.Random(seed)
+    samples = array.array("h")
+    turns: List[str] = []
+
+    def add(seconds: float, amplitude: int) -> None:
+        frequency = rng.uniform(120, 260)
+        samples.extend(
+            int(amplitude * math.sin(2 * math.pi * frequency * index / AUDIO_SAMPLE_RATE))
+            for index in range(int(seconds * AUDIO_SAMPLE_RATE))
+        )
+
+    while len(samples) < minutes * 60 * AUDIO_SAMPLE_RATE:
+        words: List[str] = []
+        for _ in range(rng.randint(1, 3)):
+            phrase_seconds = rng.uniform(1.5, 5.0)
+            add(phrase_seconds, TONE_AMPLITUDE)
+            add(rng.uniform(0.5, 0.9), 0)
+            words.extend(rng.choice(WORDS) for _ in range(int(phrase_seconds * 2.5)))
+        turns.append(" ".join(words))
+        add(rng.uniform(4.0, 10.0), 0)
+    return bytearray(samples.tobytes()), turns
+
+
+async def _time_assessment(assessor: PronunciationAssessor, pcm: bytearray, turns: List[str]) -> Dict[str, Any]:
+    """Assess the recording and return the wall-clock time and segment count."""
+    start = time.perf_counter()
+    result = await assessor.assess_pronunciation(pcm, " ".join(turns), turns)
+    if result is None:
+        raise SystemExit("Assessment failed")
+    return {"ms": round((time.perf_counter() - start) * 1000, 1), "segments": result.get("segment_count", 1)}
+
+
+async def run_benchmark(minutes: List[float], concurrencies: List[int], per_second_ms: float) -> List[Dict[str, Any]]:
+    """Assess a session of each length whole and with each segment concurrency."""
+    profile = {**DEFAULT_PROFILES[SERVICE_SPEECH], "per_unit_ms": per_second_ms}
+    # Repeated runs assess the same recording, keep them from hitting the result cache
+    assessor = PronunciationAssessor(
+        FakeSpeechAssessor(FakeBackend(SERVICE_SPEECH, profile)), EvaluationCache(max_memory_entries=0)
+    )
+
+    results = []
+    for session_minutes in minutes:
+        pcm, turns = _build_session(session_minutes, seed=int(session_minutes * 1000))
+        row: Dict[str, Any] = {"minutes": session_minutes, "user_turns": len(turns)}
+
+        assessor.segmentation_enabled = False
+        row["whole_ms"] = (await _time_assessment(assessor, pcm, turns))["ms"]
+
+        assessor.segmentation_enabled = True
+        for concurrency in concurrencies:
+            assessor.segment_concurrency = concurrency
+            timing = await _time_assessment(assessor, pcm, turns)
+            row["segments"] = timing["segments"]
+            row[f"segmented_c{concurrency}_ms"] = timing["ms"]
+        results.append(row)
+    return results
+
+
+def main() -> None:
+    """Parse arguments and print benchmark results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, nargs="+", default=[1, 5, 10, 20], help="Session lengths")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8], help="Segments assessed at once")
+    parser.add_argument("--per-second-ms", type=float, default=50, help="Fake Speech service time per second of audio")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run_benchmark(args.minutes, args.concurrency, args.per_second_ms)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
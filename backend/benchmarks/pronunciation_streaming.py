@@ -0,0 +1,127 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Compare handing a recording to the Speech SDK as one WAV with streaming its raw PCM in chunks.
+
+The previous path built a WAV copy of the recording in memory, wrote it into the push stream
+in one call and only then started recognition. The streaming path starts recognition first
+and writes the PCM in PUSH_CHUNK_MS pieces straight from the recording. Both write into real
+SDK push streams without connecting to the service, so this measures when the recognizer has
+its first and last audio, and the peak Python memory the handover allocates on top of the
+recording. The SDK's own buffer of the written audio is the same for both paths.
+
+    python -m benchmarks.pronunciation_streaming --minutes 1 5 20 --runs 3
+"""
+
+import argparse
+import io
+import json
+import statistics
+import time
+import tracemalloc
+import wave
+from typing import Any, Callable, Dict, List, Tuple
+
+import azure.cognitiveservices.speech as speechsdk  # pyright: ignore[reportMissingTypeStubs]
+from src.services.pronunciation_assessment import (
+    AUDIO_BITS_PER_SAMPLE,
+    AUDIO_CHANNELS,
+    AUDIO_SAMPLE_RATE,
+    AUDIO_SAMPLE_WIDTH,
+    PUSH_CHUNK_BYTES,
+)
+
+BYTES_PER_MINUTE = AUDIO_SAMPLE_RATE * AUDIO_SAMPLE_WIDTH * AUDIO_CHANNELS * 60
+
+# (seconds until the recognizer has audio, seconds until all audio is written)
+Handover = Tuple[float, float]
+
+
+def _push_stream() -> speechsdk.audio.PushAudioInputStream:
+    """A push stream in the recordings' PCM format."""
+    audio_format = speechsdk.audio.AudioStreamFormat(
+        samples_per_second=AUDIO_SAMPLE_RATE,
+        bits_per_sample=AUDIO_BITS_PER_SAMPLE,
+        channels=AUDIO_CHANNELS,
+        wave_stream_format=speechsdk.audio.AudioStreamWaveFormat.PCM,
+    )
+    return speechsdk.audio.PushAudioInputStream(stream_format=audio_format)
+
+
+def _handover_wav(pcm: bytearray) -> Handover:
+    """The previous path: build a WAV, write it whole, then start recognizing."""
+    start = time.perf_counter()
+    with io.BytesIO() as wav_buffer:
+        with wave.open(wav_buffer, "wb") as wav_file:
+            wav_file.setnchannels(AUDIO_CHANNELS)
+            wav_file.setsampwidth(AUDIO_SAMPLE_WIDTH)
+            wav_file.setframerate(AUDIO_SAMPLE_RATE)
+            wav_file.writeframes(pcm)
+        wav_buffer.seek(0)
+        wav_audio = wav_buffer.read()
+    push_stream = _push_stream()
+    push_stream.write(wav_audio)
+    push_stream.close()
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed
+
+
+def _handover_streaming(pcm: bytearray) -> Handover:
+    """The streaming path: recognition is already running when the first chunk is written."""
+    start = time.perf_counter()
+    push_stream = _push_stream()
+    view = memoryview(pcm)
+    first_audio = None
+    for offset in range(0, len(view), PUSH_CHUNK_BYTES):
+        push_stream.write(view[offset : offset + PUSH_CHUNK_BYTES].tobytes())
+        if first_audio is None:
+            first_audio = time.perf_counter() - start
+    push_stream.close()
+    return first_audio or 0.0, time.perf_counter() - start
+
+
+def _measure(handover: Callable[[bytearray], Handover], pcm: bytearray, runs: int) -> Dict[str, Any]:
+    """Time the handover over several runs and trace its peak allocation once."""
+    samples = [handover(pcm) for _ in range(runs)]
+    tracemalloc.start()
+    handover(pcm)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "first_audio_ms": round(statistics.median(first for first, _ in samples) * 1000, 2),
+        "all_audio_ms": round(statistics.median(last for _, last in samples) * 1000, 1),
+        "peak_python_mb": round(peak / 1_000_000, 2),
+    }
+
+
+def run_benchmark(minutes: List[float], runs: int) -> Dict[str, Any]:
+    """Measure both handovers for recordings of each length."""
+    results = []
+    for length in minutes:
+        pcm = bytearray(int(length * BYTES_PER_MINUTE))
+        results.append(
+            {
+                "minutes": length,
+                "recording_mb": round(len(pcm) / 1_000_000, 1),
+                "wav": _measure(_handover_wav, pcm, runs),
+                "streaming": _measure(_handover_streaming, pcm, runs),
+            }
+        )
+    return {"push_chunk_bytes": PUSH_CHUNK_BYTES, "runs": runs, "results": results}
+
+
+def main() -> None:
+    """Parse arguments and print benchmark results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, nargs="+", default=[1.0, 5.0, 20.0], help="Recording lengths")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args.minutes, args.runs), indent=2))
+
+
+if __name__ == "__main__":
+    main()
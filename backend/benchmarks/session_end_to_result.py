@@ -0,0 +1,104 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Compare end-of-session-to-result latency of incremental and full conversation evaluation.
+
+Replays a conversation turn by turn against the configured Azure OpenAI deployment, as the voice
+proxy would report it, then measures how long it takes to get the assessment once the session
+ends: consolidating the running evaluation versus evaluating the whole transcript from scratch.
+
+    python -m benchmarks.session_end_to_result --scenario scenario1 --turn-interval 8 --runs 3
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Any, Dict, List, Tuple
+
+from src.services.analyzers import ConversationAnalyzer
+from src.services.evaluation_cache import EvaluationCache
+from src.services.incremental_evaluation import ROLE_ASSISTANT, ROLE_USER, IncrementalEvaluator
+
+DEFAULT_SCENARIO = "scenario1"
+CONVERSATION: List[Tuple[str, str]] = [
+    ("Hi, thanks for taking the time today. What are your biggest challenges right now?", "Integration, mostly."),
+    ("Could you tell me more about the systems you use today?", "An on-premises CRM and a custom billing tool."),
+    ("How much time does your team spend keeping those two in sync?", "A few hours every week, honestly."),
+    ("We have customers who cut that to minutes with our connectors.", "That sounds expensive to set up."),
+    ("Most teams are live in two weeks, and we handle the migration.", "What about our security reviews?"),
+    ("We can share our certifications and join your review call. Would Thursday work?", "Thursday works."),
+]
+
+
+async def _replay_incremental(
+    evaluator: IncrementalEvaluator, scenario: str, turn_interval: float
+) -> Tuple[float, bool]:
+    """Replay the conversation through the incremental evaluator and time the final consolidation."""
+    session_id = evaluator.start_session(scenario)
+    if session_id is None:
+        raise SystemExit(f"No evaluation scenario named {scenario}")
+
+    for user_text, assistant_text in CONVERSATION:
+        evaluator.record_turn(session_id, ROLE_USER, user_text)
+        await asyncio.sleep(turn_interval)
+        evaluator.record_turn(session_id, ROLE_ASSISTANT, assistant_text)
+
+    start = time.perf_counter()
+    result = await evaluator.consolidate(session_id, scenario)
+    return time.perf_counter() - start, result is not None
+
+
+async def _evaluate_full(analyzer: ConversationAnalyzer, scenario: str) -> Tuple[float, bool]:
+    """Time a full evaluation of the transcript, as the analyze endpoint does without a session."""
+    transcript = "\n".join(f"user: {user}\nassistant: {assistant}" for user, assistant in CONVERSATION)
+    start = time.perf_counter()
+    result = await analyzer.analyze_conversation(scenario, transcript)
+    return time.perf_counter() - start, result is not None
+
+
+def _summarize(samples: List[Tuple[float, bool]]) -> Dict[str, Any]:
+    """Summarize latency samples in milliseconds."""
+    latencies = [latency * 1000 for latency, _ in samples]
+    return {
+        "runs": len(samples),
+        "failures": sum(1 for _, ok in samples if not ok),
+        "mean_ms": round(statistics.mean(latencies), 1),
+        "median_ms": round(statistics.median(latencies), 1),
+        "max_ms": round(max(latencies), 1),
+    }
+
+
+async def run_benchmark(scenario: str, turn_interval: float, runs: int) -> Dict[str, Any]:
+    """Run both flows and return summary statistics."""
+    analyzer = ConversationAnalyzer(evaluation_cache=EvaluationCache(max_memory_entries=0))
+    evaluator = IncrementalEvaluator(analyzer, asyncio.get_running_loop)
+
+    full = [await _evaluate_full(analyzer, scenario) for _ in range(runs)]
+    incremental = [await _replay_incremental(evaluator, scenario, turn_interval) for _ in range(runs)]
+
+    return {
+        "turns": len(CONVERSATION),
+        "turn_interval_s": turn_interval,
+        "full": _summarize(full),
+        "incremental": _summarize(incremental),
+    }
+
+
+def main() -> None:
+    """Parse arguments and print benchmark results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", default=DEFAULT_SCENARIO)
+    parser.add_argument("--turn-interval", type=float, default=8.0, help="seconds between user turns")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run_benchmark(args.scenario, args.turn_interval, args.runs)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,20 +6,54 @@
 """Flask application for the upskilling agent."""
 
 import asyncio
+import atexit
+import base64
+import concurrent.futures
 import json
 import logging
 import os
+import queue
 import time
 from pathlib import Path
-from typing import Any, Dict, List, cast
+from typing import Any, Callable, Coroutine, Dict, Iterator, List, Optional, TypeVar, cast
 
 import simple_websocket.ws  # pyright: ignore[reportMissingTypeStubs]
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, jsonify, request, send_from_directory
 from flask_sock import Sock  # pyright: ignore[reportMissingTypeStubs]
 
 from src.config import config
-from src.services.analyzers import ConversationAnalyzer, PronunciationAssessor
+from src.services.acoustic_analytics import AcousticAnalyzer
+from src.services.analysis_jobs import FINISHED_STATUSES, AnalysisJobQueue
+from src.services.analysis_runtime import TIMEOUTS_METRIC, AnalysisRuntime
+from src.services.analyze_request import InvalidRequestBody, parse_analyze_request
+from src.services.analyzers import ConversationAnalyzer
+from src.services.batch_evaluation import STATUS_ERROR, BatchEvaluator, parse_items, prepare_items
+from src.services.conversation_metrics import (
+    ROLE_USER,
+    build_fallback_assessment,
+    compute_conversation_metrics,
+    parse_turns,
+)
+from src.services.evaluation_stream import (
+    EVENT_ACOUSTIC_ANALYTICS,
+    EVENT_AI_ASSESSMENT,
+    EVENT_CONVERSATION_METRICS,
+    EVENT_DONE,
+    EVENT_ERROR,
+    EVENT_PRONUNCIATION_ASSESSMENT,
+    format_sse,
+)
+from src.services.incremental_evaluation import IncrementalEvaluator
+from src.services.live_pronunciation import LivePronunciationAssessor
 from src.services.managers import AgentManager, ScenarioManager
+from src.services.metrics import metrics
+from src.services.pronunciation_assessment import (
+    PRONUNCIATION_SCORE_FIELDS,
+    AudioData,
+    PronunciationAssessor,
+    combine_user_audio,
+)
+from src.services.rate_limiter import QuotaLimiter
 from src.services.websocket_handler import VoiceProxyHandler
 
 # Constants
@@ -34,17 +68,46 @@ API_CONFIG_ENDPOINT = "/api/config"
 API_SCENARIOS_ENDPOINT = "/api/scenarios"
 API_AGENTS_CREATE_ENDPOINT = "/api/agents/create"
 API_ANALYZE_ENDPOINT = "/api/analyze"
+API_ANALYZE_STREAM_ENDPOINT = "/api/analyze/stream"
+API_ANALYZE_JOBS_ENDPOINT = "/api/analyze/jobs"
 API_GRAPH_SCENARIO_ENDPOINT = "/api/scenarios/graph"
+API_METRICS_ENDPOINT = "/api/metrics"
+API_BATCH_EVALUATION_ENDPOINT = "/api/evaluations/batch"
+NDJSON_MIMETYPE = "application/x-ndjson"
 
 # Error messages
 SCENARIO_ID_REQUIRED = "scenario_id is required"
 SCENARIO_NOT_FOUND = "Scenario not found"
 TRANSCRIPT_REQUIRED = "scenario_id and transcript are required"
+BATCH_ITEMS_REQUIRED = "at least one item with scenario_id and transcript is required"
+JOB_NOT_FOUND = "Analysis job not found"
+ANALYSIS_TIMED_OUT = "Analysis did not finish in time"
 
 # HTTP status codes
+HTTP_ACCEPTED = 202
 HTTP_BAD_REQUEST = 400
 HTTP_NOT_FOUND = 404
 HTTP_INTERNAL_SERVER_ERROR = 500
+HTTP_GATEWAY_TIMEOUT = 504
+
+# Analysis metrics
+TIME_TO_FIRST_RESULT_METRIC = "analysis_time_to_first_result_ms"
+SESSION_END_TO_RESULT_METRIC = "analysis_session_end_to_result_ms"
+PRONUNCIATION_END_TO_RESULT_METRIC = "pronunciation_session_end_to_result_ms"
+EVALUATION_FALLBACKS_METRIC = "evaluation_fallbacks"
+MODE_INCREMENTAL = "incremental"
+MODE_FULL = "full"
+MODE_LIVE = "live"
+EVENT_JOB = "job"
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+SSE_KEEPALIVE = ": keepalive\n\n"
+SSE_KEEPALIVE_SECONDS = 15.0
+EVALUATION_FALLBACK_ENABLED = config["evaluation_fallback_enabled"]
+
+T = TypeVar("T")
+
+# Long-lived analysis event loops, started on first use
+analysis_runtime = AnalysisRuntime(config["analysis_loop_threads"])
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -59,7 +122,39 @@ scenario_manager = ScenarioManager()
 agent_manager = AgentManager()
 conversation_analyzer = ConversationAnalyzer()
 pronunciation_assessor = PronunciationAssessor()
-voice_proxy_handler = VoiceProxyHandler(agent_manager)
+acoustic_analyzer = AcousticAnalyzer.from_config()
+atexit.register(acoustic_analyzer.shutdown)
+incremental_evaluator = IncrementalEvaluator(
+    conversation_analyzer,
+    lambda: _get_analysis_loop(),  # pylint: disable=unnecessary-lambda
+    enabled=config["incremental_evaluation_enabled"],
+    max_sessions=config["incremental_evaluation_max_sessions"],
+    session_ttl_seconds=config["incremental_evaluation_session_ttl_seconds"],
+)
+live_pronunciation = LivePronunciationAssessor(
+    pronunciation_assessor,
+    lambda: _get_analysis_loop(),  # pylint: disable=unnecessary-lambda
+    enabled=config["live_pronunciation_enabled"],
+    max_sessions=config["live_pronunciation_max_sessions"],
+    session_ttl_seconds=config["live_pronunciation_session_ttl_seconds"],
+)
+voice_proxy_handler = VoiceProxyHandler(agent_manager, incremental_evaluator, live_pronunciation)
+if config["live_pronunciation_push_enabled"]:
+    live_pronunciation.on_turn_assessed = voice_proxy_handler.push_pronunciation_turn
+batch_evaluator = BatchEvaluator(
+    conversation_analyzer,
+    QuotaLimiter(config["batch_evaluation_tokens_per_minute"], config["batch_evaluation_requests_per_minute"]),
+    config["batch_evaluation_concurrency"],
+)
+analysis_job_queue = AnalysisJobQueue(
+    lambda payload: _analyze(**payload),
+    lambda: _get_analysis_loop(),  # pylint: disable=unnecessary-lambda
+    path=config["analysis_jobs_db_path"],
+    workers=config["analysis_job_workers"],
+    timeout_seconds=config["analysis_request_timeout_seconds"],
+    retention_seconds=config["analysis_job_retention_seconds"],
+    on_finished=voice_proxy_handler.push_analysis_job,
+)
 
 
 @app.route("/")
@@ -79,6 +174,12 @@ def get_config():
     return jsonify({"proxy_enabled": True, "ws_endpoint": WEBSOCKET_ENDPOINT})
 
 
+@app.route(API_METRICS_ENDPOINT)
+def get_metrics():
+    """Get in-process latency and throughput metrics."""
+    return jsonify(metrics.snapshot())
+
+
 @app.route(API_SCENARIOS_ENDPOINT)
 def get_scenarios():
     """Get list of available scenarios."""
@@ -135,18 +236,25 @@ def delete_agent(agent_id: str):
 @app.route(API_ANALYZE_ENDPOINT, methods=["POST"])
 def analyze_conversation():
     """Analyze a conversation for performance assessment."""
-    data = cast(Dict[str, Any], request.json)
+    try:
+        data, audio_data = parse_analyze_request(request.stream)
+    except InvalidRequestBody as e:
+        return jsonify({"error": str(e)}), HTTP_BAD_REQUEST
     scenario_id = cast(str, data.get("scenario_id"))
     transcript = cast(str, data.get("transcript"))
-    audio_data = data.get("audio_data", [])
     reference_text = cast(str, data.get("reference_text"))
+    session_id = cast(Optional[str], data.get("session_id"))
+    latency_slo_ms = cast(Optional[float], data.get("latency_slo_ms"))
+    turns = cast(Optional[List[Dict[str, Any]]], data.get("turns"))
 
     _log_analyze_request(scenario_id, transcript, reference_text)
 
     if not scenario_id or not transcript:
         return jsonify({"error": TRANSCRIPT_REQUIRED}), HTTP_BAD_REQUEST
 
-    return _perform_conversation_analysis(scenario_id, transcript, audio_data, reference_text)
+    return _perform_conversation_analysis(
+        scenario_id, transcript, audio_data, reference_text, session_id, latency_slo_ms, turns
+    )
 
 
 def _log_analyze_request(scenario_id: str, transcript: str, reference_text: str):
@@ -162,35 +270,450 @@ def _log_analyze_request(scenario_id: str, transcript: str, reference_text: str)
 def _perform_conversation_analysis(
     scenario_id: str,
     transcript: str,
-    audio_data: List[Dict[str, Any]],
+    audio_data: AudioData,
     reference_text: str,
+    session_id: Optional[str] = None,
+    latency_slo_ms: Optional[float] = None,
+    turns: Optional[List[Dict[str, Any]]] = None,
 ):
     """Perform the actual conversation analysis."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+    start_time = time.perf_counter()
+    try:
+        result = _run_async(
+            _analyze(scenario_id, transcript, audio_data, reference_text, session_id, latency_slo_ms, turns),
+            # Incremental sessions live on the primary loop
+            _get_analysis_loop() if session_id else None,
+        )
+    except TimeoutError:
+        return jsonify({"error": ANALYSIS_TIMED_OUT}), HTTP_GATEWAY_TIMEOUT
+    metrics.observe(TIME_TO_FIRST_RESULT_METRIC, (time.perf_counter() - start_time) * 1000, {"mode": "batch"})
+    return jsonify(result)
+
+
+async def _analyze(
+    scenario_id: str,
+    transcript: str,
+    audio_data: AudioData,
+    reference_text: str,
+    session_id: Optional[str] = None,
+    latency_slo_ms: Optional[float] = None,
+    turns: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """Run the AI and pronunciation assessments concurrently and combine them with the conversation metrics."""
+    conversation_metrics = compute_conversation_metrics(transcript, turns)
+    ai_assessment, pronunciation = await _gather(
+        _assess_conversation(scenario_id, transcript, session_id, latency_slo_ms),
+        _assess_pronunciation(transcript, audio_data, reference_text, session_id, turns, latency_slo_ms=latency_slo_ms),
+    )
+
+    if isinstance(ai_assessment, Exception):
+        logger.error("AI assessment failed: %s", ai_assessment)
+        ai_assessment = None
+    if ai_assessment is None:
+        ai_assessment = _fallback_assessment(scenario_id, conversation_metrics)
+
+    if isinstance(pronunciation, Exception):
+        logger.error("Pronunciation assessment failed: %s", pronunciation)
+        pronunciation = None
+
+    return {
+        "ai_assessment": ai_assessment,
+        "pronunciation_assessment": pronunciation,
+        "conversation_metrics": conversation_metrics,
+    }
+
+
+async def _assess_pronunciation(
+    transcript: str,
+    audio_data: AudioData,
+    reference_text: str,
+    session_id: Optional[str] = None,
+    turns: Optional[List[Dict[str, Any]]] = None,
+    on_acoustics: Optional[Callable[[Dict[str, Any]], None]] = None,
+    latency_slo_ms: Optional[float] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Assess pronunciation and compute the recording's acoustic analytics concurrently.
+
+    The analytics are computed locally, so they are passed to `on_acoustics` as soon as they
+    are ready, usually well before the Speech service answers, and are returned under the
+    pronunciation result's "acoustics" even when the Speech service is unavailable.
+    """
+    user_turns = _user_turn_texts(transcript, turns)
+    acoustics_task = asyncio.ensure_future(_analyze_acoustics(audio_data, user_turns, on_acoustics))
+    try:
+        pronunciation = await _assess_speech_pronunciation(
+            audio_data, reference_text, user_turns, session_id, latency_slo_ms
+        )
+    except BaseException:
+        acoustics_task.cancel()
+        raise
+    return _with_acoustics(pronunciation, await acoustics_task)
+
+
+async def _assess_speech_pronunciation(
+    audio_data: AudioData,
+    reference_text: str,
+    user_turns: List[str],
+    session_id: Optional[str],
+    latency_slo_ms: Optional[float] = None,
+) -> Optional[Dict[str, Any]]:
+    """Combine the live turn assessments of the session, or assess the recorded audio when they are incomplete."""
+    start_time = time.perf_counter()
+    if session_id:
+        pronunciation = await live_pronunciation.consolidate(session_id, len(user_turns))
+        if pronunciation is not None:
+            _observe_pronunciation_end_to_result(start_time, MODE_LIVE)
+            return pronunciation
+
+    pronunciation = await pronunciation_assessor.assess_pronunciation(
+        audio_data, reference_text, user_turns, latency_slo_ms
+    )
+    _observe_pronunciation_end_to_result(start_time, MODE_FULL)
+    return pronunciation
+
+
+async def _analyze_acoustics(
+    audio_data: AudioData, user_turns: List[str], on_acoustics: Optional[Callable[[Dict[str, Any]], None]]
+) -> Optional[Dict[str, Any]]:
+    """Compute the acoustic analytics of the user's recording and report them once ready."""
+    acoustics = await acoustic_analyzer.analyze(combine_user_audio(audio_data), user_turns)
+    if acoustics is not None and on_acoustics is not None:
+        on_acoustics(acoustics)
+    return acoustics
+
+
+def _with_acoustics(
+    pronunciation: Optional[Dict[str, Any]], acoustics: Optional[Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """Add the acoustic analytics to the pronunciation result, with empty scores if the assessment failed."""
+    if acoustics is None:
+        return pronunciation
+    if pronunciation is None:
+        pronunciation = {**{field: None for field in PRONUNCIATION_SCORE_FIELDS}, "words": []}
+    return {**pronunciation, "acoustics": acoustics}
+
+
+def _user_turn_texts(transcript: str, turns: Optional[List[Dict[str, Any]]]) -> List[str]:
+    """Text of each user turn, the reference for the pronunciation segments spoken in it."""
+    return [turn.text for turn in parse_turns(transcript or "", turns) if turn.role == ROLE_USER]
+
+
+def _fallback_assessment(scenario_id: str, conversation_metrics: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Score a known scenario from its conversation metrics after the AI assessment failed, when enabled."""
+    if not EVALUATION_FALLBACK_ENABLED or scenario_id not in conversation_analyzer.evaluation_scenarios:
+        return None
+    metrics.increment(EVALUATION_FALLBACKS_METRIC)
+    logger.warning("Serving conversation metrics fallback assessment for scenario: %s", scenario_id)
+    return build_fallback_assessment(conversation_metrics)
+
+
+@app.route(API_ANALYZE_STREAM_ENDPOINT, methods=["POST"])
+def analyze_conversation_stream():
+    """Analyze a conversation, streaming partial results as Server-Sent Events."""
+    try:
+        data, audio_data = parse_analyze_request(request.stream)
+    except InvalidRequestBody as e:
+        return jsonify({"error": str(e)}), HTTP_BAD_REQUEST
+    scenario_id = cast(str, data.get("scenario_id"))
+    transcript = cast(str, data.get("transcript"))
+    reference_text = cast(str, data.get("reference_text"))
+    session_id = cast(Optional[str], data.get("session_id"))
+    latency_slo_ms = cast(Optional[float], data.get("latency_slo_ms"))
+    turns = cast(Optional[List[Dict[str, Any]]], data.get("turns"))
+
+    _log_analyze_request(scenario_id, transcript, reference_text)
+
+    if not scenario_id or not transcript:
+        return jsonify({"error": TRANSCRIPT_REQUIRED}), HTTP_BAD_REQUEST
+
+    events = _stream_conversation_analysis(
+        scenario_id, transcript, audio_data, reference_text, session_id, latency_slo_ms, turns
+    )
+    return Response(events, mimetype="text/event-stream", headers=SSE_HEADERS)
+
+
+def _stream_conversation_analysis(
+    scenario_id: str,
+    transcript: str,
+    audio_data: AudioData,
+    reference_text: str,
+    session_id: Optional[str] = None,
+    latency_slo_ms: Optional[float] = None,
+    turns: Optional[List[Dict[str, Any]]] = None,
+) -> Iterator[str]:
+    """Run both assessments on the analysis loop and yield their events as they arrive."""
+    start_time = time.perf_counter()
+    events: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+    future = asyncio.run_coroutine_threadsafe(
+        _produce_assessment_events(
+            scenario_id, transcript, audio_data, reference_text, events.put, session_id, latency_slo_ms, turns
+        ),
+        _get_analysis_loop(),
+    )
 
     try:
-        tasks = [
-            conversation_analyzer.analyze_conversation(scenario_id, transcript),
-            pronunciation_assessor.assess_pronunciation(audio_data, reference_text),
-        ]
+        first_result = True
+        for event in _results_until_deadline(events, future):
+            if first_result:
+                elapsed_ms = (time.perf_counter() - start_time) * 1000
+                metrics.observe(TIME_TO_FIRST_RESULT_METRIC, elapsed_ms, {"mode": "stream"})
+                first_result = False
+            yield format_sse(event)
+    except TimeoutError:
+        yield format_sse({"type": EVENT_ERROR, "value": ANALYSIS_TIMED_OUT})
+    finally:
+        future.cancel()
+    yield format_sse({"type": EVENT_DONE})
 
-        results = loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
 
-        ai_assessment, pronunciation = results
+async def _produce_assessment_events(
+    scenario_id: str,
+    transcript: str,
+    audio_data: AudioData,
+    reference_text: str,
+    emit: Callable[[Optional[Dict[str, Any]]], None],
+    session_id: Optional[str] = None,
+    latency_slo_ms: Optional[float] = None,
+    turns: Optional[List[Dict[str, Any]]] = None,
+) -> None:
+    """
+    Emit conversation metrics, then AI assessment, acoustic analytics and pronunciation events independently.
+
+    None is emitted last.
+    """
+    conversation_metrics = compute_conversation_metrics(transcript, turns)
+    emit({"type": EVENT_CONVERSATION_METRICS, "value": conversation_metrics})
+
+    async def stream_ai_assessment():
+        start_time = time.perf_counter()
+        if session_id:
+            evaluation = await incremental_evaluator.consolidate(session_id, scenario_id)
+            if evaluation is not None:
+                _observe_session_end_to_result(start_time, MODE_INCREMENTAL)
+                emit({"type": EVENT_AI_ASSESSMENT, "value": evaluation})
+                return
+
+        try:
+            async for event in conversation_analyzer.stream_conversation_analysis(
+                scenario_id, transcript, latency_slo_ms
+            ):
+                if event["type"] == EVENT_AI_ASSESSMENT:
+                    _observe_session_end_to_result(start_time, MODE_FULL)
+                    if event["value"] is None:
+                        event = {**event, "value": _fallback_assessment(scenario_id, conversation_metrics)}
+                emit(event)
+        except Exception:
+            emit({"type": EVENT_AI_ASSESSMENT, "value": _fallback_assessment(scenario_id, conversation_metrics)})
+            raise
+
+    async def emit_pronunciation_assessment():
+        pronunciation = await _assess_pronunciation(
+            transcript,
+            audio_data,
+            reference_text,
+            session_id,
+            turns,
+            lambda acoustics: emit({"type": EVENT_ACOUSTIC_ANALYTICS, "value": acoustics}),
+            latency_slo_ms,
+        )
+        emit({"type": EVENT_PRONUNCIATION_ASSESSMENT, "value": pronunciation})
 
-        if isinstance(ai_assessment, Exception):
-            logger.error("AI assessment failed: %s", ai_assessment)
-            ai_assessment = None
+    try:
+        results = await _gather(stream_ai_assessment(), emit_pronunciation_assessment())
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("Streaming assessment failed: %s", result)
+    finally:
+        emit(None)
 
-        if isinstance(pronunciation, Exception):
-            logger.error("Pronunciation assessment failed: %s", pronunciation)
-            pronunciation = None
 
-        return jsonify({"ai_assessment": ai_assessment, "pronunciation_assessment": pronunciation})
+@app.route(API_ANALYZE_JOBS_ENDPOINT, methods=["POST"])
+def create_analysis_job():
+    """Queue a conversation analysis and return its job ID without waiting for the result."""
+    try:
+        data, user_audio = parse_analyze_request(request.stream)
+    except InvalidRequestBody as e:
+        return jsonify({"error": str(e)}), HTTP_BAD_REQUEST
+    payload = {
+        "scenario_id": data.get("scenario_id"),
+        "transcript": data.get("transcript"),
+        # Jobs are stored as JSON, so only the user's audio is kept, as a single chunk
+        "audio_data": [{"type": "user", "data": base64.b64encode(user_audio).decode("ascii")}] if user_audio else [],
+        "reference_text": data.get("reference_text"),
+        "session_id": data.get("session_id"),
+        "latency_slo_ms": data.get("latency_slo_ms"),
+        "turns": data.get("turns"),
+    }
+
+    _log_analyze_request(payload["scenario_id"], payload["transcript"], payload["reference_text"])
+
+    if not payload["scenario_id"] or not payload["transcript"]:
+        return jsonify({"error": TRANSCRIPT_REQUIRED}), HTTP_BAD_REQUEST
 
+    job = analysis_job_queue.submit(payload, payload["session_id"])
+    return jsonify(job), HTTP_ACCEPTED
+
+
+@app.route(f"{API_ANALYZE_JOBS_ENDPOINT}/<job_id>")
+def get_analysis_job(job_id: str):
+    """Get an analysis job's status and, once finished, its result."""
+    job = analysis_job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": JOB_NOT_FOUND}), HTTP_NOT_FOUND
+    return jsonify(job)
+
+
+@app.route(f"{API_ANALYZE_JOBS_ENDPOINT}/<job_id>/events")
+def stream_analysis_job(job_id: str):
+    """Wait for an analysis job to finish and send it as a Server-Sent Event."""
+    if analysis_job_queue.get(job_id) is None:
+        return jsonify({"error": JOB_NOT_FOUND}), HTTP_NOT_FOUND
+    return Response(_stream_analysis_job(job_id), mimetype="text/event-stream", headers=SSE_HEADERS)
+
+
+def _stream_analysis_job(job_id: str) -> Iterator[str]:
+    """
+    Yield the finished job, then a done event, with keepalive comments while it is queued or running.
+
+    The stream also ends, with the job as it stands, once the job has run past its timeout.
+    """
+    finished: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+    unsubscribe = analysis_job_queue.subscribe(job_id, finished.put)
+    timeout = config["analysis_request_timeout_seconds"]
+    try:
+        while True:
+            try:
+                job = finished.get(timeout=SSE_KEEPALIVE_SECONDS)
+                break
+            except queue.Empty:
+                pass
+            current = analysis_job_queue.get(job_id)
+            if current is None or current["status"] in FINISHED_STATUSES:
+                job = current or {"job_id": job_id, "status": None}
+                break
+            if (
+                timeout
+                and current["started_at"]
+                and time.time() > current["started_at"] + timeout + SSE_KEEPALIVE_SECONDS
+            ):
+                logger.warning("Analysis job %s still running past its deadline, ending its event stream", job_id)
+                job = current
+                break
+            yield SSE_KEEPALIVE
+        yield format_sse({"type": EVENT_JOB, "value": job})
+        yield format_sse({"type": EVENT_DONE})
     finally:
-        loop.close()
+        unsubscribe()
+
+
+@app.route(API_BATCH_EVALUATION_ENDPOINT, methods=["POST"])
+def batch_evaluate():
+    """Re-score many transcripts, streaming one JSON result per line as each evaluation finishes."""
+    if request.mimetype == NDJSON_MIMETYPE:
+        items = list(parse_items(request.get_data(as_text=True).splitlines()))
+    else:
+        data = cast(Dict[str, Any], request.json)
+        items = list(prepare_items(data.get("items", [])))
+
+    if not items:
+        return jsonify({"error": BATCH_ITEMS_REQUIRED}), HTTP_BAD_REQUEST
+
+    logger.info("Batch evaluation request with %s items", len(items))
+    return Response(_stream_batch_evaluation(items), mimetype=NDJSON_MIMETYPE, headers=SSE_HEADERS)
+
+
+def _stream_batch_evaluation(items: List[Dict[str, Any]]) -> Iterator[str]:
+    """Run a batch evaluation on the analysis loop and yield its results as JSON lines."""
+    results: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+
+    async def produce_results() -> None:
+        try:
+            await batch_evaluator.evaluate(items, results.put)
+        finally:
+            results.put(None)
+
+    future = asyncio.run_coroutine_threadsafe(produce_results(), _get_analysis_loop())
+    try:
+        for result in _results_until_deadline(results, future):
+            yield json.dumps(result) + "\n"
+    except TimeoutError:
+        yield json.dumps({"status": STATUS_ERROR, "error": ANALYSIS_TIMED_OUT}) + "\n"
+    finally:
+        future.cancel()
+
+
+def _results_until_deadline(
+    results: "queue.Queue[Optional[Dict[str, Any]]]", future: "concurrent.futures.Future[Any]"
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield what a coroutine puts on the queue until it puts None.
+
+    The coroutine is cancelled and TimeoutError raised once the configured request timeout passes.
+    """
+    timeout = config["analysis_request_timeout_seconds"]
+    deadline = time.monotonic() + timeout if timeout else None
+    while True:
+        try:
+            result = results.get(timeout=None if deadline is None else max(deadline - time.monotonic(), 0))
+        except queue.Empty:
+            future.cancel()
+            metrics.increment(TIMEOUTS_METRIC)
+            logger.warning("Streamed analysis cancelled after %.1fs", timeout)
+            raise TimeoutError(ANALYSIS_TIMED_OUT) from None
+        if result is None:
+            return
+        yield result
+
+
+async def _assess_conversation(
+    scenario_id: str, transcript: str, session_id: Optional[str] = None, latency_slo_ms: Optional[float] = None
+) -> Optional[Dict[str, Any]]:
+    """Consolidate the session's incremental evaluation, falling back to a full evaluation."""
+    start_time = time.perf_counter()
+    if session_id:
+        evaluation = await incremental_evaluator.consolidate(session_id, scenario_id)
+        if evaluation is not None:
+            _observe_session_end_to_result(start_time, MODE_INCREMENTAL)
+            return evaluation
+
+    evaluation = await conversation_analyzer.analyze_conversation(scenario_id, transcript, latency_slo_ms)
+    _observe_session_end_to_result(start_time, MODE_FULL)
+    return evaluation
+
+
+def _observe_pronunciation_end_to_result(start_time: float, mode: str) -> None:
+    """Record the time from the end of a session (the analyze request) to its pronunciation assessment."""
+    metrics.observe(PRONUNCIATION_END_TO_RESULT_METRIC, (time.perf_counter() - start_time) * 1000, {"mode": mode})
+
+
+def _observe_session_end_to_result(start_time: float, mode: str) -> None:
+    """Record the time from the end of a session (the analyze request) to its AI assessment."""
+    metrics.observe(SESSION_END_TO_RESULT_METRIC, (time.perf_counter() - start_time) * 1000, {"mode": mode})
+
+
+async def _gather(*coroutines: Coroutine[Any, Any, Any]) -> List[Any]:
+    """Run coroutines concurrently, returning exceptions in place of results."""
+    return await asyncio.gather(*coroutines, return_exceptions=True)
+
+
+def _run_async(coroutine: Coroutine[Any, Any, T], loop: Optional[asyncio.AbstractEventLoop] = None) -> T:
+    """
+    Run a coroutine on a long-lived analysis event loop and wait for its result.
+
+    The coroutine is cancelled and TimeoutError raised once the configured request timeout passes.
+    """
+    return analysis_runtime.run(coroutine, config["analysis_request_timeout_seconds"], loop)
+
+
+def _get_analysis_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the primary long-lived event loop, which owns incremental sessions and analysis jobs.
+
+    Pooled async clients are bound to the loop that created them, so the loop threads are kept
+    alive for the lifetime of the process instead of creating a new loop per request.
+    """
+    return analysis_runtime.primary_loop
 
 
 @app.route(f"/{AUDIO_PROCESSOR_FILE}")
@@ -234,7 +757,7 @@ def generate_graph_scenario():
             with open(canned_file, encoding="utf-8") as f:
                 graph_data = json.load(f)
 
-        scenario = scenario_manager.generate_scenario_from_graph(graph_data)
+        scenario = _run_async(scenario_manager.generate_scenario_from_graph(graph_data))
 
         return jsonify(scenario)
     except Exception as e:
@@ -249,6 +772,9 @@ def main():
     print(f"Starting Voice Live Demo on http://{host}:{port}")
 
     debug_mode = os.getenv("FLASK_ENV") == "development"
+    # The debug reloader runs this twice; only the serving child should claim jobs
+    if not debug_mode or os.getenv("WERKZEUG_RUN_MAIN") == "true":
+        analysis_job_queue.start()
     app.run(host=host, port=port, debug=debug_mode)
 
 
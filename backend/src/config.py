@@ -6,7 +6,7 @@
 """Configuration management for the upskilling agent application."""
 
 import os
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from dotenv import load_dotenv
 
@@ -25,6 +25,60 @@ DEFAULT_VOICE_NAME = "en-US-Ava:DragonHDLatestNeural"
 DEFAULT_VOICE_TYPE = "azure-standard"
 DEFAULT_AVATAR_CHARACTER = "lisa"
 DEFAULT_AVATAR_STYLE = "casual-sitting"
+DEFAULT_CONTEXT_MAX_TOKENS = 0
+DEFAULT_CONTEXT_MAX_TURNS = 0
+DEFAULT_CONTEXT_KEEP_RECENT_ITEMS = 6
+DEFAULT_CONTEXT_STRATEGY = "summarize"
+DEFAULT_WS_COMPRESSION_POLICY = "selective"
+DEFAULT_WS_COMPRESSION_SKIP_TYPES = "input_audio_buffer.append,response.audio.delta"
+DEFAULT_WS_COMPRESSION_MIN_BYTES = 128
+DEFAULT_OPENAI_MAX_CONNECTIONS = 100
+DEFAULT_OPENAI_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_OPENAI_KEEPALIVE_EXPIRY_SECONDS = 60.0
+DEFAULT_OPENAI_TIMEOUT_SECONDS = 60.0
+DEFAULT_EVALUATION_CACHE_DIR = ""
+DEFAULT_EVALUATION_CACHE_TTL_SECONDS = 86400.0
+DEFAULT_EVALUATION_CACHE_MAX_ENTRIES = 256
+DEFAULT_EVALUATION_CACHE_MAX_DISK_MB = 100
+DEFAULT_EVALUATION_MAX_TRANSCRIPT_TOKENS = 12000
+DEFAULT_EVALUATION_CHUNK_TOKENS = 6000
+DEFAULT_EVALUATION_CHUNK_OVERLAP_TURNS = 2
+DEFAULT_EVALUATION_MODE = "single"
+DEFAULT_EVALUATION_HEDGE_PERCENTILE = 90.0
+DEFAULT_EVALUATION_HEDGE_MIN_SAMPLES = 20
+DEFAULT_MODEL_ROUTER_FAST_MAX_TOKENS = 2000
+DEFAULT_MODEL_ROUTER_FAST_LATENCY_SLO_MS = 3000.0
+DEFAULT_MODEL_ROUTER_DISAGREEMENT_THRESHOLD = 10
+DEFAULT_OPENAI_MAX_RETRIES = 0
+DEFAULT_MODEL_CONCURRENCY_INITIAL_LIMIT = 16
+DEFAULT_MODEL_CONCURRENCY_MIN_LIMIT = 1
+DEFAULT_MODEL_CONCURRENCY_MAX_LIMIT = 64
+DEFAULT_MODEL_CALL_DEADLINE_SECONDS = 60.0
+DEFAULT_CIRCUIT_BREAKER_FAILURE_THRESHOLD = 5
+DEFAULT_CIRCUIT_BREAKER_RESET_SECONDS = 30.0
+DEFAULT_INCREMENTAL_EVALUATION_MAX_SESSIONS = 100
+DEFAULT_INCREMENTAL_EVALUATION_SESSION_TTL_SECONDS = 3600.0
+DEFAULT_LIVE_PRONUNCIATION_MAX_SESSIONS = 100
+DEFAULT_LIVE_PRONUNCIATION_SESSION_TTL_SECONDS = 3600.0
+DEFAULT_BATCH_EVALUATION_TOKENS_PER_MINUTE = 30000
+DEFAULT_BATCH_EVALUATION_REQUESTS_PER_MINUTE = 180
+DEFAULT_BATCH_EVALUATION_CONCURRENCY = 8
+DEFAULT_ANALYSIS_JOBS_DB_PATH = ".cache/analysis_jobs.sqlite3"
+DEFAULT_ANALYSIS_JOB_WORKERS = 4
+DEFAULT_ANALYSIS_JOB_RETENTION_SECONDS = 86400.0
+DEFAULT_ANALYSIS_LOOP_THREADS = 1
+DEFAULT_ANALYSIS_REQUEST_TIMEOUT_SECONDS = 120.0
+DEFAULT_PRONUNCIATION_SEGMENT_CONCURRENCY = 4
+DEFAULT_PRONUNCIATION_MIN_SILENCE_MS = 400
+DEFAULT_PRONUNCIATION_MAX_SEGMENT_SECONDS = 15.0
+DEFAULT_PRONUNCIATION_MAX_PAUSE_MS = 1000
+DEFAULT_PRONUNCIATION_CACHE_DIR = ""
+DEFAULT_PRONUNCIATION_CACHE_TTL_SECONDS = 86400.0
+DEFAULT_PRONUNCIATION_CACHE_MAX_ENTRIES = 2048
+DEFAULT_PRONUNCIATION_CACHE_MAX_DISK_MB = 100
+DEFAULT_PRONUNCIATION_LATENCY_BUDGET_MS = 0.0
+DEFAULT_ACOUSTIC_ANALYTICS_WORKERS = 0
+DEFAULT_PROVIDER = "azure"
 
 
 class Config:
@@ -53,6 +107,7 @@ class Config:
             "azure_speech_key": os.getenv("AZURE_SPEECH_KEY", ""),
             "azure_speech_region": os.getenv("AZURE_SPEECH_REGION", DEFAULT_REGION),
             "azure_speech_language": os.getenv("AZURE_SPEECH_LANGUAGE", DEFAULT_SPEECH_LANGUAGE),
+            "azure_speech_auth_token_enabled": self._parse_bool_env("AZURE_SPEECH_AUTH_TOKEN_ENABLED"),
             "api_version": DEFAULT_API_VERSION,
             # NEW ADDITIONS
             "azure_input_transcription_model": os.getenv(
@@ -68,6 +123,162 @@ class Config:
             "azure_voice_type": os.getenv("AZURE_VOICE_TYPE", DEFAULT_VOICE_TYPE),
             "azure_avatar_character": os.getenv("AZURE_AVATAR_CHARACTER", DEFAULT_AVATAR_CHARACTER),
             "azure_avatar_style": os.getenv("AZURE_AVATAR_STYLE", DEFAULT_AVATAR_STYLE),
+            "context_max_tokens": int(os.getenv("CONTEXT_MAX_TOKENS", str(DEFAULT_CONTEXT_MAX_TOKENS))),
+            "context_max_turns": int(os.getenv("CONTEXT_MAX_TURNS", str(DEFAULT_CONTEXT_MAX_TURNS))),
+            "context_keep_recent_items": int(
+                os.getenv("CONTEXT_KEEP_RECENT_ITEMS", str(DEFAULT_CONTEXT_KEEP_RECENT_ITEMS))
+            ),
+            "context_strategy": os.getenv("CONTEXT_STRATEGY", DEFAULT_CONTEXT_STRATEGY),
+            "barge_in_flush_enabled": self._parse_bool_env("BARGE_IN_FLUSH_ENABLED", True),
+            "ws_compression_policy": os.getenv("WS_COMPRESSION_POLICY", DEFAULT_WS_COMPRESSION_POLICY),
+            "ws_compression_skip_types": self._parse_list_env(
+                "WS_COMPRESSION_SKIP_TYPES", DEFAULT_WS_COMPRESSION_SKIP_TYPES
+            ),
+            "ws_compression_min_bytes": int(
+                os.getenv("WS_COMPRESSION_MIN_BYTES", str(DEFAULT_WS_COMPRESSION_MIN_BYTES))
+            ),
+            "openai_max_connections": int(os.getenv("OPENAI_MAX_CONNECTIONS", str(DEFAULT_OPENAI_MAX_CONNECTIONS))),
+            "openai_max_keepalive_connections": int(
+                os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", str(DEFAULT_OPENAI_MAX_KEEPALIVE_CONNECTIONS))
+            ),
+            "openai_keepalive_expiry_seconds": float(
+                os.getenv("OPENAI_KEEPALIVE_EXPIRY_SECONDS", str(DEFAULT_OPENAI_KEEPALIVE_EXPIRY_SECONDS))
+            ),
+            "openai_timeout_seconds": float(os.getenv("OPENAI_TIMEOUT_SECONDS", str(DEFAULT_OPENAI_TIMEOUT_SECONDS))),
+            "openai_max_retries": int(os.getenv("OPENAI_MAX_RETRIES", str(DEFAULT_OPENAI_MAX_RETRIES))),
+            "model_concurrency_initial_limit": int(
+                os.getenv("MODEL_CONCURRENCY_INITIAL_LIMIT", str(DEFAULT_MODEL_CONCURRENCY_INITIAL_LIMIT))
+            ),
+            "model_concurrency_min_limit": int(
+                os.getenv("MODEL_CONCURRENCY_MIN_LIMIT", str(DEFAULT_MODEL_CONCURRENCY_MIN_LIMIT))
+            ),
+            "model_concurrency_max_limit": int(
+                os.getenv("MODEL_CONCURRENCY_MAX_LIMIT", str(DEFAULT_MODEL_CONCURRENCY_MAX_LIMIT))
+            ),
+            "model_call_deadline_seconds": float(
+                os.getenv("MODEL_CALL_DEADLINE_SECONDS", str(DEFAULT_MODEL_CALL_DEADLINE_SECONDS))
+            ),
+            "circuit_breaker_failure_threshold": int(
+                os.getenv("CIRCUIT_BREAKER_FAILURE_THRESHOLD", str(DEFAULT_CIRCUIT_BREAKER_FAILURE_THRESHOLD))
+            ),
+            "circuit_breaker_reset_seconds": float(
+                os.getenv("CIRCUIT_BREAKER_RESET_SECONDS", str(DEFAULT_CIRCUIT_BREAKER_RESET_SECONDS))
+            ),
+            "evaluation_cache_enabled": self._parse_bool_env("EVALUATION_CACHE_ENABLED", True),
+            "evaluation_cache_dir": os.getenv("EVALUATION_CACHE_DIR", DEFAULT_EVALUATION_CACHE_DIR),
+            "evaluation_cache_ttl_seconds": float(
+                os.getenv("EVALUATION_CACHE_TTL_SECONDS", str(DEFAULT_EVALUATION_CACHE_TTL_SECONDS))
+            ),
+            "evaluation_cache_max_entries": int(
+                os.getenv("EVALUATION_CACHE_MAX_ENTRIES", str(DEFAULT_EVALUATION_CACHE_MAX_ENTRIES))
+            ),
+            "evaluation_cache_max_disk_mb": int(
+                os.getenv("EVALUATION_CACHE_MAX_DISK_MB", str(DEFAULT_EVALUATION_CACHE_MAX_DISK_MB))
+            ),
+            "evaluation_max_transcript_tokens": int(
+                os.getenv("EVALUATION_MAX_TRANSCRIPT_TOKENS", str(DEFAULT_EVALUATION_MAX_TRANSCRIPT_TOKENS))
+            ),
+            "evaluation_chunk_tokens": int(os.getenv("EVALUATION_CHUNK_TOKENS", str(DEFAULT_EVALUATION_CHUNK_TOKENS))),
+            "evaluation_chunk_overlap_turns": int(
+                os.getenv("EVALUATION_CHUNK_OVERLAP_TURNS", str(DEFAULT_EVALUATION_CHUNK_OVERLAP_TURNS))
+            ),
+            "evaluation_mode": os.getenv("EVALUATION_MODE", DEFAULT_EVALUATION_MODE),
+            "evaluation_deployments": os.getenv("EVALUATION_DEPLOYMENTS", ""),
+            "evaluation_hedging_enabled": self._parse_bool_env("EVALUATION_HEDGING_ENABLED"),
+            "evaluation_hedge_percentile": float(
+                os.getenv("EVALUATION_HEDGE_PERCENTILE", str(DEFAULT_EVALUATION_HEDGE_PERCENTILE))
+            ),
+            "evaluation_hedge_min_samples": int(
+                os.getenv("EVALUATION_HEDGE_MIN_SAMPLES", str(DEFAULT_EVALUATION_HEDGE_MIN_SAMPLES))
+            ),
+            "fast_model_deployment_name": os.getenv("FAST_MODEL_DEPLOYMENT_NAME", ""),
+            "model_router_enabled": self._parse_bool_env("MODEL_ROUTER_ENABLED"),
+            "model_router_shadow_mode": self._parse_bool_env("MODEL_ROUTER_SHADOW_MODE"),
+            "model_router_fast_max_tokens": int(
+                os.getenv("MODEL_ROUTER_FAST_MAX_TOKENS", str(DEFAULT_MODEL_ROUTER_FAST_MAX_TOKENS))
+            ),
+            "model_router_fast_latency_slo_ms": float(
+                os.getenv("MODEL_ROUTER_FAST_LATENCY_SLO_MS", str(DEFAULT_MODEL_ROUTER_FAST_LATENCY_SLO_MS))
+            ),
+            "model_router_disagreement_threshold": int(
+                os.getenv("MODEL_ROUTER_DISAGREEMENT_THRESHOLD", str(DEFAULT_MODEL_ROUTER_DISAGREEMENT_THRESHOLD))
+            ),
+            "evaluation_fallback_enabled": self._parse_bool_env("EVALUATION_FALLBACK_ENABLED"),
+            "incremental_evaluation_enabled": self._parse_bool_env("INCREMENTAL_EVALUATION_ENABLED"),
+            "incremental_evaluation_max_sessions": int(
+                os.getenv("INCREMENTAL_EVALUATION_MAX_SESSIONS", str(DEFAULT_INCREMENTAL_EVALUATION_MAX_SESSIONS))
+            ),
+            "incremental_evaluation_session_ttl_seconds": float(
+                os.getenv(
+                    "INCREMENTAL_EVALUATION_SESSION_TTL_SECONDS",
+                    str(DEFAULT_INCREMENTAL_EVALUATION_SESSION_TTL_SECONDS),
+                )
+            ),
+            "batch_evaluation_tokens_per_minute": int(
+                os.getenv("BATCH_EVALUATION_TOKENS_PER_MINUTE", str(DEFAULT_BATCH_EVALUATION_TOKENS_PER_MINUTE))
+            ),
+            "batch_evaluation_requests_per_minute": int(
+                os.getenv("BATCH_EVALUATION_REQUESTS_PER_MINUTE", str(DEFAULT_BATCH_EVALUATION_REQUESTS_PER_MINUTE))
+            ),
+            "batch_evaluation_concurrency": int(
+                os.getenv("BATCH_EVALUATION_CONCURRENCY", str(DEFAULT_BATCH_EVALUATION_CONCURRENCY))
+            ),
+            "analysis_jobs_db_path": os.getenv("ANALYSIS_JOBS_DB_PATH", DEFAULT_ANALYSIS_JOBS_DB_PATH),
+            "analysis_job_workers": int(os.getenv("ANALYSIS_JOB_WORKERS", str(DEFAULT_ANALYSIS_JOB_WORKERS))),
+            "analysis_job_retention_seconds": float(
+                os.getenv("ANALYSIS_JOB_RETENTION_SECONDS", str(DEFAULT_ANALYSIS_JOB_RETENTION_SECONDS))
+            ),
+            "llm_provider": os.getenv("LLM_PROVIDER", DEFAULT_PROVIDER),
+            "speech_provider": os.getenv("SPEECH_PROVIDER", DEFAULT_PROVIDER),
+            "agent_provider": os.getenv("AGENT_PROVIDER", DEFAULT_PROVIDER),
+            "fake_llm_profile": os.getenv("FAKE_LLM_PROFILE", ""),
+            "fake_speech_profile": os.getenv("FAKE_SPEECH_PROFILE", ""),
+            "fake_agent_profile": os.getenv("FAKE_AGENT_PROFILE", ""),
+            "fake_provider_seed": int(os.getenv("FAKE_PROVIDER_SEED", "0")),
+            "analysis_loop_threads": int(os.getenv("ANALYSIS_LOOP_THREADS", str(DEFAULT_ANALYSIS_LOOP_THREADS))),
+            "analysis_request_timeout_seconds": float(
+                os.getenv("ANALYSIS_REQUEST_TIMEOUT_SECONDS", str(DEFAULT_ANALYSIS_REQUEST_TIMEOUT_SECONDS))
+            ),
+            "pronunciation_segmentation_enabled": self._parse_bool_env("PRONUNCIATION_SEGMENTATION_ENABLED", True),
+            "live_pronunciation_enabled": self._parse_bool_env("LIVE_PRONUNCIATION_ENABLED"),
+            "live_pronunciation_push_enabled": self._parse_bool_env("LIVE_PRONUNCIATION_PUSH_ENABLED"),
+            "live_pronunciation_max_sessions": int(
+                os.getenv("LIVE_PRONUNCIATION_MAX_SESSIONS", str(DEFAULT_LIVE_PRONUNCIATION_MAX_SESSIONS))
+            ),
+            "live_pronunciation_session_ttl_seconds": float(
+                os.getenv("LIVE_PRONUNCIATION_SESSION_TTL_SECONDS", str(DEFAULT_LIVE_PRONUNCIATION_SESSION_TTL_SECONDS))
+            ),
+            "pronunciation_segment_concurrency": int(
+                os.getenv("PRONUNCIATION_SEGMENT_CONCURRENCY", str(DEFAULT_PRONUNCIATION_SEGMENT_CONCURRENCY))
+            ),
+            "pronunciation_min_silence_ms": int(
+                os.getenv("PRONUNCIATION_MIN_SILENCE_MS", str(DEFAULT_PRONUNCIATION_MIN_SILENCE_MS))
+            ),
+            "pronunciation_max_segment_seconds": float(
+                os.getenv("PRONUNCIATION_MAX_SEGMENT_SECONDS", str(DEFAULT_PRONUNCIATION_MAX_SEGMENT_SECONDS))
+            ),
+            "pronunciation_preprocessing_enabled": self._parse_bool_env("PRONUNCIATION_PREPROCESSING_ENABLED"),
+            "pronunciation_max_pause_ms": int(
+                os.getenv("PRONUNCIATION_MAX_PAUSE_MS", str(DEFAULT_PRONUNCIATION_MAX_PAUSE_MS))
+            ),
+            "pronunciation_cache_enabled": self._parse_bool_env("PRONUNCIATION_CACHE_ENABLED", True),
+            "pronunciation_cache_dir": os.getenv("PRONUNCIATION_CACHE_DIR", DEFAULT_PRONUNCIATION_CACHE_DIR),
+            "pronunciation_cache_ttl_seconds": float(
+                os.getenv("PRONUNCIATION_CACHE_TTL_SECONDS", str(DEFAULT_PRONUNCIATION_CACHE_TTL_SECONDS))
+            ),
+            "pronunciation_cache_max_entries": int(
+                os.getenv("PRONUNCIATION_CACHE_MAX_ENTRIES", str(DEFAULT_PRONUNCIATION_CACHE_MAX_ENTRIES))
+            ),
+            "pronunciation_cache_max_disk_mb": int(
+                os.getenv("PRONUNCIATION_CACHE_MAX_DISK_MB", str(DEFAULT_PRONUNCIATION_CACHE_MAX_DISK_MB))
+            ),
+            "pronunciation_latency_budget_ms": float(
+                os.getenv("PRONUNCIATION_LATENCY_BUDGET_MS", str(DEFAULT_PRONUNCIATION_LATENCY_BUDGET_MS))
+            ),
+            "acoustic_analytics_enabled": self._parse_bool_env("ACOUSTIC_ANALYTICS_ENABLED", True),
+            "acoustic_analytics_workers": int(
+                os.getenv("ACOUSTIC_ANALYTICS_WORKERS", str(DEFAULT_ACOUSTIC_ANALYTICS_WORKERS))
+            ),
         }
         return result
 
@@ -75,6 +286,10 @@ class Config:
         """Parse boolean environment variable."""
         return os.getenv(env_var, str(default)).lower() == "true"
 
+    def _parse_list_env(self, env_var: str, default: str = "") -> List[str]:
+        """Parse a comma-separated environment variable."""
+        return [value.strip() for value in os.getenv(env_var, default).split(",") if value.strip()]
+
     def __getitem__(self, key: str) -> Any:
         """Get configuration value by key."""
         return self._config.get(key)
@@ -0,0 +1,109 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Re-score stored transcripts in bulk, for example after an evaluation rubric changed.
+
+Input is JSONL with one {"id", "scenario_id", "transcript"} object per line; id is optional.
+
+    python -m src.rescore run transcripts.jsonl --output results.jsonl
+    python -m src.rescore prepare transcripts.jsonl --output batch-input.jsonl --deployment gpt-4o-batch
+    python -m src.rescore submit batch-input.jsonl
+    python -m src.rescore collect <batch_id> --output results.jsonl
+
+`run` evaluates online through a token bucket sized to the deployment quota and appends results
+as they finish; rerunning it with the same output resumes where it stopped. `prepare`, `submit`
+and `collect` target the Azure OpenAI Batch API for large, non-urgent jobs instead.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict
+
+from src.config import config
+from src.services.analyzers import ConversationAnalyzer
+from src.services.batch_evaluation import (
+    BatchEvaluator,
+    build_offline_batch,
+    collect_offline_batch,
+    read_jsonl_items,
+    submit_offline_batch,
+    write_jsonl,
+)
+from src.services.evaluation_cache import EvaluationCache
+from src.services.rate_limiter import QuotaLimiter
+
+logger = logging.getLogger(__name__)
+
+
+async def _run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Evaluate items online under the quota limiter."""
+    analyzer = ConversationAnalyzer(evaluation_cache=EvaluationCache(max_memory_entries=0))
+    evaluator = BatchEvaluator(analyzer, QuotaLimiter(args.tpm, args.rpm), args.concurrency)
+    return await evaluator.evaluate_to_file(read_jsonl_items(args.input), args.output)
+
+
+def _prepare(args: argparse.Namespace) -> Dict[str, Any]:
+    """Write a Batch API input file for the items."""
+    analyzer = ConversationAnalyzer(evaluation_cache=EvaluationCache(max_memory_entries=0))
+    count = write_jsonl(build_offline_batch(analyzer, read_jsonl_items(args.input), args.deployment), args.output)
+    return {"requests": count, "output": str(args.output)}
+
+
+async def _collect(args: argparse.Namespace) -> Dict[str, Any]:
+    """Download the results of a batch job."""
+    analyzer = ConversationAnalyzer(evaluation_cache=EvaluationCache(max_memory_entries=0))
+    return await collect_offline_batch(analyzer, args.batch_id, args.output)
+
+
+def _parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="evaluate online, paced to the deployment quota")
+    run.add_argument("input", type=Path)
+    run.add_argument("--output", type=Path, required=True, help="results JSONL, also used to resume")
+    run.add_argument("--tpm", type=int, default=config["batch_evaluation_tokens_per_minute"])
+    run.add_argument("--rpm", type=int, default=config["batch_evaluation_requests_per_minute"])
+    run.add_argument("--concurrency", type=int, default=config["batch_evaluation_concurrency"])
+
+    prepare = commands.add_parser("prepare", help="write a Batch API input file")
+    prepare.add_argument("input", type=Path)
+    prepare.add_argument("--output", type=Path, required=True)
+    prepare.add_argument("--deployment", help="global batch deployment name, defaults to MODEL_DEPLOYMENT_NAME")
+
+    submit = commands.add_parser("submit", help="upload a Batch API input file and start the job")
+    submit.add_argument("input", type=Path)
+
+    collect = commands.add_parser("collect", help="download the results of a completed batch job")
+    collect.add_argument("batch_id")
+    collect.add_argument("--output", type=Path, required=True)
+
+    return parser.parse_args()
+
+
+def main():
+    """Run the re-scoring command line."""
+    logging.basicConfig(level=logging.INFO)
+    args = _parse_args()
+
+    if args.command == "run":
+        summary = asyncio.run(_run(args))
+    elif args.command == "prepare":
+        summary = _prepare(args)
+    elif args.command == "submit":
+        summary = asyncio.run(submit_offline_batch(args.input))
+    else:
+        summary = asyncio.run(_collect(args))
+
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
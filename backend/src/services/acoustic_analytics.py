@@ -0,0 +1,288 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Fluency analytics of the user's turns computed locally from the recorded PCM."""
+
+import asyncio
+import concurrent.futures
+import logging
+import multiprocessing
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from src.config import config
+from src.services.audio_segmentation import (
+    DEFAULT_SAMPLE_RATE,
+    FRAME_MS,
+    LOUD_PERCENTILE,
+    MIN_SPEECH_ENERGY,
+    NOISE_FLOOR_PERCENTILE,
+    SAMPLE_WIDTH,
+    SPEECH_TO_LOUD_RATIO,
+    SPEECH_TO_NOISE_RATIO,
+    segment_speech,
+)
+from src.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Pause constants, silences inside a turn at least this long count as pauses
+MIN_PAUSE_MS = 250
+# Recordings shorter than this are not analyzed
+MIN_RECORDING_MS = 500
+
+# Pitch constants, estimated by autocorrelation at a reduced sample rate
+PITCH_SAMPLE_RATE = 8000
+PITCH_WINDOW_MS = 40
+MIN_PITCH_HZ = 75
+MAX_PITCH_HZ = 400
+MAX_VOICED_ZERO_CROSSING_RATE = 0.1
+MIN_VOICING_STRENGTH = 0.3
+PITCH_BLOCK_FRAMES = 2048
+
+ACOUSTIC_ANALYTICS_LATENCY_METRIC = "acoustic_analytics_ms"
+ACOUSTIC_ANALYTICS_FAILURES_METRIC = "acoustic_analytics_failures"
+TURN_FIELDS = ("speaking_rate_wpm", "pause_ratio", "pitch_variability_semitones", "volume_variability_db")
+
+
+def analyze_session_acoustics(
+    pcm: bytes, reference_turns: List[str], min_silence_ms: int, sample_rate: int = DEFAULT_SAMPLE_RATE
+) -> Optional[Dict[str, Any]]:
+    """
+    Compute fluency analytics for each user turn of a recording and for the session.
+
+    The turns are found like pronunciation segments: the recording is split at its silences and
+    grouped into turns at the longest ones. Each turn is analyzed from its first to its last
+    speech, and the session values are averages weighted by each turn's speech time.
+
+    Args:
+        pcm: The user's 16-bit mono PCM recording
+        reference_turns: Text of each user turn in order, used for the speaking rate
+        min_silence_ms: Pauses at least this long separate speech spans
+        sample_rate: Sample rate of the audio
+
+    Returns:
+        Optional[Dict[str, Any]]: Session values and a list of per-turn values, None without speech
+    """
+    turns = [turn for turn in reference_turns if turn.strip()]
+    segments = segment_speech(pcm, turns, min_silence_ms, 0, sample_rate)
+    if not segments:
+        return None
+
+    spans: Dict[Optional[int], Tuple[int, int]] = {}
+    for segment in segments:
+        start, end = spans.get(segment.turn, (segment.start, segment.end))
+        spans[segment.turn] = (min(start, segment.start), max(end, segment.end))
+
+    results = []
+    for turn, (start, end) in spans.items():
+        text = turns[turn] if turn is not None else " ".join(turns)
+        analytics = analyze_turn_acoustics(memoryview(pcm)[start:end], text, sample_rate)
+        if analytics is not None:
+            results.append({"turn": turn, **analytics})
+    if not results:
+        return None
+    return {**_weighted_turn_values(results), "turns": results}
+
+
+def analyze_turn_acoustics(pcm: bytes, text: str, sample_rate: int = DEFAULT_SAMPLE_RATE) -> Optional[Dict[str, Any]]:
+    """
+    Compute fluency analytics of one turn's PCM on 20 ms frames.
+
+    - speaking_rate_wpm: words of the turn's text per minute from first to last speech
+    - pause_ratio: share of that time spent in silence
+    - pause_count: silences of at least MIN_PAUSE_MS
+    - pitch_mean_hz and pitch_variability_semitones: median and spread of the voiced frames' pitch
+    - volume_variability_db: spread of the speech frames' level, lower is more consistent
+
+    Returns:
+        Optional[Dict[str, Any]]: The analytics, None if the turn has no speech
+    """
+    samples = np.frombuffer(pcm, dtype="<i2", count=len(pcm) // SAMPLE_WIDTH).astype(np.float32)
+    frame_samples = sample_rate * FRAME_MS // 1000
+    frame_count = len(samples) // frame_samples
+    if frame_count == 0:
+        return None
+    samples -= samples.mean()
+    frames = samples[: frame_count * frame_samples].reshape(frame_count, frame_samples)
+
+    levels = np.sqrt(np.mean(np.square(frames), axis=1))
+    speech = _speech_frames(levels)
+    if not speech.any():
+        return None
+
+    span_seconds, timing = _speech_timing(speech)
+    words = len(text.split())
+    zero_crossings = np.mean(np.signbit(frames[:, 1:]) != np.signbit(frames[:, :-1]), axis=1)
+    voiced = speech & (zero_crossings <= MAX_VOICED_ZERO_CROSSING_RATE)
+    return {
+        **timing,
+        "speaking_rate_wpm": round(words / span_seconds * 60, 1) if words else None,
+        **_pitch_values(_frame_pitches(samples, np.flatnonzero(voiced), sample_rate)),
+        "volume_variability_db": round(float(np.std(20 * np.log10(levels[speech]))), 2),
+    }
+
+
+def _speech_frames(levels: np.ndarray) -> np.ndarray:
+    """Whether each frame is speech, with the frame energy thresholds of segmentation."""
+    noise_floor, loud = np.quantile(levels, [NOISE_FLOOR_PERCENTILE, LOUD_PERCENTILE])
+    threshold = max(MIN_SPEECH_ENERGY, min(noise_floor * SPEECH_TO_NOISE_RATIO, loud * SPEECH_TO_LOUD_RATIO))
+    speech: np.ndarray = levels >= threshold
+    return speech
+
+
+def _speech_timing(speech: np.ndarray) -> Tuple[float, Dict[str, Any]]:
+    """Seconds from the first to the last speech frame, with the rounded timing values of that span."""
+    speech_frames = np.flatnonzero(speech)
+    first, last = int(speech_frames[0]), int(speech_frames[-1]) + 1
+    active = speech[first:last]
+    edges = np.flatnonzero(np.diff(np.concatenate(([1], active.astype(np.int8), [1]))))
+    pause_frames = edges[1::2] - edges[0::2]
+    span_seconds = (last - first) * FRAME_MS / 1000
+    return span_seconds, {
+        "duration_seconds": round(span_seconds, 2),
+        "speech_seconds": round(len(speech_frames) * FRAME_MS / 1000, 2),
+        "pause_ratio": round(1 - float(active.mean()), 3),
+        "pause_count": int(np.count_nonzero(pause_frames * FRAME_MS >= MIN_PAUSE_MS)),
+    }
+
+
+def _pitch_values(pitches: np.ndarray) -> Dict[str, Optional[float]]:
+    """Median pitch and its spread in semitones, None without voiced frames."""
+    if pitches.size == 0:
+        return {"pitch_mean_hz": None, "pitch_variability_semitones": None}
+    median = float(np.median(pitches))
+    return {
+        "pitch_mean_hz": round(median, 1),
+        "pitch_variability_semitones": round(float(np.std(12 * np.log2(pitches / median))), 2),
+    }
+
+
+def _frame_pitches(samples: np.ndarray, frame_indexes: np.ndarray, sample_rate: int) -> np.ndarray:
+    """
+    Estimate the pitch of the given 20 ms frames by autocorrelation of a window starting at each.
+
+    The audio is reduced to PITCH_SAMPLE_RATE by averaging, and the autocorrelations of blocks
+    of windows are computed at once with FFTs. Frames whose strongest periodicity between
+    MIN_PITCH_HZ and MAX_PITCH_HZ is weak are left out.
+    """
+    factor = max(1, sample_rate // PITCH_SAMPLE_RATE)
+    rate = sample_rate // factor
+    reduced = samples[: len(samples) // factor * factor].reshape(-1, factor).mean(axis=1)
+    window = rate * PITCH_WINDOW_MS // 1000
+    hop = rate * FRAME_MS // 1000
+    starts = frame_indexes * hop
+    starts = starts[starts + window <= len(reduced)]
+
+    pitches = [
+        _window_pitches(reduced[starts[block : block + PITCH_BLOCK_FRAMES, None] + np.arange(window)], rate)
+        for block in range(0, len(starts), PITCH_BLOCK_FRAMES)
+    ]
+    return np.concatenate(pitches) if pitches else np.zeros(0)
+
+
+def _window_pitches(windows: np.ndarray, rate: int) -> np.ndarray:
+    """Pitch of each row of windows from its autocorrelation peak, leaving out weakly periodic windows."""
+    min_lag, max_lag = rate // MAX_PITCH_HZ, rate // MIN_PITCH_HZ
+    windows = windows - windows.mean(axis=1, keepdims=True)
+    spectrum = np.fft.rfft(windows, n=2 * windows.shape[1], axis=1)
+    autocorrelation = np.fft.irfft(np.abs(spectrum) ** 2, axis=1)[:, : max_lag + 2]
+    rows = np.arange(len(windows))
+    lags = np.argmax(autocorrelation[:, min_lag : max_lag + 1], axis=1) + min_lag
+    before, peak, after = (autocorrelation[rows, lags + offset] for offset in (-1, 0, 1))
+    # Refine the peak between lags with a parabola through it and its neighbours
+    curvature = before - 2 * peak + after
+    shift = np.where(curvature < 0, 0.5 * (before - after) / np.where(curvature < 0, curvature, -1), 0)
+    strength = peak / np.maximum(autocorrelation[:, 0], 1e-9)
+    result: np.ndarray = rate / (lags + shift)[strength >= MIN_VOICING_STRENGTH]
+    return result
+
+
+def _weighted_turn_values(turns: List[Dict[str, Any]]) -> Dict[str, Optional[float]]:
+    """Average each turn value over the turns that have it, weighted by speech time."""
+    values: Dict[str, Optional[float]] = {}
+    for field in TURN_FIELDS + ("pitch_mean_hz",):
+        weighted = [(turn["speech_seconds"], turn[field]) for turn in turns if turn[field] is not None]
+        total = sum(weight for weight, _ in weighted)
+        values[field] = round(sum(weight * value for weight, value in weighted) / total, 2) if total else None
+    return values
+
+
+class AcousticAnalyzer:
+    """
+    Runs acoustic analytics in a pool of worker processes, next to the remote pronunciation assessment.
+
+    The analytics are CPU bound, so worker processes keep them from competing with the event
+    loops for the GIL. The pool is started on first use; with 0 workers the analytics run on
+    the event loop's default thread pool instead. Spawned workers import the launching script
+    again, so they cost one server import each and are opt-in.
+    """
+
+    def __init__(self, enabled: bool = True, workers: int = 0, min_silence_ms: int = 400):
+        """
+        Initialize the analyzer.
+
+        Args:
+            enabled: Whether acoustic analytics are computed
+            workers: Worker processes, 0 to use threads
+            min_silence_ms: Pauses at least this long separate speech spans when finding turns
+        """
+        self.enabled = enabled
+        self.workers = workers
+        self.min_silence_ms = min_silence_ms
+        self._pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls) -> "AcousticAnalyzer":
+        """Create the analyzer from configuration."""
+        return cls(
+            enabled=bool(config["acoustic_analytics_enabled"]),
+            workers=int(config["acoustic_analytics_workers"] or 0),
+            min_silence_ms=int(config["pronunciation_min_silence_ms"] or 0),
+        )
+
+    async def analyze(self, pcm: bytes, reference_turns: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Compute the session's acoustic analytics, see `analyze_session_acoustics`.
+
+        Returns:
+            Optional[Dict[str, Any]]: The analytics, None if disabled, too short, without speech or on failure
+        """
+        if not self.enabled or len(pcm) < DEFAULT_SAMPLE_RATE * SAMPLE_WIDTH * MIN_RECORDING_MS // 1000:
+            return None
+
+        start_time = time.perf_counter()
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(
+                self._get_pool(), analyze_session_acoustics, bytes(pcm), reference_turns, self.min_silence_ms
+            )
+        except Exception as e:
+            logger.error("Acoustic analytics failed: %s", e)
+            metrics.increment(ACOUSTIC_ANALYTICS_FAILURES_METRIC)
+            return None
+        metrics.observe(ACOUSTIC_ANALYTICS_LATENCY_METRIC, (time.perf_counter() - start_time) * 1000)
+        return result
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def _get_pool(self) -> Optional[concurrent.futures.ProcessPoolExecutor]:
+        """The worker pool, started on first use; None to run on the default thread pool."""
+        if self.workers <= 0:
+            return None
+        with self._lock:
+            if self._pool is None:
+                # Forking a process that runs event loop and server threads can deadlock the child
+                self._pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool
@@ -0,0 +1,442 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Durable queue of conversation analysis jobs processed by a bounded pool of workers."""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from src.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Job statuses
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+FINISHED_STATUSES = (STATUS_COMPLETED, STATUS_FAILED)
+
+# Storage constants
+IN_MEMORY_PATH = ":memory:"
+PRUNE_INTERVAL_SECONDS = 3600.0
+HEARTBEAT_INTERVAL_SECONDS = 10.0
+STALE_CLAIM_SECONDS = 60.0
+TIMED_OUT_ERROR = "Analysis did not finish in time"
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analysis_jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    session_id TEXT,
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    owner TEXT,
+    heartbeat_at REAL
+);
+CREATE INDEX IF NOT EXISTS analysis_jobs_status ON analysis_jobs (status, created_at);
+"""
+# Columns added after the first release, with their type
+ADDED_COLUMNS = {"owner": "TEXT", "heartbeat_at": "REAL"}
+
+# Metrics
+QUEUE_DEPTH_METRIC = "analysis_jobs_queue_depth"
+RUNNING_METRIC = "analysis_jobs_running"
+JOBS_METRIC = "analysis_jobs"
+WAIT_LATENCY_METRIC = "analysis_job_wait_ms"
+JOB_LATENCY_METRIC = "analysis_job_ms"
+
+JobListener = Callable[[Dict[str, Any]], None]
+
+
+class AnalysisJobStore:
+    """
+    SQLite table of analysis jobs, their request payload and their result.
+
+    All methods are thread-safe and block on the database, so call them off the event loop. A job
+    is claimed by moving it from queued to running in a single write transaction, so each job is
+    processed by one worker at a time, even with several processes sharing the file. Claims carry
+    the store's owner id and a heartbeat, so only claims their owner stopped refreshing are requeued.
+    """
+
+    def __init__(self, path: str = IN_MEMORY_PATH, owner: Optional[str] = None):
+        """
+        Initialize the store.
+
+        Args:
+            path: Database file, created if missing, or ":memory:" for a store that does not survive restarts
+            owner: Id recorded on the jobs this store claims, unique per store by default
+        """
+        self.owner = owner or uuid.uuid4().hex
+        if path != IN_MEMORY_PATH:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            if path != IN_MEMORY_PATH:
+                self._connection.execute("PRAGMA journal_mode=WAL")
+                self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(SCHEMA)
+            columns = {row["name"] for row in self._connection.execute("PRAGMA table_info(analysis_jobs)")}
+            for name, column_type in ADDED_COLUMNS.items():
+                if name not in columns:
+                    self._connection.execute(f"ALTER TABLE analysis_jobs ADD COLUMN {name} {column_type}")
+
+    def create(self, payload: Dict[str, Any], session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Add a queued job and return it."""
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO analysis_jobs (id, status, session_id, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, STATUS_QUEUED, session_id, json.dumps(payload), time.time()),
+            )
+        job = self.get(job_id)
+        assert job is not None
+        return job
+
+    def get(self, job_id: str, include_payload: bool = False) -> Optional[Dict[str, Any]]:
+        """Get a job, without its request payload unless asked for."""
+        with self._lock:
+            row = self._connection.execute("SELECT * FROM analysis_jobs WHERE id = ?", (job_id,)).fetchone()
+        return _row_to_job(row, include_payload) if row is not None else None
+
+    def claim_next(self) -> Optional[Dict[str, Any]]:
+        """Claim the oldest queued job for this store and return it with its payload, None if the queue is empty."""
+        with self._lock:
+            # Not UPDATE ... RETURNING, which needs SQLite 3.35
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._connection.execute(
+                    "SELECT id FROM analysis_jobs WHERE status = ? ORDER BY created_at LIMIT 1", (STATUS_QUEUED,)
+                ).fetchone()
+                if row is not None:
+                    now = time.time()
+                    self._connection.execute(
+                        "UPDATE analysis_jobs SET status = ?, started_at = ?, owner = ?, heartbeat_at = ? "
+                        "WHERE id = ? AND status = ?",
+                        (STATUS_RUNNING, now, self.owner, now, row["id"], STATUS_QUEUED),
+                    )
+                    row = self._connection.execute("SELECT * FROM analysis_jobs WHERE id = ?", (row["id"],)).fetchone()
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+        return _row_to_job(row, include_payload=True) if row is not None else None
+
+    def finish(self, job_id: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        """Store a running job's result, or its error if it failed."""
+        with self._lock:
+            self._connection.execute(
+                "UPDATE analysis_jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+                (
+                    STATUS_FAILED if error is not None else STATUS_COMPLETED,
+                    json.dumps(result) if error is None else None,
+                    error,
+                    time.time(),
+                    job_id,
+                ),
+            )
+
+    def count(self, status: str) -> int:
+        """Number of jobs in a status."""
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM analysis_jobs WHERE status = ?", (status,)
+            ).fetchone()[0]
+
+    def heartbeat(self) -> int:
+        """Mark the jobs this store is running as alive and return how many there are."""
+        with self._lock:
+            return self._connection.execute(
+                "UPDATE analysis_jobs SET heartbeat_at = ? WHERE status = ? AND owner = ?",
+                (time.time(), STATUS_RUNNING, self.owner),
+            ).rowcount
+
+    def requeue_interrupted(self, stale_before: float) -> int:
+        """
+        Put running jobs whose claim was last refreshed before a time back in the queue.
+
+        Args:
+            stale_before: Claims with an older heartbeat, or none, belong to a stopped process
+
+        Returns:
+            int: Number of jobs requeued
+        """
+        with self._lock:
+            return self._connection.execute(
+                "UPDATE analysis_jobs SET status = ?, started_at = NULL, owner = NULL, heartbeat_at = NULL "
+                "WHERE status = ? AND (heartbeat_at IS NULL OR heartbeat_at < ?)",
+                (STATUS_QUEUED, STATUS_RUNNING, stale_before),
+            ).rowcount
+
+    def release(self) -> int:
+        """Put the jobs this store is running back in the queue and return how many there were."""
+        with self._lock:
+            return self._connection.execute(
+                "UPDATE analysis_jobs SET status = ?, started_at = NULL, owner = NULL, heartbeat_at = NULL "
+                "WHERE status = ? AND owner = ?",
+                (STATUS_QUEUED, STATUS_RUNNING, self.owner),
+            ).rowcount
+
+    def prune(self, finished_before: float) -> int:
+        """Delete jobs finished before a time and return how many were deleted."""
+        with self._lock:
+            return self._connection.execute(
+                "DELETE FROM analysis_jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (finished_before,)
+            ).rowcount
+
+
+def _row_to_job(row: sqlite3.Row, include_payload: bool = False) -> Dict[str, Any]:
+    """Convert a database row to the job representation returned by the API."""
+    job: Dict[str, Any] = {
+        "job_id": row["id"],
+        "status": row["status"],
+        "session_id": row["session_id"],
+        "created_at": row["created_at"],
+        "started_at": row["started_at"],
+        "finished_at": row["finished_at"],
+    }
+    if row["status"] == STATUS_COMPLETED:
+        job["result"] = json.loads(row["result"])
+    if row["status"] == STATUS_FAILED:
+        job["error"] = row["error"]
+    if include_payload:
+        job["payload"] = json.loads(row["payload"])
+    return job
+
+
+class AnalysisJobQueue:  # pylint: disable=too-many-instance-attributes
+    """
+    Processes stored analysis jobs with a fixed number of workers on the analysis event loop.
+
+    Jobs are submitted from request threads and outlive the request that created them. The store
+    is opened when the queue starts, falling back to memory if the database cannot be opened. While
+    it runs, the queue refreshes the heartbeat of its claims and queues again the jobs of processes
+    that stopped refreshing theirs. Workers reach the store through the loop's executor and give
+    up on a job once its timeout passes. When a job finishes, listeners
+    subscribed to it and the `on_finished` callback are called on the event loop.
+    """
+
+    def __init__(
+        self,
+        process: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+        loop_provider: Callable[[], asyncio.AbstractEventLoop],
+        path: str = IN_MEMORY_PATH,
+        workers: int = 4,
+        timeout_seconds: float = 0.0,
+        retention_seconds: float = 86400.0,
+        on_finished: Optional[JobListener] = None,
+    ):
+        """
+        Initialize the job queue.
+
+        Args:
+            process: Analyzes a job's payload and returns its result
+            loop_provider: Returns the event loop the workers run on
+            path: Database file of the job store, or ":memory:" for jobs that do not survive restarts
+            workers: Maximum jobs processed at once
+            timeout_seconds: Time a job may run before it fails, 0 to let it run to completion
+            retention_seconds: How long finished jobs are kept, 0 to keep them forever
+            on_finished: Called with every finished job, for example to push it to the client
+        """
+        self.process = process
+        self.loop_provider = loop_provider
+        self.path = path
+        self.workers = max(1, workers)
+        self.timeout_seconds = timeout_seconds
+        self.retention_seconds = retention_seconds
+        self.on_finished = on_finished
+        self._store: Optional[AnalysisJobStore] = None
+        self._listeners: Dict[str, List[JobListener]] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker_tasks: List["asyncio.Task[None]"] = []
+        self._start_lock = threading.Lock()
+        self._last_prune = 0.0
+
+    @property
+    def store(self) -> AnalysisJobStore:
+        """The job store, opened when the queue starts."""
+        if self._store is None:
+            raise RuntimeError("Analysis job queue not started")
+        return self._store
+
+    def start(self) -> None:
+        """Open the store and start the workers if they are not running yet. Safe to call from any thread."""
+        with self._start_lock:
+            if self._wakeup is not None:
+                return
+            if self._store is None:
+                self._store = self._open_store()
+            self._prune()
+            asyncio.run_coroutine_threadsafe(self._start_workers(), self.loop_provider()).result()
+
+    def stop(self) -> None:
+        """Cancel the workers and wait for them to exit; jobs they were running are queued again."""
+        with self._start_lock:
+            if self._wakeup is None:
+                return
+            asyncio.run_coroutine_threadsafe(self._stop_workers(), self.loop_provider()).result()
+            self._wakeup = None
+            self.store.release()
+
+    def _open_store(self) -> AnalysisJobStore:
+        """Open the job store, in memory if its database cannot be opened."""
+        try:
+            return AnalysisJobStore(self.path)
+        except (OSError, sqlite3.Error) as e:
+            logger.error("Cannot open analysis job store %s, jobs will not survive restarts: %s", self.path, e)
+            return AnalysisJobStore()
+
+    def submit(self, payload: Dict[str, Any], session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Queue a job and return it. Safe to call from any thread."""
+        self.start()
+        if time.time() - self._last_prune >= PRUNE_INTERVAL_SECONDS:
+            self._prune()
+        job = self.store.create(payload, session_id)
+        self._publish_depth()
+        self._wake_workers()
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job and, once finished, its result or error."""
+        self.start()
+        return self.store.get(job_id)
+
+    def subscribe(self, job_id: str, listener: JobListener) -> Callable[[], None]:
+        """
+        Call a listener once a job has finished, right away if it already has. Safe to call from any thread.
+
+        Returns:
+            Callable[[], None]: Removes the listener
+        """
+        self.start()
+        asyncio.run_coroutine_threadsafe(self._subscribe(job_id, listener), self.loop_provider())
+
+        def unsubscribe() -> None:
+            self.loop_provider().call_soon_threadsafe(self._unsubscribe, job_id, listener)
+
+        return unsubscribe
+
+    async def _subscribe(self, job_id: str, listener: JobListener) -> None:
+        """Register a listener before looking the job up, so it cannot miss the job finishing."""
+        self._listeners.setdefault(job_id, []).append(listener)
+        job = await self._call_store(self.store.get, job_id)
+        if (job is None or job["status"] in FINISHED_STATUSES) and listener in self._listeners.get(job_id, []):
+            self._unsubscribe(job_id, listener)
+            listener(job or {"job_id": job_id, "status": None})
+
+    def _unsubscribe(self, job_id: str, listener: JobListener) -> None:
+        """Remove a listener that has not been called yet."""
+        listeners = self._listeners.get(job_id, [])
+        if listener in listeners:
+            listeners.remove(listener)
+        if not listeners:
+            self._listeners.pop(job_id, None)
+
+    async def _start_workers(self) -> None:
+        """Create the wakeup event, the worker tasks and the heartbeat task on the event loop."""
+        self._wakeup = asyncio.Event()
+        self._worker_tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._worker_tasks.append(asyncio.create_task(self._heartbeat()))
+
+    async def _stop_workers(self) -> None:
+        """Cancel the worker and heartbeat tasks on the event loop."""
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+    def _wake_workers(self) -> None:
+        """Wake idle workers to look for queued jobs."""
+        if self._wakeup is not None:
+            self.loop_provider().call_soon_threadsafe(self._wakeup.set)
+
+    async def _work(self) -> None:
+        """Process queued jobs one at a time until cancelled."""
+        assert self._wakeup is not None
+        while True:
+            # Cleared before looking, so a job submitted during the lookup still wakes the worker
+            self._wakeup.clear()
+            job = await self._call_store(self.store.claim_next)
+            if job is None:
+                await self._wakeup.wait()
+                continue
+            # Another worker's clear may have swallowed a wakeup, so idle workers look for more jobs
+            self._wakeup.set()
+            await self._call_store(self._publish_depth)
+            await self._run(job)
+
+    async def _heartbeat(self) -> None:
+        """Keep this queue's claims alive and requeue the stale claims of stopped processes until cancelled."""
+        assert self._wakeup is not None
+        while True:
+            await self._call_store(self.store.heartbeat)
+            requeued = await self._call_store(self.store.requeue_interrupted, time.time() - STALE_CLAIM_SECONDS)
+            if requeued:
+                logger.warning("Requeued %s analysis jobs left running by a stopped process", requeued)
+                await self._call_store(self._publish_depth)
+                self._wakeup.set()
+            await asyncio.sleep(HEARTBEAT_INTERVAL_SECONDS)
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        """Process one claimed job and store its outcome."""
+        metrics.observe(WAIT_LATENCY_METRIC, (job["started_at"] - job["created_at"]) * 1000)
+        job_id = job["job_id"]
+        try:
+            result = await asyncio.wait_for(self.process(job["payload"]), self.timeout_seconds or None)
+            await self._call_store(lambda: self.store.finish(job_id, result=result))
+        except asyncio.TimeoutError:
+            logger.error("Analysis job %s cancelled after %.1fs", job_id, self.timeout_seconds)
+            await self._call_store(lambda: self.store.finish(job_id, error=TIMED_OUT_ERROR))
+        except Exception as e:
+            logger.error("Analysis job %s failed: %s", job_id, e)
+            error = str(e)
+            await self._call_store(lambda: self.store.finish(job_id, error=error))
+
+        finished = await self._call_store(self.store.get, job_id)
+        assert finished is not None
+        metrics.increment(JOBS_METRIC, labels={"status": finished["status"]})
+        metrics.observe(JOB_LATENCY_METRIC, (finished["finished_at"] - finished["created_at"]) * 1000)
+        await self._call_store(self._publish_depth)
+        self._notify(finished)
+
+    @staticmethod
+    async def _call_store(function: Callable[..., T], *args: Any) -> T:
+        """Run a blocking store call in the event loop's executor."""
+        return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+    def _notify(self, job: Dict[str, Any]) -> None:
+        """Deliver a finished job to its listeners."""
+        for listener in self._listeners.pop(job["job_id"], []) + ([self.on_finished] if self.on_finished else []):
+            try:
+                listener(job)
+            except Exception as e:
+                logger.error("Analysis job listener failed: %s", e)
+
+    def _publish_depth(self) -> None:
+        """Expose the number of queued and running jobs as gauges."""
+        metrics.set_gauge(QUEUE_DEPTH_METRIC, self.store.count(STATUS_QUEUED))
+        metrics.set_gauge(RUNNING_METRIC, self.store.count(STATUS_RUNNING))
+
+    def _prune(self) -> None:
+        """Delete finished jobs past their retention."""
+        self._last_prune = time.time()
+        if self.retention_seconds > 0:
+            pruned = self.store.prune(time.time() - self.retention_seconds)
+            if pruned:
+                logger.info("Pruned %s finished analysis jobs", pruned)
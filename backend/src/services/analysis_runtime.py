@@ -0,0 +1,147 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Long-lived background event loops that run analysis coroutines for synchronous request handlers."""
+
+import asyncio
+import concurrent.futures
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Coroutine, List, Optional, TypeVar
+
+from src.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Metrics
+SCHEDULING_DELAY_METRIC = "analysis_runtime_scheduling_delay_ms"
+IN_FLIGHT_METRIC = "analysis_runtime_in_flight"
+TIMEOUTS_METRIC = "analysis_runtime_timeouts"
+
+
+class AnalysisRuntime:
+    """
+    Runs coroutines on a fixed set of event loop threads that live as long as the process.
+
+    Async clients and their connection pools are bound to the loop that created them, so keeping
+    the loops alive lets every request reuse warm connections instead of paying for a new loop,
+    client and TLS handshake each time. The first loop is the primary loop: components that keep
+    per-session tasks, such as the incremental evaluator and the job queue, must run there. Other
+    work is spread over all loops round robin.
+    """
+
+    def __init__(self, loops: int = 1, name: str = "analysis-loop"):
+        """
+        Initialize the runtime. Loop threads are started on first use.
+
+        Args:
+            loops: Number of event loop threads
+            name: Thread name prefix
+        """
+        self.name = name
+        self._loop_count = max(1, loops)
+        self._loops: List[asyncio.AbstractEventLoop] = []
+        self._next = itertools.count()
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def primary_loop(self) -> asyncio.AbstractEventLoop:
+        """The loop that owns stateful analysis components."""
+        return self._get_loops()[0]
+
+    def next_loop(self) -> asyncio.AbstractEventLoop:
+        """Pick the next loop round robin."""
+        loops = self._get_loops()
+        return loops[next(self._next) % len(loops)]
+
+    def submit(
+        self, coroutine: Coroutine[Any, Any, T], loop: Optional[asyncio.AbstractEventLoop] = None
+    ) -> "concurrent.futures.Future[T]":
+        """
+        Schedule a coroutine without waiting for it.
+
+        Args:
+            coroutine: Coroutine to run
+            loop: Loop to run it on, defaults to the next loop round robin
+
+        Returns:
+            concurrent.futures.Future[T]: Future of the coroutine's result; cancelling it cancels the coroutine
+        """
+        self._update_in_flight(1)
+        future = asyncio.run_coroutine_threadsafe(
+            self._measure(coroutine, time.perf_counter()), loop or self.next_loop()
+        )
+        future.add_done_callback(lambda _: self._update_in_flight(-1))
+        return future
+
+    def run(
+        self,
+        coroutine: Coroutine[Any, Any, T],
+        timeout: Optional[float] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> T:
+        """
+        Run a coroutine and wait for its result.
+
+        Args:
+            coroutine: Coroutine to run
+            timeout: Seconds to wait before cancelling the coroutine, None or 0 to wait indefinitely
+            loop: Loop to run it on, defaults to the next loop round robin
+
+        Returns:
+            T: The coroutine's result
+
+        Raises:
+            TimeoutError: If the coroutine did not finish within the timeout
+        """
+        future = self.submit(coroutine, loop)
+        try:
+            return future.result(timeout or None)
+        except concurrent.futures.TimeoutError:
+            if future.done():
+                # The coroutine raised a timeout of its own
+                raise
+            future.cancel()
+            metrics.increment(TIMEOUTS_METRIC)
+            logger.warning("Analysis coroutine cancelled after %.1fs", timeout)
+            raise
+
+    def stop(self) -> None:
+        """Stop the loop threads; they are started again on next use."""
+        with self._lock:
+            loops, self._loops = self._loops, []
+        for loop in loops:
+            loop.call_soon_threadsafe(loop.stop)
+
+    def _get_loops(self) -> List[asyncio.AbstractEventLoop]:
+        """Get the running loops, starting their threads the first time."""
+        with self._lock:
+            if not self._loops or any(loop.is_closed() for loop in self._loops):
+                self._loops = [self._start_loop(index) for index in range(self._loop_count)]
+            return self._loops
+
+    def _start_loop(self, index: int) -> asyncio.AbstractEventLoop:
+        """Start an event loop in a daemon thread."""
+        loop = asyncio.new_event_loop()
+        name = self.name if index == 0 else f"{self.name}-{index}"
+        threading.Thread(target=loop.run_forever, name=name, daemon=True).start()
+        return loop
+
+    def _update_in_flight(self, delta: int) -> None:
+        """Track coroutines submitted but not finished."""
+        with self._lock:
+            self._in_flight += delta
+            metrics.set_gauge(IN_FLIGHT_METRIC, self._in_flight)
+
+    @staticmethod
+    async def _measure(coroutine: Coroutine[Any, Any, T], submitted_at: float) -> T:
+        """Record how long the coroutine waited for its loop, then run it."""
+        metrics.observe(SCHEDULING_DELAY_METRIC, (time.perf_counter() - submitted_at) * 1000)
+        return await coroutine
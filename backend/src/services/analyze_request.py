@@ -0,0 +1,296 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Streaming parser for analyze request bodies that keeps only the user's audio, already decoded."""
+
+import binascii
+import json
+import logging
+import time
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+from src.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Request constants
+AUDIO_DATA_FIELD = "audio_data"
+AUDIO_TYPE_FIELD = "type"
+AUDIO_DATA_KEY = "data"
+USER_AUDIO_TYPE = "user"
+DEFAULT_READ_SIZE = 64 * 1024
+BASE64_QUANTUM = 4
+
+# Metrics
+PARSE_LATENCY_METRIC = "analyze_request_parse_ms"
+BODY_BYTES_METRIC = "analyze_request_bytes"
+SKIPPED_AUDIO_BYTES_METRIC = "analyze_request_skipped_audio_bytes"
+
+_WHITESPACE = b" \t\r\n"
+_NUMBER_BYTES = frozenset(b"+-0123456789.eE")
+_LITERALS = {b"true": True, b"false": False, b"null": None}
+
+
+class InvalidRequestBody(ValueError):
+    """Raised when the request body is not a JSON object."""
+
+
+class _Reader:
+    """Pulls a byte stream through a small buffer; bytes before the current position are discarded."""
+
+    def __init__(self, stream: IO[bytes], read_size: int):
+        self.stream = stream
+        self.read_size = read_size
+        self.buffer = b""
+        self.pos = 0
+        self.total = 0
+
+    def fill(self) -> bool:
+        """Append the next block of the stream to the unread bytes; False at the end of the stream."""
+        block = self.stream.read(self.read_size)
+        if not block:
+            return False
+        self.total += len(block)
+        self.buffer = self.buffer[self.pos :] + block
+        self.pos = 0
+        return True
+
+    def peek(self) -> int:
+        """Get the next non-whitespace byte without consuming it."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                raise InvalidRequestBody("Unexpected end of request body")
+
+    def expect(self, byte: int) -> None:
+        """Consume the next non-whitespace byte, which must be `byte`."""
+        if self.peek() != byte:
+            raise InvalidRequestBody(f"Expected {chr(byte)!r} at byte {self.total - len(self.buffer) + self.pos}")
+        self.pos += 1
+
+    def consume_if(self, byte: int) -> bool:
+        """Consume the next non-whitespace byte if it is `byte`."""
+        if self.peek() == byte:
+            self.pos += 1
+            return True
+        return False
+
+    def string_segments(self) -> Iterator[bytes]:
+        """
+        Yield the raw bytes of the string at the current position in pieces, without the quotes.
+
+        Only the unread part of the buffer is ever held, so a long string is never materialized
+        here; a piece never ends in the middle of an escape sequence.
+        """
+        self.expect(ord('"'))
+        while True:
+            end = self.buffer.find(b'"', self.pos)
+            while end != -1 and _is_escaped(self.buffer, self.pos, end):
+                end = self.buffer.find(b'"', end + 1)
+            if end != -1:
+                segment = self.buffer[self.pos : end]
+                self.pos = end + 1
+                yield segment
+                return
+
+            # Keep a trailing backslash run so an escaped quote is recognized after the next read
+            cut = len(self.buffer)
+            while cut > self.pos and self.buffer[cut - 1] == ord("\\"):
+                cut -= 1
+            if (len(self.buffer) - cut) % 2 == 0:
+                cut = len(self.buffer)
+            segment = self.buffer[self.pos : cut]
+            self.pos = cut
+            if segment:
+                yield segment
+            if not self.fill():
+                raise InvalidRequestBody("Unterminated string in request body")
+
+
+def parse_analyze_request(stream: IO[bytes], read_size: int = DEFAULT_READ_SIZE) -> Tuple[Dict[str, Any], bytearray]:
+    """
+    Parse an analyze request body from its input stream.
+
+    Every field except `audio_data` is parsed as usual. Audio chunks are handled while they are
+    read: the base64 data of user chunks is decoded straight into one PCM buffer and assistant
+    chunks are skipped without being kept, so the body is never held in memory as a whole.
+
+    Args:
+        stream: The request's input stream
+        read_size: Bytes read from the stream at a time
+
+    Returns:
+        Tuple[Dict[str, Any], bytearray]: The other fields of the request and the user's PCM audio
+
+    Raises:
+        InvalidRequestBody: If the body is not a valid JSON object
+    """
+    start_time = time.perf_counter()
+    reader = _Reader(stream, read_size)
+    fields: Dict[str, Any] = {}
+    user_audio = bytearray()
+    skipped = [0]
+
+    reader.expect(ord("{"))
+    if not reader.consume_if(ord("}")):
+        while True:
+            key = _parse_string(reader)
+            reader.expect(ord(":"))
+            if key == AUDIO_DATA_FIELD and reader.peek() == ord("["):
+                _parse_audio_chunks(reader, user_audio, skipped)
+            else:
+                fields[key] = _parse_value(reader)
+            if not reader.consume_if(ord(",")):
+                break
+        reader.expect(ord("}"))
+
+    metrics.observe(PARSE_LATENCY_METRIC, (time.perf_counter() - start_time) * 1000)
+    metrics.observe(BODY_BYTES_METRIC, reader.total)
+    metrics.increment(SKIPPED_AUDIO_BYTES_METRIC, skipped[0])
+    return fields, user_audio
+
+
+def _parse_audio_chunks(reader: _Reader, user_audio: bytearray, skipped: List[int]) -> None:
+    """Parse the audio chunk array, decoding user audio and skipping everything else."""
+    reader.expect(ord("["))
+    if reader.consume_if(ord("]")):
+        return
+    while True:
+        if reader.peek() == ord("{"):
+            _parse_audio_chunk(reader, user_audio, skipped)
+        else:
+            _parse_value(reader)
+        if not reader.consume_if(ord(",")):
+            break
+    reader.expect(ord("]"))
+
+
+def _parse_audio_chunk(reader: _Reader, user_audio: bytearray, skipped: List[int]) -> None:
+    """Parse one audio chunk object; data seen before the chunk's type is held until the type is known."""
+    chunk_type: Optional[str] = None
+    pending: Optional[bytes] = None
+    reader.expect(ord("{"))
+    if not reader.consume_if(ord("}")):
+        while True:
+            key = _parse_string(reader)
+            reader.expect(ord(":"))
+            if key == AUDIO_DATA_KEY and reader.peek() == ord('"'):
+                if chunk_type == USER_AUDIO_TYPE:
+                    _decode_base64(reader.string_segments(), user_audio)
+                elif chunk_type is None:
+                    pending = b"".join(reader.string_segments())
+                else:
+                    skipped[0] += sum(len(segment) for segment in reader.string_segments())
+            else:
+                value = _parse_value(reader)
+                if key == AUDIO_TYPE_FIELD:
+                    chunk_type = value
+            if not reader.consume_if(ord(",")):
+                break
+        reader.expect(ord("}"))
+
+    if pending is not None:
+        if chunk_type == USER_AUDIO_TYPE:
+            _decode_base64(iter([pending]), user_audio)
+        else:
+            skipped[0] += len(pending)
+
+
+def _decode_base64(segments: Iterator[bytes], user_audio: bytearray) -> None:
+    """Decode base64 string pieces onto the end of the buffer, dropping the whole chunk if it is invalid."""
+    start = len(user_audio)
+    remainder = b""
+    try:
+        for segment in segments:
+            data = remainder + segment if remainder else segment
+            usable = len(data) - len(data) % BASE64_QUANTUM
+            user_audio += binascii.a2b_base64(data if usable == len(data) else data[:usable])
+            remainder = data[usable:]
+        if remainder:
+            user_audio += binascii.a2b_base64(remainder)
+    except binascii.Error as e:
+        logger.error("Error decoding audio chunk: %s", e)
+        del user_audio[start:]
+        # Consume the rest of the string so parsing can continue
+        for _ in segments:
+            pass
+
+
+def _parse_value(reader: _Reader) -> Any:
+    """Parse any JSON value."""
+    first = reader.peek()
+    if first == ord("{"):
+        reader.pos += 1
+        result: Dict[str, Any] = {}
+        if reader.consume_if(ord("}")):
+            return result
+        while True:
+            key = _parse_string(reader)
+            reader.expect(ord(":"))
+            result[key] = _parse_value(reader)
+            if not reader.consume_if(ord(",")):
+                break
+        reader.expect(ord("}"))
+        return result
+    if first == ord("["):
+        reader.pos += 1
+        items: List[Any] = []
+        if reader.consume_if(ord("]")):
+            return items
+        while True:
+            items.append(_parse_value(reader))
+            if not reader.consume_if(ord(",")):
+                break
+        reader.expect(ord("]"))
+        return items
+    if first == ord('"'):
+        return _parse_string(reader)
+    return _parse_scalar(reader)
+
+
+def _parse_string(reader: _Reader) -> str:
+    """Parse a string, resolving escapes."""
+    raw = b"".join(reader.string_segments())
+    try:
+        if b"\\" not in raw:
+            return raw.decode("utf-8")
+        return json.loads(b'"' + raw + b'"')
+    except ValueError as e:
+        raise InvalidRequestBody(f"Invalid string in request body: {e}") from e
+
+
+def _parse_scalar(reader: _Reader) -> Any:
+    """Parse a number, true, false or null."""
+    token = bytearray()
+    while True:
+        while reader.pos < len(reader.buffer):
+            byte = reader.buffer[reader.pos]
+            if byte not in _NUMBER_BYTES and not 97 <= byte <= 122:
+                break
+            token.append(byte)
+            reader.pos += 1
+        else:
+            if reader.fill():
+                continue
+        break
+
+    literal = bytes(token)
+    if literal in _LITERALS:
+        return _LITERALS[literal]
+    try:
+        return json.loads(literal)
+    except ValueError as e:
+        raise InvalidRequestBody(f"Invalid value {literal[:20]!r} in request body") from e
+
+
+def _is_escaped(buffer: bytes, start: int, index: int) -> bool:
+    """Whether the quote at `index` is preceded by an odd number of backslashes."""
+    backslashes = 0
+    while index - backslashes - 1 >= start and buffer[index - backslashes - 1] == ord("\\"):
+        backslashes += 1
+    return backslashes % 2 == 1
@@ -6,20 +6,35 @@
 """Analysis components for conversation and pronunciation assessment."""
 
 import asyncio
-import base64
-import io
+import hashlib
 import json
 import logging
-import wave
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
 
-import azure.cognitiveservices.speech as speechsdk  # pyright: ignore[reportMissingTypeStubs]
 import yaml
-from openai import AzureOpenAI
-
 from src.config import config
+from src.services.deployment_pool import TIER_LARGE, Deployment, DeploymentPool
+from src.services.evaluation_cache import EvaluationCache, build_cache_key
+from src.services.evaluation_groups import (
+    EVALUATION_GROUPS,
+    EVALUATION_MODE_PARALLEL,
+    MAX_IMPROVEMENTS_COUNT,
+    MAX_STRENGTHS_COUNT,
+    evaluation_mode,
+    group_response_format,
+    group_transcript,
+    merge_evaluation_parts,
+)
+from src.services.evaluation_stream import EVENT_AI_ASSESSMENT, EvaluationStreamParser
+from src.services.metrics import metrics
+from src.services.model_call_guard import ModelCallGuard, model_call_guard
+from src.services.model_router import ModelRouter
+from src.services.openai_clients import openai_clients
 from src.services.scenario_utils import determine_scenario_directory
+from src.services.token_budget import estimate_tokens
+from src.services.transcript_chunking import frame_transcript_chunk, merge_chunk_evaluations, split_transcript
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +44,28 @@ EVALUATION_SUFFIX_REMOVAL = "-evaluation.prompt"
 SCENARIO_DATA_DIR = "data/scenarios"
 DOCKER_APP_PATH = "/app"
 
+# Bump when the evaluation prompt template or response schema changes to invalidate cached results
+EVALUATION_PROMPT_VERSION = "1"
+PROMPT_FILE_HASH_LENGTH = 16
+
+# Running evaluation constants
+RUNNING_NOTES_FIELD = "dimension_notes"
+EVALUATION_DIMENSIONS = (
+    "professional_tone",
+    "active_listening",
+    "engagement_quality",
+    "needs_assessment",
+    "value_proposition",
+    "objection_handling",
+)
+
+# Evaluation metrics
+EVALUATION_MODE_METRIC = "evaluation_mode"
+CACHED_PROMPT_TOKENS_METRIC = "evaluation_cached_prompt_tokens"
+EVALUATION_LATENCY_METRIC = "evaluation_model_ms"
+MODE_SINGLE = "single"
+MODE_MAP_REDUCE = "map_reduce"
+
 # Scoring constants
 MAX_PROFESSIONAL_TONE_SCORE = 10
 MAX_ACTIVE_LISTENING_SCORE = 10
@@ -40,31 +77,36 @@ MAX_OVERALL_SCORE = 100
 MAX_TONE_STYLE_SCORE = 30
 MAX_CONTENT_SCORE = 70
 
-# Audio processing constants
-MIN_AUDIO_SIZE_BYTES = 48000
-AUDIO_SAMPLE_RATE = 24000
-AUDIO_CHANNELS = 1
-AUDIO_SAMPLE_WIDTH = 2
-AUDIO_BITS_PER_SAMPLE = 16
-
-# Assessment constants
-MAX_STRENGTHS_COUNT = 3
-MAX_IMPROVEMENTS_COUNT = 3
 
-
-class ConversationAnalyzer:
+class ConversationAnalyzer:  # pylint: disable=too-many-instance-attributes
     """Analyzes sales conversations using Azure OpenAI."""
 
-    def __init__(self, scenario_dir: Optional[Path] = None):
+    def __init__(
+        self,
+        scenario_dir: Optional[Path] = None,
+        evaluation_cache: Optional[EvaluationCache] = None,
+        deployment_pool: Optional[DeploymentPool] = None,
+        model_router: Optional[ModelRouter] = None,
+        call_guard: Optional[ModelCallGuard] = None,
+    ):
         """
         Initialize the conversation analyzer.
 
         Args:
             scenario_dir: Directory containing evaluation scenario files
+            evaluation_cache: Cache for evaluation results, built from configuration if omitted
+            deployment_pool: Deployments that serve evaluation calls, built from configuration if omitted
+            model_router: Router that picks the model tier of each evaluation, built from configuration if omitted
+            call_guard: Concurrency limiter, retries and circuit breaker of model calls, shared by default
         """
         self.scenario_dir = determine_scenario_directory(scenario_dir)
+        self._scenario_sources: Dict[str, Tuple[Path, int, str]] = {}
         self.evaluation_scenarios = self._load_evaluation_scenarios()
-        self.openai_client = self._initialize_openai_client()
+        self.evaluation_cache = evaluation_cache or self._create_evaluation_cache()
+        self.deployment_pool = deployment_pool or DeploymentPool.from_config()
+        self.model_router = model_router or ModelRouter.from_config()
+        self.call_guard = call_guard or model_call_guard
+        self._shadow_tasks: Set["asyncio.Future[None]"] = set()
 
     def _load_evaluation_scenarios(self) -> Dict[str, Any]:
         """
@@ -80,47 +122,101 @@ class ConversationAnalyzer:
             return scenarios
 
         for file in self.scenario_dir.glob(EVALUATION_FILE_SUFFIX):
-            try:
-                with open(file, encoding="utf-8") as f:
-                    scenario = yaml.safe_load(f)
-                    scenario_id = file.stem.replace(EVALUATION_SUFFIX_REMOVAL, "")
-                    scenarios[scenario_id] = scenario
-                    logger.info("Loaded evaluation scenario: %s", scenario_id)
-            except Exception as e:
-                logger.error("Error loading evaluation scenario %s: %s", file, e)
+            loaded = self._load_evaluation_file(file)
+            if loaded:
+                scenario_id, scenario = loaded
+                scenarios[scenario_id] = scenario
+                logger.info("Loaded evaluation scenario: %s", scenario_id)
 
         logger.info("Total evaluation scenarios loaded: %s", len(scenarios))
         return scenarios
 
-    def _initialize_openai_client(self) -> Optional[AzureOpenAI]:
+    def _load_evaluation_file(self, file: Path) -> Optional[Tuple[str, Any]]:
         """
-        Initialize the Azure OpenAI client.
+        Load one evaluation scenario file and record its modification time and content version.
 
         Returns:
-            Optional[AzureOpenAI]: Initialized client or None if configuration missing
+            Optional[Tuple[str, Any]]: The scenario ID and scenario, or None if loading fails
         """
         try:
-            endpoint = config["azure_openai_endpoint"]
-            api_key = config["azure_openai_api_key"]
+            content = file.read_bytes()
+            scenario = yaml.safe_load(content)
+            scenario_id = file.stem.replace(EVALUATION_SUFFIX_REMOVAL, "")
+            version = hashlib.sha256(content).hexdigest()[:PROMPT_FILE_HASH_LENGTH]
+            self._scenario_sources[scenario_id] = (file, file.stat().st_mtime_ns, version)
+            return scenario_id, scenario
+        except Exception as e:
+            logger.error("Error loading evaluation scenario %s: %s", file, e)
+            return None
 
-            if not endpoint or not api_key:
-                logger.error("Azure OpenAI endpoint or API key not configured")
-                return None
+    def _refresh_evaluation_scenario(self, scenario_id: str) -> None:
+        """Reload an evaluation scenario whose file changed since it was loaded."""
+        source = self._scenario_sources.get(scenario_id)
+        if not source:
+            return
 
-            client = AzureOpenAI(
-                api_version=config["api_version"],
-                azure_endpoint=endpoint,
-                api_key=api_key,
-            )
+        file, mtime_ns, _ = source
+        try:
+            if file.stat().st_mtime_ns == mtime_ns:
+                return
+        except FileNotFoundError:
+            return
+
+        loaded = self._load_evaluation_file(file)
+        if loaded:
+            self.evaluation_scenarios[scenario_id] = loaded[1]
+            logger.info("Reloaded changed evaluation scenario: %s", scenario_id)
+
+    def _create_evaluation_cache(self) -> EvaluationCache:
+        """Create the evaluation result cache from configuration."""
+        if not config["evaluation_cache_enabled"]:
+            return EvaluationCache(max_memory_entries=0)
+
+        cache_dir = config["evaluation_cache_dir"]
+        return EvaluationCache(
+            cache_dir=Path(cache_dir) if cache_dir else None,
+            ttl_seconds=config["evaluation_cache_ttl_seconds"],
+            max_memory_entries=config["evaluation_cache_max_entries"],
+            max_disk_bytes=config["evaluation_cache_max_disk_mb"] * 1024 * 1024,
+        )
 
-            logger.info("ConversationAnalyzer initialized with endpoint: %s", endpoint)
-            return client
+    def _evaluation_cache_key(self, scenario_id: str, transcript: str, tier: str = TIER_LARGE) -> str:
+        """Build the cache key for an evaluation of a transcript against a scenario by a model tier."""
+        file_version = self._scenario_sources[scenario_id][2] if scenario_id in self._scenario_sources else ""
+        prompt_version = f"{EVALUATION_PROMPT_VERSION}:{file_version}"
+        return build_cache_key(scenario_id, prompt_version, self.model_router.deployment_for(tier), transcript)
 
-        except Exception as e:
-            logger.error("Failed to initialize OpenAI client: %s", e)
-            return None
+    def _route_evaluation(
+        self, scenario: Dict[str, Any], transcript: str, latency_slo_ms: Optional[float]
+    ) -> Tuple[str, str]:
+        """
+        Pick the model tier of an evaluation.
 
-    async def analyze_conversation(self, scenario_id: str, transcript: str) -> Optional[Dict[str, Any]]:
+        Returns:
+            Tuple[str, str]: The tier the router picked and the tier that serves the evaluation,
+            which differ in shadow mode
+        """
+        tier, reason = self.model_router.route(estimate_tokens(transcript), scenario, latency_slo_ms)
+        logger.info("Routing evaluation to the %s tier (%s)", tier, reason)
+        return tier, self.model_router.serving_tier(tier)
+
+    def _start_shadow_evaluation(
+        self, scenario: Dict[str, Any], transcript: str, tier: str, served: Dict[str, Any], label: str
+    ) -> None:
+        """Evaluate the transcript with the routed tier in the background and compare it with the served result."""
+
+        async def shadow_evaluation() -> None:
+            shadow = await self._evaluate_transcript(scenario, transcript, tier)
+            if shadow is not None:
+                self.model_router.compare(served, shadow, label)
+
+        task = asyncio.ensure_future(shadow_evaluation())
+        self._shadow_tasks.add(task)
+        task.add_done_callback(self._shadow_tasks.discard)
+
+    async def analyze_conversation(
+        self, scenario_id: str, transcript: str, latency_slo_ms: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Analyze a conversation transcript.
 
@@ -128,25 +224,300 @@ class ConversationAnalyzer:
             scenario_id: The scenario identifier.
                          For AI generated scenario, use "graph_generated"
             transcript: The conversation transcript to analyze
+            latency_slo_ms: Latency the caller needs the result within, used to pick the model tier
 
         Returns:
             Optional[Dict[str, Any]]: Analysis results or None if analysis fails
         """
         logger.info("Starting conversation analysis for scenario: %s", scenario_id)
 
+        self._refresh_evaluation_scenario(scenario_id)
+        evaluation_scenario = self.evaluation_scenarios.get(scenario_id)
+        if not evaluation_scenario:
+            logger.error("Evaluation scenario not found: %s", scenario_id)
+            return None
+
+        tier, serving_tier = self._route_evaluation(evaluation_scenario, transcript, latency_slo_ms)
+        cache_key = self._evaluation_cache_key(scenario_id, transcript, serving_tier)
+        cached = await self.evaluation_cache.get_async(cache_key)
+        if cached is not None:
+            logger.info("Returning cached evaluation for scenario: %s", scenario_id)
+            return cached
+
+        if not openai_clients.configured:
+            logger.error("OpenAI client not configured")
+            return None
+
+        result = await self._evaluate_transcript(evaluation_scenario, transcript, serving_tier)
+        if result is not None:
+            self.evaluation_cache.set(cache_key, result)
+            if tier != serving_tier:
+                self._start_shadow_evaluation(evaluation_scenario, transcript, tier, result, scenario_id)
+        return result
+
+    async def _evaluate_transcript(
+        self, scenario: Dict[str, Any], transcript: str, tier: str = TIER_LARGE
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Evaluate a transcript in one call, or in parallel chunks when it exceeds the token budget.
+
+        Chunk evaluations are merged into a single result with the same schema.
+
+        Returns:
+            Optional[Dict[str, Any]]: Evaluation results or None if any call fails
+        """
+        chunks = split_transcript(scenario, transcript)
+        if len(chunks) <= 1:
+            metrics.increment(EVALUATION_MODE_METRIC, labels={"mode": MODE_SINGLE})
+            return await self._call_evaluation_model(scenario, transcript, tier)
+
+        metrics.increment(EVALUATION_MODE_METRIC, labels={"mode": MODE_MAP_REDUCE})
+        logger.info("Evaluating long transcript in %s chunks", len(chunks))
+        results = await asyncio.gather(
+            *(
+                self._call_evaluation_model(scenario, frame_transcript_chunk(chunk, index, len(chunks)), tier)
+                for index, chunk in enumerate(chunks)
+            )
+        )
+
+        completed = [result for result in results if result is not None]
+        if len(completed) < len(results):
+            logger.error("%s of %s chunk evaluations failed", len(results) - len(completed), len(results))
+            return None
+        return self._process_evaluation_result(
+            merge_chunk_evaluations(completed, [estimate_tokens(chunk) for chunk in chunks])
+        )
+
+    def build_evaluation_request(self, scenario_id: str, transcript: str) -> Optional[Dict[str, Any]]:
+        """
+        Build the chat completion arguments for evaluating a transcript against a scenario.
+
+        Returns:
+            Optional[Dict[str, Any]]: The request arguments or None if the scenario is unknown
+        """
+        self._refresh_evaluation_scenario(scenario_id)
+        evaluation_scenario = self.evaluation_scenarios.get(scenario_id)
+        if not evaluation_scenario:
+            return None
+        return self._build_evaluation_request(evaluation_scenario, transcript)
+
+    def build_evaluation_plan(self, scenario_id: str, transcript: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Build the chat completion arguments of every call `analyze_conversation` makes for a transcript.
+
+        A long transcript is evaluated in chunks, and in parallel mode each chunk takes one call per group.
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: The request arguments or None if the scenario is unknown
+        """
+        self._refresh_evaluation_scenario(scenario_id)
+        evaluation_scenario = self.evaluation_scenarios.get(scenario_id)
+        if not evaluation_scenario:
+            return None
+        chunks = split_transcript(evaluation_scenario, transcript)
+        if len(chunks) <= 1:
+            return self._build_evaluation_requests(evaluation_scenario, transcript)
+        return [
+            request
+            for index, chunk in enumerate(chunks)
+            for request in self._build_evaluation_requests(
+                evaluation_scenario, frame_transcript_chunk(chunk, index, len(chunks))
+            )
+        ]
+
+    def parse_evaluation_content(self, content: str) -> Dict[str, Any]:
+        """Parse and validate the structured output of an evaluation request."""
+        return self._process_evaluation_result(json.loads(content))
+
+    async def stream_conversation_analysis(
+        self, scenario_id: str, transcript: str, latency_slo_ms: Optional[float] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Analyze a conversation transcript, yielding partial results as the model generates them.
+
+        Each dimension score, strength and improvement is yielded as an event as soon as it has been
+        parsed from the token stream. The final event is an ai_assessment event carrying the complete
+        result, or None if analysis fails.
+
+        Args:
+            scenario_id: The scenario identifier
+            transcript: The conversation transcript to analyze
+            latency_slo_ms: Latency the caller needs the result within, used to pick the model tier
+
+        Yields:
+            Dict[str, Any]: Assessment events
+        """
+        logger.info("Starting streaming conversation analysis for scenario: %s", scenario_id)
+
+        self._refresh_evaluation_scenario(scenario_id)
+        evaluation_scenario = self.evaluation_scenarios.get(scenario_id)
+        if not evaluation_scenario:
+            logger.error("Evaluation scenario not found: %s", scenario_id)
+            yield {"type": EVENT_AI_ASSESSMENT, "value": None}
+            return
+
+        tier, serving_tier = self._route_evaluation(evaluation_scenario, transcript, latency_slo_ms)
+        cache_key = self._evaluation_cache_key(scenario_id, transcript, serving_tier)
+        cached = await self.evaluation_cache.get_async(cache_key)
+        if cached is not None:
+            logger.info("Returning cached evaluation for scenario: %s", scenario_id)
+            yield {"type": EVENT_AI_ASSESSMENT, "value": cached}
+            return
+
+        if not openai_clients.configured:
+            logger.error("OpenAI client not configured")
+            yield {"type": EVENT_AI_ASSESSMENT, "value": None}
+            return
+
+        if len(split_transcript(evaluation_scenario, transcript)) > 1:
+            # Chunk results are only meaningful once merged, so long transcripts yield just the final event
+            result = await self._evaluate_transcript(evaluation_scenario, transcript, serving_tier)
+            if result is not None:
+                self.evaluation_cache.set(cache_key, result)
+            yield {"type": EVENT_AI_ASSESSMENT, "value": result}
+            return
+
+        async for event in self._stream_evaluation(evaluation_scenario, transcript, serving_tier):
+            if event["type"] == EVENT_AI_ASSESSMENT and event["value"] is not None:
+                self.evaluation_cache.set(cache_key, event["value"])
+                if tier != serving_tier:
+                    self._start_shadow_evaluation(evaluation_scenario, transcript, tier, event["value"], scenario_id)
+            yield event
+
+    async def _stream_evaluation(
+        self, scenario: Dict[str, Any], transcript: str, tier: str
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream the evaluation calls of a transcript, yielding field events and then the merged result event."""
+        requests = self._build_evaluation_requests(scenario, transcript)
+        parsers = [EvaluationStreamParser() for _ in requests]
+        events: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue()
+
+        async def stream_request(request: Dict[str, Any], parser: EvaluationStreamParser) -> None:
+            try:
+                stream = await self._create_completion(request, stream=True, tier=tier)
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        for event in parser.feed(chunk.choices[0].delta.content):
+                            events.put_nowait(event)
+            finally:
+                events.put_nowait(None)
+
+        # In parallel mode the group streams interleave, so each field is yielded as soon as any call produces it
+        tasks = [asyncio.create_task(stream_request(request, parser)) for request, parser in zip(requests, parsers)]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                event = await events.get()
+                if event is None:
+                    remaining -= 1
+                else:
+                    yield event
+
+            for task in tasks:
+                task.result()
+            result = self._process_evaluation_result(
+                merge_evaluation_parts([json.loads(parser.text) for parser in parsers])
+            )
+        except Exception as e:
+            logger.error("Error in streaming evaluation model: %s", e)
+            yield {"type": EVENT_AI_ASSESSMENT, "value": None}
+            return
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        yield {"type": EVENT_AI_ASSESSMENT, "value": result}
+
+    async def update_running_evaluation(
+        self, scenario_id: str, running_evaluation: Optional[Dict[str, Any]], new_turns: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Fold newly completed turns of a live conversation into its running evaluation.
+
+        The running evaluation is a complete assessment plus short evidence notes per scoring
+        dimension, so each update only sends the turns completed since the previous one.
+
+        Args:
+            scenario_id: The scenario identifier
+            running_evaluation: The previous running evaluation, or None for the first update
+            new_turns: Transcript of the turns completed since the previous update
+
+        Returns:
+            Optional[Dict[str, Any]]: The updated running evaluation or None if the update fails
+        """
+        self._refresh_evaluation_scenario(scenario_id)
         evaluation_scenario = self.evaluation_scenarios.get(scenario_id)
         if not evaluation_scenario:
             logger.error("Evaluation scenario not found: %s", scenario_id)
             return None
 
-        if not self.openai_client:
+        if not openai_clients.configured:
             logger.error("OpenAI client not configured")
             return None
 
-        return await self._call_evaluation_model(evaluation_scenario, transcript)
+        tier, _ = self.model_router.route(estimate_tokens(new_turns), evaluation_scenario)
+        try:
+            completion = await self._create_completion(
+                self._build_running_evaluation_request(evaluation_scenario, running_evaluation, new_turns),
+                tier=self.model_router.serving_tier(tier),
+            )
+
+            if completion.choices[0].message.content:
+                return self._process_evaluation_result(json.loads(completion.choices[0].message.content))
+
+            logger.error("No content received from OpenAI")
+            return None
+
+        except Exception as e:
+            logger.error("Error updating running evaluation: %s", e)
+            return None
+
+    def _build_running_evaluation_request(
+        self, scenario: Dict[str, Any], running_evaluation: Optional[Dict[str, Any]], new_turns: str
+    ) -> Dict[str, Any]:
+        """Build the chat completion arguments for a running evaluation update."""
+        prompt = self._build_running_evaluation_prompt(scenario, running_evaluation, new_turns)
+        return {
+            "model": config["model_deployment_name"],
+            "messages": self._build_evaluation_messages(prompt),
+            "response_format": self._get_running_response_format(),
+        }
+
+    def _build_running_evaluation_prompt(
+        self, scenario: Dict[str, Any], running_evaluation: Optional[Dict[str, Any]], new_turns: str
+    ) -> str:
+        """Build the prompt that updates a running evaluation with new turns."""
+        if running_evaluation is None:
+            conversation = f"""{new_turns}
+
+        The conversation is still in progress. In {RUNNING_NOTES_FIELD}, note the evidence seen so far
+        for each scoring dimension in one or two sentences."""
+        else:
+            conversation = f"""RUNNING ASSESSMENT OF THE CONVERSATION SO FAR:
+        {json.dumps(running_evaluation)}
+
+        NEW TURNS SINCE THAT ASSESSMENT:
+        {new_turns}
+
+        The conversation is still in progress. Update the running assessment with the new turns rather
+        than starting over, and revise {RUNNING_NOTES_FIELD} so each note summarizes the evidence for its
+        dimension across the whole conversation in one or two sentences."""
+
+        return self._build_evaluation_prompt(scenario, conversation)
 
     def _build_evaluation_prompt(self, scenario: Dict[str, Any], transcript: str) -> str:
-        """Build the evaluation prompt."""
+        """
+        Build the evaluation prompt.
+
+        The static rubric comes first and the transcript last, so every evaluation of a scenario,
+        including each chunk of a long transcript, shares a prefix the service can cache.
+        """
+        return f"""{self._build_rubric(scenario)}
+        {transcript}
+        """
+
+    def _build_rubric(self, scenario: Dict[str, Any]) -> str:
+        """Build the scenario's evaluation instructions, everything in the prompt but the transcript."""
         base_prompt = scenario["messages"][0]["content"]
         return f"""{base_prompt}
 
@@ -169,42 +540,56 @@ class ConversationAnalyzer:
 
         Provide maximum of {MAX_STRENGTHS_COUNT} strengths and {MAX_IMPROVEMENTS_COUNT} areas of improvement.
 
-        CONVERSATION TO EVALUATE:
-        {transcript}
-        """
+        CONVERSATION TO EVALUATE:"""
 
-    async def _call_evaluation_model(self, scenario: Dict[str, Any], transcript: str) -> Optional[Dict[str, Any]]:
+    async def _call_evaluation_model(
+        self, scenario: Dict[str, Any], transcript: str, tier: str = TIER_LARGE
+    ) -> Optional[Dict[str, Any]]:
         """
         Call OpenAI with structured outputs for evaluation.
 
+        In parallel mode the tone, content and feedback fields are requested by concurrent calls,
+        each generating a fraction of the output, and merged into one result.
+
         Args:
             scenario: The evaluation scenario configuration
             transcript: The conversation transcript
+            tier: Model tier that serves the calls
 
         Returns:
-            Optional[Dict[str, Any]]: Evaluation results or None if call fails
+            Optional[Dict[str, Any]]: Evaluation results or None if any call fails
         """
+        start_time = time.perf_counter()
+        requests = self._build_evaluation_requests(scenario, transcript)
+        parts = await asyncio.gather(*(self._request_evaluation(request, tier) for request in requests))
+        metrics.observe(
+            EVALUATION_LATENCY_METRIC,
+            (time.perf_counter() - start_time) * 1000,
+            labels={"mode": evaluation_mode(scenario), "tier": tier},
+        )
 
-        if not self.openai_client:
+        completed = [part for part in parts if part is not None]
+        if len(completed) < len(parts):
+            return None
+        return self._process_evaluation_result(merge_evaluation_parts(completed))
+
+    async def _request_evaluation(self, request: Dict[str, Any], tier: str = TIER_LARGE) -> Optional[Dict[str, Any]]:
+        """
+        Send one evaluation request.
+
+        Returns:
+            Optional[Dict[str, Any]]: The parsed model output or None if the call fails
+        """
+        if not openai_clients.configured:
             logger.error("OpenAI client not configured")
             return None
-        openai_client = self.openai_client
 
         try:
-            evaluation_prompt = self._build_evaluation_prompt(scenario, transcript)
-
-            completion = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: openai_client.chat.completions.create(
-                    model=config["model_deployment_name"],
-                    messages=self._build_evaluation_messages(evaluation_prompt),  # pyright: ignore[reportArgumentType]
-                    response_format=self._get_response_format(),  # pyright: ignore[reportArgumentType]
-                ),
-            )
+            completion = await self._create_completion(request, tier=tier)
+            self._record_cached_prompt_tokens(completion)
 
             if completion.choices[0].message.content:
-                evaluation_json = json.loads(completion.choices[0].message.content)
-                return self._process_evaluation_result(evaluation_json)
+                return json.loads(completion.choices[0].message.content)
 
             logger.error("No content received from OpenAI")
             return None
@@ -213,6 +598,55 @@ class ConversationAnalyzer:
             logger.error("Error in evaluation model: %s", e)
             return None
 
+    async def _create_completion(self, request: Dict[str, Any], stream: bool = False, tier: str = TIER_LARGE) -> Any:
+        """
+        Send a chat completion to a deployment of the pool that serves the tier.
+
+        Non-streaming calls may be hedged on a second deployment. Streaming calls are only routed,
+        since a duplicate stream cannot be merged with the one already being yielded. Calls go
+        through the call guard, which retries them within the deadline and raises CircuitOpenError
+        without calling the model while the circuit is open.
+        """
+
+        async def send(deployment: Deployment) -> Any:
+            openai_client = openai_clients.get_client(deployment.endpoint, deployment.api_key)
+            if not openai_client:
+                raise RuntimeError(f"OpenAI client not configured for {deployment.name}")
+            arguments = {**request, "model": deployment.deployment}
+            if stream:
+                arguments["stream"] = True
+            return await openai_client.chat.completions.create(**arguments)
+
+        return await self.call_guard.call(lambda: self.deployment_pool.call(send, hedge=not stream, tier=tier))
+
+    def _build_evaluation_requests(self, scenario: Dict[str, Any], transcript: str) -> List[Dict[str, Any]]:
+        """Build the chat completion arguments of each call of an evaluation in the scenario's mode."""
+        if evaluation_mode(scenario) != EVALUATION_MODE_PARALLEL:
+            return [self._build_evaluation_request(scenario, transcript)]
+        return [
+            {
+                **self._build_evaluation_request(scenario, group_transcript(transcript, group)),
+                "response_format": group_response_format(self._get_response_format(), group),
+            }
+            for group in EVALUATION_GROUPS
+        ]
+
+    def _record_cached_prompt_tokens(self, completion: Any) -> None:
+        """Record how many prompt tokens the service served from its prompt cache, when it reports them."""
+        details = getattr(getattr(completion, "usage", None), "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", None)
+        if isinstance(cached_tokens, int):
+            metrics.observe(CACHED_PROMPT_TOKENS_METRIC, cached_tokens)
+
+    def _build_evaluation_request(self, scenario: Dict[str, Any], transcript: str) -> Dict[str, Any]:
+        """Build the chat completion arguments for an evaluation."""
+        evaluation_prompt = self._build_evaluation_prompt(scenario, transcript)
+        return {
+            "model": config["model_deployment_name"],
+            "messages": self._build_evaluation_messages(evaluation_prompt),
+            "response_format": self._get_response_format(),
+        }
+
     def _build_evaluation_messages(self, evaluation_prompt: str) -> List[Dict[str, str]]:
         """Build the messages for the evaluation API call."""
         return [
@@ -290,6 +724,20 @@ class ConversationAnalyzer:
             },
         }
 
+    def _get_running_response_format(self) -> Dict[str, Any]:
+        """Get the structured response format for running evaluations, adding per-dimension notes."""
+        response_format = self._get_response_format()
+        json_schema = response_format["json_schema"]
+        json_schema["name"] = "sales_running_evaluation"
+        json_schema["schema"]["properties"][RUNNING_NOTES_FIELD] = {
+            "type": "object",
+            "properties": {dimension: {"type": "string"} for dimension in EVALUATION_DIMENSIONS},
+            "required": list(EVALUATION_DIMENSIONS),
+            "additionalProperties": False,
+        }
+        json_schema["schema"]["required"].append(RUNNING_NOTES_FIELD)
+        return response_format
+
     def _process_evaluation_result(self, evaluation_json: Dict[str, Any]) -> Dict[str, Any]:
         """Process and validate evaluation results."""
         evaluation_json["speaking_tone_style"]["total"] = sum(
@@ -310,174 +758,3 @@ class ConversationAnalyzer:
 
         logger.info("Evaluation processed with score: %s", evaluation_json.get("overall_score"))
         return evaluation_json
-
-
-class PronunciationAssessor:
-    """Assesses pronunciation using Azure Speech Services."""
-
-    def __init__(self):
-        """Initialize the pronunciation assessor."""
-        self.speech_key = config["azure_speech_key"]
-        self.speech_region = config["azure_speech_region"]
-
-    def _create_wav_audio(self, audio_bytes: bytearray) -> bytes:
-        """Create WAV format audio from raw PCM bytes."""
-        with io.BytesIO() as wav_buffer:
-            wav_file: wave.Wave_write = wave.open(wav_buffer, "wb")  # type: ignore
-            with wav_file:
-                wav_file.setnchannels(AUDIO_CHANNELS)
-                wav_file.setsampwidth(AUDIO_SAMPLE_WIDTH)
-                wav_file.setframerate(AUDIO_SAMPLE_RATE)
-                wav_file.writeframes(audio_bytes)
-
-            wav_buffer.seek(0)
-            return wav_buffer.read()
-
-    def _log_assessment_info(self, wav_audio: bytes, reference_text: Optional[str]) -> None:
-        """Log information about the assessment being performed."""
-        logger.info("Starting pronunciation assessment with audio size: %s bytes", len(wav_audio))
-        logger.info("Reference text: %s", reference_text or "None")
-        logger.info("Speech key configured: %s", "Yes" if self.speech_key else "No")
-        logger.info("Speech region: %s", self.speech_region)
-
-    def _create_speech_config(self) -> speechsdk.SpeechConfig:
-        """Create speech configuration."""
-        speech_config = speechsdk.SpeechConfig(subscription=self.speech_key, region=self.speech_region)
-        speech_config.speech_recognition_language = config["azure_speech_language"]
-        return speech_config
-
-    def _create_pronunciation_config(self, reference_text: Optional[str]) -> speechsdk.PronunciationAssessmentConfig:
-        """Create pronunciation assessment configuration."""
-        pronunciation_config = speechsdk.PronunciationAssessmentConfig(
-            reference_text=reference_text or "",
-            grading_system=speechsdk.PronunciationAssessmentGradingSystem.HundredMark,
-            granularity=speechsdk.PronunciationAssessmentGranularity.Phoneme,
-            enable_miscue=True,
-        )
-        pronunciation_config.enable_prosody_assessment()
-        return pronunciation_config
-
-    def _create_audio_config(self, wav_audio: bytes) -> speechsdk.audio.AudioConfig:
-        """Create audio configuration from WAV data."""
-        audio_format = speechsdk.audio.AudioStreamFormat(
-            samples_per_second=AUDIO_SAMPLE_RATE,
-            bits_per_sample=AUDIO_BITS_PER_SAMPLE,
-            channels=AUDIO_CHANNELS,
-            wave_stream_format=speechsdk.audio.AudioStreamWaveFormat.PCM,
-        )
-
-        push_stream = speechsdk.audio.PushAudioInputStream(stream_format=audio_format)
-        push_stream.write(wav_audio)
-        push_stream.close()
-
-        return speechsdk.audio.AudioConfig(stream=push_stream)
-
-    def _build_assessment_result(
-        self,
-        pronunciation_result: speechsdk.PronunciationAssessmentResult,
-        result: speechsdk.SpeechRecognitionResult,
-    ) -> Dict[str, Any]:
-        """Build the final assessment result."""
-        return {
-            "accuracy_score": pronunciation_result.accuracy_score,
-            "fluency_score": pronunciation_result.fluency_score,
-            "completeness_score": pronunciation_result.completeness_score,
-            "prosody_score": getattr(pronunciation_result, "prosody_score", None),
-            "pronunciation_score": pronunciation_result.pronunciation_score,
-            "words": self._extract_word_details(result),
-        }
-
-    async def assess_pronunciation(
-        self, audio_data: List[Dict[str, Any]], reference_text: Optional[str] = None
-    ) -> Optional[Dict[str, Any]]:
-        """
-        Assess pronunciation of audio data.
-
-        Args:
-            audio_data: List of audio chunks with metadata
-            reference_text: Optional reference text for comparison
-
-        Returns:
-            Optional[Dict[str, Any]]: Pronunciation assessment results or None if assessment fails
-        """
-        if not self.speech_key:
-            logger.error("Azure Speech key not configured")
-            return None
-
-        try:
-            combined_audio = await self._prepare_audio_data(audio_data)
-            if not combined_audio:
-                logger.error("No audio data to assess")
-                return None
-
-            logger.info("Combined audio size: %s bytes", len(combined_audio))
-
-            if len(combined_audio) < MIN_AUDIO_SIZE_BYTES:
-                logger.warning("Audio might be too short: %s bytes", len(combined_audio))
-
-            wav_audio = self._create_wav_audio(combined_audio)
-            return await self._perform_assessment(wav_audio, reference_text)
-
-        except Exception as e:
-            logger.error("Error in pronunciation assessment: %s", e)
-            return None
-
-    async def _prepare_audio_data(self, audio_data: List[Dict[str, Any]]) -> bytearray:
-        """Prepare and combine audio chunks."""
-        combined_audio = bytearray()
-
-        for chunk in audio_data:
-            if chunk.get("type") == "user":
-                try:
-                    audio_bytes = base64.b64decode(chunk["data"])
-                    combined_audio.extend(audio_bytes)
-                except Exception as e:
-                    logger.error("Error decoding audio chunk: %s", e)
-
-        return combined_audio
-
-    async def _perform_assessment(self, wav_audio: bytes, reference_text: Optional[str]) -> Optional[Dict[str, Any]]:
-        """Perform the actual pronunciation assessment."""
-        self._log_assessment_info(wav_audio, reference_text)
-
-        speech_config = self._create_speech_config()
-        pronunciation_config = self._create_pronunciation_config(reference_text)
-        audio_config = self._create_audio_config(wav_audio)
-
-        speech_recognizer = speechsdk.SpeechRecognizer(
-            speech_config=speech_config,
-            audio_config=audio_config,
-            language=config["azure_speech_language"],
-        )
-        pronunciation_config.apply_to(speech_recognizer)
-
-        result = await asyncio.get_event_loop().run_in_executor(None, speech_recognizer.recognize_once)
-
-        pronunciation_result = speechsdk.PronunciationAssessmentResult(result)
-        return self._build_assessment_result(pronunciation_result, result)
-
-    def _extract_word_details(self, result: speechsdk.SpeechRecognitionResult) -> List[Dict[str, Any]]:
-        """Extract word-level pronunciation details."""
-        try:
-            json_result = json.loads(
-                result.properties.get(
-                    speechsdk.PropertyId.SpeechServiceResponse_JsonResult,
-                    "{}",
-                )  # pyright: ignore[reportUnknownMemberType]  # pyright: ignore[reportUnknownArgumentType]
-            )
-
-            words: List[Dict[str, Any]] = []
-            if "NBest" in json_result and json_result["NBest"]:
-                for word_info in json_result["NBest"][0].get("Words", []):
-                    words.append(
-                        {
-                            "word": word_info.get("Word", ""),
-                            "accuracy": word_info.get("PronunciationAssessment", {}).get("AccuracyScore", 0),
-                            "error_type": word_info.get("PronunciationAssessment", {}).get("ErrorType", "None"),
-                        }
-                    )
-
-            return words
-        except Exception as e:
-            logger.error("Error extracting word details: %s", e)
-            return []
@@ -0,0 +1,201 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Per-segment pronunciation assessment settings that fit a latency budget."""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Assessment granularities, from most to least detailed
+GRANULARITY_PHONEME = "Phoneme"
+GRANULARITY_WORD = "Word"
+
+# Relative Speech service cost per second of audio of the settings, full detail is 1
+GRANULARITY_COSTS = {GRANULARITY_PHONEME: 1.0, GRANULARITY_WORD: 0.8, "FullText": 0.7}
+NO_PROSODY_COST_FACTOR = 0.75
+# Recognition seconds per second of audio at full detail until a recognition has been observed
+DEFAULT_SECONDS_PER_AUDIO_SECOND = 0.5
+# Share by which older observations lose weight with each new one
+LATENCY_DECAY = 0.05
+# Share of the budget planned for, leaving room for latency spread, uneven packing and segmentation
+BUDGET_HEADROOM = 0.9
+# Spread of the observed audio lengths, in squared seconds, needed to fit a per-call overhead
+MIN_FIT_VARIANCE = 0.25
+
+# Metrics
+PLANNED_SEGMENTS_METRIC = "pronunciation_planned_segments"
+PLANNED_LATENCY_METRIC = "pronunciation_planned_latency_ms"
+
+
+def relative_cost(settings: Dict[str, Any]) -> float:
+    """Relative Speech service cost of assessing with the given settings."""
+    cost = GRANULARITY_COSTS.get(settings.get("granularity", GRANULARITY_PHONEME), 1.0)
+    return cost if settings.get("enable_prosody") else cost * NO_PROSODY_COST_FACTOR
+
+
+def cheaper_settings(settings: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    The next cheaper settings: phoneme granularity is dropped to word first, then prosody is turned off.
+
+    Returns:
+        Optional[Dict[str, Any]]: The cheaper settings, None if the settings are the cheapest used
+    """
+    if settings.get("granularity") == GRANULARITY_PHONEME:
+        return {**settings, "granularity": GRANULARITY_WORD}
+    if settings.get("enable_prosody"):
+        return {**settings, "enable_prosody": False}
+    return None
+
+
+class AssessmentPlanner:
+    """
+    Picks the assessment settings of each segment of a recording so the assessment fits a latency budget.
+
+    Every segment starts with the most detailed settings. While the estimated time to assess all
+    segments, given how many run at once, is over the budget, the one step down that saves the
+    most time is taken, which is on the longest segments. Short turns, where phoneme feedback is
+    most useful, keep full detail longest, and bulk audio is assessed at word level or without
+    prosody. Recognition latency is estimated as a per-call overhead plus time per second of
+    audio scaled by the settings' relative cost, fitted to the observed recognitions.
+    """
+
+    def __init__(self, budget_ms: float = 0.0, seconds_per_audio_second: float = DEFAULT_SECONDS_PER_AUDIO_SECOND):
+        """
+        Initialize the planner.
+
+        Args:
+            budget_ms: Latency budget of an assessment, 0 to always use the most detailed settings
+            seconds_per_audio_second: Recognition time per second of audio at full detail before any is observed
+        """
+        self.budget_ms = budget_ms
+        self.initial_seconds_per_audio_second = seconds_per_audio_second
+        # Decaying weight, sums of cost-scaled audio seconds x and latency y, and of x * x and x * y
+        self._weight = 0.0
+        self._sums = [0.0, 0.0, 0.0, 0.0]
+        self._lock = threading.Lock()
+
+    def observe(self, settings: Dict[str, Any], audio_seconds: float, latency_seconds: float) -> None:
+        """Record the latency of a recognition of `audio_seconds` of audio with the given settings."""
+        if audio_seconds <= 0:
+            return
+        x = audio_seconds * relative_cost(settings)
+        with self._lock:
+            self._weight = self._weight * (1 - LATENCY_DECAY) + 1
+            for index, value in enumerate((x, latency_seconds, x * x, x * latency_seconds)):
+                self._sums[index] = self._sums[index] * (1 - LATENCY_DECAY) + value
+
+    def estimate_seconds(self, settings: Dict[str, Any], audio_seconds: float) -> float:
+        """Estimate the recognition time of `audio_seconds` of audio with the given settings."""
+        overhead, rate = self._latency_model()
+        return overhead + rate * relative_cost(settings) * audio_seconds
+
+    def _latency_model(self) -> Tuple[float, float]:
+        """
+        The per-call overhead and the seconds per second of audio at full detail.
+
+        Fitted by least squares when the observed audio lengths vary enough, otherwise the
+        observed latency is taken as proportional to the audio.
+        """
+        with self._lock:
+            weight = self._weight
+            sum_x, sum_y, sum_xx, sum_xy = self._sums
+        if weight <= 0 or sum_x <= 0:
+            return 0.0, self.initial_seconds_per_audio_second
+        mean_x, mean_y = sum_x / weight, sum_y / weight
+        variance = sum_xx / weight - mean_x * mean_x
+        if variance > MIN_FIT_VARIANCE:
+            rate = (sum_xy / weight - mean_x * mean_y) / variance
+            overhead = mean_y - rate * mean_x
+            if rate > 0 and overhead >= 0:
+                return overhead, rate
+        return 0.0, sum_y / sum_x
+
+    def plan(
+        self,
+        durations: List[float],
+        settings: Dict[str, Any],
+        concurrency: int,
+        budget_ms: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Pick the settings of each segment.
+
+        Args:
+            durations: Seconds of audio of each segment
+            settings: The most detailed settings to use
+            concurrency: Segments assessed at once
+            budget_ms: Latency budget of this assessment, defaults to the planner's
+
+        Returns:
+            List[Dict[str, Any]]: Settings of each segment, in the order of `durations`
+        """
+        budget_ms = self.budget_ms if budget_ms is None else budget_ms
+        planned = [dict(settings) for _ in durations]
+        if not budget_ms or not durations:
+            return planned
+
+        target_ms = budget_ms * BUDGET_HEADROOM
+        concurrency = max(1, concurrency)
+        overhead, rate = self._latency_model()
+        latencies = [overhead + rate * relative_cost(settings) * duration for duration in durations]
+        estimate = max(sum(latencies) / concurrency, *latencies)
+        while estimate * 1000 > target_ms:
+            step = _best_step(planned, durations, latencies, concurrency, rate)
+            if step is None:
+                break
+            index, saving, cheaper = step
+            planned[index] = cheaper
+            latencies[index] -= saving
+            estimate = max(sum(latencies) / concurrency, *latencies)
+
+        if estimate * 1000 > target_ms:
+            logger.warning(
+                "Assessment estimated at %.0f ms with the cheapest useful settings, over the %.0f ms planned for",
+                estimate * 1000,
+                target_ms,
+            )
+        _record_plan(planned, estimate)
+        return planned
+
+
+def _best_step(
+    planned: List[Dict[str, Any]], durations: List[float], latencies: List[float], concurrency: int, rate: float
+) -> Optional[Tuple[int, float, Dict[str, Any]]]:
+    """
+    Find the segment whose next cheaper settings save the most time.
+
+    Returns:
+        Optional[Tuple[int, float, Dict[str, Any]]]: The segment's index, the seconds saved and its
+        cheaper settings, None when no segment that matters can be made cheaper
+    """
+    slowest = max(range(len(latencies)), key=latencies.__getitem__)
+    # When the slowest segment alone takes longer than the rest spread over the workers, only it matters
+    candidates = [slowest] if latencies[slowest] >= sum(latencies) / concurrency else range(len(latencies))
+    best: Optional[Tuple[int, float, Dict[str, Any]]] = None
+    best_saving = 0.0
+    for index in candidates:
+        cheaper = cheaper_settings(planned[index])
+        if cheaper is None:
+            continue
+        saving = rate * (relative_cost(planned[index]) - relative_cost(cheaper)) * durations[index]
+        if saving > best_saving:
+            best, best_saving = (index, saving, cheaper), saving
+    return best
+
+
+def _record_plan(planned: List[Dict[str, Any]], estimate: float) -> None:
+    """Record a plan's estimated latency and the settings of its segments."""
+    metrics.observe(PLANNED_LATENCY_METRIC, estimate * 1000)
+    for segment_settings in planned:
+        labels = {
+            "granularity": str(segment_settings.get("granularity")),
+            "prosody": str(bool(segment_settings.get("enable_prosody"))).lower(),
+        }
+        metrics.increment(PLANNED_SEGMENTS_METRIC, labels=labels)
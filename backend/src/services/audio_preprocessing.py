@@ -0,0 +1,144 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Cleans up recorded PCM before it is sent for pronunciation assessment."""
+
+from typing import Tuple, Union
+
+import numpy as np
+from src.services.audio_segmentation import (
+    DEFAULT_SAMPLE_RATE,
+    FRAME_MS,
+    LOUD_PERCENTILE,
+    MIN_SPEECH_ENERGY,
+    NOISE_FLOOR_PERCENTILE,
+    PADDING_MS,
+    SAMPLE_WIDTH,
+    SPEECH_TO_LOUD_RATIO,
+    SPEECH_TO_NOISE_RATIO,
+)
+
+# Loudness constants, speech is brought to about -20 dBFS RMS without clipping
+TARGET_SPEECH_RMS = 3300.0
+MAX_GAIN = 8.0
+MIN_GAIN = 0.25
+PEAK_CEILING = 32000.0
+INT16_MIN = -32768
+INT16_MAX = 32767
+
+PcmBuffer = Union[bytes, bytearray, memoryview]
+
+
+class PreprocessedAudio:
+    """Cleaned PCM audio with what the preprocessing changed."""
+
+    def __init__(self, pcm: bytes, removed_seconds: float, gain: float, dc_offset: float):
+        """
+        Initialize the result.
+
+        Args:
+            pcm: 16-bit mono PCM audio after preprocessing
+            removed_seconds: Length of the silence trimmed from the ends and cut out of long pauses
+            gain: Factor the audio was scaled by
+            dc_offset: Mean sample value removed from the audio
+        """
+        self.pcm = pcm
+        self.removed_seconds = removed_seconds
+        self.gain = gain
+        self.dc_offset = dc_offset
+
+
+def preprocess_audio(pcm: PcmBuffer, max_pause_ms: int, sample_rate: int = DEFAULT_SAMPLE_RATE) -> PreprocessedAudio:
+    """
+    Remove DC offset and surplus silence from PCM audio and normalize its loudness.
+
+    Silence before the first and after the last speech is trimmed to the segmentation padding,
+    and pauses longer than `max_pause_ms` are shortened to it by cutting out their middle, so
+    the decay and onset around speech are kept. Speech is scaled towards TARGET_SPEECH_RMS,
+    limited so the loudest sample stays below PEAK_CEILING. Speech is detected with the same
+    frame energy thresholds as segmentation. Everything runs on whole arrays or per pause,
+    never per sample. Audio without detectable speech is returned unchanged.
+
+    Args:
+        pcm: 16-bit mono little-endian PCM audio
+        max_pause_ms: Longer pauses are shortened to this, 0 to keep pauses
+        sample_rate: Sample rate of the audio
+
+    Returns:
+        PreprocessedAudio: The cleaned audio and what was changed
+    """
+    samples = np.frombuffer(pcm, dtype="<i2", count=len(pcm) // SAMPLE_WIDTH)
+    frame_samples = sample_rate * FRAME_MS // 1000
+    if len(samples) < frame_samples:
+        return PreprocessedAudio(bytes(pcm), 0.0, 1.0, 0.0)
+
+    audio = samples.astype(np.float32)
+    dc_offset = float(audio.mean())
+    audio -= dc_offset
+
+    frame_lengths, speech = _detect_speech_frames(audio, frame_samples)
+    if not speech.any():
+        return PreprocessedAudio(bytes(pcm), 0.0, 1.0, 0.0)
+
+    keep = _keep_frames(speech, max_pause_ms // FRAME_MS if max_pause_ms > 0 else 0, PADDING_MS // FRAME_MS)
+    audio = audio[np.repeat(keep, frame_lengths)]
+
+    gain = _speech_gain(audio, frame_lengths, speech, keep)
+    audio *= gain
+
+    cleaned = np.clip(np.rint(audio), INT16_MIN, INT16_MAX).astype("<i2")
+    removed_seconds = (len(samples) - len(cleaned)) / sample_rate
+    return PreprocessedAudio(cleaned.tobytes(), removed_seconds, gain, dc_offset)
+
+
+def _detect_speech_frames(audio: np.ndarray, frame_samples: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Length of each frame and whether it is speech, with the frame energy thresholds of segmentation."""
+    frame_starts = np.arange(0, len(audio), frame_samples)
+    frame_lengths = np.diff(np.append(frame_starts, len(audio)))
+    energies = np.add.reduceat(np.abs(audio), frame_starts) / frame_lengths
+    noise_floor, loud = np.quantile(energies, [NOISE_FLOOR_PERCENTILE, LOUD_PERCENTILE])
+    threshold = max(MIN_SPEECH_ENERGY, min(noise_floor * SPEECH_TO_NOISE_RATIO, loud * SPEECH_TO_LOUD_RATIO))
+    return frame_lengths, energies >= threshold
+
+
+def _speech_gain(audio: np.ndarray, frame_lengths: np.ndarray, speech: np.ndarray, keep: np.ndarray) -> float:
+    """
+    Gain bringing the speech frames of the kept audio to TARGET_SPEECH_RMS.
+
+    The gain is limited to MIN_GAIN and MAX_GAIN and so the loudest sample stays below PEAK_CEILING.
+    """
+    powers = np.add.reduceat(np.square(audio), np.cumsum(frame_lengths[keep]) - frame_lengths[keep])
+    speech_power = powers[speech[keep]].sum() / frame_lengths[speech].sum()
+    gain = TARGET_SPEECH_RMS / max(float(np.sqrt(speech_power)), 1.0)
+    peak = float(np.abs(audio).max())
+    return min(max(MIN_GAIN, min(gain, MAX_GAIN)), PEAK_CEILING / max(peak, 1.0))
+
+
+def _keep_frames(speech: np.ndarray, max_pause_frames: int, padding_frames: int) -> np.ndarray:
+    """
+    Mark the frames to keep: speech, short pauses, the middle-trimmed rest of long pauses and padding at the ends.
+
+    Works on the runs of silent frames, so the cost grows with the number of pauses.
+    """
+    edges = np.flatnonzero(np.diff(np.concatenate(([1], speech.astype(np.int8), [1]))))
+    run_starts, run_ends = edges[0::2], edges[1::2]
+
+    head = np.full(len(run_starts), max_pause_frames - max_pause_frames // 2)
+    tail = np.full(len(run_starts), max_pause_frames // 2)
+    if max_pause_frames == 0:
+        head[:], tail[:] = run_ends - run_starts, 0
+    leading = run_starts == 0
+    trailing = run_ends == len(speech)
+    head[leading], tail[leading] = 0, padding_frames
+    head[trailing], tail[trailing] = padding_frames, 0
+
+    cut_starts = run_starts + head
+    cut_ends = run_ends - tail
+    cut = cut_starts < cut_ends
+    removed = np.zeros(len(speech) + 1, dtype=np.int32)
+    np.add.at(removed, cut_starts[cut], 1)
+    np.add.at(removed, cut_ends[cut], -1)
+    result: np.ndarray = np.cumsum(removed[:-1]) == 0
+    return result
@@ -0,0 +1,230 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Splits a session's microphone recording into speech segments aligned with the user's turns."""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Audio constants, 16-bit mono PCM
+DEFAULT_SAMPLE_RATE = 24000
+SAMPLE_WIDTH = 2
+
+# Voice activity constants
+FRAME_MS = 20
+NOISE_FLOOR_PERCENTILE = 0.1
+LOUD_PERCENTILE = 0.9
+SPEECH_TO_NOISE_RATIO = 3.0
+SPEECH_TO_LOUD_RATIO = 0.3
+MIN_SPEECH_ENERGY = 300.0
+MIN_SPEECH_MS = 120
+PADDING_MS = 100
+
+Span = Tuple[int, int]
+
+
+class SpeechSegment:
+    """A span of the recording assessed on its own, with the part of the user's transcript spoken in it."""
+
+    def __init__(
+        self,
+        start: int,
+        end: int,
+        turn: Optional[int] = None,
+        reference_text: Optional[str] = None,
+        sample_rate: int = DEFAULT_SAMPLE_RATE,
+    ):
+        """
+        Initialize the segment.
+
+        Args:
+            start: Byte offset of the segment in the PCM audio
+            end: Byte offset just past the segment
+            turn: Index of the user turn the segment belongs to, None if it could not be aligned
+            reference_text: Words of the turn spoken in the segment, None to assess without a script
+            sample_rate: Sample rate of the audio
+        """
+        self.start = start
+        self.end = end
+        self.turn = turn
+        self.reference_text = reference_text
+        self.sample_rate = sample_rate
+
+    @property
+    def start_seconds(self) -> float:
+        """Start of the segment in the recording."""
+        return self.start / (self.sample_rate * SAMPLE_WIDTH)
+
+    @property
+    def duration_seconds(self) -> float:
+        """Length of the segment."""
+        return (self.end - self.start) / (self.sample_rate * SAMPLE_WIDTH)
+
+
+def segment_speech(
+    pcm: bytes,
+    reference_turns: List[str],
+    min_silence_ms: int,
+    max_segment_seconds: float,
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
+) -> List[SpeechSegment]:
+    """
+    Split PCM audio at silences and align the segments with the user's turns.
+
+    The microphone records the whole session, so the user's turns are separated by the
+    assistant's replies: the longest silences. When there are at least as many speech spans
+    as turns, the recording is cut into turns at the turn count minus one longest silences.
+    Otherwise all turns are treated as one. A turn's words are spread over its segments in
+    proportion to their length.
+
+    Args:
+        pcm: 16-bit mono PCM audio
+        reference_turns: Text of each user turn in order, empty to assess without a script
+        min_silence_ms: Pauses at least this long end a segment
+        max_segment_seconds: Longer speech is cut at its quietest frame, 0 to never cut
+        sample_rate: Sample rate of the audio
+
+    Returns:
+        List[SpeechSegment]: Segments in recording order, empty if no speech was found
+    """
+    frame_samples = sample_rate * FRAME_MS // 1000
+    energies = frame_energies(pcm, frame_samples)
+    spans = find_speech(energies, max(1, min_silence_ms // FRAME_MS), max(1, MIN_SPEECH_MS // FRAME_MS))
+    if not spans:
+        return []
+
+    max_frames = max(2, int(max_segment_seconds * 1000) // FRAME_MS) if max_segment_seconds > 0 else len(energies)
+    frame_bytes = frame_samples * SAMPLE_WIDTH
+    return [
+        SpeechSegment(start * frame_bytes, min(end * frame_bytes, len(pcm)), turn, words or None, sample_rate)
+        for turn, (start, end), words in _turn_pieces(energies, spans, reference_turns, max_frames)
+    ]
+
+
+def frame_energies(pcm: bytes, frame_samples: int) -> List[float]:
+    """Mean absolute amplitude of each frame around the recording's mean, so a DC offset does not read as speech."""
+    samples = np.frombuffer(pcm, dtype="<i2", count=len(pcm) // SAMPLE_WIDTH).astype(np.float32)
+    if samples.size == 0:
+        return []
+    samples -= samples.mean()
+    frame_starts = np.arange(0, len(samples), frame_samples)
+    frame_lengths = np.diff(np.append(frame_starts, len(samples)))
+    energies: List[float] = (np.add.reduceat(np.abs(samples), frame_starts) / frame_lengths).tolist()
+    return energies
+
+
+def find_speech(energies: List[float], min_silence_frames: int, min_speech_frames: int) -> List[Span]:
+    """
+    Find the spans of frames with speech.
+
+    A frame is speech when it is well above the recording's noise floor, or when the recording
+    has no quiet part, a fair share of its loud frames' energy. Spans separated by
+    shorter pauses than `min_silence_frames` are joined, spans shorter than `min_speech_frames`
+    are dropped as clicks, and the rest are padded into the surrounding silence.
+    """
+    if not energies:
+        return []
+    spans = [
+        (start, end)
+        for start, end in _loud_spans(energies, _speech_threshold(energies), min_silence_frames)
+        if end - start >= min_speech_frames
+    ]
+    return _pad_spans(spans, len(energies))
+
+
+def _speech_threshold(energies: List[float]) -> float:
+    """Energy above which a frame is speech, from the recording's noise floor and loud frames."""
+    ordered = sorted(energies)
+    noise_floor = ordered[int(len(ordered) * NOISE_FLOOR_PERCENTILE)]
+    loud = ordered[int(len(ordered) * LOUD_PERCENTILE)]
+    return max(MIN_SPEECH_ENERGY, min(noise_floor * SPEECH_TO_NOISE_RATIO, loud * SPEECH_TO_LOUD_RATIO))
+
+
+def _loud_spans(energies: List[float], threshold: float, min_silence_frames: int) -> List[Span]:
+    """Spans of frames at or above the threshold, joined across pauses shorter than `min_silence_frames`."""
+    spans: List[Span] = []
+    start: Optional[int] = None
+    last_speech = -1
+    for index, energy in enumerate(energies):
+        if energy < threshold:
+            continue
+        if start is None:
+            start = index
+        elif index - last_speech - 1 >= min_silence_frames:
+            spans.append((start, last_speech + 1))
+            start = index
+        last_speech = index
+    if start is not None:
+        spans.append((start, last_speech + 1))
+    return spans
+
+
+def _pad_spans(spans: List[Span], frame_count: int) -> List[Span]:
+    """Pad each span into the surrounding silence without overlapping its neighbours."""
+    padding = PADDING_MS // FRAME_MS
+    padded: List[Span] = []
+    for index, (start, end) in enumerate(spans):
+        previous_end = padded[-1][1] if padded else 0
+        next_start = spans[index + 1][0] if index + 1 < len(spans) else frame_count
+        padded.append((max(previous_end, start - padding), min(next_start, end + padding)))
+    return padded
+
+
+def _group_by_turn(spans: List[Span], reference_turns: List[str]) -> List[Tuple[Optional[int], str, List[Span]]]:
+    """Split the spans into one group per turn at the longest silences, with each group's turn and text."""
+    if len(reference_turns) == 1:
+        return [(0, reference_turns[0], spans)]
+    if not reference_turns or len(spans) < len(reference_turns):
+        return [(None, " ".join(reference_turns), spans)]
+
+    gaps = sorted(range(1, len(spans)), key=lambda index: spans[index][0] - spans[index - 1][1], reverse=True)
+    boundaries = sorted(gaps[: len(reference_turns) - 1]) + [len(spans)]
+    groups: List[Tuple[Optional[int], str, List[Span]]] = []
+    previous = 0
+    for turn, boundary in enumerate(boundaries):
+        groups.append((turn, reference_turns[turn], spans[previous:boundary]))
+        previous = boundary
+    return groups
+
+
+def _turn_pieces(
+    energies: List[float], spans: List[Span], reference_turns: List[str], max_frames: int
+) -> List[Tuple[Optional[int], Span, str]]:
+    """Cut the spans into pieces of at most `max_frames`, each with its turn and its share of the turn's words."""
+    pieces: List[Tuple[Optional[int], Span, str]] = []
+    for turn, text, group in _group_by_turn(spans, reference_turns):
+        turn_pieces = [piece for span in group for piece in _split_long_span(energies, span, max_frames)]
+        texts = _distribute_words(text, [end - start for start, end in turn_pieces])
+        pieces.extend((turn, piece, words) for piece, words in zip(turn_pieces, texts))
+    return pieces
+
+
+def _split_long_span(energies: List[float], span: Span, max_frames: int) -> List[Span]:
+    """Cut a span longer than `max_frames` at the quietest frame of the second half of each window."""
+    start, end = span
+    pieces: List[Span] = []
+    while end - start > max_frames:
+        window = range(start + max_frames // 2, start + max_frames)
+        cut = min(window, key=lambda index: energies[index])
+        pieces.append((start, cut))
+        start = cut
+    pieces.append((start, end))
+    return pieces
+
+
+def _distribute_words(text: str, lengths: List[int]) -> List[str]:
+    """Spread the words of a text over consecutive pieces in proportion to their lengths."""
+    words = text.split()
+    total = sum(lengths)
+    texts: List[str] = []
+    elapsed = 0
+    previous = 0
+    for length in lengths:
+        elapsed += length
+        end = round(len(words) * elapsed / total) if total else len(words)
+        texts.append(" ".join(words[previous:end]))
+        previous = end
+    return texts
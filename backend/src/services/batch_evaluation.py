@@ -0,0 +1,295 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Bulk re-scoring of stored transcripts, paced to the deployment's quota."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+from src.services.analyzers import ConversationAnalyzer
+from src.services.conversation_context import CHARS_PER_TOKEN, ITEM_OVERHEAD_TOKENS
+from src.services.metrics import metrics
+from src.services.openai_clients import openai_clients
+from src.services.rate_limiter import QuotaLimiter
+
+logger = logging.getLogger(__name__)
+
+# Estimation constants
+COMPLETION_TOKENS_ESTIMATE = 500
+ITEM_ID_HASH_LENGTH = 16
+
+# Result constants
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+UNKNOWN_SCENARIO_ERROR = "Evaluation scenario not found"
+EVALUATION_FAILED_ERROR = "Evaluation failed"
+
+# Offline batch constants
+BATCH_ENDPOINT = "/chat/completions"
+BATCH_STATUS_COMPLETED = "completed"
+
+# Metrics
+ITEMS_METRIC = "batch_evaluation_items"
+ITEM_LATENCY_METRIC = "batch_evaluation_item_ms"
+
+
+def item_id(item: Dict[str, Any]) -> str:
+    """Get an item's ID, derived from its scenario and transcript when not given explicitly."""
+    if item.get("id"):
+        return str(item["id"])
+    key_material = f"{item.get('scenario_id', '')}\x1f{item.get('transcript', '')}"
+    return hashlib.sha256(key_material.encode("utf-8")).hexdigest()[:ITEM_ID_HASH_LENGTH]
+
+
+def prepare_items(raw_items: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Validate (scenario_id, transcript) items, skipping any that lack either field.
+
+    Yields:
+        Dict[str, Any]: Items with their ID filled in
+    """
+    for index, item in enumerate(raw_items, start=1):
+        if not isinstance(item, dict) or not item.get("scenario_id") or not item.get("transcript"):
+            logger.warning("Skipping item %s without scenario_id and transcript", index)
+            continue
+        yield {**item, "id": item_id(item)}
+
+
+def parse_items(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Parse items from JSONL lines, skipping blank lines and invalid JSON."""
+
+    def decode() -> Iterator[Any]:
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                logger.warning("Skipping invalid JSON on line %s", line_number)
+
+    return prepare_items(decode())
+
+
+def estimate_request_tokens(request: Dict[str, Any]) -> int:
+    """Estimate the tokens a chat completion request consumes, prompt and completion included."""
+    prompt_tokens = sum(
+        ITEM_OVERHEAD_TOKENS + len(message.get("content", "")) // CHARS_PER_TOKEN for message in request["messages"]
+    )
+    return prompt_tokens + COMPLETION_TOKENS_ESTIMATE
+
+
+def completed_item_ids(output_path: Path) -> Set[str]:
+    """Read the IDs of successfully evaluated items from a previous run's output."""
+    completed: Set[str] = set()
+    if not output_path.exists():
+        return completed
+
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(result, dict) and result.get("status") == STATUS_OK:
+                completed.add(str(result.get("id")))
+    return completed
+
+
+class BatchEvaluator:
+    """
+    Evaluates many transcripts with bounded concurrency under a tokens and requests per minute quota.
+
+    Results are emitted one JSON object per item as soon as each evaluation finishes, so output
+    can be streamed and an interrupted run resumed from what was already written.
+    """
+
+    def __init__(self, analyzer: ConversationAnalyzer, limiter: QuotaLimiter, concurrency: int):
+        """
+        Initialize the batch evaluator.
+
+        Args:
+            analyzer: Analyzer that evaluates each transcript
+            limiter: Quota limiter shared by all evaluations of the batch
+            concurrency: Maximum evaluations in flight at once
+        """
+        self.analyzer = analyzer
+        self.limiter = limiter
+        self.concurrency = max(1, concurrency)
+
+    async def evaluate(
+        self,
+        items: Iterable[Dict[str, Any]],
+        emit: Callable[[Dict[str, Any]], None],
+        skip_ids: Optional[Set[str]] = None,
+    ) -> Dict[str, int]:
+        """
+        Evaluate items and emit a result for each.
+
+        Args:
+            items: Items with id, scenario_id and transcript
+            emit: Called with each result as soon as it is available
+            skip_ids: IDs of items already evaluated, which are not evaluated again
+
+        Returns:
+            Dict[str, int]: Counts of succeeded, failed and skipped items
+        """
+        summary = {"succeeded": 0, "failed": 0, "skipped": 0}
+        pending = iter(items)
+
+        async def worker() -> None:
+            for item in pending:
+                if skip_ids and item["id"] in skip_ids:
+                    summary["skipped"] += 1
+                    continue
+                result = await self.evaluate_item(item)
+                summary["succeeded" if result["status"] == STATUS_OK else "failed"] += 1
+                emit(result)
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        return summary
+
+    async def evaluate_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Evaluate a single item once the quota allows every call of its evaluation."""
+        result: Dict[str, Any] = {"id": item["id"], "scenario_id": item["scenario_id"]}
+
+        requests = self.analyzer.build_evaluation_plan(item["scenario_id"], item["transcript"])
+        if requests is None:
+            metrics.increment(ITEMS_METRIC, labels={"status": STATUS_ERROR})
+            return {**result, "status": STATUS_ERROR, "error": UNKNOWN_SCENARIO_ERROR}
+
+        # Chunks and parallel groups are separate calls, each with its own tokens and request
+        for request in requests:
+            await self.limiter.acquire(estimate_request_tokens(request))
+        start_time = time.perf_counter()
+        try:
+            evaluation = await self.analyzer.analyze_conversation(item["scenario_id"], item["transcript"])
+        except Exception as e:
+            logger.error("Batch evaluation of item %s failed: %s", item["id"], e)
+            evaluation = None
+        metrics.observe(ITEM_LATENCY_METRIC, (time.perf_counter() - start_time) * 1000)
+
+        if evaluation is None:
+            metrics.increment(ITEMS_METRIC, labels={"status": STATUS_ERROR})
+            return {**result, "status": STATUS_ERROR, "error": EVALUATION_FAILED_ERROR}
+
+        metrics.increment(ITEMS_METRIC, labels={"status": STATUS_OK})
+        return {**result, "status": STATUS_OK, "ai_assessment": evaluation}
+
+    async def evaluate_to_file(self, items: Iterable[Dict[str, Any]], output_path: Path) -> Dict[str, int]:
+        """
+        Evaluate items, appending results to a JSONL file that doubles as the resume checkpoint.
+
+        Items with a successful result already in the file are skipped, failed ones are retried.
+        """
+        skip_ids = completed_item_ids(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "a", encoding="utf-8") as f:
+
+            def write(result: Dict[str, Any]) -> None:
+                f.write(json.dumps(result) + "\n")
+                f.flush()
+
+            return await self.evaluate(items, write, skip_ids)
+
+
+def build_offline_batch(
+    analyzer: ConversationAnalyzer, items: Iterable[Dict[str, Any]], deployment: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Build request lines in the Azure OpenAI Batch API input format.
+
+    Args:
+        analyzer: Analyzer that builds each evaluation request
+        items: Items with id, scenario_id and transcript
+        deployment: Global batch deployment to target instead of the configured model
+
+    Yields:
+        Dict[str, Any]: One batch request per item with a known scenario
+    """
+    for item in items:
+        request = analyzer.build_evaluation_request(item["scenario_id"], item["transcript"])
+        if request is None:
+            logger.warning("Skipping item %s with unknown scenario %s", item["id"], item["scenario_id"])
+            continue
+        if deployment:
+            request["model"] = deployment
+        yield {"custom_id": item["id"], "method": "POST", "url": BATCH_ENDPOINT, "body": request}
+
+
+async def submit_offline_batch(input_path: Path) -> Dict[str, Any]:
+    """Upload a batch input file and create a batch job for it."""
+    client = openai_clients.get_client()
+    if client is None:
+        raise RuntimeError("Azure OpenAI endpoint or API key not configured")
+
+    with open(input_path, "rb") as f:
+        input_file = await client.files.create(file=f, purpose="batch")
+    # Azure OpenAI takes the endpoint without the /v1 prefix of the OpenAI API
+    batch = await client.batches.create(
+        input_file_id=input_file.id, endpoint=BATCH_ENDPOINT, completion_window="24h"  # type: ignore[arg-type]
+    )
+    logger.info("Submitted batch %s with input file %s", batch.id, input_file.id)
+    return {"batch_id": batch.id, "status": batch.status}
+
+
+async def collect_offline_batch(analyzer: ConversationAnalyzer, batch_id: str, output_path: Path) -> Dict[str, Any]:
+    """
+    Download the results of a completed batch job and write them in the online result format.
+
+    Returns:
+        Dict[str, Any]: The batch status, plus result counts once the batch has completed
+    """
+    client = openai_clients.get_client()
+    if client is None:
+        raise RuntimeError("Azure OpenAI endpoint or API key not configured")
+
+    batch = await client.batches.retrieve(batch_id)
+    if batch.status != BATCH_STATUS_COMPLETED or not batch.output_file_id:
+        return {"batch_id": batch_id, "status": batch.status}
+
+    content = await client.files.content(batch.output_file_id)
+    summary = {"succeeded": 0, "failed": 0}
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "a", encoding="utf-8") as f:
+        for line in content.text.splitlines():
+            if line.strip():
+                result = parse_offline_result(analyzer, json.loads(line))
+                summary["succeeded" if result["status"] == STATUS_OK else "failed"] += 1
+                f.write(json.dumps(result) + "\n")
+
+    return {"batch_id": batch_id, "status": batch.status, **summary}
+
+
+def parse_offline_result(analyzer: ConversationAnalyzer, line: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert one Batch API output line into a batch evaluation result."""
+    result: Dict[str, Any] = {"id": line.get("custom_id")}
+    try:
+        content = line["response"]["body"]["choices"][0]["message"]["content"]
+        return {**result, "status": STATUS_OK, "ai_assessment": analyzer.parse_evaluation_content(content)}
+    except Exception as e:
+        error = line.get("error") or str(e)
+        return {**result, "status": STATUS_ERROR, "error": error}
+
+
+def write_jsonl(lines: Iterable[Dict[str, Any]], output_path: Path) -> int:
+    """Write objects as JSONL and return how many were written."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with open(output_path, "w", encoding="utf-8") as f:
+        for line in lines:
+            f.write(json.dumps(line) + "\n")
+            count += 1
+    return count
+
+
+def read_jsonl_items(input_path: Path) -> List[Dict[str, Any]]:
+    """Read evaluation items from a JSONL file."""
+    with open(input_path, encoding="utf-8") as f:
+        return list(parse_items(f))
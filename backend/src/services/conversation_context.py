@@ -0,0 +1,313 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Conversation context window management for long voice sessions."""
+
+import logging
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Token estimation constants
+CHARS_PER_TOKEN = 4
+ITEM_OVERHEAD_TOKENS = 4
+AUDIO_TOKENS_PER_SECOND = 10
+AUDIO_BYTES_PER_SECOND = 48000
+
+# Compaction constants
+STRATEGY_TRUNCATE = "truncate"
+STRATEGY_SUMMARIZE = "summarize"
+SUMMARY_ITEM_PREFIX = "proxy-summary-"
+SUMMARY_HEADER = "Summary of the earlier part of this conversation (keep these facts in mind):"
+SUMMARY_LINE_MAX_CHARS = 200
+SUMMARY_MAX_CHARS = 1500
+PINNED_ROLES = ("system",)
+
+# Latency reporting constants
+TURN_LATENCY_METRIC = "voice_turn_latency_ms"
+CONTEXT_TOKENS_METRIC = "voice_context_tokens"
+CONTEXT_ITEMS_DELETED_METRIC = "voice_context_items_deleted"
+TURN_BUCKET_SIZE = 5
+MAX_TURN_BUCKET = 40
+
+# Realtime event types
+ITEM_CREATED_TYPE = "conversation.item.created"
+ITEM_DELETED_TYPE = "conversation.item.deleted"
+ITEM_DELETE_TYPE = "conversation.item.delete"
+ITEM_CREATE_TYPE = "conversation.item.create"
+INPUT_TRANSCRIPTION_COMPLETED_TYPE = "conversation.item.input_audio_transcription.completed"
+AUDIO_TRANSCRIPT_DONE_TYPE = "response.audio_transcript.done"
+SPEECH_STARTED_TYPE = "input_audio_buffer.speech_started"
+SPEECH_STOPPED_TYPE = "input_audio_buffer.speech_stopped"
+AUDIO_DELTA_TYPE = "response.audio.delta"
+RESPONSE_DONE_TYPE = "response.done"
+FIRST_RESPONSE_OUTPUT_TYPES = (AUDIO_DELTA_TYPE, "response.text.delta", "response.audio_transcript.delta")
+
+
+class _TrackedItem:
+    """A conversation item as seen by the proxy."""
+
+    def __init__(self, item_id: str, role: str, text: str = "", pinned: bool = False):
+        self.item_id = item_id
+        self.role = role
+        self.text = text
+        self.pinned = pinned
+        self.audio_seconds = 0.0
+
+    @property
+    def tokens(self) -> int:
+        """Estimate the tokens this item occupies in the model context."""
+        text_tokens = len(self.text) // CHARS_PER_TOKEN
+        audio_tokens = int(self.audio_seconds * AUDIO_TOKENS_PER_SECOND)
+        return ITEM_OVERHEAD_TOKENS + text_tokens + audio_tokens
+
+
+class ConversationContextManager:  # pylint: disable=too-many-instance-attributes
+    """Tracks upstream conversation items and keeps them within a token and turn budget."""
+
+    def __init__(
+        self,
+        max_tokens: int = 0,
+        max_turns: int = 0,
+        keep_recent_items: int = 0,
+        strategy: str = STRATEGY_SUMMARIZE,
+    ):
+        """
+        Initialize the context manager.
+
+        Args:
+            max_tokens: Estimated token budget for conversation items (0 disables the limit)
+            max_turns: Maximum number of user turns kept upstream (0 disables the limit)
+            keep_recent_items: Number of most recent items that are never removed
+            strategy: "truncate" to delete old items, "summarize" to replace them with a pinned summary
+        """
+        self.max_tokens = max_tokens
+        self.max_turns = max_turns
+        self.keep_recent_items = keep_recent_items
+        self.strategy = strategy
+        self.items: List[_TrackedItem] = []
+        self._speech_started_ms: Dict[str, int] = {}
+        self._pending_audio_seconds: Dict[str, float] = {}
+        self._speech_stopped_at: Optional[float] = None
+        self._completed_turns = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any budget is configured."""
+        return self.max_tokens > 0 or self.max_turns > 0
+
+    @property
+    def total_tokens(self) -> int:
+        """Estimated tokens used by all tracked items."""
+        return sum(item.tokens for item in self.items)
+
+    @property
+    def user_turns(self) -> int:
+        """Number of tracked user items."""
+        return sum(1 for item in self.items if item.role == "user")
+
+    def observe_event(self, event: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Observe an upstream event and return any events to send back upstream.
+
+        Args:
+            event: A parsed event received from the Voice Live API
+
+        Returns:
+            List[Dict[str, Any]]: Protocol events that compact the conversation, if needed
+        """
+        event_type = event.get("type")
+
+        # Turn latency is recorded with or without a budget, so sessions without compaction give the baseline
+        if event_type == SPEECH_STOPPED_TYPE:
+            self._speech_stopped_at = time.perf_counter()
+        elif event_type in FIRST_RESPONSE_OUTPUT_TYPES:
+            self._record_turn_latency()
+        elif event_type == RESPONSE_DONE_TYPE:
+            self._completed_turns += 1
+
+        if not self.enabled:
+            return []
+
+        if event_type == ITEM_CREATED_TYPE:
+            self._track_item(event.get("item", {}))
+        elif event_type == ITEM_DELETED_TYPE:
+            self._forget_item(event.get("item_id"))
+        elif event_type in (INPUT_TRANSCRIPTION_COMPLETED_TYPE, AUDIO_TRANSCRIPT_DONE_TYPE):
+            self._set_item_text(event.get("item_id"), event.get("transcript") or "")
+        elif event_type == SPEECH_STARTED_TYPE:
+            self._speech_started_ms[event.get("item_id", "")] = event.get("audio_start_ms", 0)
+        elif event_type == SPEECH_STOPPED_TYPE:
+            self._record_user_audio(event)
+        elif event_type == AUDIO_DELTA_TYPE:
+            self._record_assistant_audio(event)
+
+        if event_type == RESPONSE_DONE_TYPE:
+            metrics.set_gauge(CONTEXT_TOKENS_METRIC, self.total_tokens)
+            return self._plan_compaction()
+        return []
+
+    def _track_item(self, item: Dict[str, Any]) -> None:
+        """Start tracking a newly created conversation item."""
+        item_id = item.get("id")
+        if not item_id or self._find_item(item_id):
+            return
+
+        role = item.get("role") or item.get("type", "")
+        tracked = _TrackedItem(item_id, role, self._extract_item_text(item), pinned=role in PINNED_ROLES)
+        tracked.audio_seconds = self._pending_audio_seconds.pop(item_id, 0.0)
+        self.items.append(tracked)
+
+    def _extract_item_text(self, item: Dict[str, Any]) -> str:
+        """Extract any text or transcript already attached to an item."""
+        parts: List[str] = []
+        for content in item.get("content") or []:
+            parts.append(content.get("text") or content.get("transcript") or "")
+        if item.get("output"):
+            parts.append(str(item["output"]))
+        return " ".join(part for part in parts if part)
+
+    def _find_item(self, item_id: Optional[str]) -> Optional[_TrackedItem]:
+        """Find a tracked item by ID."""
+        for item in self.items:
+            if item.item_id == item_id:
+                return item
+        return None
+
+    def _forget_item(self, item_id: Optional[str]) -> None:
+        """Stop tracking an item."""
+        self.items = [item for item in self.items if item.item_id != item_id]
+
+    def _set_item_text(self, item_id: Optional[str], text: str) -> None:
+        """Attach a completed transcript to an item."""
+        item = self._find_item(item_id)
+        if item:
+            item.text = text
+
+    def _record_user_audio(self, event: Dict[str, Any]) -> None:
+        """Account for the audio duration of a user turn, which may arrive before its item is created."""
+        item_id = event.get("item_id", "")
+        start_ms = self._speech_started_ms.pop(item_id, None)
+        if start_ms is None:
+            return
+
+        audio_seconds = max(0, event.get("audio_end_ms", start_ms) - start_ms) / 1000
+        item = self._find_item(item_id)
+        if item:
+            item.audio_seconds = audio_seconds
+        else:
+            self._pending_audio_seconds[item_id] = audio_seconds
+
+    def _record_assistant_audio(self, event: Dict[str, Any]) -> None:
+        """Account for the audio duration of an assistant response."""
+        item = self._find_item(event.get("item_id"))
+        if item:
+            item.audio_seconds += len(event.get("delta", "")) * 3 / 4 / AUDIO_BYTES_PER_SECOND
+
+    def _record_turn_latency(self) -> None:
+        """Record the time from end of user speech to the first response output."""
+        if self._speech_stopped_at is None:
+            return
+
+        latency_ms = (time.perf_counter() - self._speech_stopped_at) * 1000
+        self._speech_stopped_at = None
+
+        metrics.observe(TURN_LATENCY_METRIC, latency_ms, {"turns": self._turn_bucket()})
+        metrics.observe(TURN_LATENCY_METRIC, latency_ms)
+
+    def _turn_bucket(self) -> str:
+        """Bucket the number of completed turns for latency reporting."""
+        if self._completed_turns >= MAX_TURN_BUCKET:
+            return f"{MAX_TURN_BUCKET}+"
+        bucket_start = self._completed_turns // TURN_BUCKET_SIZE * TURN_BUCKET_SIZE
+        return f"{bucket_start}-{bucket_start + TURN_BUCKET_SIZE - 1}"
+
+    def _is_over_budget(self, items: List[_TrackedItem]) -> bool:
+        """Check whether a set of items exceeds the configured budget."""
+        if self.max_tokens and sum(item.tokens for item in items) > self.max_tokens:
+            return True
+        if self.max_turns and sum(1 for item in items if item.role == "user") > self.max_turns:
+            return True
+        return False
+
+    def _plan_compaction(self) -> List[Dict[str, Any]]:
+        """Select the oldest removable items and build the events that compact them."""
+        if not self._is_over_budget(self.items):
+            return []
+
+        recent_start = max(0, len(self.items) - self.keep_recent_items)
+        removable = [item for item in self.items[:recent_start] if not item.pinned]
+
+        dropped: List[_TrackedItem] = []
+        remaining = list(self.items)
+        while removable and self._is_over_budget(remaining):
+            item = removable.pop(0)
+            dropped.append(item)
+            remaining.remove(item)
+
+        if not dropped:
+            return []
+
+        events: List[Dict[str, Any]] = [{"type": ITEM_DELETE_TYPE, "item_id": item.item_id} for item in dropped]
+        if self.strategy == STRATEGY_SUMMARIZE:
+            summary_item, summary_events = self._build_summary(dropped, remaining)
+            events.extend(summary_events)
+            remaining = [summary_item] + [
+                item for item in remaining if not item.item_id.startswith(SUMMARY_ITEM_PREFIX)
+            ]
+
+        self.items = remaining
+        metrics.increment(CONTEXT_ITEMS_DELETED_METRIC, len(dropped))
+        logger.info(
+            "Compacted conversation context: removed %s items, %s estimated tokens remain",
+            len(dropped),
+            self.total_tokens,
+        )
+        return events
+
+    def _build_summary(
+        self, dropped: List[_TrackedItem], remaining: List[_TrackedItem]
+    ) -> Tuple[_TrackedItem, List[Dict[str, Any]]]:
+        """Build a pinned summary item and the events replacing the previous summary with it."""
+        events: List[Dict[str, Any]] = []
+        previous_summary = ""
+        for item in remaining:
+            if item.item_id.startswith(SUMMARY_ITEM_PREFIX):
+                previous_summary = item.text
+                events.append({"type": ITEM_DELETE_TYPE, "item_id": item.item_id})
+
+        summary_text = self._summarize(previous_summary, dropped)
+        summary_item = _TrackedItem(
+            f"{SUMMARY_ITEM_PREFIX}{uuid.uuid4().hex[:12]}", "system", summary_text, pinned=True
+        )
+        events.append(
+            {
+                "type": ITEM_CREATE_TYPE,
+                "previous_item_id": "root",
+                "item": {
+                    "id": summary_item.item_id,
+                    "type": "message",
+                    "role": "system",
+                    "content": [{"type": "input_text", "text": summary_text}],
+                },
+            }
+        )
+        return summary_item, events
+
+    def _summarize(self, previous_summary: str, dropped: List[_TrackedItem]) -> str:
+        """Build an extractive summary of dropped turns, keeping the most recent lines within budget."""
+        lines = previous_summary.splitlines()[1:] if previous_summary else []
+        for item in dropped:
+            if item.text:
+                lines.append(f"- {item.role}: {item.text[:SUMMARY_LINE_MAX_CHARS]}")
+
+        while lines and len("\n".join(lines)) > SUMMARY_MAX_CHARS:
+            lines.pop(0)
+
+        return "\n".join([SUMMARY_HEADER, *lines])
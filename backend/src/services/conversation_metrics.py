@@ -0,0 +1,235 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Conversation metrics computed locally from the transcript, and a fallback score derived from them."""
+
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.services.analyzers import (
+    MAX_ACTIVE_LISTENING_SCORE,
+    MAX_ENGAGEMENT_QUALITY_SCORE,
+    MAX_NEEDS_ASSESSMENT_SCORE,
+    MAX_OBJECTION_HANDLING_SCORE,
+    MAX_PROFESSIONAL_TONE_SCORE,
+    MAX_VALUE_PROPOSITION_SCORE,
+)
+from src.services.metrics import metrics
+
+# Transcript constants
+ROLE_USER = "user"
+ROLE_ASSISTANT = "assistant"
+TRANSCRIPT_LINE_PATTERN = re.compile(r"^\s*(user|assistant)\s*:\s?(.*)$", re.IGNORECASE)
+WORD_PATTERN = re.compile(r"[\w']+")
+SENTENCE_PATTERN = re.compile(r"[^.!?]+[.!?]*")
+FILLER_PATTERN = re.compile(
+    r"\b(?:um+|uh+|erm?|ah+|hmm+|basically|actually|literally|you know|i mean|kind of|sort of)\b",
+    re.IGNORECASE,
+)
+QUESTION_OPENERS = frozenset("what how why when where who which could can would will do does did is are should".split())
+MS_PER_MINUTE = 60000.0
+
+# Fallback scoring constants
+TARGET_QUESTIONS = 5
+TARGET_TALK_SHARE = 0.5
+MAX_FILLER_RATE = 10.0
+MONOLOGUE_COMFORT_WORDS = 150
+MONOLOGUE_LIMIT_WORDS = 450
+UNOBSERVABLE_SCORE_SHARE = 0.5
+
+# Metrics
+COMPUTE_LATENCY_METRIC = "conversation_metrics_ms"
+
+
+class _Turn:
+    """A turn of the conversation with optional start and end times in epoch milliseconds."""
+
+    def __init__(self, role: str, text: str, started_at: Optional[float] = None, ended_at: Optional[float] = None):
+        self.role = role
+        self.text = text
+        self.started_at = started_at
+        self.ended_at = ended_at
+        self.words = len(WORD_PATTERN.findall(text))
+
+
+def parse_turns(transcript: str, turns: Optional[List[Dict[str, Any]]] = None) -> List[_Turn]:
+    """
+    Get the turns of a conversation.
+
+    Args:
+        transcript: Transcript with one "role: content" line per turn
+        turns: Recorded turns with role, content and optional started_at and ended_at in epoch
+            milliseconds, preferred over the transcript when given
+
+    Returns:
+        List[_Turn]: Turns in conversation order
+    """
+    if turns:
+        return [
+            _Turn(
+                str(turn.get("role", "")).lower(),
+                str(turn.get("content", "")),
+                _timestamp(turn.get("started_at")),
+                _timestamp(turn.get("ended_at")),
+            )
+            for turn in turns
+            if isinstance(turn, dict)
+        ]
+
+    parsed: List[_Turn] = []
+    for line in transcript.splitlines():
+        match = TRANSCRIPT_LINE_PATTERN.match(line)
+        if match:
+            parsed.append(_Turn(match.group(1).lower(), match.group(2)))
+        elif parsed and line.strip():
+            # Continuation of a multi-line turn
+            parsed[-1] = _Turn(parsed[-1].role, f"{parsed[-1].text}\n{line}")
+    return parsed
+
+
+def compute_conversation_metrics(transcript: str, turns: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    Compute the trainee's conversation metrics in a single pass over the turns.
+
+    Timing metrics (words per minute and response latency) need recorded turns with timestamps
+    and are None otherwise.
+
+    Args:
+        transcript: Transcript with one "role: content" line per turn
+        turns: Recorded turns, see `parse_turns`
+
+    Returns:
+        Dict[str, Any]: Conversation metrics
+    """
+    start_time = time.perf_counter()
+    user_words = assistant_words = questions = fillers = 0
+    monologue_words = longest_monologue = 0
+    speaking_words = 0
+    speaking_ms = 0.0
+    latencies: List[float] = []
+    previous: Optional[_Turn] = None
+
+    for turn in parse_turns(transcript, turns):
+        if turn.role == ROLE_USER:
+            user_words += turn.words
+            questions += _count_questions(turn.text)
+            fillers += len(FILLER_PATTERN.findall(turn.text))
+            monologue_words = monologue_words + turn.words if previous and previous.role == ROLE_USER else turn.words
+            longest_monologue = max(longest_monologue, monologue_words)
+            if turn.started_at is not None and turn.ended_at is not None and turn.ended_at > turn.started_at:
+                speaking_words += turn.words
+                speaking_ms += turn.ended_at - turn.started_at
+            if previous and previous.role == ROLE_ASSISTANT and previous.ended_at is not None:
+                if turn.started_at is not None:
+                    # Negative gaps are barge-ins, answered without any delay
+                    latencies.append(max(0.0, turn.started_at - previous.ended_at))
+        elif turn.role == ROLE_ASSISTANT:
+            assistant_words += turn.words
+        previous = turn
+
+    result = {
+        "user_words": user_words,
+        "assistant_words": assistant_words,
+        "talk_share": round(user_words / (user_words + assistant_words), 3) if user_words or assistant_words else None,
+        "talk_listen_ratio": round(user_words / assistant_words, 2) if assistant_words else None,
+        "questions_asked": questions,
+        "filler_words": fillers,
+        "filler_rate_per_100_words": round(100 * fillers / user_words, 2) if user_words else 0.0,
+        "longest_monologue_words": longest_monologue,
+        "words_per_minute": round(speaking_words * MS_PER_MINUTE / speaking_ms, 1) if speaking_ms else None,
+        "average_response_latency_ms": round(sum(latencies) / len(latencies)) if latencies else None,
+        "max_response_latency_ms": round(max(latencies)) if latencies else None,
+    }
+    metrics.observe(COMPUTE_LATENCY_METRIC, (time.perf_counter() - start_time) * 1000)
+    return result
+
+
+def build_fallback_assessment(conversation_metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Score a conversation from its local metrics when the AI evaluation is unavailable.
+
+    The result has the AI assessment schema and is flagged as degraded. Value proposition and
+    objection handling cannot be judged from these metrics and get a provisional half score.
+    """
+    question_score = min(1.0, conversation_metrics["questions_asked"] / TARGET_QUESTIONS)
+    talk_share = conversation_metrics["talk_share"] or 0.0
+    listening_score = 1.0 - max(0.0, talk_share - TARGET_TALK_SHARE) / (1.0 - TARGET_TALK_SHARE)
+    filler_score = 1.0 - min(1.0, conversation_metrics["filler_rate_per_100_words"] / MAX_FILLER_RATE)
+    monologue_score = 1.0 - min(
+        1.0,
+        max(0, conversation_metrics["longest_monologue_words"] - MONOLOGUE_COMFORT_WORDS)
+        / (MONOLOGUE_LIMIT_WORDS - MONOLOGUE_COMFORT_WORDS),
+    )
+
+    speaking_tone_style = {
+        "professional_tone": round(MAX_PROFESSIONAL_TONE_SCORE * filler_score),
+        "active_listening": round(MAX_ACTIVE_LISTENING_SCORE * (question_score + listening_score) / 2),
+        "engagement_quality": round(MAX_ENGAGEMENT_QUALITY_SCORE * (question_score + monologue_score) / 2),
+    }
+    conversation_content = {
+        "needs_assessment": round(MAX_NEEDS_ASSESSMENT_SCORE * question_score),
+        "value_proposition": round(MAX_VALUE_PROPOSITION_SCORE * UNOBSERVABLE_SCORE_SHARE),
+        "objection_handling": round(MAX_OBJECTION_HANDLING_SCORE * UNOBSERVABLE_SCORE_SHARE),
+    }
+    speaking_tone_style["total"] = sum(speaking_tone_style.values())
+    conversation_content["total"] = sum(conversation_content.values())
+
+    strengths, improvements = _describe_metrics(conversation_metrics, question_score, listening_score)
+    return {
+        "speaking_tone_style": speaking_tone_style,
+        "conversation_content": conversation_content,
+        "overall_score": speaking_tone_style["total"] + conversation_content["total"],
+        "strengths": strengths,
+        "improvements": improvements,
+        "specific_feedback": (
+            "The AI evaluation is unavailable, so this score was computed from conversation metrics. "
+            "Value proposition and objection handling are provisional."
+        ),
+        "degraded": True,
+    }
+
+
+def _describe_metrics(
+    conversation_metrics: Dict[str, Any], question_score: float, listening_score: float
+) -> Tuple[List[str], List[str]]:
+    """Turn the metrics into strengths and areas of improvement."""
+    strengths: List[str] = []
+    improvements: List[str] = []
+    questions = conversation_metrics["questions_asked"]
+    if question_score >= 1.0:
+        strengths.append(f"Asked {questions} questions to understand the customer")
+    else:
+        improvements.append(f"Ask more discovery questions (asked {questions}, aim for {TARGET_QUESTIONS})")
+
+    if conversation_metrics["talk_share"] is not None:
+        share = round(100 * conversation_metrics["talk_share"])
+        if listening_score >= 1.0:
+            strengths.append(f"Balanced talking and listening ({share}% of the words were yours)")
+        else:
+            improvements.append(f"Listen more, you spoke {share}% of the words")
+
+    filler_rate = conversation_metrics["filler_rate_per_100_words"]
+    if filler_rate > MAX_FILLER_RATE / 2:
+        improvements.append(f"Reduce filler words ({filler_rate} per 100 words)")
+    return strengths, improvements
+
+
+def _count_questions(text: str) -> int:
+    """Count sentences that end with a question mark or open like a question."""
+    count = 0
+    for sentence in SENTENCE_PATTERN.findall(text):
+        words = WORD_PATTERN.findall(sentence)
+        if words and (sentence.rstrip().endswith("?") or words[0].lower() in QUESTION_OPENERS):
+            count += 1
+    return count
+
+
+def _timestamp(value: Any) -> Optional[float]:
+    """Read an epoch milliseconds timestamp, ignoring missing or invalid values."""
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,288 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Latency-aware routing of evaluation calls across equivalent Azure OpenAI deployments."""
+
+import asyncio
+import json
+import logging
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, List, Optional, TypeVar
+
+import openai
+
+from src.config import config
+from src.services.metrics import metrics
+from src.services.model_call_guard import RETRYABLE_ERRORS
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Model tiers
+TIER_FAST = "fast"
+TIER_LARGE = "large"
+
+# Routing constants
+LATENCY_SAMPLES = 200
+LATENCY_SMOOTHING = 0.2
+FAILURE_THRESHOLD = 3
+COOLDOWN_SECONDS = 30.0
+# Errors that say something about a deployment's health; others, like invalid requests, do not count
+DEPLOYMENT_FAILURE_ERRORS = RETRYABLE_ERRORS + (asyncio.TimeoutError,)
+
+# Metrics
+DEPLOYMENT_LATENCY_METRIC = "deployment_request_ms"
+DEPLOYMENT_REQUESTS_METRIC = "deployment_requests"
+DEPLOYMENT_ERRORS_METRIC = "deployment_errors"
+DEPLOYMENT_HEALTHY_METRIC = "deployment_healthy"
+HEDGED_REQUESTS_METRIC = "evaluation_hedged_requests"
+HEDGE_WINS_METRIC = "evaluation_hedge_wins"
+
+
+class Deployment:  # pylint: disable=too-many-instance-attributes
+    """One Azure OpenAI deployment of the pool and its observed latency and health."""
+
+    def __init__(self, endpoint: str, api_key: str, deployment: str, tier: str = TIER_LARGE):
+        """
+        Initialize a deployment.
+
+        Args:
+            endpoint: Azure OpenAI endpoint
+            api_key: API key of the endpoint
+            deployment: Model deployment name
+            tier: Model tier the deployment serves
+        """
+        self.endpoint = endpoint
+        self.api_key = api_key
+        self.deployment = deployment
+        self.tier = tier
+        self.name = f"{endpoint.rstrip('/')}/{deployment}"
+        self.latency_ewma: Optional[float] = None
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.in_flight = 0
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+
+    def is_healthy(self, now: float) -> bool:
+        """Whether the deployment is outside its failure cooldown."""
+        return now >= self.unhealthy_until
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """Latency percentile in seconds over recent successful calls."""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percentile / 100))]
+
+
+class DeploymentPool:
+    """
+    Routes calls across equivalent deployments, preferring fast and idle ones.
+
+    Each call goes to a healthy deployment picked at random with weights inversely proportional to
+    its smoothed latency, in-flight calls and recent failures. Throttled (429), server, connection
+    and timeout errors count against a deployment, and deployments that are throttled or keep
+    failing sit out a cooldown. The pool does not retry failed calls: ModelCallGuard is the only
+    retry layer, and each of its retries is routed afresh, so it moves away from the deployment
+    that failed. With hedging enabled, a call still running after the deployment's latency
+    percentile is duplicated on another deployment and the first response wins.
+    """
+
+    def __init__(
+        self,
+        deployments: List[Deployment],
+        hedging_enabled: bool = False,
+        hedge_percentile: float = 90.0,
+        hedge_min_samples: int = 20,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ):
+        """
+        Initialize the deployment pool.
+
+        Args:
+            deployments: Equivalent deployments to route between
+            hedging_enabled: Whether slow calls are duplicated on another deployment
+            hedge_percentile: Latency percentile after which a call is hedged
+            hedge_min_samples: Latency samples a deployment needs before its calls are hedged
+            clock: Monotonic time source in seconds
+            rng: Random source for weighted routing
+        """
+        self.deployments = deployments
+        self.hedging_enabled = hedging_enabled
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.clock = clock
+        self.rng = rng or random.Random()
+
+    @classmethod
+    def from_config(cls) -> "DeploymentPool":
+        """
+        Build the pool from the configured deployments plus any extra EVALUATION_DEPLOYMENTS.
+
+        The configured endpoint serves the large tier with MODEL_DEPLOYMENT_NAME and, when set, the
+        fast tier with FAST_MODEL_DEPLOYMENT_NAME. Extra entries serve the large tier unless they
+        name another tier.
+        """
+        endpoint, api_key = config["azure_openai_endpoint"], config["azure_openai_api_key"]
+        deployments = [Deployment(endpoint, api_key, config["model_deployment_name"])]
+        if config["fast_model_deployment_name"]:
+            deployments.append(Deployment(endpoint, api_key, config["fast_model_deployment_name"], TIER_FAST))
+        if config["evaluation_deployments"]:
+            try:
+                entries = json.loads(config["evaluation_deployments"])
+                deployments.extend(
+                    Deployment(entry["endpoint"], entry["api_key"], entry["deployment"], entry.get("tier", TIER_LARGE))
+                    for entry in entries
+                )
+            except (ValueError, TypeError, KeyError) as e:
+                logger.error("Ignoring invalid EVALUATION_DEPLOYMENTS: %s", e)
+
+        return cls(
+            deployments,
+            hedging_enabled=config["evaluation_hedging_enabled"],
+            hedge_percentile=config["evaluation_hedge_percentile"],
+            hedge_min_samples=config["evaluation_hedge_min_samples"],
+        )
+
+    def has_tier(self, tier: str) -> bool:
+        """Whether any deployment serves a tier."""
+        return any(deployment.tier == tier for deployment in self.deployments)
+
+    def choose(self, exclude: Optional[Deployment] = None, tier: str = TIER_LARGE) -> Optional[Deployment]:
+        """
+        Pick a deployment of a tier for the next call.
+
+        Returns:
+            Optional[Deployment]: A healthy deployment, the one closest to recovery if none is
+            healthy, or None if no other deployment than `exclude` serves the tier
+        """
+        candidates = [
+            deployment for deployment in self.deployments if deployment.tier == tier and deployment is not exclude
+        ]
+        if not candidates:
+            return None
+
+        now = self.clock()
+        healthy = [deployment for deployment in candidates if deployment.is_healthy(now)]
+        if not healthy:
+            return None if exclude else min(candidates, key=lambda deployment: deployment.unhealthy_until)
+
+        known = [deployment.latency_ewma for deployment in healthy if deployment.latency_ewma is not None]
+        # Deployments without samples get the best known latency so they are tried early
+        default_latency = min(known) if known else 1.0
+        weights = [
+            1.0
+            / (
+                (deployment.latency_ewma or default_latency)
+                * (deployment.in_flight + 1)
+                * (deployment.consecutive_failures + 1)
+            )
+            for deployment in healthy
+        ]
+        return self.rng.choices(healthy, weights=weights)[0]
+
+    async def call(self, send: Callable[[Deployment], Awaitable[T]], hedge: bool = True, tier: str = TIER_LARGE) -> T:
+        """
+        Make a call on the best deployment of a tier, hedging it on another one when it is slow.
+
+        Args:
+            send: Makes the call against a given deployment
+            hedge: Whether the call may be hedged and its duration counts as a latency sample;
+                disable for streaming calls, which return as soon as the response starts
+            tier: Model tier that serves the call
+
+        Returns:
+            T: The result of the call, or of its hedge if that finished first
+        """
+        primary = self.choose(tier=tier)
+        if primary is None:
+            raise RuntimeError("No Azure OpenAI deployment configured")
+
+        first = asyncio.ensure_future(self._send(primary, send, record_latency=hedge))
+        delay = self._hedge_delay(primary) if hedge else None
+        try:
+            done, _ = await asyncio.wait({first}, timeout=delay)
+            secondary = None if done else self.choose(exclude=primary, tier=tier)
+            if secondary is None:
+                return await first
+
+            metrics.increment(HEDGED_REQUESTS_METRIC)
+            second = asyncio.ensure_future(self._send(secondary, send, record_latency=hedge))
+            return await self._first_success([first, second], second)
+        finally:
+            if not first.done():
+                first.cancel()
+
+    async def _first_success(self, attempts: "List[asyncio.Future[T]]", hedge_attempt: "asyncio.Future[T]") -> T:
+        """Return the first successful result of concurrent attempts and cancel the others."""
+        pending = set(attempts)
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    if attempt.exception() is None:
+                        if attempt is hedge_attempt:
+                            metrics.increment(HEDGE_WINS_METRIC)
+                        return attempt.result()
+                    error = attempt.exception()
+            assert error is not None
+            raise error
+        finally:
+            for attempt in pending:
+                attempt.cancel()
+
+    async def _send(
+        self, deployment: Deployment, send: Callable[[Deployment], Awaitable[T]], record_latency: bool
+    ) -> T:
+        """Make one attempt against a deployment and record its latency and health."""
+        labels = {"deployment": deployment.name}
+        metrics.increment(DEPLOYMENT_REQUESTS_METRIC, labels=labels)
+        deployment.in_flight += 1
+        start_time = time.perf_counter()
+        try:
+            result = await send(deployment)
+        except DEPLOYMENT_FAILURE_ERRORS as e:
+            self._record_failure(deployment, e)
+            raise
+        finally:
+            deployment.in_flight -= 1
+
+        latency = time.perf_counter() - start_time
+        if record_latency:
+            metrics.observe(DEPLOYMENT_LATENCY_METRIC, latency * 1000, labels=labels)
+            deployment.latencies.append(latency)
+            deployment.latency_ewma = (
+                latency
+                if deployment.latency_ewma is None
+                else LATENCY_SMOOTHING * latency + (1 - LATENCY_SMOOTHING) * deployment.latency_ewma
+            )
+        deployment.consecutive_failures = 0
+        metrics.set_gauge(DEPLOYMENT_HEALTHY_METRIC, 1, labels=labels)
+        return result
+
+    def _record_failure(self, deployment: Deployment, error: Exception) -> None:
+        """Count a failure and start a cooldown once the deployment is throttled or keeps failing."""
+        labels = {"deployment": deployment.name}
+        metrics.increment(DEPLOYMENT_ERRORS_METRIC, labels=labels)
+        deployment.consecutive_failures += 1
+
+        throttled = isinstance(error, openai.RateLimitError)
+        if throttled or deployment.consecutive_failures >= FAILURE_THRESHOLD:
+            deployment.unhealthy_until = self.clock() + COOLDOWN_SECONDS
+            metrics.set_gauge(DEPLOYMENT_HEALTHY_METRIC, 0, labels=labels)
+            logger.warning("Deployment %s unhealthy for %ss: %s", deployment.name, COOLDOWN_SECONDS, error)
+
+    def _hedge_delay(self, deployment: Deployment) -> Optional[float]:
+        """Seconds after which a call to the deployment is hedged, or None to never hedge."""
+        if not self.hedging_enabled or sum(1 for other in self.deployments if other.tier == deployment.tier) < 2:
+            return None
+        if len(deployment.latencies) < self.hedge_min_samples:
+            return None
+        return deployment.percentile(self.hedge_percentile)
@@ -0,0 +1,298 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Two-tier (memory and disk) cache for conversation evaluation and pronunciation assessment results."""
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Cache constants
+CACHE_FILE_SUFFIX = ".json"
+WHITESPACE_PATTERN = re.compile(r"[ \t]+")
+BLANK_LINES_PATTERN = re.compile(r"\n{2,}")
+# Share of the disk size limit the disk tier is evicted down to once it is over the limit
+DISK_EVICTION_TARGET = 0.9
+
+# Metrics, prefixed with the cache name
+DEFAULT_CACHE_NAME = "evaluation_cache"
+HITS_METRIC = "hits"
+MISSES_METRIC = "misses"
+EVICTIONS_METRIC = "evictions"
+TIER_MEMORY = "memory"
+TIER_DISK = "disk"
+
+
+def normalize_transcript(transcript: str) -> str:
+    """
+    Normalize a transcript so formatting-only differences map to the same cache entry.
+
+    Applies Unicode NFC, unifies line endings, collapses runs of spaces and blank lines and
+    strips surrounding whitespace on every line.
+    """
+    text = unicodedata.normalize("NFC", transcript).replace("\r\n", "\n").replace("\r", "\n")
+    lines = [WHITESPACE_PATTERN.sub(" ", line).strip() for line in text.split("\n")]
+    return BLANK_LINES_PATTERN.sub("\n", "\n".join(lines)).strip()
+
+
+def build_cache_key(scenario_id: str, prompt_version: str, model: str, transcript: str) -> str:
+    """Build the cache key from the scenario, prompt version, model deployment and transcript."""
+    transcript_hash = hashlib.sha256(normalize_transcript(transcript).encode("utf-8")).hexdigest()
+    key_material = "\x1f".join((scenario_id, prompt_version, model, transcript_hash))
+    return hashlib.sha256(key_material.encode("utf-8")).hexdigest()
+
+
+class EvaluationCache:  # pylint: disable=too-many-instance-attributes
+    """
+    Caches evaluation results in an in-memory LRU backed by a JSON file store on disk.
+
+    Entries expire after the configured TTL. The memory tier is bounded by entry count and the
+    disk tier by total size, evicting least recently written files first. Disk reads and writes
+    run on one background thread, so `set` and `get_async` never wait for the disk on the event
+    loop. The size of the disk tier is tracked from the bytes written, and the directory is only
+    scanned once that estimate goes over the limit, evicting down to DISK_EVICTION_TARGET of it.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        ttl_seconds: float = 0,
+        max_memory_entries: int = 256,
+        max_disk_bytes: int = 0,
+        name: str = DEFAULT_CACHE_NAME,
+    ):
+        """
+        Initialize the evaluation cache.
+
+        Args:
+            cache_dir: Directory for the disk tier, or None to keep results in memory only
+            ttl_seconds: Entry lifetime in seconds, 0 for no expiry
+            max_memory_entries: Maximum entries kept in memory, 0 disables the cache entirely
+            max_disk_bytes: Maximum total size of the disk tier, 0 for no limit
+            name: Prefix of the cache's metrics, e.g. pronunciation_cache for pronunciation results
+        """
+        self.name = name
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Estimated size of the disk tier, None until the directory has been scanned
+        self._disk_bytes: Optional[int] = None
+        self._disk_executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether caching is enabled."""
+        return self.max_memory_entries > 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached evaluation.
+
+        Args:
+            key: Cache key from build_cache_key
+
+        Returns:
+            Optional[Dict[str, Any]]: A copy of the cached result or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        cached = self._get_memory(key)
+        if cached is not None or self.cache_dir is None:
+            return self._count_lookup(cached)
+        return self._count_lookup(self._promote(key, self._run_on_disk_thread(self._read_disk, key).result()))
+
+    async def get_async(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached evaluation like `get`, reading the disk tier off the event loop."""
+        if not self.enabled:
+            return None
+
+        cached = self._get_memory(key)
+        if cached is not None or self.cache_dir is None:
+            return self._count_lookup(cached)
+        entry = await asyncio.wrap_future(self._run_on_disk_thread(self._read_disk, key))
+        return self._count_lookup(self._promote(key, entry))
+
+    def set(self, key: str, result: Dict[str, Any]) -> None:
+        """Store an evaluation result in memory and queue its write to the disk tier."""
+        if not self.enabled:
+            return
+
+        entry = (time.time(), copy.deepcopy(result))
+        with self._lock:
+            self._store_memory(key, entry)
+        if self.cache_dir is not None:
+            self._run_on_disk_thread(self._write_disk, key, entry)
+
+    def flush(self) -> None:
+        """Wait until queued disk writes are done."""
+        if self._disk_executor is not None:
+            self._run_on_disk_thread(lambda: None).result()
+
+    def clear(self) -> None:
+        """Remove all cached entries from both tiers."""
+        with self._lock:
+            self._memory.clear()
+        if self.cache_dir is not None:
+            self._run_on_disk_thread(self._clear_disk).result()
+
+    def _get_memory(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up an unexpired entry in the memory tier."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and not self._expired(entry[0]):
+                self._memory.move_to_end(key)
+                metrics.increment(self._metric(HITS_METRIC), labels={"tier": TIER_MEMORY})
+                return copy.deepcopy(entry[1])
+            if entry is not None:
+                del self._memory[key]
+        return None
+
+    def _promote(self, key: str, entry: Optional[Tuple[float, Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """Copy an entry read from disk into the memory tier."""
+        if entry is None:
+            return None
+        with self._lock:
+            self._store_memory(key, entry)
+        metrics.increment(self._metric(HITS_METRIC), labels={"tier": TIER_DISK})
+        return copy.deepcopy(entry[1])
+
+    def _count_lookup(self, cached: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Record a miss when a lookup found nothing in either tier."""
+        if cached is None:
+            metrics.increment(self._metric(MISSES_METRIC))
+        return cached
+
+    def _run_on_disk_thread(self, function: Any, *args: Any) -> "Future[Any]":
+        """Run disk IO on the cache's background thread, in submission order."""
+        with self._lock:
+            if self._disk_executor is None:
+                self._disk_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=self.name)
+        return self._disk_executor.submit(function, *args)
+
+    def _metric(self, metric: str) -> str:
+        """Name a metric of this cache."""
+        return f"{self.name}_{metric}"
+
+    def _expired(self, created_at: float) -> bool:
+        """Check whether an entry created at the given time has outlived the TTL."""
+        return self.ttl_seconds > 0 and time.time() - created_at > self.ttl_seconds
+
+    def _store_memory(self, key: str, entry: Tuple[float, Dict[str, Any]]) -> None:
+        """Insert into the LRU, evicting the least recently used entries over capacity."""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            metrics.increment(self._metric(EVICTIONS_METRIC), labels={"tier": TIER_MEMORY})
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        """Get the file path for a key, or None when the disk tier is disabled."""
+        return self.cache_dir / f"{key}{CACHE_FILE_SUFFIX}" if self.cache_dir else None
+
+    def _read_disk(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """Read an unexpired entry from disk."""
+        path = self._disk_path(key)
+        if path is None or not path.exists():
+            return None
+
+        try:
+            with open(path, encoding="utf-8") as f:
+                payload = json.load(f)
+            entry = (float(payload["created_at"]), payload["result"])
+        except Exception as e:
+            logger.warning("Discarding unreadable %s entry %s: %s", self.name, path.name, e)
+            path.unlink(missing_ok=True)
+            return None
+
+        if self._expired(entry[0]):
+            path.unlink(missing_ok=True)
+            return None
+        return entry
+
+    def _write_disk(self, key: str, entry: Tuple[float, Dict[str, Any]]) -> None:
+        """Write an entry to disk atomically and enforce the disk size limit."""
+        path = self._disk_path(key)
+        if path is None:
+            return
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.warning("Disabling the %s disk tier, %s is not writable: %s", self.name, path.parent, e)
+            self.cache_dir = None
+            return
+
+        try:
+            temp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"created_at": entry[0], "result": entry[1]}, f)
+            written_bytes = temp_path.stat().st_size
+            os.replace(temp_path, path)
+        except Exception as e:
+            logger.warning("Failed to write %s entry: %s", self.name, e)
+            return
+
+        if not self.max_disk_bytes:
+            return
+        if self._disk_bytes is None:
+            self._disk_bytes = self._scan_disk(path.parent)[0]
+        else:
+            # Overwriting an entry overestimates the size, which only brings the next scan forward
+            self._disk_bytes += written_bytes
+        if self._disk_bytes > self.max_disk_bytes:
+            self._enforce_disk_limit()
+
+    def _scan_disk(self, cache_dir: Path) -> Tuple[int, List[Tuple[float, int, Path]]]:
+        """Total size and modification time, size and path of each file of the disk tier."""
+        files = []
+        for file in cache_dir.glob(f"*{CACHE_FILE_SUFFIX}"):
+            try:
+                stat = file.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, file))
+        return sum(size for _, size, _ in files), files
+
+    def _enforce_disk_limit(self) -> None:
+        """Delete the oldest cache files until the disk tier is back under its size budget."""
+        if self.cache_dir is None:
+            return
+
+        total_bytes, files = self._scan_disk(self.cache_dir)
+        target_bytes = self.max_disk_bytes * DISK_EVICTION_TARGET
+        for _, size, file in sorted(files, key=lambda item: item[0]):
+            if total_bytes <= target_bytes:
+                break
+            file.unlink(missing_ok=True)
+            total_bytes -= size
+            metrics.increment(self._metric(EVICTIONS_METRIC), labels={"tier": TIER_DISK})
+        self._disk_bytes = total_bytes
+
+    def _clear_disk(self) -> None:
+        """Delete every file of the disk tier."""
+        if self.cache_dir is None or not self.cache_dir.exists():
+            return
+        for file in self.cache_dir.glob(f"*{CACHE_FILE_SUFFIX}"):
+            file.unlink(missing_ok=True)
+        self._disk_bytes = 0
@@ -0,0 +1,67 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Evaluation of a transcript in concurrent calls, one per group of fields of the evaluation schema."""
+
+from typing import Any, Dict, List, Tuple
+
+from src.config import config
+
+# Evaluation modes: one call for the whole schema, or concurrent calls per group of fields
+EVALUATION_MODE_KEY = "evaluationMode"
+EVALUATION_MODE_PARALLEL = "parallel"
+EVALUATION_GROUPS: Dict[str, Tuple[str, ...]] = {
+    "tone_style": ("speaking_tone_style",),
+    "content": ("conversation_content",),
+    "feedback": ("strengths", "improvements", "specific_feedback"),
+}
+EVALUATION_GROUP_INSTRUCTIONS = {
+    "tone_style": "Only score the SPEAKING TONE & STYLE dimensions.",
+    "content": "Only score the CONVERSATION CONTENT QUALITY dimensions.",
+    "feedback": "Only provide the strengths, areas of improvement and specific feedback.",
+}
+TONE_STYLE_DIMENSIONS = ("professional_tone", "active_listening", "engagement_quality")
+CONTENT_DIMENSIONS = ("needs_assessment", "value_proposition", "objection_handling")
+
+# Feedback limits
+MAX_STRENGTHS_COUNT = 3
+MAX_IMPROVEMENTS_COUNT = 3
+
+
+def evaluation_mode(scenario: Dict[str, Any]) -> str:
+    """Get a scenario's evaluation mode, falling back to configuration."""
+    return str(scenario.get(EVALUATION_MODE_KEY, config["evaluation_mode"]))
+
+
+def group_transcript(transcript: str, group: str) -> str:
+    """
+    Append a group's instruction to the transcript.
+
+    The instruction follows the transcript so all groups share the rubric and transcript as a
+    cacheable prefix.
+    """
+    return f"{transcript}\n\n        {EVALUATION_GROUP_INSTRUCTIONS[group]}"
+
+
+def group_response_format(response_format: Dict[str, Any], group: str) -> Dict[str, Any]:
+    """Narrow a fresh copy of the full structured response format to one group of fields."""
+    json_schema = response_format["json_schema"]
+    json_schema["name"] = f"sales_evaluation_{group}"
+    schema = json_schema["schema"]
+    schema["properties"] = {field: schema["properties"][field] for field in EVALUATION_GROUPS[group]}
+    schema["required"] = list(EVALUATION_GROUPS[group])
+    return response_format
+
+
+def merge_evaluation_parts(parts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge the outputs of an evaluation's group calls into one result of the full schema."""
+    merged: Dict[str, Any] = {}
+    for part in parts:
+        merged.update(part)
+    if "overall_score" not in merged:
+        merged["overall_score"] = sum(merged["speaking_tone_style"][field] for field in TONE_STYLE_DIMENSIONS) + sum(
+            merged["conversation_content"][field] for field in CONTENT_DIMENSIONS
+        )
+    return merged
@@ -0,0 +1,197 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Incremental parsing of streamed structured evaluation output into assessment events."""
+
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+# Event types
+EVENT_SCORE = "score"
+EVENT_OVERALL_SCORE = "overall_score"
+EVENT_STRENGTH = "strength"
+EVENT_IMPROVEMENT = "improvement"
+EVENT_SPECIFIC_FEEDBACK = "specific_feedback"
+EVENT_AI_ASSESSMENT = "ai_assessment"
+EVENT_PRONUNCIATION_ASSESSMENT = "pronunciation_assessment"
+EVENT_CONVERSATION_METRICS = "conversation_metrics"
+EVENT_ACOUSTIC_ANALYTICS = "acoustic_analytics"
+EVENT_ERROR = "error"
+EVENT_DONE = "done"
+
+SCORE_SECTIONS = ("speaking_tone_style", "conversation_content")
+LIST_EVENTS = {"strengths": EVENT_STRENGTH, "improvements": EVENT_IMPROVEMENT}
+TOTAL_FIELD = "total"
+
+JsonPath = Tuple[Union[str, int], ...]
+
+_LITERALS = {"true": True, "false": False, "null": None}
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class _Container:
+    """An open object or array on the parser stack."""
+
+    def __init__(self, is_object: bool):
+        self.is_object = is_object
+        self.key: Optional[str] = None
+        self.index = 0
+        self.expect_key = is_object
+
+    @property
+    def position(self) -> Union[str, int]:
+        """Key of the current member of an object, or index of the current element of an array."""
+        if not self.is_object:
+            return self.index
+        # A member value is only parsed once its key is complete
+        return self.key if self.key is not None else ""
+
+
+class IncrementalJsonParser:
+    """
+    Parses a JSON document fed in arbitrary text chunks.
+
+    Every scalar value is reported together with its path as soon as its last character has
+    arrived, so consumers can act on fields long before the document is complete.
+    """
+
+    def __init__(self):
+        """Initialize the parser."""
+        self._stack: List[_Container] = []
+        self._string: Optional[List[str]] = None
+        self._escape: Optional[str] = None
+        self._literal = ""
+
+    def feed(self, chunk: str) -> List[Tuple[JsonPath, Any]]:
+        """
+        Feed the next chunk of text.
+
+        Returns:
+            List[Tuple[JsonPath, Any]]: Scalar values completed by this chunk with their paths
+        """
+        completed: List[Tuple[JsonPath, Any]] = []
+        for char in chunk:
+            if self._string is not None:
+                self._consume_string_char(char, self._string, completed)
+            elif self._literal and (char.isalnum() or char in "+-."):
+                self._literal += char
+            else:
+                self._finish_literal(completed)
+                self._consume_structural_char(char)
+        return completed
+
+    def _consume_string_char(self, char: str, buffer: List[str], completed: List[Tuple[JsonPath, Any]]) -> None:
+        """Consume one character inside a string literal."""
+        if self._escape is not None:
+            self._escape += char
+            if self._escape[0] != "u":
+                buffer.append(_ESCAPES.get(self._escape, self._escape))
+                self._escape = None
+            elif len(self._escape) == 5:
+                buffer.append(chr(int(self._escape[1:], 16)))
+                self._escape = None
+        elif char == "\\":
+            self._escape = ""
+        elif char == '"':
+            self._string = None
+            self._complete_value("".join(buffer), completed, is_key_candidate=True)
+        else:
+            buffer.append(char)
+
+    def _consume_structural_char(self, char: str) -> None:
+        """Consume one character outside of strings and literals."""
+        if char in "{[":
+            self._stack.append(_Container(is_object=char == "{"))
+        elif char in "}]":
+            if self._stack:
+                self._stack.pop()
+                self._advance_parent()
+        elif char == '"':
+            self._string = []
+        elif char == ",":
+            if self._stack and not self._stack[-1].is_object:
+                self._stack[-1].index += 1
+        elif char == ":":
+            if self._stack:
+                self._stack[-1].expect_key = False
+        elif not char.isspace():
+            self._literal = char
+
+    def _finish_literal(self, completed: List[Tuple[JsonPath, Any]]) -> None:
+        """Complete a pending number or true/false/null literal."""
+        if not self._literal:
+            return
+        text, self._literal = self._literal, ""
+        if text in _LITERALS:
+            self._complete_value(_LITERALS[text], completed)
+            return
+        try:
+            self._complete_value(json.loads(text), completed)
+        except ValueError:
+            pass
+
+    def _complete_value(
+        self, value: Any, completed: List[Tuple[JsonPath, Any]], is_key_candidate: bool = False
+    ) -> None:
+        """Record a completed scalar, or the key of the next object member."""
+        container = self._stack[-1] if self._stack else None
+        if container is not None and container.is_object and container.expect_key and is_key_candidate:
+            container.key = value
+            return
+        completed.append((self._path(), value))
+        self._advance_parent()
+
+    def _advance_parent(self) -> None:
+        """Prepare the enclosing object for its next key once a member value is complete."""
+        if self._stack and self._stack[-1].is_object:
+            self._stack[-1].expect_key = True
+
+    def _path(self) -> JsonPath:
+        """Path of the value currently being parsed."""
+        return tuple(container.position for container in self._stack)
+
+
+class EvaluationStreamParser:
+    """Turns streamed evaluation JSON text into incremental assessment events."""
+
+    def __init__(self):
+        """Initialize the evaluation stream parser."""
+        self._parser = IncrementalJsonParser()
+        self._chunks: List[str] = []
+
+    @property
+    def text(self) -> str:
+        """All text received so far."""
+        return "".join(self._chunks)
+
+    def feed(self, chunk: str) -> Iterator[Dict[str, Any]]:
+        """Feed a chunk of model output and yield the assessment events it completes."""
+        self._chunks.append(chunk)
+        for path, value in self._parser.feed(chunk):
+            event = evaluation_event(path, value)
+            if event:
+                yield event
+
+
+def evaluation_event(path: JsonPath, value: Any) -> Optional[Dict[str, Any]]:
+    """
+    Map a completed value of the evaluation schema to an assessment event.
+
+    Section totals are omitted because they are recomputed from the dimension scores.
+    """
+    if len(path) == 2 and path[0] in SCORE_SECTIONS and path[1] != TOTAL_FIELD:
+        return {"type": EVENT_SCORE, "section": path[0], "field": path[1], "value": value}
+    if len(path) == 2 and path[0] in LIST_EVENTS:
+        return {"type": LIST_EVENTS[str(path[0])], "index": path[1], "value": value}
+    if path == (EVENT_OVERALL_SCORE,):
+        return {"type": EVENT_OVERALL_SCORE, "value": value}
+    if path == (EVENT_SPECIFIC_FEEDBACK,):
+        return {"type": EVENT_SPECIFIC_FEEDBACK, "value": value}
+    return None
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Format an assessment event as a Server-Sent Events message."""
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
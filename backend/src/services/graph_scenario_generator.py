@@ -6,42 +6,37 @@
 """Graph API scenario generation service."""
 
 import logging
-from typing import Dict, Any, Optional, List
-
-from openai import AzureOpenAI
+import time
+from typing import Dict, Any, List, Optional
 
 from src.config import config
+from src.services.metrics import metrics
+from src.services.model_call_guard import CircuitOpenError, ModelCallGuard, model_call_guard
+from src.services.model_router import ModelRouter
+from src.services.openai_clients import openai_clients
+from src.services.token_budget import estimate_tokens
 
 logger = logging.getLogger(__name__)
 
+# Metrics
+GENERATION_LATENCY_METRIC = "scenario_generation_ms"
+
 
 class GraphScenarioGenerator:
     """Generates training scenarios based on Microsoft Graph API data."""
 
-    def __init__(self):
-        """Initialize the Graph scenario generator."""
-        self.openai_client = self._initialize_openai_client()
-
-    def _initialize_openai_client(self) -> Optional[AzureOpenAI]:
-        """Initialize the Azure OpenAI client for scenario generation."""
-        try:
-            endpoint = config["azure_openai_endpoint"]
-            api_key = config["azure_openai_api_key"]
-
-            if not endpoint or not api_key:
-                logger.warning("Azure OpenAI not configured for scenario generation")
-                return None
+    def __init__(self, model_router: Optional[ModelRouter] = None, call_guard: Optional[ModelCallGuard] = None):
+        """
+        Initialize the scenario generator.
 
-            return AzureOpenAI(
-                api_version=config["api_version"],
-                azure_endpoint=endpoint,
-                api_key=api_key,
-            )
-        except Exception as e:
-            logger.error("Failed to initialize OpenAI client for scenarios: %s", e)
-            return None
+        Args:
+            model_router: Router that picks the model tier of each generation, built from configuration if omitted
+            call_guard: Concurrency limiter, retries and circuit breaker of model calls, shared by default
+        """
+        self.model_router = model_router or ModelRouter.from_config()
+        self.call_guard = call_guard or model_call_guard
 
-    def generate_scenario_from_graph(self, graph_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def generate_scenario_from_graph(self, graph_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate a scenario based on Microsoft Graph API data.
 
@@ -58,7 +53,7 @@ class GraphScenarioGenerator:
                 attendees = [attendee["emailAddress"]["name"] for attendee in event.get("attendees", [])[:3]]
                 meetings.append({"subject": subject, "attendees": attendees})
 
-        scenario_content = self._create_graph_scenario_content(meetings)
+        scenario_content = await self._create_graph_scenario_content(meetings)
 
         first_sentence = scenario_content.split(".")[0] + "."
         if len(first_sentence) > 100:
@@ -78,32 +73,44 @@ class GraphScenarioGenerator:
         """Format the list of meetings for display."""
         return "\n".join(f"- {meeting['subject']} with {', '.join(meeting['attendees'][:3])}" for meeting in meetings)
 
-    def _create_graph_scenario_content(self, meetings: List[Dict[str, Any]]) -> str:
+    async def _create_graph_scenario_content(self, meetings: List[Dict[str, Any]]) -> str:
         """Create scenario content based on meetings using OpenAI."""
         if not meetings:
             return self._get_fallback_scenario_content()
 
-        if not self.openai_client:
+        openai_client = openai_clients.get_client()
+        if not openai_client:
             logger.warning("OpenAI client not available, using fallback scenario")
             return self._get_fallback_scenario_content()
 
         prompt = self._build_scenario_generation_prompt(meetings)
+        tier, _ = self.model_router.route(estimate_tokens(self._format_meeting_list(meetings)))
+        tier = self.model_router.serving_tier(tier)
 
-        response = self.openai_client.chat.completions.create(
-            model=config["model_deployment_name"],
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are an expert at creating realistic business role-play scenarios for sales training. "
-                        "Generate engaging, professional scenarios that help salespeople prepare for real meetings."
-                    ),
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.7,
-            max_tokens=1500,
-        )
+        start_time = time.perf_counter()
+        try:
+            response = await self.call_guard.call(
+                lambda: openai_client.chat.completions.create(
+                    model=self.model_router.deployment_for(tier),
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": (
+                                "You are an expert at creating realistic business role-play scenarios for sales "
+                                "training. Generate engaging, professional scenarios that help salespeople prepare "
+                                "for real meetings."
+                            ),
+                        },
+                        {"role": "user", "content": prompt},
+                    ],
+                    temperature=0.7,
+                    max_tokens=1500,
+                )
+            )
+        except CircuitOpenError:
+            logger.warning("Model calls are failing, using fallback scenario")
+            return self._get_fallback_scenario_content()
+        metrics.observe(GENERATION_LATENCY_METRIC, (time.perf_counter() - start_time) * 1000, labels={"tier": tier})
 
         content = response.choices[0].message.content
         generated_content = content.strip() if content is not None else ""
@@ -0,0 +1,190 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Incremental evaluation of live voice sessions while the conversation happens."""
+
+import asyncio
+import copy
+import logging
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+from src.services.analyzers import RUNNING_NOTES_FIELD, ConversationAnalyzer
+from src.services.live_sessions import evict_sessions
+from src.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Turn roles
+ROLE_USER = "user"
+ROLE_ASSISTANT = "assistant"
+
+# Metrics
+UPDATE_LATENCY_METRIC = "incremental_evaluation_update_ms"
+UPDATE_FAILURES_METRIC = "incremental_evaluation_update_failures"
+SESSIONS_GAUGE = "incremental_evaluation_sessions"
+
+
+class _LiveSession:
+    """Running evaluation state of one voice session."""
+
+    def __init__(self, scenario_id: str):
+        self.scenario_id = scenario_id
+        self.pending_turns: List[str] = []
+        self.pending_user_turns = 0
+        self.running_evaluation: Optional[Dict[str, Any]] = None
+        self.update_task: Optional["asyncio.Task[None]"] = None
+        self.last_activity = time.monotonic()
+        self.ended = False
+
+
+class IncrementalEvaluator:
+    """
+    Keeps a running evaluation of each live voice session up to date, one user turn at a time.
+
+    The voice proxy reports completed turns from its connection thread. Session state lives on the
+    analysis event loop, so turns are handed over with call_soon_threadsafe and at most one model
+    call per session is in flight; turns completed meanwhile are batched into the next update. When
+    the session ends, consolidation only has to fold in the turns not covered yet, which usually
+    means returning the running evaluation without another model call.
+    """
+
+    def __init__(
+        self,
+        analyzer: ConversationAnalyzer,
+        loop_provider: Callable[[], asyncio.AbstractEventLoop],
+        enabled: bool = True,
+        max_sessions: int = 100,
+        session_ttl_seconds: float = 3600.0,
+    ):
+        """
+        Initialize the incremental evaluator.
+
+        Args:
+            analyzer: Analyzer used for running evaluation updates
+            loop_provider: Returns the event loop that owns session state and model calls
+            enabled: Whether live sessions are evaluated incrementally
+            max_sessions: Maximum sessions tracked at once, least recently active are dropped first
+            session_ttl_seconds: Idle time after which a session is forgotten
+        """
+        self.analyzer = analyzer
+        self.loop_provider = loop_provider
+        self.enabled = enabled
+        self.max_sessions = max_sessions
+        self.session_ttl_seconds = session_ttl_seconds
+        self._sessions: Dict[str, _LiveSession] = {}
+
+    def start_session(self, scenario_id: Optional[str]) -> Optional[str]:
+        """
+        Start tracking a live session. Safe to call from any thread.
+
+        Returns:
+            Optional[str]: The session ID, or None if the scenario has no evaluation or the
+            evaluator is disabled
+        """
+        if not self.enabled or not scenario_id or scenario_id not in self.analyzer.evaluation_scenarios:
+            return None
+
+        session_id = uuid.uuid4().hex
+        self.loop_provider().call_soon_threadsafe(self._start_session, session_id, scenario_id)
+        logger.info("Started incremental evaluation session %s for scenario %s", session_id, scenario_id)
+        return session_id
+
+    def record_turn(self, session_id: str, role: str, text: str) -> None:
+        """Record a completed turn; user turns trigger a running evaluation update. Safe to call from any thread."""
+        self.loop_provider().call_soon_threadsafe(self._record_turn, session_id, role, text)
+
+    def end_session(self, session_id: str) -> None:
+        """Mark a session as ended and start consolidating it right away. Safe to call from any thread."""
+        self.loop_provider().call_soon_threadsafe(self._end_session, session_id)
+
+    async def consolidate(self, session_id: str, scenario_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the final evaluation of a session. Must run on the evaluator's event loop.
+
+        Args:
+            session_id: The live session identifier
+            scenario_id: The scenario the caller expects the session to belong to
+
+        Returns:
+            Optional[Dict[str, Any]]: The evaluation, or None if the session is unknown or its
+            running evaluation could not be brought up to date
+        """
+        session = self._sessions.get(session_id)
+        if session is None or session.scenario_id != scenario_id:
+            logger.info("No incremental evaluation available for session %s", session_id)
+            return None
+
+        self._end_session(session_id)
+        if session.update_task is not None:
+            await asyncio.shield(session.update_task)
+
+        if session.running_evaluation is None or session.pending_user_turns:
+            logger.warning("Incremental evaluation of session %s is incomplete", session_id)
+            return None
+
+        evaluation = copy.deepcopy(session.running_evaluation)
+        evaluation.pop(RUNNING_NOTES_FIELD, None)
+        return evaluation
+
+    def _start_session(self, session_id: str, scenario_id: str) -> None:
+        """Register a new session, dropping expired and excess ones."""
+        self._sessions[session_id] = _LiveSession(scenario_id)
+        self._prune_sessions()
+
+    def _record_turn(self, session_id: str, role: str, text: str) -> None:
+        """Queue a completed turn for the next running evaluation update."""
+        session = self._sessions.get(session_id)
+        if session is None or session.ended:
+            return
+
+        session.pending_turns.append(f"{role}: {text}")
+        session.last_activity = time.monotonic()
+        if role == ROLE_USER:
+            session.pending_user_turns += 1
+            self._schedule_update(session)
+
+    def _end_session(self, session_id: str) -> None:
+        """Stop accepting turns and fold in any that are still pending."""
+        session = self._sessions.get(session_id)
+        if session is None or session.ended:
+            return
+
+        session.ended = True
+        session.last_activity = time.monotonic()
+        self._schedule_update(session)
+
+    def _schedule_update(self, session: _LiveSession) -> None:
+        """Start an update task unless one is already running or nothing new needs evaluating."""
+        if session.pending_user_turns and (session.update_task is None or session.update_task.done()):
+            session.update_task = asyncio.ensure_future(self._run_updates(session))
+
+    async def _run_updates(self, session: _LiveSession) -> None:
+        """Apply pending turns to the running evaluation until none are left."""
+        while session.pending_user_turns:
+            turn_count, user_turn_count = len(session.pending_turns), session.pending_user_turns
+            new_turns = "\n".join(session.pending_turns)
+            session.pending_user_turns = 0
+
+            start_time = time.perf_counter()
+            result = await self.analyzer.update_running_evaluation(
+                session.scenario_id, session.running_evaluation, new_turns
+            )
+            metrics.observe(UPDATE_LATENCY_METRIC, (time.perf_counter() - start_time) * 1000)
+
+            if result is None:
+                metrics.increment(UPDATE_FAILURES_METRIC)
+                session.pending_user_turns += user_turn_count
+                return
+
+            session.running_evaluation = result
+            del session.pending_turns[:turn_count]
+
+    def _prune_sessions(self) -> None:
+        """Forget idle sessions past the TTL and the least recently active ones over capacity."""
+        for session in evict_sessions(self._sessions, self.max_sessions, self.session_ttl_seconds, SESSIONS_GAUGE):
+            if session.update_task is not None:
+                session.update_task.cancel()
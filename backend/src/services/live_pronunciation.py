@@ -0,0 +1,280 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Pronunciation assessment of live voice sessions, one user turn at a time."""
+
+import asyncio
+import base64
+import binascii
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from src.services.audio_segmentation import SpeechSegment
+from src.services.live_sessions import evict_sessions
+from src.services.metrics import metrics
+from src.services.pronunciation_assessment import AUDIO_SAMPLE_RATE, AUDIO_SAMPLE_WIDTH, PronunciationAssessor
+
+logger = logging.getLogger(__name__)
+
+# Voice Live events that delimit user turns
+SPEECH_STARTED_TYPE = "input_audio_buffer.speech_started"
+SPEECH_STOPPED_TYPE = "input_audio_buffer.speech_stopped"
+INPUT_TRANSCRIPTION_COMPLETED_TYPE = "conversation.item.input_audio_transcription.completed"
+INPUT_TRANSCRIPTION_FAILED_TYPE = "conversation.item.input_audio_transcription.failed"
+TURN_EVENT_TYPES = frozenset(
+    (SPEECH_STARTED_TYPE, SPEECH_STOPPED_TYPE, INPUT_TRANSCRIPTION_COMPLETED_TYPE, INPUT_TRANSCRIPTION_FAILED_TYPE)
+)
+
+# Audio kept before the earliest turn still waiting for its transcript, for speech the server
+# detects after it started
+AUDIO_RETENTION_SECONDS = 5.0
+# Turns still without a transcript this long after they ended are given up on
+STALE_TURN_SECONDS = 30.0
+BYTES_PER_MS = AUDIO_SAMPLE_RATE * AUDIO_SAMPLE_WIDTH // 1000
+
+# Metrics
+TURN_LATENCY_METRIC = "live_pronunciation_turn_ms"
+TURN_FAILURES_METRIC = "live_pronunciation_turn_failures"
+SESSIONS_GAUGE = "live_pronunciation_sessions"
+
+
+class _LiveTurn:
+    """A user turn, from the server's speech detection to its pronunciation result."""
+
+    def __init__(self, item_id: str, start: int):
+        self.item_id = item_id
+        self.start = start
+        self.end: Optional[int] = None
+        self.text: Optional[str] = None
+        self.task: Optional["asyncio.Task[None]"] = None
+        self.result: Optional[Dict[str, Any]] = None
+
+
+class _LiveSession:
+    """Captured audio and turns of one voice session."""
+
+    def __init__(self):
+        self.audio = bytearray()
+        self.audio_offset = 0
+        self.pending: Dict[str, _LiveTurn] = {}
+        self.turns: List[_LiveTurn] = []
+        self.last_activity = time.monotonic()
+        self.ended = False
+
+    @property
+    def audio_end(self) -> int:
+        """Position just past the captured audio, counted from the start of the session."""
+        return self.audio_offset + len(self.audio)
+
+
+class LivePronunciationAssessor:
+    """
+    Assesses the pronunciation of each user turn of a live voice session as soon as it ends.
+
+    The voice proxy reports the user's audio and the server's turn events from its connection
+    thread. Session state lives on the analysis event loop, so they are handed over with
+    call_soon_threadsafe. A turn is cut from the captured audio at the offsets of its speech
+    started and stopped events and assessed once its transcript arrives, with the transcript as
+    reference text. Audio no longer needed by any turn is dropped. When the session is analyzed,
+    the final report only has to combine the turn results.
+    """
+
+    def __init__(
+        self,
+        assessor: PronunciationAssessor,
+        loop_provider: Callable[[], asyncio.AbstractEventLoop],
+        enabled: bool = True,
+        max_sessions: int = 100,
+        session_ttl_seconds: float = 3600.0,
+        on_turn_assessed: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    ):
+        """
+        Initialize the live pronunciation assessor.
+
+        Args:
+            assessor: Assessor used for each turn
+            loop_provider: Returns the event loop that owns session state and assessments
+            enabled: Whether live sessions are assessed turn by turn
+            max_sessions: Maximum sessions tracked at once, least recently active are dropped first
+            session_ttl_seconds: Idle time after which a session is forgotten
+            on_turn_assessed: Called on the loop with the session ID and each turn's result
+        """
+        self.assessor = assessor
+        self.loop_provider = loop_provider
+        self.enabled = enabled
+        self.max_sessions = max_sessions
+        self.session_ttl_seconds = session_ttl_seconds
+        self.on_turn_assessed = on_turn_assessed
+        self._sessions: Dict[str, _LiveSession] = {}
+
+    def start_session(self, session_id: str) -> bool:
+        """
+        Start capturing a live session. Safe to call from any thread.
+
+        Returns:
+            bool: Whether the session is assessed live
+        """
+        if not self.enabled:
+            return False
+        self.loop_provider().call_soon_threadsafe(self._start_session, session_id)
+        return True
+
+    def record_audio(self, session_id: str, audio: Any) -> None:
+        """
+        Record a base64 chunk of the user's audio. Safe to call from any thread.
+
+        The chunk is decoded on the assessor's loop, keeping the work off the proxy's forwarding path.
+        """
+        self.loop_provider().call_soon_threadsafe(self._record_audio, session_id, audio)
+
+    def record_event(self, session_id: str, event: Dict[str, Any]) -> None:
+        """Record a server event; only turn events are kept. Safe to call from any thread."""
+        if event.get("type") in TURN_EVENT_TYPES:
+            self.loop_provider().call_soon_threadsafe(self._record_event, session_id, event)
+
+    def end_session(self, session_id: str) -> None:
+        """Stop capturing a session; its turns are still assessed. Safe to call from any thread."""
+        self.loop_provider().call_soon_threadsafe(self._end_session, session_id)
+
+    async def consolidate(self, session_id: str, user_turn_count: int) -> Optional[Dict[str, Any]]:
+        """
+        Get the pronunciation assessment of a session. Must run on the assessor's event loop.
+
+        Args:
+            session_id: The live session identifier
+            user_turn_count: User turns in the transcript being analyzed
+
+        Returns:
+            Optional[Dict[str, Any]]: The turn results merged like segment results, or None if the
+            session is unknown or fewer turns than the transcript has were assessed
+        """
+        session = self._sessions.get(session_id)
+        if session is None:
+            logger.info("No live pronunciation assessment available for session %s", session_id)
+            return None
+
+        self._end_session(session_id)
+        tasks = [turn.task for turn in session.turns if turn.task is not None]
+        if tasks:
+            await asyncio.gather(*(asyncio.shield(task) for task in tasks), return_exceptions=True)
+
+        assessed = [turn for turn in session.turns if turn.result is not None]
+        if not assessed or len(assessed) < user_turn_count:
+            logger.warning(
+                "Live pronunciation assessment of session %s is incomplete: %s of %s turns",
+                session_id,
+                len(assessed),
+                user_turn_count,
+            )
+            return None
+
+        segments = [
+            SpeechSegment(turn.start, turn.end or turn.start, index, turn.text, AUDIO_SAMPLE_RATE)
+            for index, turn in enumerate(assessed)
+        ]
+        return self.assessor.merge_segment_results(
+            segments, [turn.result for turn in assessed], [turn.text or "" for turn in assessed]
+        )
+
+    def _start_session(self, session_id: str) -> None:
+        """Register a new session, dropping expired and excess ones."""
+        self._sessions[session_id] = _LiveSession()
+        self._prune_sessions()
+
+    def _record_audio(self, session_id: str, audio: Any) -> None:
+        """Decode a base64 audio chunk and append it to the session's capture."""
+        session = self._sessions.get(session_id)
+        if session is None or session.ended:
+            return
+        try:
+            session.audio += base64.b64decode(audio)
+        except (binascii.Error, TypeError, ValueError) as e:
+            logger.error("Error decoding live audio chunk: %s", e)
+            return
+        session.last_activity = time.monotonic()
+
+    def _record_event(self, session_id: str, event: Dict[str, Any]) -> None:
+        """Track a turn through its speech and transcription events."""
+        session = self._sessions.get(session_id)
+        item_id = event.get("item_id")
+        if session is None or session.ended or not item_id:
+            return
+
+        event_type = event.get("type")
+        if event_type == SPEECH_STARTED_TYPE:
+            session.pending[item_id] = _LiveTurn(item_id, _to_bytes(event.get("audio_start_ms")))
+        elif event_type == INPUT_TRANSCRIPTION_FAILED_TYPE:
+            session.pending.pop(item_id, None)
+        elif item_id in session.pending:
+            turn = session.pending[item_id]
+            if event_type == SPEECH_STOPPED_TYPE:
+                turn.end = _to_bytes(event.get("audio_end_ms"))
+            else:
+                turn.text = str(event.get("transcript") or "").strip()
+                if not turn.text:
+                    session.pending.pop(item_id)
+            if turn.end is not None and turn.text:
+                self._schedule_turn(session_id, session, session.pending.pop(item_id))
+
+        self._trim_audio(session)
+
+    def _schedule_turn(self, session_id: str, session: _LiveSession, turn: _LiveTurn) -> None:
+        """Cut the turn's audio from the capture and start assessing it."""
+        audio = session.audio[max(0, turn.start - session.audio_offset) : max(0, turn.end - session.audio_offset)]
+        if not audio:
+            logger.warning("No captured audio for turn %s of session %s", turn.item_id, session_id)
+            return
+        session.turns.append(turn)
+        turn.task = asyncio.ensure_future(self._assess_turn(session_id, turn, len(session.turns) - 1, audio))
+
+    async def _assess_turn(self, session_id: str, turn: _LiveTurn, index: int, audio: bytearray) -> None:
+        """Assess one turn and report its result."""
+        start_time = time.perf_counter()
+        turn.result = await self.assessor.assess_pronunciation(audio, turn.text, [turn.text or ""])
+        metrics.observe(TURN_LATENCY_METRIC, (time.perf_counter() - start_time) * 1000)
+        if turn.result is None:
+            metrics.increment(TURN_FAILURES_METRIC)
+            return
+        if self.on_turn_assessed is not None:
+            self.on_turn_assessed(session_id, {"turn": index, "item_id": turn.item_id, "assessment": turn.result})
+
+    def _trim_audio(self, session: _LiveSession) -> None:
+        """Drop stale turns and the audio before every turn still waiting for its transcript."""
+        stale_before = session.audio_end - int(STALE_TURN_SECONDS * 1000) * BYTES_PER_MS
+        for item_id, turn in list(session.pending.items()):
+            if turn.end is not None and turn.end < stale_before:
+                del session.pending[item_id]
+
+        keep_from = session.audio_end - int(AUDIO_RETENTION_SECONDS * 1000) * BYTES_PER_MS
+        keep_from = min([keep_from] + [turn.start for turn in session.pending.values()])
+        if keep_from > session.audio_offset:
+            del session.audio[: keep_from - session.audio_offset]
+            session.audio_offset = keep_from
+
+    def _end_session(self, session_id: str) -> None:
+        """Stop capturing audio and release it."""
+        session = self._sessions.get(session_id)
+        if session is None or session.ended:
+            return
+        session.ended = True
+        session.pending.clear()
+        session.audio = bytearray()
+        session.last_activity = time.monotonic()
+
+    def _prune_sessions(self) -> None:
+        """Forget idle sessions past the TTL and the least recently active ones over capacity."""
+        for session in evict_sessions(self._sessions, self.max_sessions, self.session_ttl_seconds, SESSIONS_GAUGE):
+            for turn in session.turns:
+                if turn.task is not None:
+                    turn.task.cancel()
+
+
+def _to_bytes(milliseconds: Any) -> int:
+    """Convert an audio offset in milliseconds to a byte offset in the captured PCM."""
+    try:
+        return max(0, int(float(milliseconds) * BYTES_PER_MS) // AUDIO_SAMPLE_WIDTH * AUDIO_SAMPLE_WIDTH)
+    except (TypeError, ValueError):
+        return 0
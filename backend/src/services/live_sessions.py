@@ -0,0 +1,47 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Bounded tracking of live voice session state."""
+
+import time
+from typing import Dict, List, Protocol, TypeVar
+
+from src.services.metrics import metrics
+
+
+class TrackedSession(Protocol):
+    """Session state that records when the session was last active."""
+
+    last_activity: float
+
+
+SessionT = TypeVar("SessionT", bound=TrackedSession)
+
+
+def evict_sessions(
+    sessions: Dict[str, SessionT], max_sessions: int, session_ttl_seconds: float, gauge: str
+) -> List[SessionT]:
+    """
+    Forget idle sessions past the TTL and the least recently active ones over capacity.
+
+    Args:
+        sessions: Sessions by ID, evicted sessions are removed from it
+        max_sessions: Maximum sessions kept
+        session_ttl_seconds: Idle time after which a session is forgotten
+        gauge: Metric set to the number of sessions kept
+
+    Returns:
+        List[SessionT]: The evicted sessions, for the caller to cancel their work
+    """
+    now = time.monotonic()
+    by_activity = sorted(sessions.items(), key=lambda item: item[1].last_activity)
+    excess = len(by_activity) - max_sessions
+    evicted = []
+    for index, (session_id, session) in enumerate(by_activity):
+        if index < excess or now - session.last_activity > session_ttl_seconds:
+            evicted.append(session)
+            del sessions[session_id]
+    metrics.set_gauge(gauge, len(sessions))
+    return evicted
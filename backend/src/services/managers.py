@@ -9,7 +9,7 @@ import logging
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, cast
 
 import yaml
 from azure.ai.projects import AIProjectClient
@@ -17,6 +17,7 @@ from azure.identity import DefaultAzureCredential
 
 from src.config import config
 from src.services.graph_scenario_generator import GraphScenarioGenerator
+from src.services.providers import SERVICE_AGENT, FakeBackend, FakeProjectClient, is_fake
 from src.services.scenario_utils import determine_scenario_directory
 
 # Constants
@@ -126,7 +127,7 @@ class ScenarioManager:
 
         return scenarios
 
-    def generate_scenario_from_graph(self, graph_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def generate_scenario_from_graph(self, graph_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate a scenario based on Microsoft Graph API data.
 
@@ -136,7 +137,7 @@ class ScenarioManager:
         Returns:
             Dict[str, Any]: Generated scenario
         """
-        scenario = self.graph_generator.generate_scenario_from_graph(graph_data)
+        scenario = await self.graph_generator.generate_scenario_from_graph(graph_data)
 
         self.generated_scenarios[scenario["id"]] = scenario
 
@@ -164,7 +165,7 @@ CRITICAL INTERACTION GUIDELINES:
         """Initialize the agent manager."""
         self.agents: Dict[str, Dict[str, Any]] = {}
         self.credential = DefaultAzureCredential()
-        self.use_azure_ai_agents = config["use_azure_ai_agents"]
+        self.use_azure_ai_agents = config["use_azure_ai_agents"] or is_fake(SERVICE_AGENT)
         self.project_client = self._initialize_project_client()
         self._log_initialization_status()
 
@@ -176,7 +177,11 @@ CRITICAL INTERACTION GUIDELINES:
             logger.info("AgentManager initialized with instruction-based approach only")
 
     def _initialize_project_client(self) -> Optional[AIProjectClient]:
-        """Initialize the Azure AI Project client."""
+        """Initialize the Azure AI Project client, or its local fake with AGENT_PROVIDER=fake."""
+        if is_fake(SERVICE_AGENT):
+            logger.info("Using fake AI agent service")
+            return cast(AIProjectClient, FakeProjectClient(FakeBackend.from_config(SERVICE_AGENT)))
+
         try:
             project_endpoint = config["project_endpoint"]
             if not project_endpoint:
@@ -0,0 +1,143 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""In-process metrics collection for latency and throughput reporting."""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+# Constants
+DEFAULT_MAX_SAMPLES = 1024
+REPORTED_PERCENTILES = (50, 90, 99)
+
+
+def _metric_key(name: str, labels: Optional[Dict[str, Any]] = None) -> str:
+    """Build a metric key from a name and optional labels."""
+    if not labels:
+        return name
+    label_text = ",".join(f"{key}={labels[key]}" for key in sorted(labels))
+    return f"{name}{{{label_text}}}"
+
+
+def _percentile(sorted_samples: List[float], percentile: float) -> float:
+    """Return the nearest-rank percentile of pre-sorted samples."""
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, max(0, int(round(percentile / 100 * len(sorted_samples))) - 1))
+    return sorted_samples[index]
+
+
+class _Histogram:
+    """Bounded sample window with running totals."""
+
+    def __init__(self, max_samples: int):
+        self.samples: Deque[float] = deque(maxlen=max_samples)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        self.samples.append(value)
+        self.count += 1
+        self.total += value
+        self.maximum = max(self.maximum, value)
+
+    def summary(self) -> Dict[str, float]:
+        """Count, sum, average, maximum and percentiles of the observations."""
+        ordered = sorted(self.samples)
+        result: Dict[str, float] = {
+            "count": self.count,
+            "sum": round(self.total, 3),
+            "avg": round(self.total / self.count, 3) if self.count else 0.0,
+            "max": round(self.maximum, 3),
+        }
+        for percentile in REPORTED_PERCENTILES:
+            result[f"p{percentile}"] = round(_percentile(ordered, percentile), 3)
+        return result
+
+
+class MetricsRegistry:
+    """Thread-safe registry of counters, gauges and histograms."""
+
+    def __init__(self, max_samples: int = DEFAULT_MAX_SAMPLES):
+        """
+        Initialize the metrics registry.
+
+        Args:
+            max_samples: Number of recent samples kept per histogram for percentiles
+        """
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+        self._histograms: Dict[str, _Histogram] = {}
+
+    def increment(self, name: str, value: float = 1.0, labels: Optional[Dict[str, Any]] = None) -> None:
+        """Increment a counter."""
+        key = _metric_key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def set_gauge(self, name: str, value: float, labels: Optional[Dict[str, Any]] = None) -> None:
+        """Set a gauge to an absolute value."""
+        key = _metric_key(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, Any]] = None) -> None:
+        """Record a histogram sample."""
+        key = _metric_key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(self.max_samples)
+            histogram.observe(value)
+
+    def percentile(self, name: str, percentile: float, labels: Optional[Dict[str, Any]] = None) -> Optional[float]:
+        """
+        Get a percentile of a histogram's recent samples.
+
+        Returns:
+            Optional[float]: The percentile value or None if no samples were recorded
+        """
+        key = _metric_key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None or not histogram.samples:
+                return None
+            ordered = sorted(histogram.samples)
+        return _percentile(ordered, percentile)
+
+    @contextmanager
+    def timer(self, name: str, labels: Optional[Dict[str, Any]] = None) -> Iterator[None]:
+        """Record the duration of a block in milliseconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000, labels)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a point-in-time copy of all metrics."""
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "histograms": {key: histogram.summary() for key, histogram in self._histograms.items()},
+            }
+
+    def reset(self) -> None:
+        """Clear all recorded metrics."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,272 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Adaptive concurrency, deadline-bounded retries and circuit breaking around model calls."""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import openai
+
+from src.config import config
+from src.services.metrics import metrics
+from src.services.rate_limiter import AdaptiveConcurrencyLimiter
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Circuit states, exposed as the value of the circuit state gauge
+CIRCUIT_CLOSED = 0
+CIRCUIT_HALF_OPEN = 1
+CIRCUIT_OPEN = 2
+
+# Retry constants
+DEFAULT_BASE_DELAY_SECONDS = 0.5
+DEFAULT_MAX_DELAY_SECONDS = 8.0
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.InternalServerError, openai.APIConnectionError)
+
+# Metrics
+CIRCUIT_STATE_METRIC = "model_circuit_state"
+CIRCUIT_REJECTIONS_METRIC = "model_circuit_rejections"
+THROTTLED_CALLS_METRIC = "model_throttled_calls"
+RETRIES_METRIC = "model_call_retries"
+DEADLINE_EXCEEDED_METRIC = "model_call_deadline_exceeded"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of making a model call while the circuit is open."""
+
+
+class CircuitBreaker:  # pylint: disable=too-many-instance-attributes
+    """
+    Stops model calls after repeated failures and probes for recovery.
+
+    After `failure_threshold` consecutive failed calls the circuit opens and calls are rejected
+    without reaching the backend. Once `reset_timeout_seconds` have passed a single probe call is
+    let through; its success closes the circuit and its failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit, 0 to never open it
+            reset_timeout_seconds: Time the circuit stays open before a probe call
+            clock: Monotonic time source in seconds
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.clock = clock
+        self.state = CIRCUIT_CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        metrics.set_gauge(CIRCUIT_STATE_METRIC, self.state)
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead; while half-open only one probe is allowed at a time."""
+        with self._lock:
+            if self.state == CIRCUIT_OPEN and self.clock() - self._opened_at >= self.reset_timeout_seconds:
+                self._set_state(CIRCUIT_HALF_OPEN)
+            if self.state == CIRCUIT_CLOSED:
+                return True
+            if self.state == CIRCUIT_HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+        metrics.increment(CIRCUIT_REJECTIONS_METRIC)
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+            if self.state != CIRCUIT_CLOSED:
+                logger.info("Model circuit closed")
+                self._set_state(CIRCUIT_CLOSED)
+
+    def record_failure(self) -> None:
+        """Count a failed call and open the circuit once the threshold is reached or a probe fails."""
+        with self._lock:
+            self._consecutive_failures += 1
+            probe_failed = self.state == CIRCUIT_HALF_OPEN
+            self._probe_in_flight = False
+            if probe_failed or (0 < self.failure_threshold <= self._consecutive_failures):
+                if self.state != CIRCUIT_OPEN:
+                    logger.warning("Model circuit opened after %s failed calls", self._consecutive_failures)
+                self._opened_at = self.clock()
+                self._set_state(CIRCUIT_OPEN)
+
+    def abandon(self) -> None:
+        """Forget a call that was cancelled before its outcome was known, freeing the probe."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _set_state(self, state: int) -> None:
+        """Change state and expose it as a gauge. Called with the lock held."""
+        self.state = state
+        metrics.set_gauge(CIRCUIT_STATE_METRIC, state)
+
+
+class ModelCallGuard:
+    """
+    Wraps model calls with the adaptive limiter, retries within a deadline and the circuit breaker.
+
+    Throttled (429), server and connection errors are retried after the server's retry-after hint,
+    or a full-jitter exponential backoff without one, as long as the deadline allows. Only
+    throttling shrinks the concurrency limit. Other errors, such as invalid requests, are raised
+    straight away. A call that runs out of retries counts as one failure of the circuit, an error
+    response from the backend counts as a success since the backend is up, and any other error
+    leaves the circuit as it was. This is the only retry layer of model calls: the deployment pool
+    routes each attempt but does not retry on its own.
+    """
+
+    def __init__(
+        self,
+        limiter: AdaptiveConcurrencyLimiter,
+        breaker: CircuitBreaker,
+        deadline_seconds: float,
+        base_delay_seconds: float = DEFAULT_BASE_DELAY_SECONDS,
+        max_delay_seconds: float = DEFAULT_MAX_DELAY_SECONDS,
+        rng: Optional[random.Random] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the guard.
+
+        Args:
+            limiter: Concurrency limiter shared by all guarded calls
+            breaker: Circuit breaker shared by all guarded calls
+            deadline_seconds: Default total time a call may take, retries included
+            base_delay_seconds: Backoff of the first retry without a retry-after hint
+            max_delay_seconds: Largest backoff between two retries
+            rng: Random source for backoff jitter
+            clock: Monotonic time source in seconds
+        """
+        self.limiter = limiter
+        self.breaker = breaker
+        self.deadline_seconds = deadline_seconds
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.rng = rng or random.Random()
+        self.clock = clock
+
+    @classmethod
+    def from_config(cls) -> "ModelCallGuard":
+        """Build the guard from configuration."""
+        limiter = AdaptiveConcurrencyLimiter(
+            config["model_concurrency_initial_limit"],
+            min_limit=config["model_concurrency_min_limit"],
+            max_limit=config["model_concurrency_max_limit"],
+        )
+        breaker = CircuitBreaker(config["circuit_breaker_failure_threshold"], config["circuit_breaker_reset_seconds"])
+        return cls(limiter, breaker, config["model_call_deadline_seconds"])
+
+    async def call(self, attempt: Callable[[], Awaitable[T]], deadline_seconds: Optional[float] = None) -> T:
+        """
+        Make a model call, retrying transient failures until the deadline.
+
+        For streaming calls `attempt` returns once the response starts, so the concurrency slot and
+        deadline cover opening the stream rather than consuming it.
+
+        Args:
+            attempt: Makes one attempt of the call
+            deadline_seconds: Total time the call may take, defaults to the configured deadline
+
+        Returns:
+            T: The result of the first successful attempt
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            asyncio.TimeoutError: If the deadline passes before an attempt succeeds
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError("Model calls are failing, circuit open")
+
+        deadline = self.clock() + (self.deadline_seconds if deadline_seconds is None else deadline_seconds)
+        retries = 0
+        while True:
+            try:
+                result = await self._attempt(attempt, deadline)
+            except RETRYABLE_ERRORS as e:
+                if isinstance(e, openai.RateLimitError):
+                    metrics.increment(THROTTLED_CALLS_METRIC)
+                    self.limiter.on_throttle()
+                delay = self._retry_delay(e, retries)
+                if self.clock() + delay >= deadline:
+                    self.breaker.record_failure()
+                    metrics.increment(DEADLINE_EXCEEDED_METRIC)
+                    raise
+                retries += 1
+                metrics.increment(RETRIES_METRIC)
+                logger.warning("Retrying model call in %.2fs after %s", delay, type(e).__name__)
+                await asyncio.sleep(delay)
+                continue
+            except asyncio.TimeoutError:
+                self.breaker.record_failure()
+                metrics.increment(DEADLINE_EXCEEDED_METRIC)
+                raise
+            except openai.APIStatusError:
+                # The backend answered, so the failure says nothing about its health
+                self.breaker.record_success()
+                raise
+            except BaseException:
+                # Cancellation or a failure before the backend was reached, the circuit is left as it was
+                self.breaker.abandon()
+                raise
+
+            self.breaker.record_success()
+            self.limiter.on_success()
+            return result
+
+    async def _attempt(self, attempt: Callable[[], Awaitable[T]], deadline: float) -> T:
+        """Make one attempt within a concurrency slot, bounded by the time left until the deadline."""
+
+        async def run() -> T:
+            await self.limiter.acquire()
+            try:
+                return await attempt()
+            finally:
+                self.limiter.release()
+
+        return await asyncio.wait_for(run(), timeout=max(0.0, deadline - self.clock()))
+
+    def _retry_delay(self, error: Exception, retries: int) -> float:
+        """Seconds to wait before retrying, from the server's hint or a jittered exponential backoff."""
+        hint = _retry_after_seconds(error)
+        if hint is not None:
+            return hint
+        return self.rng.uniform(0, min(self.max_delay_seconds, self.base_delay_seconds * 2**retries))
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """Read the retry-after-ms or retry-after header of an error response."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    for header, scale in (("retry-after-ms", 1000.0), ("retry-after", 1.0)):
+        value = response.headers.get(header)
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value) / scale)
+        except ValueError:
+            continue
+    return None
+
+
+model_call_guard = ModelCallGuard.from_config()
@@ -0,0 +1,147 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Latency-tiered selection of the model that serves a call, from local features of its input."""
+
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from src.config import config
+from src.services.deployment_pool import TIER_FAST, TIER_LARGE
+from src.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Scenario configuration keys
+COMPLEXITY_KEY = "complexity"
+COMPLEXITY_COMPLEX = "complex"
+
+# Routing reasons
+REASON_DISABLED = "disabled"
+REASON_COMPLEX_SCENARIO = "complex_scenario"
+REASON_LATENCY_SLO = "latency_slo"
+REASON_SHORT_INPUT = "short_input"
+REASON_LONG_INPUT = "long_input"
+
+# Metrics
+DECISIONS_METRIC = "model_router_decisions"
+SHADOW_COMPARISONS_METRIC = "model_router_shadow_comparisons"
+SHADOW_DISAGREEMENTS_METRIC = "model_router_shadow_disagreements"
+SHADOW_SCORE_DELTA_METRIC = "model_router_shadow_score_delta"
+
+
+class ModelRouter:
+    """
+    Picks the fast or the large model tier for a call.
+
+    Short inputs of scenarios not marked complex, and callers with a tight latency SLO, go to the
+    fast tier; everything else to the large one. In shadow mode the large tier keeps serving and
+    inputs routed to the fast tier are scored by both, so disagreements can be reviewed before
+    the fast tier takes traffic.
+    """
+
+    def __init__(
+        self,
+        fast_deployment: str,
+        large_deployment: str,
+        enabled: bool = False,
+        shadow_mode: bool = False,
+        fast_max_tokens: int = 2000,
+        fast_latency_slo_ms: float = 3000.0,
+        disagreement_threshold: int = 10,
+    ):
+        """
+        Initialize the model router.
+
+        Args:
+            fast_deployment: Deployment name of the fast tier, empty if there is none
+            large_deployment: Deployment name of the large tier
+            enabled: Whether calls may be routed to the fast tier
+            shadow_mode: Whether the fast tier only runs in the shadow of the large one
+            fast_max_tokens: Largest input sent to the fast tier
+            fast_latency_slo_ms: Latency SLO at or below which callers get the fast tier
+            disagreement_threshold: Overall score difference logged as a disagreement
+        """
+        self.fast_deployment = fast_deployment
+        self.large_deployment = large_deployment
+        self.enabled = enabled and bool(fast_deployment)
+        self.shadow_mode = shadow_mode
+        self.fast_max_tokens = fast_max_tokens
+        self.fast_latency_slo_ms = fast_latency_slo_ms
+        self.disagreement_threshold = disagreement_threshold
+
+    @classmethod
+    def from_config(cls) -> "ModelRouter":
+        """Build the router from configuration."""
+        return cls(
+            fast_deployment=config["fast_model_deployment_name"],
+            large_deployment=config["model_deployment_name"],
+            enabled=config["model_router_enabled"],
+            shadow_mode=config["model_router_shadow_mode"],
+            fast_max_tokens=config["model_router_fast_max_tokens"],
+            fast_latency_slo_ms=config["model_router_fast_latency_slo_ms"],
+            disagreement_threshold=config["model_router_disagreement_threshold"],
+        )
+
+    def route(
+        self, input_tokens: int, scenario: Optional[Dict[str, Any]] = None, latency_slo_ms: Optional[float] = None
+    ) -> Tuple[str, str]:
+        """
+        Pick the tier best suited to an input.
+
+        Args:
+            input_tokens: Estimated tokens of the variable part of the input
+            scenario: Scenario configuration, which can be marked complex
+            latency_slo_ms: Latency the caller needs the result within
+
+        Returns:
+            Tuple[str, str]: The tier and the reason it was picked
+        """
+        if not self.enabled:
+            tier, reason = TIER_LARGE, REASON_DISABLED
+        elif scenario and scenario.get(COMPLEXITY_KEY) == COMPLEXITY_COMPLEX:
+            tier, reason = TIER_LARGE, REASON_COMPLEX_SCENARIO
+        elif latency_slo_ms is not None and latency_slo_ms <= self.fast_latency_slo_ms:
+            tier, reason = TIER_FAST, REASON_LATENCY_SLO
+        elif input_tokens <= self.fast_max_tokens:
+            tier, reason = TIER_FAST, REASON_SHORT_INPUT
+        else:
+            tier, reason = TIER_LARGE, REASON_LONG_INPUT
+
+        metrics.increment(DECISIONS_METRIC, labels={"tier": tier, "reason": reason})
+        return tier, reason
+
+    def serving_tier(self, tier: str) -> str:
+        """The tier that actually serves a call routed to `tier`."""
+        return TIER_LARGE if self.shadow_mode else tier
+
+    def deployment_for(self, tier: str) -> str:
+        """Deployment name of a tier."""
+        return self.fast_deployment if tier == TIER_FAST and self.fast_deployment else self.large_deployment
+
+    def compare(self, served: Dict[str, Any], shadow: Dict[str, Any], label: str) -> int:
+        """
+        Compare a served evaluation with the fast tier's shadow evaluation of the same input.
+
+        Returns:
+            int: Absolute difference between the overall scores
+        """
+        delta = abs(int(served.get("overall_score", 0)) - int(shadow.get("overall_score", 0)))
+        metrics.increment(SHADOW_COMPARISONS_METRIC)
+        metrics.observe(SHADOW_SCORE_DELTA_METRIC, delta)
+
+        if delta >= self.disagreement_threshold:
+            metrics.increment(SHADOW_DISAGREEMENTS_METRIC)
+            logger.warning(
+                "Fast tier disagrees on %s: overall score %s vs %s (tone %s vs %s, content %s vs %s)",
+                label,
+                served.get("overall_score"),
+                shadow.get("overall_score"),
+                served.get("speaking_tone_style", {}).get("total"),
+                shadow.get("speaking_tone_style", {}).get("total"),
+                served.get("conversation_content", {}).get("total"),
+                shadow.get("conversation_content", {}).get("total"),
+            )
+        return delta
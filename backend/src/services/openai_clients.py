@@ -0,0 +1,146 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Process-wide registry of async Azure OpenAI clients."""
+
+import asyncio
+import logging
+import ssl
+import threading
+from typing import Any, Dict, Optional, Tuple, cast
+
+import httpx
+from openai import AsyncAzureOpenAI, DefaultAsyncHttpxClient
+
+from src.config import config
+from src.services.metrics import metrics
+from src.services.providers import FAKE_ENDPOINT, SERVICE_LLM, FakeBackend, FakeChatClient, is_fake
+
+logger = logging.getLogger(__name__)
+
+# Connection constants
+CONNECT_TIMEOUT_SECONDS = 5.0
+CONNECTION_OPENED_TRACE_EVENT = "connection.connect_tcp.complete"
+
+# Metrics
+CLIENTS_CREATED_METRIC = "openai_clients_created"
+HTTP_REQUESTS_METRIC = "openai_http_requests"
+CONNECTIONS_OPENED_METRIC = "openai_connections_opened"
+
+
+class AsyncOpenAIClientRegistry:
+    """
+    Shares one AsyncAzureOpenAI client, with a configurable keep-alive connection pool, per event loop and endpoint.
+
+    httpx connections are bound to the event loop that opened them, so a client is created
+    lazily for each running loop and endpoint and reused by every caller on that loop. The TLS context is
+    built once and shared, since loading the CA bundle dominates client construction cost.
+
+    HTTP requests and newly opened connections are counted per endpoint, so connection reuse is
+    `1 - openai_connections_opened / openai_http_requests`. With LLM_PROVIDER=fake the registry
+    hands out local fake clients sharing one latency profile instead.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._clients: Dict[Tuple[asyncio.AbstractEventLoop, str], AsyncAzureOpenAI] = {}
+        self._ssl_context: Optional[ssl.SSLContext] = None
+        self._fake_backend: Optional[FakeBackend] = None
+        self._lock = threading.Lock()
+
+    @property
+    def configured(self) -> bool:
+        """Whether an Azure OpenAI endpoint and key, or the fake provider, are configured."""
+        return is_fake(SERVICE_LLM) or bool(config["azure_openai_endpoint"] and config["azure_openai_api_key"])
+
+    def get_client(self, endpoint: Optional[str] = None, api_key: Optional[str] = None) -> Optional[AsyncAzureOpenAI]:
+        """
+        Get the shared client for the running event loop.
+
+        Args:
+            endpoint: Azure OpenAI endpoint, defaults to the configured one
+            api_key: API key of the endpoint, defaults to the configured one
+
+        Returns:
+            Optional[AsyncAzureOpenAI]: The shared client or None if configuration is missing
+        """
+        endpoint = endpoint or config["azure_openai_endpoint"]
+        api_key = api_key or config["azure_openai_api_key"]
+        if is_fake(SERVICE_LLM):
+            endpoint = endpoint or FAKE_ENDPOINT
+        elif not endpoint or not api_key:
+            logger.error("Azure OpenAI endpoint or API key not configured")
+            return None
+
+        key = (asyncio.get_running_loop(), endpoint)
+        with self._lock:
+            self._prune_closed_loops()
+            client = self._clients.get(key)
+            if client is None:
+                client = self._clients[key] = self._create_client(endpoint, api_key)
+            return client
+
+    def _create_client(self, endpoint: str, api_key: str) -> AsyncAzureOpenAI:
+        """Create an async client with a pooled, keep-alive HTTP transport."""
+        if is_fake(SERVICE_LLM):
+            if self._fake_backend is None:
+                self._fake_backend = FakeBackend.from_config(SERVICE_LLM)
+            logger.info("Created fake OpenAI client for endpoint: %s", endpoint)
+            # The fake covers the chat completions surface the callers use
+            return cast(AsyncAzureOpenAI, FakeChatClient(self._fake_backend))
+
+        if self._ssl_context is None:
+            self._ssl_context = httpx.create_ssl_context()
+
+        http_client = DefaultAsyncHttpxClient(
+            verify=self._ssl_context,
+            limits=httpx.Limits(
+                max_connections=config["openai_max_connections"],
+                max_keepalive_connections=config["openai_max_keepalive_connections"],
+                keepalive_expiry=config["openai_keepalive_expiry_seconds"],
+            ),
+            timeout=httpx.Timeout(config["openai_timeout_seconds"], connect=CONNECT_TIMEOUT_SECONDS),
+            event_hooks={"request": [_connection_tracer(endpoint)]},
+        )
+        metrics.increment(CLIENTS_CREATED_METRIC)
+        logger.info("Created shared async OpenAI client for endpoint: %s", endpoint)
+        return AsyncAzureOpenAI(
+            api_version=config["api_version"],
+            azure_endpoint=endpoint,
+            api_key=api_key,
+            max_retries=config["openai_max_retries"],
+            http_client=http_client,
+        )
+
+    def _prune_closed_loops(self) -> None:
+        """Drop clients whose event loop has been closed."""
+        for key in [key for key in self._clients if key[0].is_closed()]:
+            del self._clients[key]
+
+    async def aclose(self) -> None:
+        """Close the clients owned by the running event loop, if any."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = [self._clients.pop(key) for key in list(self._clients) if key[0] is loop]
+        for client in clients:
+            await client.close()
+
+
+def _connection_tracer(endpoint: str):
+    """Build a request hook that counts the endpoint's requests and the connections they had to open."""
+    labels = {"endpoint": endpoint}
+
+    async def trace(event: str, info: Dict[str, Any]) -> None:  # pylint: disable=unused-argument
+        if event == CONNECTION_OPENED_TRACE_EVENT:
+            metrics.increment(CONNECTIONS_OPENED_METRIC, labels=labels)
+
+    async def on_request(request: httpx.Request) -> None:
+        metrics.increment(HTTP_REQUESTS_METRIC, labels=labels)
+        request.extensions["trace"] = trace
+
+    return on_request
+
+
+openai_clients = AsyncOpenAIClientRegistry()
@@ -0,0 +1,526 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Pronunciation assessment of a conversation's user audio with Azure Speech Services."""
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import azure.cognitiveservices.speech as speechsdk  # pyright: ignore[reportMissingTypeStubs]
+
+from src.config import config
+from src.services.assessment_planner import AssessmentPlanner
+from src.services.audio_preprocessing import preprocess_audio
+from src.services.audio_segmentation import SpeechSegment, segment_speech
+from src.services.evaluation_cache import EvaluationCache
+from src.services.metrics import metrics
+from src.services.providers import SERVICE_SPEECH, FakeBackend, FakeSpeechAssessor, is_fake
+from src.services.speech_auth import SpeechTokenCache
+
+logger = logging.getLogger(__name__)
+
+# Audio of an analyze request: the recorded chunks, or the user's PCM audio already combined
+AudioData = Union[List[Dict[str, Any]], bytearray]
+# Raw PCM handed to a recognition, a memoryview lets segments avoid copying
+PcmAudio = Union[bytes, bytearray, memoryview]
+
+# Audio processing constants
+MIN_AUDIO_SIZE_BYTES = 48000
+AUDIO_SAMPLE_RATE = 24000
+AUDIO_CHANNELS = 1
+AUDIO_SAMPLE_WIDTH = 2
+AUDIO_BITS_PER_SAMPLE = 16
+# PCM is written into the recognizer's push stream in pieces this long while recognition runs
+PUSH_CHUNK_MS = 100
+PUSH_CHUNK_BYTES = AUDIO_SAMPLE_RATE * AUDIO_SAMPLE_WIDTH * AUDIO_CHANNELS * PUSH_CHUNK_MS // 1000
+AUDIO_BYTES_PER_SECOND = AUDIO_SAMPLE_RATE * AUDIO_SAMPLE_WIDTH * AUDIO_CHANNELS
+
+# Pronunciation constants
+PRONUNCIATION_SCORE_FIELDS = (
+    "accuracy_score",
+    "fluency_score",
+    "completeness_score",
+    "prosody_score",
+    "pronunciation_score",
+)
+PRONUNCIATION_LATENCY_METRIC = "pronunciation_assessment_ms"
+PRONUNCIATION_SEGMENTS_METRIC = "pronunciation_segments"
+PRONUNCIATION_SEGMENT_FAILURES_METRIC = "pronunciation_segment_failures"
+PRONUNCIATION_REMOVED_SECONDS_METRIC = "pronunciation_preprocessing_removed_seconds"
+# Most detailed assessment settings sent to the Speech service, part of the result cache key.
+# Under a latency budget, segments may be assessed with cheaper settings, see AssessmentPlanner.
+DEFAULT_ASSESSMENT_SETTINGS: Dict[str, Any] = {
+    "granularity": "Phoneme",
+    "enable_miscue": True,
+    "enable_prosody": True,
+}
+
+# Pronunciation result cache, bump the version when the result format changes
+PRONUNCIATION_CACHE_NAME = "pronunciation_cache"
+PRONUNCIATION_CACHE_VERSION = "2"
+PRONUNCIATION_CACHE_HIT_RATE_METRIC = "pronunciation_cache_hit_rate"
+PRONUNCIATION_CACHE_SAVED_SECONDS_METRIC = "pronunciation_cache_saved_recognition_seconds"
+
+
+def combine_user_audio(audio_data: AudioData) -> bytearray:
+    """Decode and combine the user's audio chunks, or return the user's PCM audio already combined."""
+    if isinstance(audio_data, bytearray):
+        return audio_data
+
+    combined_audio = bytearray()
+
+    for chunk in audio_data:
+        if chunk.get("type") == "user":
+            try:
+                audio_bytes = base64.b64decode(chunk["data"])
+                combined_audio.extend(audio_bytes)
+            except Exception as e:
+                logger.error("Error decoding audio chunk: %s", e)
+
+    return combined_audio
+
+
+class PronunciationAssessor:  # pylint: disable=too-many-instance-attributes
+    """Assesses pronunciation using Azure Speech Services, or its local fake with SPEECH_PROVIDER=fake."""
+
+    def __init__(
+        self,
+        fake_assessor: Optional[FakeSpeechAssessor] = None,
+        result_cache: Optional[EvaluationCache] = None,
+    ):
+        """
+        Initialize the pronunciation assessor.
+
+        Args:
+            fake_assessor: Local stand-in for the Speech service, defaults to one when SPEECH_PROVIDER is fake
+            result_cache: Cache for assessment results, built from configuration if omitted
+        """
+        self.speech_key = config["azure_speech_key"]
+        self.speech_region = config["azure_speech_region"]
+        if fake_assessor is None and is_fake(SERVICE_SPEECH):
+            fake_assessor = FakeSpeechAssessor(FakeBackend.from_config(SERVICE_SPEECH))
+        self.fake_assessor = fake_assessor
+        self.segmentation_enabled = bool(config["pronunciation_segmentation_enabled"])
+        self.segment_concurrency = max(1, int(config["pronunciation_segment_concurrency"] or 1))
+        self.min_silence_ms = int(config["pronunciation_min_silence_ms"] or 0)
+        self.max_segment_seconds = float(config["pronunciation_max_segment_seconds"] or 0)
+        self.preprocessing_enabled = bool(config["pronunciation_preprocessing_enabled"])
+        self.max_pause_ms = int(config["pronunciation_max_pause_ms"] or 0)
+        self.token_cache: Optional[SpeechTokenCache] = None
+        if config["azure_speech_auth_token_enabled"] and self.speech_key:
+            self.token_cache = SpeechTokenCache(self.speech_key, self.speech_region)
+        # Built on first use and shared by every recognizer, see `_get_speech_config`
+        self._speech_config: Optional[speechsdk.SpeechConfig] = None
+        self._audio_format: Optional[speechsdk.audio.AudioStreamFormat] = None
+        self._config_lock = threading.Lock()
+        self.assessment_settings: Dict[str, Any] = dict(DEFAULT_ASSESSMENT_SETTINGS)
+        self.planner = AssessmentPlanner(float(config["pronunciation_latency_budget_ms"] or 0))
+        self.result_cache = result_cache or self._create_result_cache()
+        self._cache_lookups = 0
+        self._cache_hits = 0
+
+    def _create_result_cache(self) -> EvaluationCache:
+        """Create the assessment result cache from configuration."""
+        if not config["pronunciation_cache_enabled"]:
+            return EvaluationCache(max_memory_entries=0, name=PRONUNCIATION_CACHE_NAME)
+
+        cache_dir = config["pronunciation_cache_dir"]
+        return EvaluationCache(
+            cache_dir=Path(cache_dir) if cache_dir else None,
+            ttl_seconds=config["pronunciation_cache_ttl_seconds"],
+            max_memory_entries=config["pronunciation_cache_max_entries"],
+            max_disk_bytes=config["pronunciation_cache_max_disk_mb"] * 1024 * 1024,
+            name=PRONUNCIATION_CACHE_NAME,
+        )
+
+    def _result_cache_key(self, audio: PcmAudio, reference_text: Optional[str], settings: Dict[str, Any]) -> str:
+        """
+        Fingerprint an assessment: its PCM, reference text, language, assessment settings and provider.
+
+        The PCM is the audio before preprocessing, so the preprocessing options are part of the
+        key. Results of the local fake are keyed apart from Azure's, and changing any setting sent
+        to the service invalidates the entries made with the previous value.
+        """
+        material = json.dumps(
+            {
+                "version": PRONUNCIATION_CACHE_VERSION,
+                "provider": "fake" if self.fake_assessor is not None else "azure",
+                "language": config["azure_speech_language"],
+                "settings": settings,
+                "reference_text": reference_text or "",
+                "max_pause_ms": self.max_pause_ms if self.preprocessing_enabled else None,
+            },
+            sort_keys=True,
+        )
+        digest = hashlib.sha256(audio)
+        digest.update(material.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _log_assessment_info(self, audio: PcmAudio, reference_text: Optional[str]) -> None:
+        """Log information about the assessment being performed."""
+        logger.info("Starting pronunciation assessment with audio size: %s bytes", len(audio))
+        logger.info("Reference text: %s", reference_text or "None")
+        logger.info("Speech key configured: %s", "Yes" if self.speech_key else "No")
+        logger.info("Speech region: %s", self.speech_region)
+
+    def _create_speech_config(self) -> speechsdk.SpeechConfig:
+        """Create speech configuration, authorized with a token when the token cache is enabled."""
+        if self.token_cache is not None:
+            speech_config = speechsdk.SpeechConfig(auth_token=self.token_cache.get_token(), region=self.speech_region)
+        else:
+            speech_config = speechsdk.SpeechConfig(subscription=self.speech_key, region=self.speech_region)
+        speech_config.speech_recognition_language = config["azure_speech_language"]
+        return speech_config
+
+    def _get_speech_config(self) -> Tuple[speechsdk.SpeechConfig, speechsdk.audio.AudioStreamFormat]:
+        """Return the speech configuration and raw PCM stream format, building them once for all recognizers."""
+        with self._config_lock:
+            if self._speech_config is None or self._audio_format is None:
+                self._speech_config = self._create_speech_config()
+                self._audio_format = speechsdk.audio.AudioStreamFormat(
+                    samples_per_second=AUDIO_SAMPLE_RATE,
+                    bits_per_sample=AUDIO_BITS_PER_SAMPLE,
+                    channels=AUDIO_CHANNELS,
+                    wave_stream_format=speechsdk.audio.AudioStreamWaveFormat.PCM,
+                )
+            return self._speech_config, self._audio_format
+
+    def _create_pronunciation_config(
+        self, reference_text: Optional[str], settings: Dict[str, Any]
+    ) -> speechsdk.PronunciationAssessmentConfig:
+        """Create pronunciation assessment configuration."""
+        pronunciation_config = speechsdk.PronunciationAssessmentConfig(
+            reference_text=reference_text or "",
+            grading_system=speechsdk.PronunciationAssessmentGradingSystem.HundredMark,
+            granularity=getattr(speechsdk.PronunciationAssessmentGranularity, settings["granularity"]),
+            enable_miscue=settings["enable_miscue"],
+        )
+        if settings["enable_prosody"]:
+            pronunciation_config.enable_prosody_assessment()
+        return pronunciation_config
+
+    def _build_assessment_result(
+        self,
+        pronunciation_result: speechsdk.PronunciationAssessmentResult,
+        result: speechsdk.SpeechRecognitionResult,
+    ) -> Dict[str, Any]:
+        """Build the final assessment result."""
+        return {
+            "accuracy_score": pronunciation_result.accuracy_score,
+            "fluency_score": pronunciation_result.fluency_score,
+            "completeness_score": pronunciation_result.completeness_score,
+            "prosody_score": getattr(pronunciation_result, "prosody_score", None),
+            "pronunciation_score": pronunciation_result.pronunciation_score,
+            "words": self._extract_word_details(result),
+        }
+
+    async def assess_pronunciation(
+        self,
+        audio_data: AudioData,
+        reference_text: Optional[str] = None,
+        reference_turns: Optional[List[str]] = None,
+        latency_budget_ms: Optional[float] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Assess pronunciation of audio data.
+
+        Unless segmentation is disabled, the recording is split at silences and the segments are
+        assessed concurrently against the user turns spoken in them; see `_assess_segments`.
+        Under a latency budget, long segments may be assessed with cheaper settings, see
+        `AssessmentPlanner`; the results record the settings used.
+
+        Args:
+            audio_data: List of audio chunks with metadata, or the user's PCM audio already combined
+            reference_text: Optional reference text for comparison
+            reference_turns: Text of each user turn in order, used instead of the reference text for segments
+            latency_budget_ms: Latency the caller needs the result within, defaults to PRONUNCIATION_LATENCY_BUDGET_MS
+
+        Returns:
+            Optional[Dict[str, Any]]: Pronunciation assessment results or None if assessment fails
+        """
+        if not self.speech_key and self.fake_assessor is None:
+            logger.error("Azure Speech key not configured")
+            return None
+
+        try:
+            combined_audio = await self._prepare_audio_data(audio_data)
+            if not combined_audio:
+                logger.error("No audio data to assess")
+                return None
+
+            logger.info("Combined audio size: %s bytes", len(combined_audio))
+
+            if len(combined_audio) < MIN_AUDIO_SIZE_BYTES:
+                logger.warning("Audio might be too short: %s bytes", len(combined_audio))
+
+            start_time = time.perf_counter()
+            if self.segmentation_enabled:
+                result = await self._assess_segments(combined_audio, reference_text, reference_turns, latency_budget_ms)
+            else:
+                result = await self._assess_whole(combined_audio, reference_text, latency_budget_ms)
+            metrics.observe(PRONUNCIATION_LATENCY_METRIC, (time.perf_counter() - start_time) * 1000)
+            return result
+
+        except Exception as e:
+            logger.error("Error in pronunciation assessment: %s", e)
+            return None
+
+    async def _prepare_audio_data(self, audio_data: AudioData) -> bytearray:
+        """Prepare and combine audio chunks."""
+        return combine_user_audio(audio_data)
+
+    async def _assess_whole(
+        self, pcm: bytearray, reference_text: Optional[str], latency_budget_ms: Optional[float]
+    ) -> Optional[Dict[str, Any]]:
+        """Assess a recording in one recognition, with settings that fit the latency budget."""
+        (settings,) = self.planner.plan(
+            [len(pcm) / AUDIO_BYTES_PER_SECOND], self.assessment_settings, 1, latency_budget_ms
+        )
+        return await self._perform_assessment(pcm, reference_text, settings)
+
+    async def _assess_segments(
+        self,
+        pcm: bytearray,
+        reference_text: Optional[str],
+        reference_turns: Optional[List[str]],
+        latency_budget_ms: Optional[float] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Assess the speech segments of a recording concurrently and merge their results.
+
+        A single recognition only covers one utterance, so a whole session is split at its
+        silences and each segment is assessed with the words of its user turn as reference.
+        At most PRONUNCIATION_SEGMENT_CONCURRENCY recognizers run at once. Failed segments are
+        left out of the merged result; a recording without detectable speech is assessed whole.
+        """
+        turns = [turn for turn in (reference_turns or [reference_text or ""]) if turn.strip()]
+        # Finding the silences of a long session takes a few hundred milliseconds of CPU, keep it off the loop
+        segments = await asyncio.get_running_loop().run_in_executor(
+            None,
+            segment_speech,
+            pcm,
+            turns,
+            self.min_silence_ms,
+            self.max_segment_seconds,
+            AUDIO_SAMPLE_RATE,
+        )
+        metrics.observe(PRONUNCIATION_SEGMENTS_METRIC, len(segments))
+        if not segments:
+            logger.info("No speech segments found, assessing the recording whole")
+            return await self._assess_whole(pcm, reference_text, latency_budget_ms)
+
+        logger.info("Assessing %s speech segments over %s user turns", len(segments), len(turns))
+        planned = self.planner.plan(
+            [segment.duration_seconds for segment in segments],
+            self.assessment_settings,
+            self.segment_concurrency,
+            latency_budget_ms,
+        )
+        semaphore = asyncio.Semaphore(self.segment_concurrency)
+        pcm_view = memoryview(pcm)
+
+        async def assess_segment(segment: SpeechSegment, settings: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    return await self._perform_assessment(
+                        pcm_view[segment.start : segment.end], segment.reference_text, settings
+                    )
+                except Exception as e:
+                    logger.error("Error assessing speech segment at %.1fs: %s", segment.start_seconds, e)
+                    metrics.increment(PRONUNCIATION_SEGMENT_FAILURES_METRIC)
+                    return None
+
+        results = await asyncio.gather(
+            *(assess_segment(*planned_segment) for planned_segment in zip(segments, planned))
+        )
+        return self.merge_segment_results(segments, list(results), turns)
+
+    def merge_segment_results(
+        self, segments: List[SpeechSegment], results: List[Optional[Dict[str, Any]]], turns: List[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Combine segment results into duration-weighted session scores and per-turn word details."""
+        assessed = [(segment, result) for segment, result in zip(segments, results) if result is not None]
+        if not assessed:
+            return None
+
+        turn_results: Dict[int, List[Tuple[SpeechSegment, Dict[str, Any]]]] = {}
+        for segment, result in assessed:
+            if segment.turn is not None:
+                turn_results.setdefault(segment.turn, []).append((segment, result))
+
+        return {
+            **self._weighted_scores(assessed),
+            "words": [word for _, result in assessed for word in result.get("words", [])],
+            "turns": [
+                {
+                    "turn": turn,
+                    "reference_text": turns[turn],
+                    **self._weighted_scores(turn_results[turn]),
+                    "words": [word for _, result in turn_results[turn] for word in result.get("words", [])],
+                }
+                for turn in sorted(turn_results)
+            ],
+            "segment_count": len(segments),
+            "assessed_segment_count": len(assessed),
+            "removed_audio_seconds": round(sum(result.get("removed_audio_seconds", 0.0) for _, result in assessed), 2),
+            "assessment_plan": self._merge_assessment_plans(assessed),
+        }
+
+    def _merge_assessment_plans(self, assessed: List[Tuple[SpeechSegment, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Summarize the settings the segments were assessed with: segments and seconds of audio per settings."""
+        plan: Dict[str, Dict[str, Any]] = {}
+        for segment, result in assessed:
+            if "assessment_plan" in result:
+                entries = result["assessment_plan"]
+            elif "assessment_settings" in result:
+                entries = [{**result["assessment_settings"], "segments": 1, "audio_seconds": segment.duration_seconds}]
+            else:
+                entries = []
+            for entry in entries:
+                settings = {key: value for key, value in entry.items() if key not in ("segments", "audio_seconds")}
+                merged = plan.setdefault(
+                    json.dumps(settings, sort_keys=True), {**settings, "segments": 0, "audio_seconds": 0.0}
+                )
+                merged["segments"] += entry["segments"]
+                merged["audio_seconds"] = round(merged["audio_seconds"] + entry["audio_seconds"], 2)
+        return list(plan.values())
+
+    def _weighted_scores(self, assessed: List[Tuple[SpeechSegment, Dict[str, Any]]]) -> Dict[str, Optional[float]]:
+        """Average each score over the segments that have it, weighted by segment duration."""
+        scores: Dict[str, Optional[float]] = {}
+        for field in PRONUNCIATION_SCORE_FIELDS:
+            weighted = [
+                (segment.duration_seconds, result[field])
+                for segment, result in assessed
+                if result.get(field) is not None
+            ]
+            total = sum(duration for duration, _ in weighted)
+            scores[field] = round(sum(duration * score for duration, score in weighted) / total, 1) if total else None
+        return scores
+
+    async def _perform_assessment(
+        self, audio: PcmAudio, reference_text: Optional[str], settings: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Perform the actual pronunciation assessment of raw PCM audio.
+
+        Results are cached by `_result_cache_key`, so re-analyzing a session, e.g. after a page
+        refresh or a retried request, does not send the same audio to the Speech service again.
+        On a cache miss, if preprocessing is enabled, the audio is cleaned up first, see
+        `preprocess_audio`, and the result records how many seconds of silence that removed. The
+        result records the assessment settings, the most detailed ones unless given, and the
+        recognition time is reported to the planner.
+        """
+        settings = dict(settings or self.assessment_settings)
+        audio_seconds = len(audio) / AUDIO_BYTES_PER_SECOND
+        cache_key = self._result_cache_key(audio, reference_text, settings)
+        cached = await self._get_cached_result(cache_key)
+        if cached is not None:
+            return cached
+
+        removed_seconds = 0.0
+        if self.preprocessing_enabled:
+            preprocessed = await asyncio.get_running_loop().run_in_executor(
+                None, preprocess_audio, audio, self.max_pause_ms, AUDIO_SAMPLE_RATE
+            )
+            audio, removed_seconds = preprocessed.pcm, preprocessed.removed_seconds
+            metrics.increment(PRONUNCIATION_REMOVED_SECONDS_METRIC, removed_seconds)
+
+        self._log_assessment_info(audio, reference_text)
+        start_time = time.perf_counter()
+        if self.fake_assessor is not None:
+            result = await self.fake_assessor.assess(bytes(audio), reference_text, settings)
+        else:
+            result = await asyncio.get_running_loop().run_in_executor(
+                None, self._recognize, audio, reference_text, settings
+            )
+        recognition_seconds = time.perf_counter() - start_time
+        self.planner.observe(settings, audio_seconds, recognition_seconds)
+
+        if result is not None:
+            result = {**result, "removed_audio_seconds": round(removed_seconds, 2), "assessment_settings": settings}
+            self.result_cache.set(cache_key, {"assessment": result, "recognition_seconds": recognition_seconds})
+        return result
+
+    async def _get_cached_result(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached assessment, recording the hit rate and the recognition time a hit saves."""
+        if not self.result_cache.enabled:
+            return None
+
+        entry = await self.result_cache.get_async(cache_key)
+        self._cache_lookups += 1
+        if entry is not None:
+            self._cache_hits += 1
+            metrics.increment(PRONUNCIATION_CACHE_SAVED_SECONDS_METRIC, entry["recognition_seconds"])
+        metrics.set_gauge(PRONUNCIATION_CACHE_HIT_RATE_METRIC, self._cache_hits / self._cache_lookups)
+        return entry["assessment"] if entry is not None else None
+
+    def _recognize(
+        self, audio: PcmAudio, reference_text: Optional[str], settings: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run one recognition, streaming the PCM into its push stream.
+
+        Recognition is started before the first write, so connecting to the service and
+        recognizing the start of the audio overlap with writing the rest of it. The audio is
+        written in PUSH_CHUNK_MS pieces without a WAV header or a full copy of the recording.
+        """
+        speech_config, audio_format = self._get_speech_config()
+        push_stream = speechsdk.audio.PushAudioInputStream(stream_format=audio_format)
+        speech_recognizer = speechsdk.SpeechRecognizer(
+            speech_config=speech_config,
+            audio_config=speechsdk.audio.AudioConfig(stream=push_stream),
+            language=config["azure_speech_language"],
+        )
+        if self.token_cache is not None:
+            speech_recognizer.authorization_token = self.token_cache.get_token()
+        self._create_pronunciation_config(reference_text, settings or self.assessment_settings).apply_to(
+            speech_recognizer
+        )
+
+        result_future = speech_recognizer.recognize_once_async()
+        try:
+            view = memoryview(audio)
+            for offset in range(0, len(view), PUSH_CHUNK_BYTES):
+                push_stream.write(view[offset : offset + PUSH_CHUNK_BYTES].tobytes())
+        finally:
+            push_stream.close()
+        result = result_future.get()
+
+        pronunciation_result = speechsdk.PronunciationAssessmentResult(result)
+        return self._build_assessment_result(pronunciation_result, result)
+
+    def _extract_word_details(self, result: speechsdk.SpeechRecognitionResult) -> List[Dict[str, Any]]:
+        """Extract word-level pronunciation details."""
+        try:
+            json_result = json.loads(
+                result.properties.get(
+                    speechsdk.PropertyId.SpeechServiceResponse_JsonResult,
+                    "{}",
+                )  # pyright: ignore[reportUnknownMemberType]  # pyright: ignore[reportUnknownArgumentType]
+            )
+
+            words: List[Dict[str, Any]] = []
+            if "NBest" in json_result and json_result["NBest"]:
+                for word_info in json_result["NBest"][0].get("Words", []):
+                    words.append(
+                        {
+                            "word": word_info.get("Word", ""),
+                            "accuracy": word_info.get("PronunciationAssessment", {}).get("AccuracyScore", 0),
+                            "error_type": word_info.get("PronunciationAssessment", {}).get("ErrorType", "None"),
+                        }
+                    )
+
+            return words
+        except Exception as e:
+            logger.error("Error extracting word details: %s", e)
+            return []
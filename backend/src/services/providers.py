@@ -0,0 +1,357 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Provider selection and deterministic local fakes of the LLM, speech assessment and agent services.
+
+Each service is selected with LLM_PROVIDER, SPEECH_PROVIDER and AGENT_PROVIDER ("azure" or
+"fake"). Fakes answer with content derived from a hash of the request, so the same input always
+gets the same output, after a latency drawn from a seeded log-normal distribution. Their latency,
+concurrency cap and error rate are set per service with a JSON profile, for example
+FAKE_LLM_PROFILE={"median_ms": 800, "p95_ms": 2500, "per_unit_ms": 15, "max_concurrency": 8}.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+import httpx
+import openai
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+from src.config import config
+from src.services.assessment_planner import relative_cost
+from src.services.metrics import metrics
+from src.services.token_budget import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Providers
+PROVIDER_AZURE = "azure"
+PROVIDER_FAKE = "fake"
+SERVICE_LLM = "llm"
+SERVICE_SPEECH = "speech"
+SERVICE_AGENT = "agent"
+
+# Default fake profiles; per_unit_ms is per output token for the LLM and per second of audio for speech
+DEFAULT_PROFILES: Dict[str, Dict[str, float]] = {
+    SERVICE_LLM: {"median_ms": 600, "p95_ms": 1500, "per_unit_ms": 10, "max_concurrency": 0, "error_rate": 0},
+    SERVICE_SPEECH: {"median_ms": 300, "p95_ms": 800, "per_unit_ms": 100, "max_concurrency": 0, "error_rate": 0},
+    SERVICE_AGENT: {"median_ms": 200, "p95_ms": 500, "per_unit_ms": 0, "max_concurrency": 0, "error_rate": 0},
+}
+P95_Z_SCORE = 1.645
+
+# Fake content constants
+FAKE_ENDPOINT = "fake://local"
+FAKE_MAX_SCORE = 10
+FAKE_LIST_ITEMS = 2
+FAKE_TEXT_WORDS = 120
+FAKE_STREAM_CHUNK_CHARS = 24
+FAKE_AUDIO_BYTES_PER_SECOND = 48000
+FAKE_WORDS = (
+    "customer team value meeting budget timeline integration question follow next steps security review "
+    "pricing pilot partner goals challenge solution outcome priority schedule"
+).split()
+
+# Metrics
+FAKE_CALLS_METRIC = "fake_provider_calls"
+FAKE_ERRORS_METRIC = "fake_provider_errors"
+
+
+class ProviderUnavailableError(Exception):
+    """Raised by a fake service for an injected error or, with `throttled` set, when over its concurrency cap."""
+
+    def __init__(self, message: str, throttled: bool = False):
+        super().__init__(message)
+        self.throttled = throttled
+
+
+def is_fake(service: str) -> bool:
+    """Whether the service is configured to use its local fake."""
+    return str(config[f"{service}_provider"] or PROVIDER_AZURE).lower() == PROVIDER_FAKE
+
+
+class FakeBackend:  # pylint: disable=too-many-instance-attributes
+    """
+    Latency, concurrency cap and error injection shared by every fake client of one service.
+
+    Latency is log-normal with the profile's median and 95th percentile plus `per_unit_ms` for
+    each unit of work. Calls beyond `max_concurrency` in flight are rejected, like a throttling
+    service, and `error_rate` of the others fail. Draws come from one seeded generator, so a run
+    with the same seed and call order sees the same latencies and errors.
+    """
+
+    def __init__(self, service: str, profile: Dict[str, float], seed: int = 0):
+        """
+        Initialize the backend.
+
+        Args:
+            service: Service name, used as metric label
+            profile: median_ms, p95_ms, per_unit_ms, max_concurrency and error_rate
+            seed: Seed of the latency and error generator
+        """
+        self.service = service
+        self.median_ms = max(0.0, float(profile["median_ms"]))
+        self.p95_ms = max(self.median_ms, float(profile["p95_ms"]))
+        self.per_unit_ms = float(profile["per_unit_ms"])
+        self.max_concurrency = int(profile["max_concurrency"])
+        self.error_rate = float(profile["error_rate"])
+        self.in_flight = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, service: str) -> "FakeBackend":
+        """Build the backend from the service's FAKE_<SERVICE>_PROFILE, falling back to the defaults."""
+        profile = dict(DEFAULT_PROFILES[service])
+        raw_profile = config[f"fake_{service}_profile"]
+        if raw_profile:
+            try:
+                profile.update(json.loads(raw_profile))
+            except (ValueError, TypeError) as e:
+                logger.error("Ignoring invalid FAKE_%s_PROFILE: %s", service.upper(), e)
+        return cls(service, profile, config["fake_provider_seed"])
+
+    def latency_seconds(self, units: float = 0.0) -> float:
+        """Draw the latency of a call with `units` of work."""
+        with self._lock:
+            gaussian = self._rng.gauss(0.0, 1.0)
+        base_ms = 0.0
+        if self.median_ms > 0:
+            sigma = math.log(self.p95_ms / self.median_ms) / P95_Z_SCORE
+            base_ms = self.median_ms * math.exp(sigma * gaussian)
+        return (base_ms + self.per_unit_ms * units) / 1000
+
+    @contextmanager
+    def admit(self) -> Iterator[None]:
+        """
+        Hold a concurrency slot for the duration of a call.
+
+        Raises:
+            ProviderUnavailableError: If the cap is reached or an error is injected
+        """
+        with self._lock:
+            over_capacity = 0 < self.max_concurrency <= self.in_flight
+            failed = not over_capacity and self._rng.random() < self.error_rate
+            if not over_capacity and not failed:
+                self.in_flight += 1
+        labels = {"service": self.service}
+        metrics.increment(FAKE_CALLS_METRIC, labels=labels)
+        if over_capacity or failed:
+            metrics.increment(FAKE_ERRORS_METRIC, labels=labels)
+            if over_capacity:
+                raise ProviderUnavailableError(f"{self.service} over capacity", throttled=True)
+            raise ProviderUnavailableError(f"{self.service} injected error")
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class FakeChatClient:
+    """
+    Stand-in for AsyncAzureOpenAI's chat completions, as used by the evaluation and generation code.
+
+    With a JSON schema response format the content is an instance of the schema, otherwise plain
+    text. Rejections and injected errors surface as the SDK's RateLimitError and
+    InternalServerError, so the call guard retries and throttles exactly as with the service.
+    """
+
+    def __init__(self, backend: FakeBackend):
+        """Initialize the client on a shared backend."""
+        self.backend = backend
+        self.chat = self
+        self.completions = self
+        self._closed = False
+
+    async def create(self, **arguments: Any) -> Any:
+        """Create a chat completion, or a stream of chunks with `stream=True`."""
+        content = _fake_completion_content(arguments)
+        output_tokens = max(1, estimate_tokens(content))
+        prompt_tokens = estimate_tokens(json.dumps(arguments.get("messages", [])))
+        model = str(arguments.get("model", ""))
+        if arguments.get("stream"):
+            # Like the service, the stream is returned once the first token is ready
+            with self._admit():
+                await asyncio.sleep(self.backend.latency_seconds())
+            return self._stream(content, model, output_tokens)
+
+        with self._admit():
+            await asyncio.sleep(self.backend.latency_seconds(output_tokens))
+        return ChatCompletion.model_validate(
+            {
+                "id": f"chatcmpl-{uuid.uuid4().hex}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": output_tokens,
+                    "total_tokens": prompt_tokens + output_tokens,
+                },
+            }
+        )
+
+    async def _stream(self, content: str, model: str, output_tokens: int) -> AsyncIterator[ChatCompletionChunk]:
+        """Yield the content in chunks at the profile's rate per output token."""
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        pieces = [content[i : i + FAKE_STREAM_CHUNK_CHARS] for i in range(0, len(content), FAKE_STREAM_CHUNK_CHARS)]
+        for index, piece in enumerate(pieces):
+            if index:
+                await asyncio.sleep(self.backend.per_unit_ms * output_tokens / len(pieces) / 1000)
+            yield ChatCompletionChunk.model_validate(
+                {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+                }
+            )
+
+    @contextmanager
+    def _admit(self) -> Iterator[None]:
+        """Admit a call, translating rejections into the errors the SDK raises."""
+        try:
+            with self.backend.admit():
+                yield
+        except ProviderUnavailableError as e:
+            request = httpx.Request("POST", FAKE_ENDPOINT)
+            if e.throttled:
+                retry_after_ms = str(round(self.backend.median_ms))
+                response = httpx.Response(429, headers={"retry-after-ms": retry_after_ms}, request=request)
+                raise openai.RateLimitError("Too many requests", response=response, body=None) from e
+            response = httpx.Response(500, request=request)
+            raise openai.InternalServerError("Internal server error", response=response, body=None) from e
+
+    def is_closed(self) -> bool:
+        """Whether the client was closed."""
+        return self._closed
+
+    async def close(self) -> None:
+        """Close the client."""
+        self._closed = True
+
+
+class FakeSpeechAssessor:
+    """Stand-in for Azure Speech pronunciation assessment, taking time in proportion to the audio."""
+
+    def __init__(self, backend: FakeBackend):
+        """Initialize the assessor on a shared backend."""
+        self.backend = backend
+
+    async def assess(
+        self, audio: bytes, reference_text: Optional[str], settings: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Assess pronunciation of raw PCM audio.
+
+        Cheaper assessment settings take proportionally less time per second of audio, see
+        `relative_cost`, and without prosody assessment there is no prosody score.
+
+        Returns:
+            Dict[str, Any]: Result with the same fields as the Azure assessment
+
+        Raises:
+            ProviderUnavailableError: If the call is rejected or an error is injected
+        """
+        with self.backend.admit():
+            cost = relative_cost(settings) if settings else 1.0
+            await asyncio.sleep(self.backend.latency_seconds(len(audio) / FAKE_AUDIO_BYTES_PER_SECOND * cost))
+        digest = hashlib.sha256(audio + (reference_text or "").encode("utf-8")).digest()
+        scores = [60.0 + digest[index] % 41 for index in range(5)]
+        words = (reference_text or "").split() or FAKE_WORDS[: 1 + digest[5] % 8]
+        return {
+            "accuracy_score": scores[0],
+            "fluency_score": scores[1],
+            "completeness_score": scores[2],
+            "prosody_score": scores[3] if not settings or settings.get("enable_prosody") else None,
+            "pronunciation_score": scores[4],
+            "words": [
+                {
+                    "word": word,
+                    "accuracy": 50.0 + digest[(6 + index) % len(digest)] % 51,
+                    "error_type": "None",
+                }
+                for index, word in enumerate(words)
+            ],
+        }
+
+
+class FakeAgent:
+    """Agent returned by the fake agent service."""
+
+    def __init__(self, agent_id: str):
+        self.id = agent_id
+
+
+class FakeProjectClient:
+    """Stand-in for the AIProjectClient operations used by AgentManager."""
+
+    def __init__(self, backend: FakeBackend):
+        """Initialize the client on a shared backend."""
+        self.backend = backend
+        self.agents = self
+        self.created: Dict[str, Dict[str, Any]] = {}
+
+    def __enter__(self) -> "FakeProjectClient":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        return None
+
+    def create_agent(self, model: str, name: str, instructions: str, **_: Any) -> FakeAgent:
+        """Create an agent after the profile's latency."""
+        with self.backend.admit():
+            time.sleep(self.backend.latency_seconds())
+        agent_id = f"asst_{hashlib.sha256(name.encode('utf-8')).hexdigest()[:24]}"
+        self.created[agent_id] = {"model": model, "name": name, "instructions": instructions}
+        return FakeAgent(agent_id)
+
+    def delete_agent(self, agent_id: str) -> None:
+        """Delete an agent after the profile's latency."""
+        with self.backend.admit():
+            time.sleep(self.backend.latency_seconds())
+        self.created.pop(agent_id, None)
+
+
+def _fake_completion_content(arguments: Dict[str, Any]) -> str:
+    """Build the content of a fake completion, determined by the request's messages and response format."""
+    seed = hashlib.sha256(json.dumps(arguments.get("messages", []), sort_keys=True).encode("utf-8")).digest()
+    rng = random.Random(seed)
+    response_format = arguments.get("response_format") or {}
+    schema = response_format.get("json_schema", {}).get("schema")
+    if schema:
+        return json.dumps(_instance_of(schema, rng))
+    return " ".join(rng.choice(FAKE_WORDS) for _ in range(FAKE_TEXT_WORDS)).capitalize() + "."
+
+
+def _instance_of(schema: Dict[str, Any], rng: random.Random) -> Any:
+    """Build a value matching a JSON schema of objects, arrays, strings, integers, numbers and booleans."""
+    schema_type = schema.get("type")
+    if schema_type == "object":
+        return {name: _instance_of(child, rng) for name, child in schema.get("properties", {}).items()}
+    if schema_type == "array":
+        return [_instance_of(schema.get("items", {}), rng) for _ in range(FAKE_LIST_ITEMS)]
+    if schema_type == "integer":
+        return rng.randint(0, FAKE_MAX_SCORE)
+    if schema_type == "number":
+        return round(rng.uniform(0, FAKE_MAX_SCORE), 2)
+    if schema_type == "boolean":
+        return rng.random() < 0.5
+    words: List[str] = [rng.choice(FAKE_WORDS) for _ in range(6)]
+    return " ".join(words).capitalize() + "."
@@ -0,0 +1,230 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Limiting of model calls to a deployment's quota and to the concurrency it currently sustains."""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque
+
+from src.services.metrics import metrics
+
+# Constants
+SECONDS_PER_MINUTE = 60.0
+LIMITER_WAIT_METRIC = "rate_limiter_wait_ms"
+DEFAULT_DECREASE_INTERVAL_SECONDS = 1.0
+
+# Adaptive limiter metrics
+CONCURRENCY_LIMIT_METRIC = "model_concurrency_limit"
+CONCURRENCY_IN_FLIGHT_METRIC = "model_concurrency_in_flight"
+CONCURRENCY_WAITING_METRIC = "model_concurrency_waiting"
+CONCURRENCY_DECREASES_METRIC = "model_concurrency_decreases"
+
+
+class TokenBucket:
+    """A bucket holding up to `capacity` units that refills continuously at a fixed rate."""
+
+    def __init__(self, capacity: float, refill_per_second: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize a full token bucket.
+
+        Args:
+            capacity: Maximum units the bucket holds
+            refill_per_second: Units added per second
+            clock: Monotonic time source in seconds
+        """
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.clock = clock
+        self._available = capacity
+        self._updated_at = clock()
+
+    @property
+    def available(self) -> float:
+        """Units currently available."""
+        self._refill()
+        return self._available
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` units are available, capped at the bucket capacity."""
+        missing = min(amount, self.capacity) - self.available
+        return max(0.0, missing / self.refill_per_second)
+
+    def consume(self, amount: float) -> None:
+        """Take `amount` units, going into debt if fewer are available."""
+        self._refill()
+        self._available -= amount
+
+    def _refill(self) -> None:
+        """Add the units accrued since the last update."""
+        now = self.clock()
+        self._available = min(self.capacity, self._available + (now - self._updated_at) * self.refill_per_second)
+        self._updated_at = now
+
+
+class QuotaLimiter:
+    """
+    Paces model calls to a tokens-per-minute and requests-per-minute quota.
+
+    Each call reserves its estimated tokens and one request before it is sent. Callers wait in
+    arrival order, so a large request is not starved by a stream of small ones.
+    """
+
+    def __init__(self, tokens_per_minute: int, requests_per_minute: int, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the limiter with full buckets.
+
+        Args:
+            tokens_per_minute: Token quota of the deployment
+            requests_per_minute: Request quota of the deployment
+            clock: Monotonic time source in seconds
+        """
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / SECONDS_PER_MINUTE, clock)
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute / SECONDS_PER_MINUTE, clock)
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, estimated_tokens: int) -> float:
+        """
+        Wait until the quota allows a call of the estimated size and reserve it.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        waited = 0.0
+        async with self._lock:
+            while True:
+                delay = max(self.tokens.wait_time(estimated_tokens), self.requests.wait_time(1))
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+                waited += delay
+
+            self.tokens.consume(estimated_tokens)
+            self.requests.consume(1)
+
+        metrics.observe(LIMITER_WAIT_METRIC, waited * 1000)
+        return waited
+
+
+class AdaptiveConcurrencyLimiter:  # pylint: disable=too-many-instance-attributes
+    """
+    Bounds concurrent model calls with a limit that adapts to the backend (AIMD).
+
+    Each successful call raises the limit by 1/limit, so it grows by about one per round of calls.
+    A throttled call halves it, at most once per `decrease_interval_seconds` so a burst of 429s
+    from calls already in flight counts as one congestion signal. Waiters are served in arrival
+    order. The limiter is thread-safe and can be shared by calls on different event loops.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff_ratio: float = 0.5,
+        decrease_interval_seconds: float = DEFAULT_DECREASE_INTERVAL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            initial_limit: Concurrent calls allowed at first
+            min_limit: Lowest the limit can drop to
+            max_limit: Highest the limit can grow to
+            backoff_ratio: Factor the limit is multiplied by when calls are throttled
+            decrease_interval_seconds: Minimum time between two decreases
+            clock: Monotonic time source in seconds
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.backoff_ratio = backoff_ratio
+        self.decrease_interval_seconds = decrease_interval_seconds
+        self.clock = clock
+        self._limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self._in_flight = 0
+        self._waiters: "Deque[asyncio.Future[None]]" = deque()
+        self._last_decrease = float("-inf")
+        self._lock = threading.Lock()
+        self._publish()
+
+    @property
+    def limit(self) -> int:
+        """Concurrent calls currently allowed."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Calls currently holding a slot."""
+        return self._in_flight
+
+    async def acquire(self) -> None:
+        """Wait for a free slot and take it."""
+        with self._lock:
+            if not self._waiters and self._in_flight < self.limit:
+                self._in_flight += 1
+                self._publish()
+                return
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            self._publish()
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            with self._lock:
+                granted = waiter not in self._waiters
+                if not granted:
+                    self._waiters.remove(waiter)
+                    self._publish()
+            if granted:
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Return a slot and hand it to the next waiter."""
+        with self._lock:
+            self._in_flight -= 1
+            self._wake_waiters()
+            self._publish()
+
+    def on_success(self) -> None:
+        """Grow the limit additively after a successful call."""
+        with self._lock:
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            self._wake_waiters()
+            self._publish()
+
+    def on_throttle(self) -> None:
+        """Shrink the limit multiplicatively after a throttled call."""
+        with self._lock:
+            now = self.clock()
+            if now - self._last_decrease < self.decrease_interval_seconds:
+                return
+            self._last_decrease = now
+            self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+            metrics.increment(CONCURRENCY_DECREASES_METRIC)
+            self._publish()
+
+    def _wake_waiters(self) -> None:
+        """Grant free slots to waiters in arrival order. Called with the lock held."""
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            self._in_flight += 1
+            waiter.get_loop().call_soon_threadsafe(_resolve_waiter, waiter)
+
+    def _publish(self) -> None:
+        """Expose the limiter state as gauges."""
+        metrics.set_gauge(CONCURRENCY_LIMIT_METRIC, self.limit)
+        metrics.set_gauge(CONCURRENCY_IN_FLIGHT_METRIC, self._in_flight)
+        metrics.set_gauge(CONCURRENCY_WAITING_METRIC, len(self._waiters))
+
+
+def _resolve_waiter(waiter: "asyncio.Future[None]") -> None:
+    """Wake a waiter granted a slot, unless it was cancelled in the meantime."""
+    if not waiter.done():
+        waiter.set_result(None)
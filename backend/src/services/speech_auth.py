@@ -0,0 +1,80 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Cached authorization tokens for Azure Speech recognizers."""
+
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+import httpx
+from src.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+ISSUE_TOKEN_URL = "https://{region}.api.cognitive.microsoft.com/sts/v1.0/issueToken"
+# Tokens are valid for 10 minutes, refresh them a minute early
+TOKEN_LIFETIME_SECONDS = 540.0
+TOKEN_REQUEST_TIMEOUT_SECONDS = 10.0
+TOKEN_FETCHES_METRIC = "speech_auth_token_fetches"
+
+
+class SpeechTokenCache:
+    """
+    Issues Speech authorization tokens from the subscription key and shares them until they expire.
+
+    Recognizers are created on executor threads, so the cache is guarded by a lock and a
+    token is fetched at most once per lifetime however many segments are assessed at once.
+    """
+
+    def __init__(
+        self,
+        speech_key: str,
+        region: str,
+        lifetime_seconds: float = TOKEN_LIFETIME_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the token cache.
+
+        Args:
+            speech_key: Speech resource key used to issue tokens
+            region: Speech resource region
+            lifetime_seconds: How long an issued token is reused
+            clock: Monotonic time source
+        """
+        self.speech_key = speech_key
+        self.url = ISSUE_TOKEN_URL.format(region=region)
+        self.lifetime_seconds = lifetime_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+
+    def get_token(self) -> str:
+        """
+        Return a valid token, issuing a new one when the cached token has expired.
+
+        Raises:
+            httpx.HTTPError: If the token could not be issued
+        """
+        with self._lock:
+            if self._token is None or self._clock() >= self._expires_at:
+                self._token = self._fetch_token()
+                self._expires_at = self._clock() + self.lifetime_seconds
+            return self._token
+
+    def _fetch_token(self) -> str:
+        """Issue a token from the Speech token endpoint."""
+        response = httpx.post(
+            self.url,
+            headers={"Ocp-Apim-Subscription-Key": self.speech_key},
+            timeout=TOKEN_REQUEST_TIMEOUT_SECONDS,
+        )
+        response.raise_for_status()
+        metrics.increment(TOKEN_FETCHES_METRIC)
+        logger.info("Issued Speech authorization token")
+        return response.text
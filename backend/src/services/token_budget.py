@@ -0,0 +1,98 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Local token estimation and transcript budgeting for evaluation prompts."""
+
+from typing import Any, Dict, List
+
+from src.config import config
+from src.services.conversation_context import CHARS_PER_TOKEN
+
+# Scenario configuration keys
+TOKEN_BUDGET_KEY = "tokenBudget"
+MAX_TRANSCRIPT_TOKENS_KEY = "maxTranscriptTokens"
+CHUNK_TOKENS_KEY = "chunkTokens"
+CHUNK_OVERLAP_TURNS_KEY = "chunkOverlapTurns"
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a text without calling a tokenizer service."""
+    return len(text) // CHARS_PER_TOKEN
+
+
+class TokenBudget:
+    """
+    Transcript token budget of an evaluation scenario.
+
+    Transcripts within `max_transcript_tokens` are evaluated in a single call. Longer ones are
+    split into chunks of about `chunk_tokens`, each repeating the last `overlap_turns` turns of
+    the previous chunk for context.
+    """
+
+    def __init__(self, max_transcript_tokens: int, chunk_tokens: int, overlap_turns: int):
+        """
+        Initialize the token budget.
+
+        Args:
+            max_transcript_tokens: Largest transcript evaluated in one call, 0 for no limit
+            chunk_tokens: Target size of each transcript chunk
+            overlap_turns: Turns repeated at the start of the next chunk
+        """
+        self.max_transcript_tokens = max_transcript_tokens
+        self.chunk_tokens = chunk_tokens
+        self.overlap_turns = overlap_turns
+
+    @classmethod
+    def for_scenario(cls, scenario: Dict[str, Any]) -> "TokenBudget":
+        """Build the budget from a scenario's tokenBudget block, falling back to configuration."""
+        overrides = scenario.get(TOKEN_BUDGET_KEY) or {}
+        return cls(
+            max_transcript_tokens=int(
+                overrides.get(MAX_TRANSCRIPT_TOKENS_KEY, config["evaluation_max_transcript_tokens"])
+            ),
+            chunk_tokens=int(overrides.get(CHUNK_TOKENS_KEY, config["evaluation_chunk_tokens"])),
+            overlap_turns=int(overrides.get(CHUNK_OVERLAP_TURNS_KEY, config["evaluation_chunk_overlap_turns"])),
+        )
+
+    def requires_chunking(self, transcript_tokens: int) -> bool:
+        """Whether a transcript of this size exceeds the single-call budget."""
+        return 0 < self.max_transcript_tokens < transcript_tokens
+
+    def split(self, transcript: str) -> List[str]:
+        """
+        Split a transcript into chunks at turn boundaries.
+
+        Turns longer than a whole chunk are cut into pieces of the chunk size.
+
+        Returns:
+            List[str]: Chunks in conversation order
+        """
+        turns = self._split_long_turns([line for line in transcript.splitlines() if line.strip()])
+        chunks: List[List[str]] = []
+        current: List[str] = []
+        current_tokens = 0
+        overlap_count = 0
+
+        for turn in turns:
+            turn_tokens = estimate_tokens(turn)
+            if len(current) > overlap_count and current_tokens + turn_tokens > self.chunk_tokens:
+                chunks.append(current)
+                overlap_count = self.overlap_turns if 0 < self.overlap_turns < len(current) else 0
+                current = current[len(current) - overlap_count :]
+                current_tokens = sum(estimate_tokens(line) for line in current)
+            current.append(turn)
+            current_tokens += turn_tokens
+
+        if len(current) > overlap_count:
+            chunks.append(current)
+        return ["\n".join(chunk) for chunk in chunks]
+
+    def _split_long_turns(self, turns: List[str]) -> List[str]:
+        """Cut turns that do not fit in a chunk into chunk-sized pieces."""
+        max_chars = max(1, self.chunk_tokens * CHARS_PER_TOKEN)
+        pieces: List[str] = []
+        for turn in turns:
+            pieces.extend(turn[start : start + max_chars] for start in range(0, len(turn), max_chars))
+        return pieces
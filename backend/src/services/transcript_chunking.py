@@ -0,0 +1,84 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Evaluation of transcripts over the token budget in chunks, merged into one evaluation."""
+
+from typing import Any, Dict, List
+
+from src.services.evaluation_groups import (
+    CONTENT_DIMENSIONS,
+    MAX_IMPROVEMENTS_COUNT,
+    MAX_STRENGTHS_COUNT,
+    TONE_STYLE_DIMENSIONS,
+)
+from src.services.metrics import metrics
+from src.services.token_budget import TokenBudget, estimate_tokens
+
+# Metrics
+TRANSCRIPT_TOKENS_METRIC = "evaluation_transcript_tokens"
+
+
+def split_transcript(scenario: Dict[str, Any], transcript: str) -> List[str]:
+    """Split a transcript into chunks if it exceeds the scenario's token budget."""
+    transcript_tokens = estimate_tokens(transcript)
+    metrics.observe(TRANSCRIPT_TOKENS_METRIC, transcript_tokens)
+
+    budget = TokenBudget.for_scenario(scenario)
+    if not budget.requires_chunking(transcript_tokens):
+        return [transcript]
+    return budget.split(transcript)
+
+
+def frame_transcript_chunk(chunk: str, index: int, count: int) -> str:
+    """Introduce a transcript chunk so the model scores only the evidence it contains."""
+    return f"""PART {index + 1} OF {count} of a longer conversation. The first turns may repeat the end of the
+        previous part for context. Score only the evidence in this part.
+
+        {chunk}"""
+
+
+def merge_chunk_evaluations(results: List[Dict[str, Any]], weights: List[int]) -> Dict[str, Any]:
+    """
+    Merge evaluations of transcript chunks into one evaluation.
+
+    Tone and style describe the whole conversation, so they are averaged weighted by chunk size.
+    Content skills are demonstrated once, so each takes the best score of any chunk.
+    """
+    if not sum(weights):
+        weights = [1] * len(results)
+    total_weight = sum(weights)
+
+    speaking_tone_style = {
+        dimension: round(
+            sum(result["speaking_tone_style"][dimension] * weight for result, weight in zip(results, weights))
+            / total_weight
+        )
+        for dimension in TONE_STYLE_DIMENSIONS
+    }
+    conversation_content = {
+        dimension: max(result["conversation_content"][dimension] for result in results)
+        for dimension in CONTENT_DIMENSIONS
+    }
+
+    return {
+        "speaking_tone_style": speaking_tone_style,
+        "conversation_content": conversation_content,
+        "overall_score": sum(speaking_tone_style.values()) + sum(conversation_content.values()),
+        "strengths": merge_chunk_items([result["strengths"] for result in results], MAX_STRENGTHS_COUNT),
+        "improvements": merge_chunk_items([result["improvements"] for result in results], MAX_IMPROVEMENTS_COUNT),
+        "specific_feedback": " ".join(
+            result["specific_feedback"] for result in results if result.get("specific_feedback")
+        ),
+    }
+
+
+def merge_chunk_items(item_lists: List[List[str]], limit: int) -> List[str]:
+    """Interleave the items of each chunk, dropping duplicates, up to a limit."""
+    merged: List[str] = []
+    for position in range(max((len(items) for items in item_lists), default=0)):
+        for items in item_lists:
+            if position < len(items) and items[position] not in merged:
+                merged.append(items[position])
+    return merged[:limit]
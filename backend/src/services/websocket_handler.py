@@ -8,15 +8,29 @@
 import asyncio
 import json
 import logging
+import re
+import threading
+import time
 import uuid
-from typing import Any, Dict, Optional
+import weakref
+from typing import Any, Dict, Optional, Set, Tuple
 
 import simple_websocket.ws  # pyright: ignore[reportMissingTypeStubs]
 import websockets
 import websockets.asyncio.client
 
 from src.config import config
+from src.services.conversation_context import (
+    FIRST_RESPONSE_OUTPUT_TYPES,
+    ITEM_CREATED_TYPE,
+    ITEM_DELETED_TYPE,
+    ConversationContextManager,
+)
+from src.services.incremental_evaluation import ROLE_ASSISTANT, ROLE_USER, IncrementalEvaluator
+from src.services.live_pronunciation import TURN_EVENT_TYPES, LivePronunciationAssessor
 from src.services.managers import AgentManager
+from src.services.metrics import metrics
+from src.services.ws_compression import CompressionPolicy, apply_downstream_policy, build_upstream_connect_options
 
 logger = logging.getLogger(__name__)
 
@@ -38,23 +52,120 @@ DEFAULT_VOICE_TYPE = "azure-standard"
 # Message types
 SESSION_UPDATE_TYPE = "session.update"
 PROXY_CONNECTED_TYPE = "proxy.connected"
+PROXY_AUDIO_FLUSH_TYPE = "proxy.audio.flush"
+PROXY_ANALYSIS_COMPLETED_TYPE = "proxy.analysis.completed"
+PROXY_PRONUNCIATION_TURN_TYPE = "proxy.pronunciation.turn"
+INPUT_AUDIO_APPEND_TYPE = "input_audio_buffer.append"
 ERROR_TYPE = "error"
+SPEECH_STARTED_TYPE = "input_audio_buffer.speech_started"
+RESPONSE_CREATED_TYPE = "response.created"
+RESPONSE_DONE_TYPE = "response.done"
+AUDIO_DELTA_TYPE = "response.audio.delta"
+INPUT_TRANSCRIPTION_COMPLETED_TYPE = "conversation.item.input_audio_transcription.completed"
+AUDIO_TRANSCRIPT_DONE_TYPE = "response.audio_transcript.done"
+
+# Azure events the proxy consumes: parsed in full, reduced to their type, or (audio deltas) to their ids and audio
+PARSED_UPSTREAM_TYPES = frozenset(
+    (
+        RESPONSE_CREATED_TYPE,
+        RESPONSE_DONE_TYPE,
+        INPUT_TRANSCRIPTION_COMPLETED_TYPE,
+        AUDIO_TRANSCRIPT_DONE_TYPE,
+        ITEM_CREATED_TYPE,
+        ITEM_DELETED_TYPE,
+    )
+).union(TURN_EVENT_TYPES)
+TYPE_ONLY_UPSTREAM_TYPES = frozenset(FIRST_RESPONSE_OUTPUT_TYPES) - {AUDIO_DELTA_TYPE}
+EVENT_TYPE_PATTERN = re.compile(r'"type"\s*:\s*"([^"]*)"')
+EVENT_TYPE_SEARCH_LENGTH = 256
+AUDIO_DELTA_ID_PATTERN = re.compile(r'"(response_id|item_id)"\s*:\s*"([^"]*)"')
+AUDIO_DELTA_FIELD_PATTERN = re.compile(r'"delta"\s*:\s*"')
+
+# Barge-in metrics
+BARGE_IN_FLUSH_METRIC = "voice_barge_in_flush_ms"
+BARGE_IN_DROPPED_DELTAS_METRIC = "voice_barge_in_dropped_audio_deltas"
 
 # Log message truncation length
 LOG_MESSAGE_MAX_LENGTH = 100
 
 
+class BargeInController:
+    """Drops downstream assistant audio once the user starts talking over the response."""
+
+    def __init__(self):
+        """Initialize the per-connection barge-in state."""
+        self.active_response_id: Optional[str] = None
+        self.interrupted_response_ids: Set[str] = set()
+
+    def process(self, event: Dict[str, Any]) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """
+        Process an Azure event before it is forwarded to the client.
+
+        Args:
+            event: A parsed event received from the Voice Live API
+
+        Returns:
+            Tuple[bool, Optional[Dict[str, Any]]]: Whether to forward the event, and a flush
+            event to send to the client first, if any
+        """
+        event_type = event.get("type")
+
+        if event_type == RESPONSE_CREATED_TYPE:
+            self.active_response_id = event.get("response", {}).get("id")
+        elif event_type == RESPONSE_DONE_TYPE:
+            response_id = event.get("response", {}).get("id")
+            self.interrupted_response_ids.discard(response_id)
+            if response_id == self.active_response_id:
+                self.active_response_id = None
+        elif event_type == AUDIO_DELTA_TYPE:
+            if event.get("response_id") in self.interrupted_response_ids:
+                metrics.increment(BARGE_IN_DROPPED_DELTAS_METRIC)
+                return False, None
+        elif event_type == SPEECH_STARTED_TYPE:
+            return True, self._interrupt(event)
+
+        return True, None
+
+    def _interrupt(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """Mark the in-flight response as interrupted and build the client flush event."""
+        if self.active_response_id:
+            self.interrupted_response_ids.add(self.active_response_id)
+
+        return {
+            "type": PROXY_AUDIO_FLUSH_TYPE,
+            "response_id": self.active_response_id,
+            "audio_start_ms": event.get("audio_start_ms"),
+        }
+
+
 class VoiceProxyHandler:
     """Handles WebSocket proxy connections between client and Azure Voice API."""
 
-    def __init__(self, agent_manager: AgentManager):
+    def __init__(
+        self,
+        agent_manager: AgentManager,
+        incremental_evaluator: Optional[IncrementalEvaluator] = None,
+        live_pronunciation: Optional[LivePronunciationAssessor] = None,
+    ):
         """
         Initialize the voice proxy handler.
 
         Args:
             agent_manager: Agent manager instance
+            incremental_evaluator: Evaluates completed turns while the session is live, if provided
+            live_pronunciation: Assesses the pronunciation of user turns while the session is live, if provided
         """
         self.agent_manager = agent_manager
+        self.incremental_evaluator = incremental_evaluator
+        self.live_pronunciation = live_pronunciation
+        self.compression_policy = CompressionPolicy(
+            mode=config["ws_compression_policy"],
+            skip_types=config["ws_compression_skip_types"],
+            min_bytes=config["ws_compression_min_bytes"],
+        )
+        self._clients: Dict[str, simple_websocket.ws.Server] = {}
+        self._push_tasks: Set["asyncio.Task[None]"] = set()
+        self._send_locks: "weakref.WeakKeyDictionary[Any, threading.Lock]" = weakref.WeakKeyDictionary()
 
     async def handle_connection(self, client_ws: simple_websocket.ws.Server) -> None:
         """
@@ -66,6 +177,10 @@ class VoiceProxyHandler:
 
         azure_ws = None
         current_agent_id = None
+        evaluation_session_id = None
+        session_id = None
+        pronunciation_session_id = None
+        apply_downstream_policy(client_ws, self.compression_policy)
 
         try:
             current_agent_id = await self._get_agent_id_from_client(client_ws)
@@ -75,20 +190,68 @@ class VoiceProxyHandler:
                 await self._send_error(client_ws, "Failed to connect to Azure Voice API")
                 return
 
+            evaluation_session_id = self._start_evaluation_session(current_agent_id)
+            # Sessions without incremental evaluation still get an ID so analysis results can be pushed to them
+            session_id = evaluation_session_id or uuid.uuid4().hex
+            self._clients[session_id] = client_ws
+            if self.live_pronunciation and self.live_pronunciation.start_session(session_id):
+                pronunciation_session_id = session_id
             await self._send_message(
                 client_ws,
-                {"type": "proxy.connected", "message": "Connected to Azure Voice API"},
+                {
+                    "type": PROXY_CONNECTED_TYPE,
+                    "message": "Connected to Azure Voice API",
+                    "session_id": session_id,
+                },
             )
 
-            await self._handle_message_forwarding(client_ws, azure_ws)
+            await self._handle_message_forwarding(
+                client_ws,
+                azure_ws,
+                self._create_context_manager(),
+                BargeInController() if config["barge_in_flush_enabled"] else None,
+                evaluation_session_id,
+                pronunciation_session_id,
+            )
 
         except Exception as e:
             logger.error("Proxy error: %s", e)
             await self._send_error(client_ws, str(e))
 
         finally:
+            if session_id:
+                self._clients.pop(session_id, None)
             if azure_ws:
                 await azure_ws.close()
+            if self.incremental_evaluator and evaluation_session_id:
+                self.incremental_evaluator.end_session(evaluation_session_id)
+            if self.live_pronunciation and pronunciation_session_id:
+                self.live_pronunciation.end_session(pronunciation_session_id)
+
+    def push_analysis_job(self, job: Dict[str, Any]) -> None:
+        """
+        Push a finished analysis job to its session's client, if the client is still connected.
+
+        Must be called on a running event loop; the message is sent from an executor thread.
+        """
+        self._push(job.get("session_id") or "", {"type": PROXY_ANALYSIS_COMPLETED_TYPE, "job": job})
+
+    def push_pronunciation_turn(self, session_id: str, turn: Dict[str, Any]) -> None:
+        """
+        Push a user turn's live pronunciation assessment to the session's client, if still connected.
+
+        Must be called on a running event loop; the message is sent from an executor thread.
+        """
+        self._push(session_id, {"type": PROXY_PRONUNCIATION_TURN_TYPE, **turn})
+
+    def _push(self, session_id: str, message: Dict[str, Any]) -> None:
+        """Send a message to a session's client in the background."""
+        client_ws = self._clients.get(session_id)
+        if client_ws is None:
+            return
+        task = asyncio.get_running_loop().create_task(self._send_message(client_ws, message))
+        self._push_tasks.add(task)
+        task.add_done_callback(self._push_tasks.discard)
 
     async def _get_agent_id_from_client(self, client_ws: simple_websocket.ws.Server) -> Optional[str]:
         """Get agent ID from initial client message."""
@@ -106,6 +269,14 @@ class VoiceProxyHandler:
             logger.error("Error getting agent ID: %s", e)
             return None
 
+    def _start_evaluation_session(self, agent_id: Optional[str]) -> Optional[str]:
+        """Start incremental evaluation for the scenario behind the agent, if enabled."""
+        if not self.incremental_evaluator or not agent_id:
+            return None
+
+        agent_config = self.agent_manager.get_agent(agent_id)
+        return self.incremental_evaluator.start_session(agent_config.get("scenario_id") if agent_config else None)
+
     async def _connect_to_azure(self, agent_id: Optional[str]) -> Optional[websockets.asyncio.client.ClientConnection]:
         """Connect to Azure Voice API with appropriate configuration."""
         try:
@@ -120,7 +291,11 @@ class VoiceProxyHandler:
 
             headers = {"api-key": api_key}
 
-            azure_ws = await websockets.connect(azure_url, additional_headers=headers)
+            azure_ws = await websockets.connect(
+                azure_url,
+                additional_headers=headers,
+                **build_upstream_connect_options(self.compression_policy),
+            )
             logger.info("Connected to Azure Voice API with agent: %s", agent_id or "default")
 
             await self._send_initial_config(azure_ws, agent_config)
@@ -203,15 +378,32 @@ class VoiceProxyHandler:
         session["temperature"] = agent_config["temperature"]
         session["max_response_output_tokens"] = agent_config["max_tokens"]
 
+    def _create_context_manager(self) -> ConversationContextManager:
+        """Create the per-connection conversation context manager."""
+        return ConversationContextManager(
+            max_tokens=config["context_max_tokens"],
+            max_turns=config["context_max_turns"],
+            keep_recent_items=config["context_keep_recent_items"],
+            strategy=config["context_strategy"],
+        )
+
     async def _handle_message_forwarding(
         self,
         client_ws: simple_websocket.ws.Server,
         azure_ws: websockets.asyncio.client.ClientConnection,
+        context_manager: Optional[ConversationContextManager] = None,
+        barge_in: Optional[BargeInController] = None,
+        evaluation_session_id: Optional[str] = None,
+        pronunciation_session_id: Optional[str] = None,
     ) -> None:
         """Handle bidirectional message forwarding."""
         tasks = [
-            asyncio.create_task(self._forward_client_to_azure(client_ws, azure_ws)),
-            asyncio.create_task(self._forward_azure_to_client(azure_ws, client_ws)),
+            asyncio.create_task(self._forward_client_to_azure(client_ws, azure_ws, pronunciation_session_id)),
+            asyncio.create_task(
+                self._forward_azure_to_client(
+                    azure_ws, client_ws, context_manager, barge_in, evaluation_session_id, pronunciation_session_id
+                )
+            ),
         ]
 
         _, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
@@ -223,8 +415,9 @@ class VoiceProxyHandler:
         self,
         client_ws: simple_websocket.ws.Server,
         azure_ws: websockets.asyncio.client.ClientConnection,
+        pronunciation_session_id: Optional[str] = None,
     ) -> None:
-        """Forward messages from client to Azure."""
+        """Forward messages from client to Azure, capturing the user's audio for live pronunciation assessment."""
         try:
             while True:
                 message: Optional[Any] = await asyncio.get_event_loop().run_in_executor(
@@ -235,6 +428,9 @@ class VoiceProxyHandler:
                     break
                 logger.debug("Client->Azure: %s", message[:LOG_MESSAGE_MAX_LENGTH])
                 await azure_ws.send(message)
+                event = self._parse_client_event(message) if pronunciation_session_id else None
+                if pronunciation_session_id and event is not None:
+                    self._record_pronunciation_audio(pronunciation_session_id, event)
         except Exception:
             logger.debug("Client connection closed during forwarding")
 
@@ -242,30 +438,144 @@ class VoiceProxyHandler:
         self,
         azure_ws: websockets.asyncio.client.ClientConnection,
         client_ws: simple_websocket.ws.Server,
+        context_manager: Optional[ConversationContextManager] = None,
+        barge_in: Optional[BargeInController] = None,
+        evaluation_session_id: Optional[str] = None,
+        pronunciation_session_id: Optional[str] = None,
     ) -> None:
         """Forward messages from Azure to client."""
+        parse_events = (
+            context_manager is not None
+            or barge_in is not None
+            or evaluation_session_id is not None
+            or pronunciation_session_id is not None
+        )
         try:
             async for message in azure_ws:
+                received_at = time.perf_counter()
+                event = self._parse_upstream_event(message) if parse_events else None
+
+                if barge_in and event is not None:
+                    forward, flush_event = barge_in.process(event)
+                    if flush_event:
+                        await self._send_message(client_ws, flush_event)
+                        metrics.observe(BARGE_IN_FLUSH_METRIC, (time.perf_counter() - received_at) * 1000)
+                    if not forward:
+                        continue
+
                 logger.debug("Azure->Client: %s", message[:LOG_MESSAGE_MAX_LENGTH])
-                await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    client_ws.send,  # pyright: ignore[reportUnknownArgumentType,reportUnknownMemberType]
-                    message,
-                )
+                await self._send(client_ws, message)
+
+                if context_manager and event is not None:
+                    await self._manage_context(azure_ws, context_manager, event)
+                if evaluation_session_id and event is not None:
+                    self._record_evaluation_turn(evaluation_session_id, event)
+                if self.live_pronunciation and pronunciation_session_id and event is not None:
+                    self.live_pronunciation.record_event(pronunciation_session_id, event)
         except Exception:
             logger.debug("Client connection closed during forwarding")
 
-    async def _send_message(self, ws: simple_websocket.ws.Server, message: Dict[str, str | Dict[str, str]]) -> None:
+    async def _manage_context(
+        self,
+        azure_ws: websockets.asyncio.client.ClientConnection,
+        context_manager: ConversationContextManager,
+        event: Dict[str, Any],
+    ) -> None:
+        """Let the context manager observe an Azure event and send any compaction events upstream."""
+        for upstream_event in context_manager.observe_event(event):
+            await azure_ws.send(json.dumps(upstream_event))
+
+    def _record_evaluation_turn(self, session_id: str, event: Dict[str, Any]) -> None:
+        """Report completed user and assistant transcripts to the incremental evaluator."""
+        transcript = event.get("transcript")
+        if not self.incremental_evaluator or not transcript:
+            return
+
+        event_type = event.get("type")
+        if event_type == INPUT_TRANSCRIPTION_COMPLETED_TYPE:
+            self.incremental_evaluator.record_turn(session_id, ROLE_USER, transcript)
+        elif event_type == AUDIO_TRANSCRIPT_DONE_TYPE:
+            self.incremental_evaluator.record_turn(session_id, ROLE_ASSISTANT, transcript)
+
+    def _parse_client_event(self, message: str | bytes) -> Optional[Dict[str, Any]]:
+        """
+        Parse a client message once for the consumers of client events.
+
+        Only audio append events are consumed, so other messages are not parsed at all.
+        """
+        if not isinstance(message, str) or INPUT_AUDIO_APPEND_TYPE not in message:
+            return None
+        return self._parse_event(message)
+
+    def _parse_upstream_event(self, message: str | bytes) -> Optional[Dict[str, Any]]:
+        """
+        Parse an Azure message for the consumers of server events.
+
+        The event type is read from the start of the message, so events no consumer handles are not
+        parsed at all. Audio deltas, most of the stream, are reduced to their ids and audio and other
+        response deltas to their type, without parsing them.
+        """
+        if not isinstance(message, str):
+            return None
+        match = EVENT_TYPE_PATTERN.search(message, 0, EVENT_TYPE_SEARCH_LENGTH)
+        if match is None:
+            return self._parse_event(message)
+        event_type = match.group(1)
+        if event_type == AUDIO_DELTA_TYPE:
+            return self._audio_delta_fields(message)
+        if event_type in TYPE_ONLY_UPSTREAM_TYPES:
+            return {"type": event_type}
+        return self._parse_event(message) if event_type in PARSED_UPSTREAM_TYPES else None
+
+    @staticmethod
+    def _audio_delta_fields(message: str) -> Dict[str, Any]:
+        """Read the ids and the base64 audio of an audio delta event without parsing its JSON."""
+        event: Dict[str, Any] = {"type": AUDIO_DELTA_TYPE}
+        for match in AUDIO_DELTA_ID_PATTERN.finditer(message):
+            event.setdefault(match.group(1), match.group(2))
+        delta = AUDIO_DELTA_FIELD_PATTERN.search(message)
+        if delta is not None:
+            # Base64 has no characters JSON escapes, so the audio ends at the next quote
+            event["delta"] = message[delta.end() : message.find('"', delta.end())]
+        return event
+
+    def _record_pronunciation_audio(self, session_id: str, event: Dict[str, Any]) -> None:
+        """Hand the base64 audio of a client append event to the live pronunciation assessor."""
+        if self.live_pronunciation and event.get("type") == INPUT_AUDIO_APPEND_TYPE and event.get("audio"):
+            self.live_pronunciation.record_audio(session_id, event["audio"])
+
+    def _parse_event(self, message: str | bytes) -> Optional[Dict[str, Any]]:
+        """Parse a JSON event, returning None for binary or malformed messages."""
+        if not isinstance(message, str):
+            return None
+        try:
+            event = json.loads(message)
+        except ValueError:
+            return None
+        return event if isinstance(event, dict) else None
+
+    async def _send_message(self, ws: simple_websocket.ws.Server, message: Dict[str, Any]) -> None:
         """Send a JSON message to a WebSocket."""
         try:
-            await asyncio.get_event_loop().run_in_executor(
-                None,
-                ws.send,  # pyright: ignore[reportUnknownArgumentType,reportUnknownMemberType]
-                json.dumps(message),
-            )
+            await self._send(ws, json.dumps(message))
         except Exception:
             pass
 
+    async def _send(self, ws: simple_websocket.ws.Server, data: str | bytes) -> None:
+        """Send a message to a client WebSocket from an executor thread."""
+        await asyncio.get_event_loop().run_in_executor(None, self._send_serialized, ws, data)
+
+    def _send_serialized(self, ws: simple_websocket.ws.Server, data: str | bytes) -> None:
+        """
+        Send a message while holding the connection's send lock.
+
+        simple_websocket sends without a lock, and pushes from the analysis loop run alongside the
+        forwarding of Azure events, so unserialized sends could interleave frames and corrupt the
+        shared deflate context.
+        """
+        with self._send_locks.setdefault(ws, threading.Lock()):
+            ws.send(data)  # pyright: ignore[reportUnknownMemberType]
+
     async def _send_error(self, ws: simple_websocket.ws.Server, error_message: str) -> None:
         """Send an error message to a WebSocket."""
         await self._send_message(ws, {"type": "error", "error": {"message": error_message}})
@@ -0,0 +1,248 @@
+# ---------------------------------------------------------------------------------------------
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License. See LICENSE in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Per-message-type permessage-deflate policy for the voice proxy WebSockets."""
+
+import logging
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, cast
+
+import wsproto.extensions
+import wsproto.frame_protocol
+from websockets.extensions.base import Extension
+from websockets.extensions.permessage_deflate import ClientPerMessageDeflateFactory, PerMessageDeflate
+from websockets.frames import CTRL_OPCODES, OP_BINARY, OP_CONT, Frame
+from websockets.typing import ExtensionParameter
+
+from src.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Policy modes
+POLICY_ALL = "all"
+POLICY_NONE = "none"
+POLICY_SELECTIVE = "selective"
+
+# Frame categories
+CATEGORY_AUDIO = "audio"
+CATEGORY_CONTROL = "control"
+CATEGORY_BINARY = "binary"
+
+# Directions
+DIRECTION_UPSTREAM = "upstream"
+DIRECTION_DOWNSTREAM = "downstream"
+
+# Only the start of a frame is scanned for the event type
+EVENT_TYPE_SCAN_BYTES = 256
+EVENT_TYPE_PATTERN = re.compile(rb'"type"\s*:\s*"([^"]+)"')
+
+# Metrics
+RAW_BYTES_METRIC = "ws_compression_raw_bytes"
+WIRE_BYTES_METRIC = "ws_compression_wire_bytes"
+CPU_METRIC = "ws_compression_cpu_us"
+
+# Upstream deflate settings, matching the websockets defaults
+UPSTREAM_COMPRESS_SETTINGS = {"memLevel": 5}
+
+
+class CompressionPolicy:
+    """Decides per message whether permessage-deflate is worth its CPU cost."""
+
+    def __init__(self, mode: str = POLICY_SELECTIVE, skip_types: Iterable[str] = (), min_bytes: int = 0):
+        """
+        Initialize the compression policy.
+
+        Args:
+            mode: "all" compresses every message, "none" disables compression, "selective"
+                  skips binary frames, the given event types and messages smaller than min_bytes
+            skip_types: Event types that are never compressed in selective mode
+            min_bytes: Messages smaller than this are never compressed in selective mode
+        """
+        self.mode = mode
+        self.skip_types = frozenset(skip_types)
+        self.min_bytes = min_bytes
+
+    @property
+    def enabled(self) -> bool:
+        """Whether compression should be negotiated at all."""
+        return self.mode != POLICY_NONE
+
+    def classify(self, data: bytes, is_binary: bool) -> str:
+        """Classify a message as audio, control or binary."""
+        if is_binary:
+            return CATEGORY_BINARY
+        match = EVENT_TYPE_PATTERN.search(data[:EVENT_TYPE_SCAN_BYTES])
+        if match and match.group(1).decode("utf-8", "replace") in self.skip_types:
+            return CATEGORY_AUDIO
+        return CATEGORY_CONTROL
+
+    def should_compress(self, category: str, size: int) -> bool:
+        """Decide whether a message of the given category and size is compressed."""
+        if self.mode == POLICY_ALL:
+            return True
+        if self.mode == POLICY_NONE:
+            return False
+        return category == CATEGORY_CONTROL and size >= self.min_bytes
+
+
+class _CompressionStats:
+    """Records raw versus wire bytes and deflate CPU time per frame category."""
+
+    def __init__(self, direction: str):
+        self.direction = direction
+
+    def record(self, category: str, raw_bytes: int, wire_bytes: int, cpu_seconds: Optional[float]) -> None:
+        """Count one frame of a category, with its deflate CPU time when it was compressed."""
+        labels = {"direction": self.direction, "category": category}
+        metrics.increment(RAW_BYTES_METRIC, raw_bytes, labels)
+        metrics.increment(WIRE_BYTES_METRIC, wire_bytes, labels)
+        if cpu_seconds is not None:
+            metrics.observe(CPU_METRIC, cpu_seconds * 1_000_000, labels)
+
+
+class SelectiveDeflate(PerMessageDeflate):
+    """A websockets permessage-deflate extension with the parameters of a negotiated one and a per-message policy."""
+
+    def __init__(self, negotiated: PerMessageDeflate, policy: CompressionPolicy, direction: str = DIRECTION_UPSTREAM):
+        super().__init__(
+            negotiated.remote_no_context_takeover,
+            negotiated.local_no_context_takeover,
+            negotiated.remote_max_window_bits,
+            negotiated.local_max_window_bits,
+            negotiated.compress_settings,
+        )
+        self.policy = policy
+        self.stats = _CompressionStats(direction)
+        self._compress_message = True
+
+    def encode(self, frame: Frame) -> Frame:
+        """Compress an outgoing frame only if the policy allows it for this message."""
+        if frame.opcode in CTRL_OPCODES:
+            return frame
+
+        category = self.policy.classify(bytes(frame.data[:EVENT_TYPE_SCAN_BYTES]), frame.opcode == OP_BINARY)
+        if frame.opcode is not OP_CONT:
+            self._compress_message = self.policy.should_compress(category, len(frame.data))
+
+        if not self._compress_message:
+            self.stats.record(category, len(frame.data), len(frame.data), None)
+            return frame
+
+        start = time.perf_counter()
+        encoded = super().encode(frame)
+        self.stats.record(category, len(frame.data), len(encoded.data), time.perf_counter() - start)
+        return encoded
+
+
+class SelectiveClientPerMessageDeflateFactory(ClientPerMessageDeflateFactory):
+    """Client permessage-deflate factory producing policy-aware extensions."""
+
+    def __init__(self, policy: CompressionPolicy, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.policy = policy
+
+    def process_response_params(
+        self,
+        params: Sequence[ExtensionParameter],
+        accepted_extensions: Sequence[Extension],
+    ) -> PerMessageDeflate:
+        """Apply the compression policy to the negotiated extension."""
+        return SelectiveDeflate(super().process_response_params(params, accepted_extensions), self.policy)
+
+
+class SelectiveServerDeflate(wsproto.extensions.Extension):
+    """Wraps a negotiated wsproto permessage-deflate extension with a per-message policy."""
+
+    def __init__(
+        self,
+        inner: wsproto.extensions.Extension,
+        policy: CompressionPolicy,
+        direction: str = DIRECTION_DOWNSTREAM,
+    ):
+        self.inner = inner
+        self.name = inner.name
+        self.policy = policy
+        self.stats = _CompressionStats(direction)
+        self._compress_message = True
+
+    def enabled(self) -> bool:
+        return self.inner.enabled()
+
+    def offer(self) -> bool | str:
+        return self.inner.offer()
+
+    def accept(self, offer: str) -> bool | str | None:
+        return self.inner.accept(offer)
+
+    def finalize(self, offer: str) -> None:
+        self.inner.finalize(offer)
+
+    def frame_inbound_header(self, proto: Any, opcode: Any, rsv: Any, payload_length: int) -> Any:
+        return self.inner.frame_inbound_header(proto, opcode, rsv, payload_length)
+
+    def frame_inbound_payload_data(self, proto: Any, data: bytes) -> Any:
+        return self.inner.frame_inbound_payload_data(proto, data)
+
+    def frame_inbound_complete(self, proto: Any, fin: bool) -> Any:
+        return self.inner.frame_inbound_complete(proto, fin)
+
+    def frame_outbound(
+        self,
+        proto: Any,
+        opcode: wsproto.frame_protocol.Opcode,
+        rsv: wsproto.frame_protocol.RsvBits,
+        data: bytes,
+        fin: bool,
+    ) -> Tuple[wsproto.frame_protocol.RsvBits, bytes]:
+        """Compress an outgoing frame only if the policy allows it for this message."""
+        if opcode.iscontrol():
+            return rsv, data
+
+        category = self.policy.classify(data, opcode is wsproto.frame_protocol.Opcode.BINARY)
+        if opcode is not wsproto.frame_protocol.Opcode.CONTINUATION:
+            self._compress_message = self.policy.should_compress(category, len(data))
+
+        if not self._compress_message:
+            self.stats.record(category, len(data), len(data), None)
+            return rsv, data
+
+        start = time.perf_counter()
+        rsv, encoded = self.inner.frame_outbound(proto, opcode, rsv, data, fin)
+        self.stats.record(category, len(data), len(encoded), time.perf_counter() - start)
+        return rsv, encoded
+
+
+def build_upstream_connect_options(policy: CompressionPolicy) -> Dict[str, Any]:
+    """Build the websockets.connect() compression options for a policy."""
+    if not policy.enabled:
+        return {"compression": None}
+    factory = SelectiveClientPerMessageDeflateFactory(policy, compress_settings=UPSTREAM_COMPRESS_SETTINGS)
+    return {"compression": None, "extensions": [factory]}
+
+
+def apply_downstream_policy(client_ws: Any, policy: CompressionPolicy) -> bool:
+    """
+    Apply a compression policy to an accepted simple_websocket client connection.
+
+    simple_websocket always accepts permessage-deflate when the browser offers it, so the
+    negotiated extension is wrapped in place on the connection's frame protocol. That protocol
+    is private to simple_websocket and wsproto; the layout is the one of the pinned
+    simple-websocket version, and connections that do not have it are left as they are.
+
+    Returns:
+        bool: True if a negotiated deflate extension was found and wrapped
+    """
+    extensions = getattr(getattr(getattr(client_ws, "ws", None), "connection", None), "_proto", None)
+    extensions = getattr(extensions, "extensions", None)
+    if not isinstance(extensions, list):
+        logger.warning("Client connection does not expose frame extensions; compression policy not applied")
+        return False
+
+    for index, extension in enumerate(cast(List[Any], extensions)):
+        if isinstance(extension, wsproto.extensions.PerMessageDeflate):
+            extensions[index] = SelectiveServerDeflate(extension, policy)
+            return True
+    return False
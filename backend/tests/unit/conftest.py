@@ -0,0 +1,28 @@
+"""Shared fixtures for the unit tests."""
+
+import asyncio
+import threading
+from typing import Any
+
+import pytest
+
+
+class HangingCall:
+    """Coroutine function that never finishes on its own and records its cancellation."""
+
+    def __init__(self):
+        self.cancelled = threading.Event()
+
+    async def __call__(self, *_args: Any) -> Any:
+        """Sleep until cancelled."""
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            self.cancelled.set()
+            raise
+
+
+@pytest.fixture(name="hanging_call")
+def fixture_hanging_call():
+    """A coroutine function that hangs until it is cancelled."""
+    return HangingCall()
@@ -0,0 +1,82 @@
+"""Tests for acoustic fluency analytics."""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.services.acoustic_analytics import AcousticAnalyzer, analyze_session_acoustics, analyze_turn_acoustics
+
+SAMPLE_RATE = 24000
+
+
+def tone(seconds: float, amplitude: float, frequency: float = 180) -> np.ndarray:
+    """A tone, or silence at amplitude 0."""
+    return amplitude * np.sin(2 * np.pi * frequency * np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE)
+
+
+def to_pcm(audio: np.ndarray) -> bytearray:
+    """16-bit little-endian PCM of the samples."""
+    return bytearray(np.rint(audio).astype("<i2").tobytes())
+
+
+class TestAnalyzeTurnAcoustics:
+    """Test the analytics of a single turn."""
+
+    def test_rate_pauses_pitch_and_volume(self):
+        """Test speaking rate, pauses, pitch and volume spread of speech with one pause."""
+        audio = np.concatenate([tone(0.5, 0), tone(2, 8000), tone(0.5, 0), tone(1, 4000, 220), tone(0.5, 0)])
+
+        result = analyze_turn_acoustics(to_pcm(audio), "one two three four five six seven")
+
+        assert result is not None
+        assert result["duration_seconds"] == pytest.approx(3.5)
+        assert result["speech_seconds"] == pytest.approx(3.0)
+        assert result["speaking_rate_wpm"] == pytest.approx(120)
+        assert result["pause_ratio"] == pytest.approx(0.5 / 3.5, abs=0.01)
+        assert result["pause_count"] == 1
+        assert result["pitch_mean_hz"] == pytest.approx(180, rel=0.02)
+        assert result["pitch_variability_semitones"] > 1
+        assert result["volume_variability_db"] == pytest.approx(20 * np.log10(2) * np.sqrt(2 / 9), abs=0.1)
+
+    def test_noise_has_no_pitch_and_silence_no_result(self):
+        """Test unvoiced audio has no pitch and a turn without speech is not analyzed."""
+        noise = np.random.default_rng(0).normal(0, 3000, SAMPLE_RATE)
+
+        result = analyze_turn_acoustics(to_pcm(noise), "")
+
+        assert result is not None
+        assert result["pitch_mean_hz"] is None
+        assert result["speaking_rate_wpm"] is None
+        assert analyze_turn_acoustics(to_pcm(tone(1, 0)), "hello") is None
+
+
+class TestAnalyzeSessionAcoustics:
+    """Test the analytics of a session's user turns."""
+
+    def test_turns_weighted_by_speech_time(self):
+        """Test each turn is analyzed with its own text and the session values are weighted by speech time."""
+        audio = np.concatenate([tone(0.5, 0), tone(2, 6000, 150), tone(3, 0), tone(1, 6000, 300), tone(0.5, 0)])
+
+        result = analyze_session_acoustics(to_pcm(audio), ["one two three four", "five six"], min_silence_ms=400)
+
+        assert result is not None
+        assert [turn["turn"] for turn in result["turns"]] == [0, 1]
+        assert [turn["speaking_rate_wpm"] for turn in result["turns"]] == pytest.approx([120, 120], rel=0.02)
+        assert result["pitch_mean_hz"] == pytest.approx((2 * 150 + 300) / 3, rel=0.02)
+
+
+class TestAcousticAnalyzer:
+    """Test running the analytics off the event loop."""
+
+    def test_analyze_on_threads(self):
+        """Test the analytics run without worker processes and short or disabled recordings are skipped."""
+        pcm = to_pcm(np.concatenate([tone(1, 6000), tone(0.5, 0)]))
+        analyzer = AcousticAnalyzer(workers=0)
+
+        result = asyncio.run(analyzer.analyze(pcm, ["hello there"]))
+
+        assert result is not None
+        assert result["turns"][0]["speaking_rate_wpm"] == pytest.approx(120, rel=0.02)
+        assert asyncio.run(analyzer.analyze(pcm[:1000], ["hello"])) is None
+        assert asyncio.run(AcousticAnalyzer(enabled=False, workers=0).analyze(pcm, ["hello"])) is None
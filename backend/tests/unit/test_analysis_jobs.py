@@ -0,0 +1,171 @@
+"""Tests for the analysis job store and queue."""
+
+import asyncio
+import queue
+import threading
+import time
+
+import pytest
+
+from src.services.analysis_jobs import (
+    STATUS_COMPLETED,
+    STATUS_FAILED,
+    STATUS_QUEUED,
+    STATUS_RUNNING,
+    TIMED_OUT_ERROR,
+    AnalysisJobQueue,
+    AnalysisJobStore,
+)
+from src.services.metrics import metrics
+
+
+@pytest.fixture(name="loop")
+def fixture_loop():
+    """Run an event loop in a background thread, like the application's analysis loop."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield loop
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=1)
+
+
+class TestAnalysisJobStore:
+    """Test cases for AnalysisJobStore."""
+
+    def test_jobs_survive_reopening_and_stale_claims_are_requeued(self, tmp_path):
+        """Test queued and running jobs are still there after a restart and stale claims go back in the queue."""
+        path = str(tmp_path / "jobs.sqlite3")
+        store = AnalysisJobStore(path)
+        first = store.create({"transcript": "first"}, session_id="session-1")
+        second = store.create({"transcript": "second"})
+
+        claimed = store.claim_next()
+        assert claimed is not None
+        assert claimed["job_id"] == first["job_id"]
+        assert claimed["payload"] == {"transcript": "first"}
+
+        reopened = AnalysisJobStore(path)
+        assert reopened.get(first["job_id"])["status"] == STATUS_RUNNING
+        assert reopened.requeue_interrupted(stale_before=time.time() - 60) == 0
+        assert store.heartbeat() == 1
+        assert reopened.heartbeat() == 0
+        assert reopened.requeue_interrupted(stale_before=time.time() + 1) == 1
+        assert reopened.count(STATUS_QUEUED) == 2
+        assert reopened.claim_next()["job_id"] == first["job_id"]
+        assert reopened.claim_next()["job_id"] == second["job_id"]
+        assert reopened.claim_next() is None
+
+    def test_release_requeues_only_own_claims(self, tmp_path):
+        """Test a store releasing its claims leaves the claims of other stores running."""
+        path = str(tmp_path / "jobs.sqlite3")
+        store, other = AnalysisJobStore(path), AnalysisJobStore(path)
+        store.create({})
+        store.create({})
+        store.claim_next()
+        other.claim_next()
+
+        assert store.release() == 1
+        assert store.count(STATUS_RUNNING) == 1
+        assert store.count(STATUS_QUEUED) == 1
+
+    def test_finish_and_prune(self):
+        """Test results and errors are stored and finished jobs are pruned after their retention."""
+        store = AnalysisJobStore()
+        ok, failed = store.create({}), store.create({})
+        store.claim_next()
+        store.claim_next()
+
+        store.finish(ok["job_id"], result={"overall_score": 80})
+        store.finish(failed["job_id"], error="boom")
+
+        assert store.get(ok["job_id"])["result"] == {"overall_score": 80}
+        assert store.get(failed["job_id"])["error"] == "boom"
+        assert store.prune(finished_before=0) == 0
+        assert store.prune(finished_before=float("inf")) == 2
+
+
+class TestAnalysisJobQueue:
+    """Test cases for AnalysisJobQueue."""
+
+    def test_jobs_processed_with_bounded_concurrency_and_delivered(self, loop):
+        """Test workers process submitted jobs at most `workers` at a time and notify listeners."""
+        metrics.reset()
+        running = 0
+        peak = 0
+
+        async def process(payload):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            if payload["fail"]:
+                raise RuntimeError("analysis failed")
+            return {"echo": payload["index"]}
+
+        pushed: "queue.Queue[dict]" = queue.Queue()
+        job_queue = AnalysisJobQueue(process, lambda: loop, workers=2, on_finished=pushed.put)
+        jobs = [job_queue.submit({"index": i, "fail": i == 3}, session_id=f"session-{i}") for i in range(6)]
+
+        finished: "queue.Queue[dict]" = queue.Queue()
+        job_queue.subscribe(jobs[0]["job_id"], finished.put)
+        assert finished.get(timeout=2)["result"] == {"echo": 0}
+
+        results = {job["job_id"]: job for job in (pushed.get(timeout=2) for _ in jobs)}
+        assert results[jobs[3]["job_id"]]["status"] == STATUS_FAILED
+        assert results[jobs[5]["job_id"]]["status"] == STATUS_COMPLETED
+        assert peak == 2
+        assert metrics.snapshot()["gauges"]["analysis_jobs_queue_depth"] == 0
+
+        # Subscribing after the job finished delivers it right away
+        job_queue.subscribe(jobs[5]["job_id"], finished.put)
+        assert finished.get(timeout=2)["result"] == {"echo": 5}
+        job_queue.stop()
+
+    def test_slow_job_fails_at_timeout(self, loop, hanging_call):
+        """Test a job still running after the timeout is cancelled and stored as failed."""
+        pushed: "queue.Queue[dict]" = queue.Queue()
+        job_queue = AnalysisJobQueue(hanging_call, lambda: loop, timeout_seconds=0.05, on_finished=pushed.put)
+        job_queue.submit({})
+
+        job = pushed.get(timeout=2)
+        assert job["status"] == STATUS_FAILED
+        assert job["error"] == TIMED_OUT_ERROR
+        assert hanging_call.cancelled.wait(timeout=1)
+        job_queue.stop()
+
+    def test_stale_claims_of_stopped_process_are_processed(self, loop, tmp_path, monkeypatch):
+        """Test a running queue picks up jobs whose owner stopped refreshing its claim."""
+        monkeypatch.setattr("src.services.analysis_jobs.HEARTBEAT_INTERVAL_SECONDS", 0.02)
+        monkeypatch.setattr("src.services.analysis_jobs.STALE_CLAIM_SECONDS", 0.05)
+        path = str(tmp_path / "jobs.sqlite3")
+        stopped = AnalysisJobStore(path, owner="stopped")
+        job = stopped.create({"transcript": "hello"})
+        stopped.claim_next()
+        pushed: "queue.Queue[dict]" = queue.Queue()
+
+        async def process(payload):
+            return payload
+
+        job_queue = AnalysisJobQueue(process, lambda: loop, path=path, on_finished=pushed.put)
+        job_queue.start()
+
+        finished = pushed.get(timeout=2)
+        assert finished["job_id"] == job["job_id"]
+        assert finished["result"] == {"transcript": "hello"}
+        job_queue.stop()
+
+    def test_unopenable_store_falls_back_to_memory(self, loop, tmp_path):
+        """Test the queue still takes jobs when its database cannot be created."""
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+
+        async def process(payload):
+            return payload
+
+        job_queue = AnalysisJobQueue(process, lambda: loop, path=str(blocker / "jobs.sqlite3"))
+        job = job_queue.submit({"transcript": "hello"})
+
+        assert job_queue.get(job["job_id"]) is not None
+        job_queue.stop()
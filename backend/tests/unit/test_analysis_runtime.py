@@ -0,0 +1,55 @@
+"""Tests for the long-lived analysis runtime."""
+
+import asyncio
+
+import pytest
+
+from src.services.analysis_runtime import AnalysisRuntime
+from src.services.metrics import metrics
+
+
+@pytest.fixture(name="runtime")
+def fixture_runtime():
+    """Runtime with two loop threads, stopped after the test."""
+    runtime = AnalysisRuntime(loops=2)
+    yield runtime
+    runtime.stop()
+
+
+async def _current_loop() -> asyncio.AbstractEventLoop:
+    return asyncio.get_running_loop()
+
+
+class TestAnalysisRuntime:
+    """Test cases for AnalysisRuntime."""
+
+    def test_loops_reused_round_robin(self, runtime):
+        """Test requests are spread over the same long-lived loops and can target the primary loop."""
+        metrics.reset()
+        loops = [runtime.run(_current_loop()) for _ in range(4)]
+
+        assert loops[0] is loops[2] and loops[1] is loops[3]
+        assert loops[0] is not loops[1]
+        assert runtime.run(_current_loop(), loop=runtime.primary_loop) is runtime.primary_loop
+        assert metrics.snapshot()["histograms"]["analysis_runtime_scheduling_delay_ms"]["count"] == 5
+
+    def test_timeout_cancels_coroutine(self, runtime, hanging_call):
+        """Test a coroutine still running at the deadline is cancelled and the timeout counted."""
+        metrics.reset()
+
+        with pytest.raises(TimeoutError):
+            runtime.run(hanging_call(), timeout=0.05, loop=runtime.primary_loop)
+
+        assert hanging_call.cancelled.wait(timeout=1)
+        assert metrics.snapshot()["counters"]["analysis_runtime_timeouts"] == 1
+
+    def test_timeout_raised_by_coroutine_not_counted(self, runtime):
+        """Test a TimeoutError from the coroutine itself is raised without counting a runtime timeout."""
+        metrics.reset()
+
+        async def times_out():
+            raise asyncio.TimeoutError
+
+        with pytest.raises(TimeoutError):
+            runtime.run(times_out(), timeout=5)
+        assert "analysis_runtime_timeouts" not in metrics.snapshot()["counters"]
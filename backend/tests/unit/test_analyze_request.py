@@ -0,0 +1,60 @@
+"""Tests for the streaming analyze request parser."""
+
+import base64
+import io
+import json
+
+import pytest
+
+from src.services.analyze_request import InvalidRequestBody, parse_analyze_request
+from src.services.metrics import metrics
+
+
+def _chunk(chunk_type: str, data: bytes) -> dict:
+    return {"type": chunk_type, "data": base64.b64encode(data).decode("ascii"), "timestamp": "2025-01-01T00:00:00Z"}
+
+
+class TestParseAnalyzeRequest:
+    """Test cases for parse_analyze_request."""
+
+    @pytest.mark.parametrize("read_size", [1, 7, 64 * 1024])
+    def test_fields_parsed_and_only_user_audio_kept(self, read_size):
+        """Test other fields match json.loads and user audio is decoded in order, at any read size."""
+        metrics.reset()
+        body = {
+            "scenario_id": "scenario1",
+            "transcript": 'user: Say "hi" \\ café\nassistant: é 😀',
+            "audio_data": [
+                _chunk("user", b"\x01\x02\x03"),
+                _chunk("assistant", b"\xff" * 300),
+                {"data": base64.b64encode(b"\x04\x05").decode("ascii"), "type": "user"},
+                {"data": base64.b64encode(b"\xee" * 10).decode("ascii"), "type": "assistant"},
+                _chunk("user", b"\x06" * 100),
+            ],
+            "session_id": None,
+            "latency_slo_ms": 2500.5,
+            "turns": [{"role": "user", "content": "Hi", "started_at": 1700000000000, "final": True}],
+        }
+
+        fields, user_audio = parse_analyze_request(io.BytesIO(json.dumps(body).encode("utf-8")), read_size)
+
+        expected = dict(body)
+        del expected["audio_data"]
+        assert fields == expected
+        assert bytes(user_audio) == b"\x01\x02\x03\x04\x05" + b"\x06" * 100
+        assert metrics.snapshot()["counters"]["analyze_request_skipped_audio_bytes"] == 400 + 16
+
+    def test_invalid_audio_chunk_dropped(self):
+        """Test a user chunk that is not valid base64 is dropped and the others kept."""
+        body = {"audio_data": [{"type": "user", "data": "AAE"}, _chunk("user", b"\x07")]}
+
+        fields, user_audio = parse_analyze_request(io.BytesIO(json.dumps(body).encode("utf-8")))
+
+        assert not fields
+        assert bytes(user_audio) == b"\x07"
+
+    @pytest.mark.parametrize("body", [b"", b"[]", b'{"transcript": "unterminated', b'{"a": 1,}', b'{"a": nope}'])
+    def test_invalid_body_raises(self, body):
+        """Test bodies that are not a JSON object are rejected."""
+        with pytest.raises(InvalidRequestBody):
+            parse_analyze_request(io.BytesIO(body))
@@ -1,15 +1,19 @@
 """Tests for analyzer classes."""
 
-import base64
+import asyncio
 import json
+import os
 import tempfile
 from pathlib import Path
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 import yaml
 
-from src.services.analyzers import ConversationAnalyzer, PronunciationAssessor
+from src.services.analyzers import ConversationAnalyzer
+from src.services.deployment_pool import Deployment, DeploymentPool
+from src.services.evaluation_cache import EvaluationCache
+from src.services.model_router import ModelRouter
 
 
 class TestConversationAnalyzer:
@@ -41,29 +45,18 @@ class TestConversationAnalyzer:
             assert len(analyzer.evaluation_scenarios) == 1
             assert "test-scenario" in analyzer.evaluation_scenarios
 
-    @patch("src.services.analyzers.config")
-    def test_initialize_openai_client_missing_config(self, mock_config):
-        """Test OpenAI client initialization with missing config."""
-        mock_config.__getitem__.side_effect = lambda key: {
-            "azure_openai_endpoint": "",
-            "azure_openai_api_key": "",
-        }.get(key, "")
-
+    @pytest.mark.asyncio
+    @patch("src.services.analyzers.openai_clients")
+    async def test_analyze_conversation_openai_not_configured(self, mock_clients):
+        """Test analysis is skipped when Azure OpenAI is not configured."""
+        mock_clients.configured = False
         analyzer = ConversationAnalyzer()
-        assert analyzer.openai_client is None
+        analyzer.evaluation_scenarios = {"test-scenario": {"messages": [{"content": "Test scenario content"}]}}
 
-    @patch("src.services.analyzers.AzureOpenAI")
-    @patch("src.services.analyzers.config")
-    def test_initialize_openai_client_success(self, mock_config, mock_azure_openai):
-        """Test successful OpenAI client initialization."""
-        mock_config.__getitem__.side_effect = lambda key: {
-            "azure_openai_endpoint": "https://test.openai.azure.com",
-            "azure_openai_api_key": "test-key",
-        }.get(key, "")
+        result = await analyzer.analyze_conversation("test-scenario", "test transcript")
 
-        analyzer = ConversationAnalyzer()
-        assert analyzer.openai_client is not None
-        mock_azure_openai.assert_called_once()
+        assert result is None
+        mock_clients.get_client.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_analyze_conversation_missing_scenario(self):
@@ -141,225 +134,323 @@ class TestConversationAnalyzer:
         assert messages[1]["content"] == prompt
         assert "expert sales conversation evaluator" in messages[0]["content"]
 
-    # pylint: disable=R0801
-    def test_analyze_conversation_with_openai_client(self):
-        """Test analyzing conversation with mocked OpenAI client."""
+    def test_build_evaluation_plan_covers_chunks_and_groups(self):
+        """Test the plan holds one request per call: per chunk, and per group in parallel mode."""
         analyzer = ConversationAnalyzer()
+        budget = {"maxTranscriptTokens": 100, "chunkTokens": 60, "chunkOverlapTurns": 1}
+        analyzer.evaluation_scenarios = {
+            "single": {"messages": [{"content": "Test scenario content"}]},
+            "chunked": {"messages": [{"content": "Test scenario content"}], "tokenBudget": budget},
+            "parallel": {
+                "messages": [{"content": "Test scenario content"}],
+                "tokenBudget": budget,
+                "evaluationMode": "parallel",
+            },
+        }
+        transcript = "\n".join(f"user: question number {index} {'x' * 60}" for index in range(8))
 
-        # Mock OpenAI client and configuration
-        with patch("src.services.analyzers.config") as mock_config:
-            mock_config.__getitem__.side_effect = lambda key: {
-                "azure_openai_endpoint": "https://test.openai.azure.com",
-                "azure_openai_api_key": "test-key",
-                "api_version": "2024-02-01",
-                "model_deployment_name": "gpt-4",
-            }.get(key, "test-value")
-
-            mock_client = Mock()
-            mock_response = Mock()
-            mock_response.choices = [Mock()]
-            mock_response.choices[0].message.content = json.dumps(
-                {
-                    "professional_tone": 8,
-                    "active_listening": 7,
-                    "engagement_quality": 9,
-                    "needs_assessment": 20,
-                    "value_proposition": 22,
-                    "objection_handling": 18,
-                    "strengths": ["Good rapport"],
-                    "improvements": ["Ask more questions"],
-                }
-            )
-            mock_client.chat.completions.create.return_value = mock_response
-
-            # Recreate analyzer with proper config
-            analyzer = ConversationAnalyzer()
-            analyzer.openai_client = mock_client
+        chunks = analyzer.build_evaluation_plan("chunked", transcript)
 
-            # Mock scenario
-            analyzer.evaluation_scenarios = {"test-scenario": {"messages": [{"content": "Test scenario content"}]}}
+        assert len(analyzer.build_evaluation_plan("single", transcript)) == 1
+        assert len(chunks) > 1
+        assert len(analyzer.build_evaluation_plan("parallel", transcript)) == 3 * len(chunks)
+        assert analyzer.build_evaluation_plan("unknown", transcript) is None
 
-            # Test that the method exists and can be called
-            # Due to complexity of async mocking, we just verify the client is set
-            assert analyzer.openai_client is not None
+    # pylint: disable=R0801
+    @pytest.mark.asyncio
+    @patch("src.services.analyzers.openai_clients")
+    async def test_analyze_conversation_with_openai_client(self, mock_clients):
+        """Test analyzing conversation awaits the shared async OpenAI client."""
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = json.dumps(
+            {
+                "speaking_tone_style": {"professional_tone": 8, "active_listening": 7, "engagement_quality": 9},
+                "conversation_content": {"needs_assessment": 20, "value_proposition": 22, "objection_handling": 18},
+                "strengths": ["Good rapport"],
+                "improvements": ["Ask more questions"],
+            }
+        )
+        mock_client = Mock()
+        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+        mock_clients.configured = True
+        mock_clients.get_client.return_value = mock_client
 
+        analyzer = ConversationAnalyzer(evaluation_cache=EvaluationCache())
+        analyzer.evaluation_scenarios = {"test-scenario": {"messages": [{"content": "Test scenario content"}]}}
 
-# pylint: enable=R0801
+        result = await analyzer.analyze_conversation("test-scenario", "test transcript")
 
+        assert result is not None
+        assert result["speaking_tone_style"]["total"] == 24
+        assert result["conversation_content"]["total"] == 60
+        mock_client.chat.completions.create.assert_awaited_once()
 
-class TestPronunciationAssessor:
-    """Test pronunciation assessor functionality."""
+        cached = await analyzer.analyze_conversation("test-scenario", "  test   transcript \n")
 
-    def test_pronunciation_assessor_initialization(self):
-        """Test assessor initialization."""
-        assessor = PronunciationAssessor()
-        # Test that it initializes with config values
-        assert hasattr(assessor, "speech_key")
-        assert hasattr(assessor, "speech_region")
+        assert cached == result
+        mock_client.chat.completions.create.assert_awaited_once()
 
     @pytest.mark.asyncio
-    async def test_assess_pronunciation_no_speech_key(self):
-        """Test pronunciation assessment with no speech key configured."""
-        assessor = PronunciationAssessor()
-        assessor.speech_key = None
+    @patch("src.services.analyzers.openai_clients")
+    async def test_stream_conversation_analysis(self, mock_clients):
+        """Test streamed model output is yielded as partial events followed by the full result."""
+        text = json.dumps(
+            {
+                "speaking_tone_style": {"professional_tone": 8, "active_listening": 7, "engagement_quality": 9},
+                "conversation_content": {"needs_assessment": 20, "value_proposition": 22, "objection_handling": 18},
+                "overall_score": 84,
+                "strengths": ["Good rapport"],
+                "improvements": [],
+                "specific_feedback": "Solid",
+            }
+        )
 
-        result = await assessor.assess_pronunciation([], "test text")
-        assert result is None
+        async def token_stream():
+            for index in range(0, len(text), 7):
+                chunk = Mock()
+                chunk.choices = [Mock()]
+                chunk.choices[0].delta.content = text[index : index + 7]
+                yield chunk
+
+        mock_client = Mock()
+        mock_client.chat.completions.create = AsyncMock(return_value=token_stream())
+        mock_clients.get_client.return_value = mock_client
+        analyzer = ConversationAnalyzer(evaluation_cache=EvaluationCache())
+        analyzer.evaluation_scenarios = {"test-scenario": {"messages": [{"content": "Test scenario content"}]}}
+
+        events = [event async for event in analyzer.stream_conversation_analysis("test-scenario", "transcript")]
+
+        assert events[0]["type"] == "score"
+        assert {"type": "strength", "index": 0, "value": "Good rapport"} in events
+        assert events[-1]["type"] == "ai_assessment"
+        assert events[-1]["value"]["conversation_content"]["total"] == 60
+        assert mock_client.chat.completions.create.call_args.kwargs["stream"] is True
+
+        cached_events = [event async for event in analyzer.stream_conversation_analysis("test-scenario", "transcript")]
+
+        assert cached_events == [events[-1]]
 
     @pytest.mark.asyncio
-    async def test_prepare_audio_data_empty_list(self):
-        """Test preparing audio data with empty list."""
-        assessor = PronunciationAssessor()
-        result = await assessor._prepare_audio_data([])
-        assert len(result) == 0
+    @patch("src.services.analyzers.openai_clients")
+    async def test_update_running_evaluation(self, mock_clients):
+        """Test running evaluation updates send only new turns plus the previous assessment and notes."""
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = json.dumps(
+            {
+                "speaking_tone_style": {"professional_tone": 8, "active_listening": 7, "engagement_quality": 9},
+                "conversation_content": {"needs_assessment": 20, "value_proposition": 22, "objection_handling": 18},
+                "dimension_notes": {"active_listening": "Asked about integration needs"},
+            }
+        )
+        mock_client = Mock()
+        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+        mock_clients.get_client.return_value = mock_client
+        analyzer = ConversationAnalyzer(evaluation_cache=EvaluationCache())
+        analyzer.evaluation_scenarios = {"test-scenario": {"messages": [{"content": "Test scenario content"}]}}
+
+        result = await analyzer.update_running_evaluation(
+            "test-scenario", {"overall_score": 40}, "user: What systems do you use today?"
+        )
+
+        assert result is not None
+        assert result["speaking_tone_style"]["total"] == 24
+        assert result["dimension_notes"]["active_listening"] == "Asked about integration needs"
+        request = mock_client.chat.completions.create.call_args.kwargs
+        prompt = request["messages"][1]["content"]
+        assert '{"overall_score": 40}' in prompt
+        assert "user: What systems do you use today?" in prompt
+        schema = request["response_format"]["json_schema"]["schema"]
+        assert "dimension_notes" in schema["required"]
+        assert "objection_handling" in schema["properties"]["dimension_notes"]["required"]
+        assert "dimension_notes" not in analyzer._get_response_format()["json_schema"]["schema"]["required"]
 
     @pytest.mark.asyncio
-    async def test_prepare_audio_data_with_user_chunks(self):
-        """Test preparing audio data with user chunks."""
-        assessor = PronunciationAssessor()
-
-        # Create test audio data
-        test_audio = b"test audio data"
-        encoded_audio = base64.b64encode(test_audio).decode("utf-8")
-
-        audio_data = [
-            {"type": "user", "data": encoded_audio},
-            {"type": "assistant", "data": "should be ignored"},
-        ]
-
-        result = await assessor._prepare_audio_data(audio_data)
-        assert len(result) > 0
-        assert test_audio in result
-
-    def test_create_wav_audio(self):
-        """Test creating WAV audio from raw bytes."""
-        assessor = PronunciationAssessor()
-        test_audio = bytearray(b"test audio data" * 100)  # Make it longer
-
-        wav_audio = assessor._create_wav_audio(test_audio)
-        assert isinstance(wav_audio, bytes)
-        assert len(wav_audio) > len(test_audio)  # WAV header adds overhead
-
-    def test_extract_word_details_empty_result(self):
-        """Test extracting word details from empty result."""
-        assessor = PronunciationAssessor()
-
-        # Mock result object
-        mock_result = Mock()
-        mock_result.properties.get.return_value = "{}"
-
-        words = assessor._extract_word_details(mock_result)
-        assert not words
-
-    def test_extract_word_details_with_words(self):
-        """Test extracting word details with actual words."""
-        assessor = PronunciationAssessor()
-
-        # Mock result with word data
-        mock_result = Mock()
-        test_response = {
-            "NBest": [
-                {
-                    "Words": [
-                        {
-                            "Word": "hello",
-                            "PronunciationAssessment": {
-                                "AccuracyScore": 85,
-                                "ErrorType": "None",
-                            },
-                        },
-                        {
-                            "Word": "world",
-                            "PronunciationAssessment": {
-                                "AccuracyScore": 90,
-                                "ErrorType": "None",
-                            },
-                        },
-                    ]
-                }
-            ]
+    @patch("src.services.analyzers.openai_clients")
+    async def test_analyze_long_conversation_in_chunks(self, mock_clients):
+        """Test transcripts over the token budget are evaluated per chunk behind a shared rubric prefix."""
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = json.dumps(
+            {
+                "speaking_tone_style": {"professional_tone": 8, "active_listening": 7, "engagement_quality": 9},
+                "conversation_content": {"needs_assessment": 20, "value_proposition": 22, "objection_handling": 18},
+                "overall_score": 84,
+                "strengths": ["Good rapport"],
+                "improvements": ["Ask more questions"],
+                "specific_feedback": "Solid",
+            }
+        )
+        mock_client = Mock()
+        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+        mock_clients.configured = True
+        mock_clients.get_client.return_value = mock_client
+        analyzer = ConversationAnalyzer(evaluation_cache=EvaluationCache())
+        scenario = {
+            "messages": [{"content": "Test scenario content"}],
+            "tokenBudget": {"maxTranscriptTokens": 100, "chunkTokens": 60, "chunkOverlapTurns": 1},
         }
-        mock_result.properties.get.return_value = json.dumps(test_response)
-
-        words = assessor._extract_word_details(mock_result)
+        analyzer.evaluation_scenarios = {"test-scenario": scenario}
+        transcript = "\n".join(f"user: question number {index} {'x' * 60}" for index in range(8))
 
-        assert len(words) == 2
-        assert words[0]["word"] == "hello"
-        assert words[0]["accuracy"] == 85
-        assert words[1]["word"] == "world"
-        assert words[1]["accuracy"] == 90
+        result = await analyzer.analyze_conversation("test-scenario", transcript)
 
-    def test_extract_word_details_with_error_types(self):
-        """Test extracting word details with different error types."""
-        assessor = PronunciationAssessor()
+        assert result is not None
+        assert result["overall_score"] == 84
+        assert mock_client.chat.completions.create.await_count > 1
+        rubric = analyzer._build_rubric(scenario)
+        prompts = [call.kwargs["messages"][1]["content"] for call in mock_client.chat.completions.create.call_args_list]
+        assert all(prompt.startswith(rubric) for prompt in prompts)
+        assert "PART 1 OF" in prompts[0]
 
-        mock_result = Mock()
-        test_response = {
-            "NBest": [
-                {
-                    "Words": [
-                        {
-                            "Word": "mispronounced",
-                            "PronunciationAssessment": {
-                                "AccuracyScore": 45,
-                                "ErrorType": "Mispronunciation",
-                            },
-                        },
-                        {
-                            "Word": "omitted",
-                            "PronunciationAssessment": {
-                                "AccuracyScore": 0,
-                                "ErrorType": "Omission",
-                            },
-                        },
-                    ]
-                }
-            ]
+    @pytest.mark.asyncio
+    @patch("src.services.analyzers.openai_clients")
+    async def test_analyze_conversation_parallel_mode(self, mock_clients):
+        """Test parallel mode requests each group of fields concurrently and merges them into one result."""
+        parts = {
+            "sales_evaluation_tone_style": {
+                "speaking_tone_style": {"professional_tone": 8, "active_listening": 7, "engagement_quality": 9}
+            },
+            "sales_evaluation_content": {
+                "conversation_content": {"needs_assessment": 20, "value_proposition": 22, "objection_handling": 18}
+            },
+            "sales_evaluation_feedback": {
+                "strengths": ["Good rapport"],
+                "improvements": ["Ask more questions"],
+                "specific_feedback": "Solid",
+            },
         }
-        mock_result.properties.get.return_value = json.dumps(test_response)
 
-        words = assessor._extract_word_details(mock_result)
-
-        assert len(words) == 2
-        assert words[0]["error_type"] == "Mispronunciation"
-        assert words[1]["error_type"] == "Omission"
+        async def create(**request):
+            response = Mock()
+            response.choices = [Mock()]
+            response.choices[0].message.content = json.dumps(parts[request["response_format"]["json_schema"]["name"]])
+            return response
+
+        mock_client = Mock()
+        mock_client.chat.completions.create = AsyncMock(side_effect=create)
+        mock_clients.configured = True
+        mock_clients.get_client.return_value = mock_client
+        analyzer = ConversationAnalyzer(evaluation_cache=EvaluationCache())
+        analyzer.evaluation_scenarios = {
+            "test-scenario": {"messages": [{"content": "Test scenario content"}], "evaluationMode": "parallel"}
+        }
 
-    def test_extract_word_details_malformed_json(self):
-        """Test extracting word details with malformed JSON."""
-        assessor = PronunciationAssessor()
+        result = await analyzer.analyze_conversation("test-scenario", "test transcript")
 
-        mock_result = Mock()
-        mock_result.properties.get.return_value = "invalid json"
+        assert result is not None
+        assert result["speaking_tone_style"]["total"] == 24
+        assert result["conversation_content"]["total"] == 60
+        assert result["overall_score"] == 84
+        assert result["specific_feedback"] == "Solid"
+        assert mock_client.chat.completions.create.await_count == 3
+        requests = [call.kwargs for call in mock_client.chat.completions.create.call_args_list]
+        assert requests[0]["response_format"]["json_schema"]["schema"]["required"] == ["speaking_tone_style"]
+        assert requests[2]["messages"][1]["content"].rstrip().endswith("specific feedback.")
+        shared_prefix = analyzer._build_evaluation_prompt(
+            analyzer.evaluation_scenarios["test-scenario"], "test transcript"
+        ).rstrip()
+        assert all(request["messages"][1]["content"].startswith(shared_prefix) for request in requests)
 
-        words = assessor._extract_word_details(mock_result)
+    @pytest.mark.asyncio
+    @patch("src.services.analyzers.openai_clients")
+    async def test_stream_conversation_analysis_parallel_mode(self, mock_clients):
+        """Test parallel mode interleaves events from every group stream before the merged result."""
+        parts = {
+            "sales_evaluation_tone_style": {
+                "speaking_tone_style": {"professional_tone": 8, "active_listening": 7, "engagement_quality": 9}
+            },
+            "sales_evaluation_content": {
+                "conversation_content": {"needs_assessment": 20, "value_proposition": 22, "objection_handling": 18}
+            },
+            "sales_evaluation_feedback": {"strengths": ["Good rapport"], "improvements": [], "specific_feedback": ""},
+        }
 
-        assert not words
+        async def token_stream(text):
+            for index in range(0, len(text), 7):
+                chunk = Mock()
+                chunk.choices = [Mock()]
+                chunk.choices[0].delta.content = text[index : index + 7]
+                yield chunk
+
+        async def create(**request):
+            return token_stream(json.dumps(parts[request["response_format"]["json_schema"]["name"]]))
+
+        mock_client = Mock()
+        mock_client.chat.completions.create = AsyncMock(side_effect=create)
+        mock_clients.get_client.return_value = mock_client
+        analyzer = ConversationAnalyzer(evaluation_cache=EvaluationCache())
+        analyzer.evaluation_scenarios = {
+            "test-scenario": {"messages": [{"content": "Test scenario content"}], "evaluationMode": "parallel"}
+        }
 
-    def test_assess_pronunciation_with_valid_audio(self):
-        """Test pronunciation assessment with valid audio data setup."""
-        assessor = PronunciationAssessor()
+        events = [event async for event in analyzer.stream_conversation_analysis("test-scenario", "transcript")]
 
-        # Mock the speech services
-        assessor.speech_key = "test-key"
-        assessor.speech_region = "test-region"
+        sections = {event["section"] for event in events if event["type"] == "score"}
+        assert sections == {"speaking_tone_style", "conversation_content"}
+        assert {"type": "strength", "index": 0, "value": "Good rapport"} in events
+        assert events[-1]["type"] == "ai_assessment"
+        assert events[-1]["value"]["overall_score"] == 84
 
-        # Test that the method exists and can handle basic setup
-        assert hasattr(assessor, "assess_pronunciation")
-        assert callable(assessor.assess_pronunciation)
+    @pytest.mark.asyncio
+    @patch("src.services.analyzers.openai_clients")
+    async def test_shadow_mode_scores_with_both_tiers(self, mock_clients):
+        """Test shadow mode serves the large tier and scores fast-tier inputs with the fast tier in the background."""
+        scores = {"gpt-4o": 9, "gpt-4o-mini": 5}
+
+        async def create(**request):
+            score = scores[request["model"]]
+            response = Mock()
+            response.choices = [Mock()]
+            response.choices[0].message.content = json.dumps(
+                {
+                    "speaking_tone_style": {"professional_tone": score, "active_listening": 7, "engagement_quality": 9},
+                    "conversation_content": {"needs_assessment": 20, "value_proposition": 22, "objection_handling": 18},
+                    "strengths": [],
+                    "improvements": [],
+                    "specific_feedback": "",
+                }
+            )
+            return response
+
+        mock_client = Mock()
+        mock_client.chat.completions.create = AsyncMock(side_effect=create)
+        mock_clients.configured = True
+        mock_clients.get_client.return_value = mock_client
+        pool = DeploymentPool(
+            [Deployment("https://test", "key", "gpt-4o"), Deployment("https://test", "key", "gpt-4o-mini", "fast")]
+        )
+        router = ModelRouter("gpt-4o-mini", "gpt-4o", enabled=True, shadow_mode=True, disagreement_threshold=3)
+        analyzer = ConversationAnalyzer(evaluation_cache=EvaluationCache(), deployment_pool=pool, model_router=router)
+        analyzer.evaluation_scenarios = {"test-scenario": {"messages": [{"content": "Test scenario content"}]}}
+
+        with patch.object(router, "compare", wraps=router.compare) as compare:
+            result = await analyzer.analyze_conversation("test-scenario", "user: short transcript")
+            await asyncio.gather(*analyzer._shadow_tasks)
+
+        assert result is not None
+        assert result["speaking_tone_style"]["professional_tone"] == 9
+        models = [call.kwargs["model"] for call in mock_client.chat.completions.create.call_args_list]
+        assert models == ["gpt-4o", "gpt-4o-mini"]
+        served, shadow, _ = compare.call_args.args
+        assert (served["overall_score"], shadow["overall_score"]) == (85, 81)
 
     @pytest.mark.asyncio
-    async def test_prepare_audio_data_mixed_speakers(self):
-        """Test preparing audio data with mixed user and assistant chunks."""
-        assessor = PronunciationAssessor()
+    async def test_evaluation_cache_invalidated_when_prompt_file_changes(self):
+        """Test editing the evaluation prompt file reloads it and bypasses cached results."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            prompt_file = Path(temp_dir) / "test-scenario-evaluation.prompt.yml"
+            prompt_file.write_text(yaml.dump({"messages": [{"content": "Version one"}]}), encoding="utf-8")
+            analyzer = ConversationAnalyzer(scenario_dir=Path(temp_dir), evaluation_cache=EvaluationCache())
+            first_key = analyzer._evaluation_cache_key("test-scenario", "transcript")
+
+            prompt_file.write_text(yaml.dump({"messages": [{"content": "Version two!"}]}), encoding="utf-8")
+            os.utime(prompt_file, ns=(0, prompt_file.stat().st_mtime_ns + 1_000_000))
+            analyzer._refresh_evaluation_scenario("test-scenario")
 
-        audio_data = [
-            {"chunk": base64.b64encode(b"user audio").decode(), "user": True},
-            {"chunk": base64.b64encode(b"assistant audio").decode(), "user": False},
-            {"chunk": base64.b64encode(b"more user audio").decode(), "user": True},
-        ]
+            assert analyzer.evaluation_scenarios["test-scenario"]["messages"][0]["content"] == "Version two!"
+            assert analyzer._evaluation_cache_key("test-scenario", "transcript") != first_key
 
-        result = await assessor._prepare_audio_data(audio_data)
 
-        # Should include some audio data (user chunks are processed)
-        assert isinstance(result, (bytes, bytearray))
-        # The actual filtering logic depends on implementation details
+# pylint: enable=R0801
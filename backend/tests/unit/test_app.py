@@ -1,7 +1,9 @@
 """Tests for the Flask application endpoints."""
 
+import asyncio
 import json
-from unittest.mock import patch
+import time
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from flask.testing import FlaskClient
@@ -235,3 +237,349 @@ class TestFlaskApp:
         from src.app import _perform_conversation_analysis  # pylint: disable=C0415
 
         assert callable(_perform_conversation_analysis)
+
+    def test_get_metrics_route(self):
+        """Test the /api/metrics endpoint."""
+        response = self.client.get("/api/metrics")
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert set(data) == {"counters", "gauges", "histograms"}
+
+    def test_run_async_reuses_analysis_loop(self):
+        """Test coroutines from different requests run on the same long-lived event loop."""
+        from src.app import _run_async  # pylint: disable=C0415
+
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        first = _run_async(current_loop())
+        second = _run_async(current_loop())
+
+        assert first is second
+        assert first.is_running()
+
+
+class TestAnalyzeRoutes:
+    """Test cases for the conversation analysis endpoints."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        app.config["TESTING"] = True
+        self.client: FlaskClient = app.test_client()  # pylint: disable=attribute-defined-outside-init
+
+    @patch("src.app.analysis_runtime")
+    def test_analyze_times_out(self, mock_runtime):
+        """Test /api/analyze answers 504 once the analysis runs past the request timeout."""
+
+        def time_out(coroutine, *_):
+            coroutine.close()
+            raise TimeoutError
+
+        mock_runtime.run.side_effect = time_out
+
+        response = self.client.post("/api/analyze", json={"scenario_id": "test-scenario", "transcript": "user: Hi"})
+
+        assert response.status_code == 504
+
+    @patch("src.app.pronunciation_assessor")
+    @patch("src.app.conversation_analyzer")
+    def test_analyze_stream_route(self, mock_analyzer, mock_assessor):
+        """Test the streaming analyze endpoint emits partial events, both results and a done event."""
+
+        async def stream(*_):
+            yield {"type": "overall_score", "value": 84}
+            yield {"type": "ai_assessment", "value": {"overall_score": 84}}
+
+        async def assess(*_):
+            return {"accuracy_score": 90}
+
+        mock_analyzer.stream_conversation_analysis = stream
+        mock_assessor.assess_pronunciation = assess
+
+        response = self.client.post("/api/analyze/stream", json={"scenario_id": "scenario1", "transcript": "hello"})
+
+        assert response.status_code == 200
+        assert response.mimetype == "text/event-stream"
+        events = [json.loads(line[6:]) for line in response.get_data(as_text=True).splitlines() if line[:6] == "data: "]
+        event_types = [event["type"] for event in events]
+        assert event_types.index("overall_score") < event_types.index("ai_assessment")
+        assert {"type": "pronunciation_assessment", "value": {"accuracy_score": 90}} in events
+        assert event_types[-1] == "done"
+
+    @patch("src.app.pronunciation_assessor")
+    @patch("src.app.conversation_analyzer")
+    @patch("src.app.incremental_evaluator")
+    def test_analyze_uses_incremental_evaluation(self, mock_evaluator, mock_analyzer, mock_assessor):
+        """Test a live session's consolidated evaluation is returned instead of a full evaluation."""
+
+        async def consolidate(*_):
+            return {"overall_score": 84}
+
+        async def assess(*_):
+            return None
+
+        mock_evaluator.consolidate = consolidate
+        mock_analyzer.analyze_conversation = AsyncMock()
+        mock_assessor.assess_pronunciation = assess
+
+        response = self.client.post(
+            "/api/analyze", json={"scenario_id": "scenario1", "transcript": "hello", "session_id": "session-1"}
+        )
+
+        assert json.loads(response.data)["ai_assessment"] == {"overall_score": 84}
+        mock_analyzer.analyze_conversation.assert_not_called()
+
+    @patch("src.app.pronunciation_assessor")
+    @patch("src.app.conversation_analyzer")
+    @patch("src.app.live_pronunciation")
+    def test_analyze_uses_live_pronunciation(self, mock_live, mock_analyzer, mock_assessor):
+        """Test a live session's combined turn assessments are returned instead of assessing the audio."""
+        mock_live.consolidate = AsyncMock(return_value={"pronunciation_score": 88})
+        mock_analyzer.analyze_conversation = AsyncMock(return_value=None)
+        mock_assessor.assess_pronunciation = AsyncMock()
+
+        response = self.client.post(
+            "/api/analyze",
+            json={
+                "scenario_id": "scenario1",
+                "transcript": "user: Hi\nassistant: Hello\nuser: Bye",
+                "session_id": "session-1",
+            },
+        )
+
+        assert json.loads(response.data)["pronunciation_assessment"] == {"pronunciation_score": 88}
+        mock_live.consolidate.assert_awaited_once_with("session-1", 2)
+        mock_assessor.assess_pronunciation.assert_not_called()
+
+    @patch("src.app.pronunciation_assessor")
+    @patch("src.app.conversation_analyzer")
+    def test_analyze_passes_only_decoded_user_audio(self, mock_analyzer, mock_assessor):
+        """Test the analyze body is streamed and the assessor gets the user's audio already decoded."""
+        mock_analyzer.analyze_conversation = AsyncMock(return_value={"overall_score": 70})
+        mock_assessor.assess_pronunciation = AsyncMock(return_value=None)
+
+        response = self.client.post(
+            "/api/analyze",
+            json={
+                "scenario_id": "scenario1",
+                "transcript": "user: Hi",
+                "audio_data": [
+                    {"type": "user", "data": "AAE="},
+                    {"type": "assistant", "data": "//8="},
+                    {"type": "user", "data": "AgM="},
+                ],
+                "reference_text": "Hi",
+            },
+        )
+
+        assert response.status_code == 200
+        mock_assessor.assess_pronunciation.assert_awaited_once_with(bytearray(b"\x00\x01\x02\x03"), "Hi", ["Hi"], None)
+
+    def test_analyze_rejects_invalid_body(self):
+        """Test a body that is not a JSON object is rejected."""
+        response = self.client.post("/api/analyze", data="not json", content_type="application/json")
+
+        assert response.status_code == 400
+
+    @patch("src.app.pronunciation_assessor")
+    @patch("src.app.conversation_analyzer")
+    @patch("src.app.EVALUATION_FALLBACK_ENABLED", True)
+    def test_analyze_falls_back_to_conversation_metrics(self, mock_analyzer, mock_assessor):
+        """Test conversation metrics score the session when the AI assessment fails and the fallback is enabled."""
+        mock_analyzer.evaluation_scenarios = {"scenario1": {}}
+        mock_analyzer.analyze_conversation = AsyncMock(return_value=None)
+        mock_assessor.assess_pronunciation = AsyncMock(return_value=None)
+
+        response = self.client.post(
+            "/api/analyze",
+            json={"scenario_id": "scenario1", "transcript": "user: What matters most to you?\nassistant: Cost."},
+        )
+
+        data = json.loads(response.data)
+        assert data["conversation_metrics"]["questions_asked"] == 1
+        assert data["ai_assessment"]["degraded"] is True
+
+    @patch("src.app.pronunciation_assessor")
+    @patch("src.app.conversation_analyzer")
+    def test_analyze_without_fallback_leaves_assessment_empty(self, mock_analyzer, mock_assessor):
+        """Test no score is invented from conversation metrics when the fallback is disabled."""
+        mock_analyzer.evaluation_scenarios = {"scenario1": {}}
+        mock_analyzer.analyze_conversation = AsyncMock(return_value=None)
+        mock_assessor.assess_pronunciation = AsyncMock(return_value=None)
+
+        response = self.client.post(
+            "/api/analyze",
+            json={"scenario_id": "scenario1", "transcript": "user: What matters most to you?\nassistant: Cost."},
+        )
+
+        data = json.loads(response.data)
+        assert data["conversation_metrics"]["questions_asked"] == 1
+        assert data["ai_assessment"] is None
+
+    @patch("src.app.pronunciation_assessor")
+    @patch("src.app.conversation_analyzer")
+    @patch("src.app.EVALUATION_FALLBACK_ENABLED", True)
+    def test_analyze_stream_emits_conversation_metrics_first(self, mock_analyzer, mock_assessor):
+        """Test the stream starts with local conversation metrics and falls back when the AI assessment fails."""
+
+        async def stream(*_):
+            yield {"type": "ai_assessment", "value": None}
+
+        mock_analyzer.evaluation_scenarios = {"scenario1": {}}
+        mock_analyzer.stream_conversation_analysis = stream
+        mock_assessor.assess_pronunciation = AsyncMock(return_value=None)
+
+        response = self.client.post(
+            "/api/analyze/stream", json={"scenario_id": "scenario1", "transcript": "user: hello\nassistant: hi"}
+        )
+
+        events = [json.loads(line[6:]) for line in response.get_data(as_text=True).splitlines() if line[:6] == "data: "]
+        assert events[0]["type"] == "conversation_metrics"
+        assert events[0]["value"]["user_words"] == 1
+        ai_event = next(event for event in events if event["type"] == "ai_assessment")
+        assert ai_event["value"]["degraded"] is True
+
+    @patch("src.app.config", {"analysis_request_timeout_seconds": 0.05})
+    def test_analyze_stream_times_out(self, hanging_call):
+        """Test a stream still running at the request deadline is cancelled and ends with an error event."""
+        with patch("src.app._produce_assessment_events", hanging_call):
+            response = self.client.post(
+                "/api/analyze/stream", json={"scenario_id": "scenario1", "transcript": "user: hello\nassistant: hi"}
+            )
+            body = response.get_data(as_text=True)
+
+        events = [json.loads(line[6:]) for line in body.splitlines() if line[:6] == "data: "]
+        assert [event["type"] for event in events] == ["error", "done"]
+        assert hanging_call.cancelled.wait(timeout=1)
+
+    @patch("src.app.acoustic_analyzer")
+    @patch("src.app.pronunciation_assessor")
+    @patch("src.app.conversation_analyzer")
+    def test_analyze_stream_emits_acoustic_analytics(self, mock_analyzer, mock_assessor, mock_acoustics):
+        """Test local acoustic analytics are streamed first and kept when the Speech service fails."""
+
+        async def stream(*_):
+            yield {"type": "ai_assessment", "value": {"overall_score": 84}}
+
+        async def assess(*_):
+            await asyncio.sleep(0.05)
+            return None
+
+        mock_analyzer.stream_conversation_analysis = stream
+        mock_assessor.assess_pronunciation = assess
+        mock_acoustics.analyze = AsyncMock(return_value={"speaking_rate_wpm": 120.0, "turns": []})
+
+        response = self.client.post(
+            "/api/analyze/stream",
+            json={
+                "scenario_id": "scenario1",
+                "transcript": "user: hello",
+                "audio_data": [{"type": "user", "data": "AAE="}],
+            },
+        )
+
+        events = [json.loads(line[6:]) for line in response.get_data(as_text=True).splitlines() if line[:6] == "data: "]
+        event_types = [event["type"] for event in events]
+        assert event_types.index("acoustic_analytics") < event_types.index("pronunciation_assessment")
+        pronunciation = next(event["value"] for event in events if event["type"] == "pronunciation_assessment")
+        assert pronunciation["accuracy_score"] is None
+        assert pronunciation["acoustics"] == {"speaking_rate_wpm": 120.0, "turns": []}
+        mock_acoustics.analyze.assert_awaited_once_with(bytearray(b"\x00\x01"), ["hello"])
+
+    def test_analyze_stream_route_requires_transcript(self):
+        """Test the streaming analyze endpoint validates its input."""
+        response = self.client.post("/api/analyze/stream", json={"scenario_id": "scenario1"})
+
+        assert response.status_code == 400
+
+
+class TestBackgroundAnalysisRoutes:
+    """Test cases for the analysis job and batch evaluation endpoints."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        app.config["TESTING"] = True
+        self.client: FlaskClient = app.test_client()  # pylint: disable=attribute-defined-outside-init
+
+    @patch("src.app.analysis_job_queue")
+    def test_analysis_job_routes(self, mock_queue):
+        """Test a job is queued without waiting for the analysis and its result can be polled or streamed."""
+        finished = {"job_id": "job-1", "status": "completed", "result": {"ai_assessment": None}}
+        mock_queue.submit.return_value = {"job_id": "job-1", "status": "queued"}
+        mock_queue.get.side_effect = lambda job_id: finished if job_id == "job-1" else None
+        mock_queue.subscribe.side_effect = lambda job_id, listener: listener(finished) or (lambda: None)
+
+        response = self.client.post(
+            "/api/analyze/jobs", json={"scenario_id": "scenario1", "transcript": "hello", "session_id": "session-1"}
+        )
+
+        assert response.status_code == 202
+        assert json.loads(response.data) == {"job_id": "job-1", "status": "queued"}
+        payload, session_id = mock_queue.submit.call_args.args
+        assert payload["transcript"] == "hello"
+        assert session_id == "session-1"
+
+        assert json.loads(self.client.get("/api/analyze/jobs/job-1").data) == finished
+        assert self.client.get("/api/analyze/jobs/unknown").status_code == 404
+
+        response = self.client.get("/api/analyze/jobs/job-1/events")
+        events = [json.loads(line[6:]) for line in response.get_data(as_text=True).splitlines() if line[:6] == "data: "]
+        assert events == [{"type": "job", "value": finished}, {"type": "done"}]
+
+    @patch("src.app.SSE_KEEPALIVE_SECONDS", 0.01)
+    @patch("src.app.analysis_job_queue")
+    def test_analysis_job_events_keep_alive_and_end_at_deadline(self, mock_queue):
+        """Test the job stream sends keepalives while the job runs and ends once it overruns its timeout."""
+        running = {"job_id": "job-1", "status": "running", "started_at": time.time()}
+        overdue = {**running, "started_at": 1.0}
+        mock_queue.get.side_effect = [running, running, overdue]
+        mock_queue.subscribe.return_value = lambda: None
+
+        body = self.client.get("/api/analyze/jobs/job-1/events").get_data(as_text=True)
+
+        assert body.startswith(": keepalive\n\n")
+        events = [json.loads(line[6:]) for line in body.splitlines() if line[:6] == "data: "]
+        assert events == [{"type": "job", "value": overdue}, {"type": "done"}]
+
+    def test_analysis_job_route_requires_transcript(self):
+        """Test the job endpoint validates its input before queueing anything."""
+        response = self.client.post("/api/analyze/jobs", json={"scenario_id": "scenario1"})
+
+        assert response.status_code == 400
+
+    @patch("src.app.batch_evaluator")
+    def test_batch_evaluation_route(self, mock_batch_evaluator):
+        """Test the batch endpoint accepts JSONL and streams one result per line."""
+
+        async def evaluate(items, emit):
+            for item in items:
+                emit({"id": item["id"], "status": "ok"})
+
+        mock_batch_evaluator.evaluate = evaluate
+        body = "\n".join(json.dumps({"id": str(i), "scenario_id": "scenario1", "transcript": "hi"}) for i in range(3))
+
+        response = self.client.post("/api/evaluations/batch", data=body, content_type="application/x-ndjson")
+
+        assert response.mimetype == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert [line["id"] for line in lines] == ["0", "1", "2"]
+
+    @patch("src.app.config", {"analysis_request_timeout_seconds": 0.05})
+    @patch("src.app.batch_evaluator")
+    def test_batch_evaluation_route_times_out(self, mock_batch_evaluator, hanging_call):
+        """Test a batch still running at the request deadline is cancelled and ends with an error line."""
+        mock_batch_evaluator.evaluate = hanging_call
+        body = json.dumps({"id": "0", "scenario_id": "scenario1", "transcript": "hi"})
+
+        response = self.client.post("/api/evaluations/batch", data=body, content_type="application/x-ndjson")
+
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert lines == [{"status": "error", "error": "Analysis did not finish in time"}]
+        assert hanging_call.cancelled.wait(timeout=1)
+
+    def test_batch_evaluation_route_requires_items(self):
+        """Test the batch endpoint rejects requests without valid items."""
+        response = self.client.post("/api/evaluations/batch", json={"items": [{"scenario_id": "scenario1"}]})
+
+        assert response.status_code == 400
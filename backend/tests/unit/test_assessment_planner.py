@@ -0,0 +1,65 @@
+"""Tests for planning pronunciation assessment settings under a latency budget."""
+
+import pytest
+
+from src.services.assessment_planner import AssessmentPlanner, cheaper_settings, relative_cost
+from src.services.pronunciation_assessment import DEFAULT_ASSESSMENT_SETTINGS
+
+
+class TestAssessmentSettings:
+    """Test the ladder of assessment settings."""
+
+    def test_cheaper_settings_drop_phonemes_then_prosody(self):
+        """Test phoneme granularity is dropped before prosody and each step costs less."""
+        word = cheaper_settings(DEFAULT_ASSESSMENT_SETTINGS)
+        no_prosody = cheaper_settings(word)
+
+        assert word == {**DEFAULT_ASSESSMENT_SETTINGS, "granularity": "Word"}
+        assert no_prosody == {**word, "enable_prosody": False}
+        assert cheaper_settings(no_prosody) is None
+        assert relative_cost(DEFAULT_ASSESSMENT_SETTINGS) == 1.0
+        assert relative_cost(DEFAULT_ASSESSMENT_SETTINGS) > relative_cost(word) > relative_cost(no_prosody)
+
+
+class TestAssessmentPlanner:
+    """Test picking settings per segment."""
+
+    def test_no_budget_keeps_full_detail(self):
+        """Test every segment gets the most detailed settings without a budget."""
+        planner = AssessmentPlanner()
+
+        assert planner.plan([3.0, 60.0], DEFAULT_ASSESSMENT_SETTINGS, 4) == [DEFAULT_ASSESSMENT_SETTINGS] * 2
+
+    def test_longest_segments_made_cheaper_first(self):
+        """Test long segments lose phoneme detail, then prosody, before short turns are touched."""
+        planner = AssessmentPlanner(budget_ms=17500, seconds_per_audio_second=1.0)
+
+        planned = planner.plan([2.0, 8.0, 12.0], DEFAULT_ASSESSMENT_SETTINGS, 1)
+
+        assert planned[0] == DEFAULT_ASSESSMENT_SETTINGS
+        assert planned[1]["granularity"] == "Word" and planned[1]["enable_prosody"]
+        assert planned[2]["granularity"] == "Word" and not planned[2]["enable_prosody"]
+
+    def test_only_slowest_segment_made_cheaper_when_it_bounds_the_estimate(self):
+        """Test segments that cannot shorten the assessment keep full detail when the budget is out of reach."""
+        planner = AssessmentPlanner(budget_ms=5000, seconds_per_audio_second=1.0)
+
+        planned = planner.plan([2.0, 3.0, 20.0], DEFAULT_ASSESSMENT_SETTINGS, 4)
+
+        assert planned[:2] == [DEFAULT_ASSESSMENT_SETTINGS] * 2
+        assert cheaper_settings(planned[2]) is None
+
+    def test_observed_latency_updates_estimates(self):
+        """Test estimates follow observed recognitions, with a per-call overhead once audio lengths vary."""
+        planner = AssessmentPlanner(budget_ms=10000, seconds_per_audio_second=1.0)
+        word = cheaper_settings(DEFAULT_ASSESSMENT_SETTINGS)
+
+        planner.observe(DEFAULT_ASSESSMENT_SETTINGS, 10.0, 2.0)
+        assert planner.estimate_seconds(DEFAULT_ASSESSMENT_SETTINGS, 20.0) == pytest.approx(4.0)
+        assert planner.plan([2.0, 12.0, 20.0], DEFAULT_ASSESSMENT_SETTINGS, 4) == [DEFAULT_ASSESSMENT_SETTINGS] * 3
+
+        planner = AssessmentPlanner()
+        planner.observe(DEFAULT_ASSESSMENT_SETTINGS, 2.0, 0.5)
+        planner.observe(word, 10.0 / relative_cost(word), 1.3)
+        assert planner.estimate_seconds(DEFAULT_ASSESSMENT_SETTINGS, 10.0) == pytest.approx(1.3)
+        assert planner.estimate_seconds(word, 10.0) == pytest.approx(0.3 + 0.8)
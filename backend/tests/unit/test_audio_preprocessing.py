@@ -0,0 +1,59 @@
+"""Tests for preprocessing audio before pronunciation assessment."""
+
+import numpy as np
+import pytest
+
+from src.services.audio_preprocessing import MAX_GAIN, TARGET_SPEECH_RMS, preprocess_audio
+
+SAMPLE_RATE = 24000
+
+
+def tone(seconds: float, amplitude: float) -> np.ndarray:
+    """A 180 Hz tone, or silence at amplitude 0."""
+    return amplitude * np.sin(2 * np.pi * 180 * np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE)
+
+
+def to_pcm(audio: np.ndarray) -> bytearray:
+    """16-bit little-endian PCM of the samples."""
+    return bytearray(np.rint(audio).astype("<i2").tobytes())
+
+
+def rms(pcm: bytes) -> float:
+    """Root mean square of PCM audio."""
+    return float(np.sqrt(np.mean(np.square(np.frombuffer(pcm, dtype="<i2").astype(np.float64)))))
+
+
+class TestPreprocessAudio:
+    """Test audio preprocessing."""
+
+    def test_silence_trimmed_and_long_pauses_shortened(self):
+        """Test the ends are trimmed to padding, long pauses shortened and the DC offset removed."""
+        audio = np.concatenate([tone(1, 0), tone(1, 2000), tone(3, 0), tone(1, 2000), tone(2, 0)]) + 500
+
+        result = preprocess_audio(memoryview(to_pcm(audio)), max_pause_ms=1000)
+
+        assert result.removed_seconds == pytest.approx(0.9 + 2.0 + 1.9)
+        assert len(result.pcm) == int(3.2 * SAMPLE_RATE) * 2
+        assert result.dc_offset == pytest.approx(500, abs=1)
+        samples = np.frombuffer(result.pcm, dtype="<i2")
+        assert abs(float(samples.mean())) < 5
+        assert rms(result.pcm[int(0.1 * SAMPLE_RATE) * 2 : int(1.1 * SAMPLE_RATE) * 2]) == pytest.approx(
+            TARGET_SPEECH_RMS, rel=0.01
+        )
+
+    def test_gain_limited_and_pauses_kept_when_disabled(self):
+        """Test quiet speech is amplified at most MAX_GAIN and pauses are kept with max_pause_ms 0."""
+        audio = np.concatenate([tone(1, 500), tone(3, 0), tone(1, 500)])
+
+        result = preprocess_audio(to_pcm(audio), max_pause_ms=0)
+
+        assert result.removed_seconds == 0
+        assert result.gain == MAX_GAIN
+        assert rms(result.pcm[: SAMPLE_RATE * 2]) == pytest.approx(500 / np.sqrt(2) * MAX_GAIN, rel=0.01)
+
+    def test_audio_without_speech_unchanged(self):
+        """Test silence and very short audio are returned as they are."""
+        silence = to_pcm(tone(2, 100) + 50)
+
+        assert preprocess_audio(silence, max_pause_ms=1000).pcm == bytes(silence)
+        assert preprocess_audio(b"\x01\x00" * 10, max_pause_ms=1000).removed_seconds == 0
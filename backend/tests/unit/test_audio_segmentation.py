@@ -0,0 +1,54 @@
+"""Tests for splitting recordings into speech segments."""
+
+import array
+import math
+
+from src.services.audio_segmentation import segment_speech
+
+SAMPLE_RATE = 24000
+BYTES_PER_SECOND = SAMPLE_RATE * 2
+
+
+def _pcm(*parts):
+    """Build PCM audio from (seconds, amplitude) parts: a 220 Hz tone, or silence at amplitude 0."""
+    samples = array.array("h")
+    for seconds, amplitude in parts:
+        samples.extend(
+            int(amplitude * math.sin(2 * math.pi * 220 * index / SAMPLE_RATE))
+            for index in range(int(seconds * SAMPLE_RATE))
+        )
+    return samples.tobytes()
+
+
+class TestSegmentSpeech:
+    """Test cases for segment_speech."""
+
+    def test_turns_split_at_longest_silences(self):
+        """Test the longest silences separate turns and each turn's words follow its speech."""
+        pcm = _pcm((0.5, 0), (1, 8000), (0.5, 0), (1, 8000), (3, 0), (1, 8000), (0.5, 0))
+
+        segments = segment_speech(pcm, ["one two three four", "five six"], 400, 15)
+
+        assert [segment.turn for segment in segments] == [0, 0, 1]
+        assert [segment.reference_text for segment in segments] == ["one two", "three four", "five six"]
+        assert abs(segments[0].start_seconds - 0.4) < 0.05
+        assert abs(segments[2].duration_seconds - 1.2) < 0.05
+
+    def test_long_speech_cut_under_max_length(self):
+        """Test speech longer than the maximum segment length is cut into shorter segments."""
+        pcm = _pcm((10, 8000))
+
+        segments = segment_speech(pcm, ["hello"], 400, 4)
+
+        assert len(segments) >= 3
+        assert all(segment.duration_seconds <= 4 for segment in segments)
+        assert segments[-1].end == len(pcm)
+
+    def test_unaligned_turns_and_silence(self):
+        """Test speech with fewer spans than turns is not aligned and silence has no segments."""
+        pcm = _pcm((1, 8000))
+
+        segments = segment_speech(pcm, ["hello there", "goodbye"], 400, 15)
+
+        assert [(segment.turn, segment.reference_text) for segment in segments] == [(None, "hello there goodbye")]
+        assert not segment_speech(_pcm((2, 100)), ["hello"], 400, 15)
@@ -0,0 +1,173 @@
+"""Tests for bulk re-scoring."""
+
+import json
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.services.batch_evaluation import (
+    COMPLETION_TOKENS_ESTIMATE,
+    BatchEvaluator,
+    build_offline_batch,
+    estimate_request_tokens,
+    parse_items,
+    parse_offline_result,
+)
+
+
+def create_analyzer(evaluation: Optional[Dict[str, Any]] = None) -> Mock:
+    """Create an analyzer stand-in that knows scenario1 only."""
+    analyzer = Mock()
+    analyzer.build_evaluation_request.side_effect = lambda scenario_id, transcript: (
+        {"model": "gpt-4o", "messages": [{"role": "user", "content": transcript}]}
+        if scenario_id == "scenario1"
+        else None
+    )
+    analyzer.build_evaluation_plan.side_effect = lambda scenario_id, transcript: (
+        [analyzer.build_evaluation_request(scenario_id, transcript)] if scenario_id == "scenario1" else None
+    )
+    analyzer.analyze_conversation = AsyncMock(return_value=evaluation or {"overall_score": 80})
+    return analyzer
+
+
+def create_limiter() -> Mock:
+    """Create a limiter stand-in that never waits."""
+    limiter = Mock()
+    limiter.acquire = AsyncMock(return_value=0.0)
+    return limiter
+
+
+class TestBatchItems:
+    """Test item parsing and estimation."""
+
+    def test_parse_items(self):
+        """Test JSONL parsing skips invalid lines and derives stable IDs."""
+        lines = [
+            json.dumps({"id": "a", "scenario_id": "scenario1", "transcript": "hello"}),
+            "",
+            "not json",
+            json.dumps({"scenario_id": "scenario1"}),
+            json.dumps({"scenario_id": "scenario1", "transcript": "hi"}),
+        ]
+
+        items = list(parse_items(lines))
+
+        assert [item["id"] for item in items][0] == "a"
+        assert len(items) == 2
+        assert items[1]["id"] == list(parse_items(lines[-1:]))[0]["id"]
+
+    def test_estimate_request_tokens(self):
+        """Test estimates cover prompt characters, per-message overhead and the completion."""
+        request = {"messages": [{"role": "system", "content": "x" * 40}, {"role": "user", "content": "y" * 400}]}
+
+        assert estimate_request_tokens(request) == 4 + 10 + 4 + 100 + COMPLETION_TOKENS_ESTIMATE
+
+
+class TestBatchEvaluator:
+    """Test online batch evaluation."""
+
+    @pytest.mark.asyncio
+    async def test_evaluate_emits_results_and_errors(self):
+        """Test each item produces a result line and unknown scenarios fail without a model call."""
+        analyzer = create_analyzer()
+        limiter = create_limiter()
+        evaluator = BatchEvaluator(analyzer, limiter, concurrency=2)
+        items = list(
+            parse_items(
+                [
+                    json.dumps({"id": "1", "scenario_id": "scenario1", "transcript": "hello"}),
+                    json.dumps({"id": "2", "scenario_id": "unknown", "transcript": "hello"}),
+                    json.dumps({"id": "3", "scenario_id": "scenario1", "transcript": "bye"}),
+                ]
+            )
+        )
+        results: List[Dict[str, Any]] = []
+
+        summary = await evaluator.evaluate(items, results.append)
+
+        assert summary == {"succeeded": 2, "failed": 1, "skipped": 0}
+        assert sorted(result["id"] for result in results) == ["1", "2", "3"]
+        assert next(result for result in results if result["id"] == "2")["status"] == "error"
+        assert limiter.acquire.await_count == 2
+        assert analyzer.analyze_conversation.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_evaluate_item_reserves_every_planned_call(self):
+        """Test an evaluation made of several calls reserves the quota of each of them."""
+        analyzer = create_analyzer()
+        plan = [{"messages": [{"role": "user", "content": "x" * 400}]}] * 3
+        analyzer.build_evaluation_plan.side_effect = None
+        analyzer.build_evaluation_plan.return_value = plan
+        limiter = create_limiter()
+        evaluator = BatchEvaluator(analyzer, limiter, concurrency=1)
+
+        result = await evaluator.evaluate_item({"id": "1", "scenario_id": "scenario1", "transcript": "hello"})
+
+        assert result["status"] == "ok"
+        assert [call.args[0] for call in limiter.acquire.await_args_list] == [estimate_request_tokens(plan[0])] * 3
+
+    @pytest.mark.asyncio
+    async def test_evaluate_to_file_resumes(self):
+        """Test rerunning against the same output skips succeeded items and retries failed ones."""
+        analyzer = create_analyzer()
+        evaluator = BatchEvaluator(analyzer, create_limiter(), concurrency=1)
+        items = [
+            {"id": "1", "scenario_id": "scenario1", "transcript": "hello"},
+            {"id": "2", "scenario_id": "scenario1", "transcript": "bye"},
+        ]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output = Path(temp_dir) / "results.jsonl"
+            output.write_text(
+                json.dumps({"id": "1", "status": "ok"}) + "\n" + json.dumps({"id": "2", "status": "error"}) + "\n"
+            )
+
+            summary = await evaluator.evaluate_to_file(items, output)
+
+            lines = [json.loads(line) for line in output.read_text().splitlines()]
+
+        assert summary == {"succeeded": 1, "failed": 0, "skipped": 1}
+        assert lines[-1] == {
+            "id": "2",
+            "scenario_id": "scenario1",
+            "status": "ok",
+            "ai_assessment": {"overall_score": 80},
+        }
+
+
+class TestOfflineBatch:
+    """Test the Batch API input and output formats."""
+
+    def test_build_offline_batch(self):
+        """Test requests target the batch deployment and skip unknown scenarios."""
+        items = [
+            {"id": "1", "scenario_id": "scenario1", "transcript": "hello"},
+            {"id": "2", "scenario_id": "unknown", "transcript": "hello"},
+        ]
+
+        lines = list(build_offline_batch(create_analyzer(), items, deployment="gpt-4o-batch"))
+
+        assert len(lines) == 1
+        assert lines[0]["custom_id"] == "1"
+        assert lines[0]["url"] == "/chat/completions"
+        assert lines[0]["body"]["model"] == "gpt-4o-batch"
+
+    def test_parse_offline_result(self):
+        """Test Batch API output lines are converted into batch evaluation results."""
+        analyzer = Mock()
+        analyzer.parse_evaluation_content.side_effect = json.loads
+        line = {
+            "custom_id": "1",
+            "response": {"body": {"choices": [{"message": {"content": '{"overall_score": 70}'}}]}},
+        }
+
+        assert parse_offline_result(analyzer, line) == {
+            "id": "1",
+            "status": "ok",
+            "ai_assessment": {"overall_score": 70},
+        }
+        failed = parse_offline_result(analyzer, {"custom_id": "2", "response": None, "error": {"code": "timeout"}})
+        assert failed == {"id": "2", "status": "error", "error": {"code": "timeout"}}
@@ -34,6 +34,21 @@ class TestConfig:
             assert config["azure_ai_region"] == "westus"
             assert config["azure_ai_resource_name"] == "test-resource"
 
+    def test_context_window_defaults(self):
+        """Test conversation context compaction is off by default and summarizes once a budget is set."""
+        with patch.dict(os.environ, {}, clear=True):
+            config = Config()
+            assert config["context_max_tokens"] == 0
+            assert config["context_max_turns"] == 0
+            assert config["context_keep_recent_items"] == 6
+            assert config["context_strategy"] == "summarize"
+
+    def test_ws_compression_skip_types_parsing(self):
+        """Test the compression skip list is parsed from a comma-separated variable."""
+        with patch.dict(os.environ, {"WS_COMPRESSION_SKIP_TYPES": " response.audio.delta, ,custom.audio "}):
+            config = Config()
+            assert config["ws_compression_skip_types"] == ["response.audio.delta", "custom.audio"]
+
     def test_config_get_method(self):
         """Test the get method with defaults."""
         config = Config()
@@ -0,0 +1,132 @@
+"""Tests for the conversation_context module."""
+
+from unittest.mock import patch
+
+from src.services.conversation_context import SUMMARY_ITEM_PREFIX, ConversationContextManager
+
+
+def _created(item_id: str, role: str, text: str = "") -> dict:
+    """Build a conversation.item.created event."""
+    return {
+        "type": "conversation.item.created",
+        "item": {"id": item_id, "type": "message", "role": role, "content": [{"type": "input_text", "text": text}]},
+    }
+
+
+class TestConversationContextManager:
+    """Test cases for ConversationContextManager."""
+
+    def test_disabled_without_budget(self):
+        """Test the manager is disabled when no budget is configured."""
+        manager = ConversationContextManager()
+
+        assert not manager.enabled
+        manager.observe_event(_created("item-1", "user", "hello " * 100))
+        assert not manager.observe_event({"type": "response.done"})
+
+    def test_tracks_items_and_transcripts(self):
+        """Test items and completed transcripts are tracked."""
+        manager = ConversationContextManager(max_tokens=1000)
+
+        manager.observe_event(_created("item-1", "user"))
+        manager.observe_event(
+            {
+                "type": "conversation.item.input_audio_transcription.completed",
+                "item_id": "item-1",
+                "transcript": "Hello there",
+            }
+        )
+        manager.observe_event({"type": "conversation.item.deleted", "item_id": "missing"})
+
+        assert len(manager.items) == 1
+        assert manager.items[0].text == "Hello there"
+        assert manager.user_turns == 1
+
+    def test_user_audio_duration_counts_towards_tokens(self):
+        """Test speech duration reported before item creation is attributed to the item."""
+        manager = ConversationContextManager(max_tokens=1000)
+
+        manager.observe_event({"type": "input_audio_buffer.speech_started", "item_id": "item-1", "audio_start_ms": 0})
+        manager.observe_event({"type": "input_audio_buffer.speech_stopped", "item_id": "item-1", "audio_end_ms": 3000})
+        manager.observe_event(_created("item-1", "user"))
+
+        assert manager.items[0].audio_seconds == 3.0
+        assert manager.total_tokens > 30
+
+    def test_truncate_removes_oldest_items(self):
+        """Test truncation deletes the oldest items but keeps recent and pinned ones."""
+        manager = ConversationContextManager(max_turns=2, keep_recent_items=2, strategy="truncate")
+
+        manager.observe_event(_created("system-1", "system", "Key persona facts"))
+        for index in range(4):
+            manager.observe_event(_created(f"user-{index}", "user", f"question {index}"))
+            manager.observe_event(_created(f"assistant-{index}", "assistant", f"answer {index}"))
+
+        events = manager.observe_event({"type": "response.done"})
+
+        deleted = [event["item_id"] for event in events if event["type"] == "conversation.item.delete"]
+        assert deleted == ["user-0", "assistant-0", "user-1"]
+        assert all(event["type"] == "conversation.item.delete" for event in events)
+        assert manager.user_turns == 2
+        assert manager.items[0].item_id == "system-1"
+
+    def test_summarize_replaces_dropped_items_with_pinned_summary(self):
+        """Test summarization inserts a pinned summary at the root of the conversation."""
+        manager = ConversationContextManager(max_turns=1, keep_recent_items=1)
+
+        manager.observe_event(_created("user-0", "user", "Our budget is 50k"))
+        manager.observe_event(_created("assistant-0", "assistant", "Noted"))
+        manager.observe_event(_created("user-1", "user", "What about support?"))
+
+        events = manager.observe_event({"type": "response.done"})
+
+        create_events = [event for event in events if event["type"] == "conversation.item.create"]
+        assert len(create_events) == 1
+        assert create_events[0]["previous_item_id"] == "root"
+        summary_text = create_events[0]["item"]["content"][0]["text"]
+        assert "Our budget is 50k" in summary_text
+        assert manager.items[0].item_id.startswith(SUMMARY_ITEM_PREFIX)
+        assert manager.items[0].pinned
+
+    def test_second_summary_replaces_first(self):
+        """Test a later compaction deletes the previous summary and carries its lines forward."""
+        manager = ConversationContextManager(max_turns=1, keep_recent_items=1)
+
+        manager.observe_event(_created("user-0", "user", "First fact"))
+        manager.observe_event(_created("user-1", "user", "Second fact"))
+        first_summary_id = manager.observe_event({"type": "response.done"})[-1]["item"]["id"]
+
+        manager.observe_event(_created("user-2", "user", "Third fact"))
+        events = manager.observe_event({"type": "response.done"})
+
+        assert {"type": "conversation.item.delete", "item_id": first_summary_id} in events
+        summary_text = events[-1]["item"]["content"][0]["text"]
+        assert "First fact" in summary_text
+        assert "Second fact" in summary_text
+        assert sum(1 for item in manager.items if item.item_id.startswith(SUMMARY_ITEM_PREFIX)) == 1
+
+    @patch("src.services.conversation_context.metrics")
+    def test_turn_latency_recorded_by_conversation_length(self, mock_metrics):
+        """Test latency from speech stop to first audio is reported per turn bucket."""
+        manager = ConversationContextManager(max_tokens=1000)
+
+        manager.observe_event({"type": "input_audio_buffer.speech_stopped", "item_id": "item-1", "audio_end_ms": 100})
+        manager.observe_event({"type": "response.audio.delta", "item_id": "item-2", "delta": "AAAA"})
+        manager.observe_event({"type": "response.audio.delta", "item_id": "item-2", "delta": "AAAA"})
+
+        labelled_calls = [call for call in mock_metrics.observe.call_args_list if len(call.args) == 3]
+        assert len(labelled_calls) == 1
+        assert labelled_calls[0].args[0] == "voice_turn_latency_ms"
+        assert labelled_calls[0].args[2] == {"turns": "0-4"}
+
+    @patch("src.services.conversation_context.metrics")
+    def test_turn_latency_recorded_without_budget(self, mock_metrics):
+        """Test turn latency is reported when compaction is off, giving a baseline to compare against."""
+        manager = ConversationContextManager()
+
+        manager.observe_event(_created("item-1", "user", "hello"))
+        manager.observe_event({"type": "input_audio_buffer.speech_stopped", "item_id": "item-1", "audio_end_ms": 100})
+        manager.observe_event({"type": "response.audio.delta", "item_id": "item-2", "delta": "AAAA"})
+
+        assert [call.args[0] for call in mock_metrics.observe.call_args_list] == ["voice_turn_latency_ms"] * 2
+        assert not manager.items
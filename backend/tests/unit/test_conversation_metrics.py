@@ -0,0 +1,52 @@
+"""Tests for the conversation_metrics module."""
+
+from src.services.conversation_metrics import build_fallback_assessment, compute_conversation_metrics
+
+TRANSCRIPT = """user: Hi, um, thanks for meeting. What are your main challenges right now?
+assistant: Mostly onboarding speed and cost.
+user: How long does onboarding take today
+assistant: About six weeks.
+user: Our platform basically cuts that in half, you know.
+It also keeps every document in one place."""
+
+
+class TestConversationMetrics:
+    """Test cases for compute_conversation_metrics and build_fallback_assessment."""
+
+    def test_metrics_from_transcript(self):
+        """Test word counts, questions, filler words and monologues are read from a plain transcript."""
+        result = compute_conversation_metrics(TRANSCRIPT)
+
+        assert result["user_words"] == 35
+        assert result["assistant_words"] == 8
+        assert result["questions_asked"] == 2
+        assert result["filler_words"] == 3
+        assert result["longest_monologue_words"] == 17
+        assert result["talk_share"] == round(35 / 43, 3)
+        assert result["words_per_minute"] is None
+        assert result["average_response_latency_ms"] is None
+
+    def test_timing_metrics_from_recorded_turns(self):
+        """Test words per minute and response latency use the recorded turn timestamps."""
+        turns = [
+            {"role": "assistant", "content": "Hello, how can I help?", "started_at": 0, "ended_at": 2000},
+            {"role": "user", "content": "I want to talk about pricing today", "started_at": 3000, "ended_at": 6000},
+            {"role": "assistant", "content": "Sure.", "started_at": 6500, "ended_at": 7000},
+            {"role": "user", "content": "Great", "started_at": 6800, "ended_at": 7400},
+        ]
+
+        result = compute_conversation_metrics("", turns)
+
+        assert result["words_per_minute"] == round(8 * 60000 / 3600, 1)
+        assert result["average_response_latency_ms"] == 500
+        assert result["max_response_latency_ms"] == 1000
+
+    def test_fallback_assessment_has_evaluation_schema(self):
+        """Test the fallback score has consistent totals and is flagged as degraded."""
+        assessment = build_fallback_assessment(compute_conversation_metrics(TRANSCRIPT))
+
+        tone, content = assessment["speaking_tone_style"], assessment["conversation_content"]
+        assert tone["total"] == tone["professional_tone"] + tone["active_listening"] + tone["engagement_quality"]
+        assert assessment["overall_score"] == tone["total"] + content["total"]
+        assert assessment["degraded"] is True
+        assert any("discovery questions" in improvement for improvement in assessment["improvements"])
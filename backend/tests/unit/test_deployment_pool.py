@@ -0,0 +1,140 @@
+"""Tests for the deployment pool."""
+
+import asyncio
+import random
+from unittest.mock import patch
+
+import httpx
+import openai
+import pytest
+
+from src.services.deployment_pool import COOLDOWN_SECONDS, Deployment, DeploymentPool
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _rate_limit_error() -> openai.RateLimitError:
+    """Build the error the SDK raises for a throttled deployment."""
+    response = httpx.Response(429, request=httpx.Request("POST", "https://test.openai.azure.com"))
+    return openai.RateLimitError("Too many requests", response=response, body=None)
+
+
+class TestDeploymentPool:
+    """Test cases for DeploymentPool."""
+
+    def test_choose_prefers_fast_deployments(self):
+        """Test routing weights favour the deployment with the lower smoothed latency."""
+        fast, slow = Deployment("https://fast", "key", "gpt-4o"), Deployment("https://slow", "key", "gpt-4o")
+        fast.latency_ewma, slow.latency_ewma = 1.0, 9.0
+        pool = DeploymentPool([fast, slow], rng=random.Random(0))
+
+        picks = [pool.choose() for _ in range(1000)]
+
+        assert picks.count(fast) > 850
+        assert pool.choose(exclude=fast) is slow
+
+    @pytest.mark.asyncio
+    async def test_throttled_deployment_sits_out_cooldown(self):
+        """Test a throttled call is raised without a retry and the deployment sits out a cooldown."""
+        clock = FakeClock()
+        throttled, healthy = Deployment("https://a", "key", "gpt-4o"), Deployment("https://b", "key", "gpt-4o")
+        pool = DeploymentPool([throttled, healthy], clock=clock)
+        calls = []
+
+        async def send(deployment):
+            calls.append(deployment)
+            raise _rate_limit_error()
+
+        with patch.object(pool, "choose", return_value=throttled):
+            with pytest.raises(openai.RateLimitError):
+                await pool.call(send)
+
+        assert calls == [throttled]
+        assert not throttled.is_healthy(clock.now)
+        assert pool.choose() is healthy
+        clock.now += COOLDOWN_SECONDS
+        assert throttled.is_healthy(clock.now)
+
+    @pytest.mark.asyncio
+    async def test_only_transient_errors_count_against_deployment(self):
+        """Test invalid requests leave a deployment healthy while repeated server errors start a cooldown."""
+        clock = FakeClock()
+        only = Deployment("https://a", "key", "gpt-4o")
+        pool = DeploymentPool([only], clock=clock)
+        request = httpx.Request("POST", "https://test.openai.azure.com")
+        errors = {
+            400: openai.BadRequestError("Content filtered", response=httpx.Response(400, request=request), body=None),
+            500: openai.InternalServerError("Server error", response=httpx.Response(500, request=request), body=None),
+        }
+        status = 400
+
+        async def send(_deployment):
+            raise errors[status]
+
+        for _ in range(3):
+            with pytest.raises(openai.BadRequestError):
+                await pool.call(send)
+        assert only.consecutive_failures == 0
+        assert only.is_healthy(clock.now)
+
+        status = 500
+        for _ in range(3):
+            with pytest.raises(openai.InternalServerError):
+                await pool.call(send)
+        assert not only.is_healthy(clock.now)
+        assert pool.choose() is only
+
+    @pytest.mark.asyncio
+    async def test_slow_call_hedged_on_another_deployment(self):
+        """Test a call slower than the latency percentile is duplicated and the first response wins."""
+        slow, fast = Deployment("https://slow", "key", "gpt-4o"), Deployment("https://fast", "key", "gpt-4o")
+        slow.latencies.extend([0.01] * 5)
+        pool = DeploymentPool([slow, fast], hedging_enabled=True, hedge_min_samples=5)
+        cancelled = asyncio.Event()
+
+        async def send(deployment):
+            if deployment is slow:
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+            return deployment.name
+
+        with patch.object(pool, "choose", side_effect=[slow, fast]):
+            result = await asyncio.wait_for(pool.call(send), timeout=1)
+
+        assert result == fast.name
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        assert slow.in_flight == 0
+
+    @patch("src.services.deployment_pool.config")
+    def test_from_config_adds_extra_deployments(self, mock_config):
+        """Test EVALUATION_DEPLOYMENTS entries join the configured deployment."""
+        values = {
+            "azure_openai_endpoint": "https://primary",
+            "azure_openai_api_key": "key",
+            "model_deployment_name": "gpt-4o",
+            "fast_model_deployment_name": "",
+            "evaluation_deployments": '[{"endpoint": "https://secondary", "api_key": "key2", "deployment": "gpt-4o"}]',
+            "evaluation_hedging_enabled": True,
+            "evaluation_hedge_percentile": 95.0,
+            "evaluation_hedge_min_samples": 10,
+        }
+        mock_config.__getitem__.side_effect = values.__getitem__
+
+        pool = DeploymentPool.from_config()
+
+        assert [deployment.endpoint for deployment in pool.deployments] == ["https://primary", "https://secondary"]
+        assert pool.hedging_enabled and pool.hedge_percentile == 95.0
+
+        values["evaluation_deployments"] = "not json"
+        assert len(DeploymentPool.from_config().deployments) == 1
@@ -0,0 +1,138 @@
+"""Tests for the evaluation_cache module."""
+
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.services.evaluation_cache import EvaluationCache, build_cache_key, normalize_transcript
+
+RESULT = {"overall_score": 80, "strengths": ["Clear value proposition"]}
+
+
+class TestCacheKey:
+    """Test cases for cache key construction."""
+
+    def test_normalize_transcript(self):
+        """Test whitespace and line ending differences are normalized away."""
+        assert normalize_transcript("  user:  hello\r\n\r\n\r\nassistant:\thi  ") == "user: hello\nassistant: hi"
+
+    def test_key_components(self):
+        """Test every key component changes the key while formatting does not."""
+        key = build_cache_key("scenario1", "1:abc", "gpt-4o", "user: hello")
+
+        assert key == build_cache_key("scenario1", "1:abc", "gpt-4o", "user:   hello\n")
+        assert key != build_cache_key("scenario2", "1:abc", "gpt-4o", "user: hello")
+        assert key != build_cache_key("scenario1", "1:def", "gpt-4o", "user: hello")
+        assert key != build_cache_key("scenario1", "1:abc", "gpt-4o-mini", "user: hello")
+        assert key != build_cache_key("scenario1", "1:abc", "gpt-4o", "user: goodbye")
+
+
+class TestEvaluationCache:
+    """Test cases for EvaluationCache."""
+
+    def test_memory_hit_returns_copy(self):
+        """Test memory hits return copies that callers can mutate safely."""
+        cache = EvaluationCache()
+        cache.set("key", RESULT)
+
+        first = cache.get("key")
+        assert first == RESULT
+        first["overall_score"] = 0
+        assert cache.get("key") == RESULT
+        assert cache.get("missing") is None
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted from memory."""
+        cache = EvaluationCache(max_memory_entries=2)
+        cache.set("a", RESULT)
+        cache.set("b", RESULT)
+        cache.get("a")
+        cache.set("c", RESULT)
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+
+    def test_ttl_expiry(self):
+        """Test entries expire after the TTL."""
+        cache = EvaluationCache(ttl_seconds=60)
+        with patch("src.services.evaluation_cache.time.time", return_value=1000.0):
+            cache.set("key", RESULT)
+        with patch("src.services.evaluation_cache.time.time", return_value=1030.0):
+            assert cache.get("key") == RESULT
+        with patch("src.services.evaluation_cache.time.time", return_value=1061.0):
+            assert cache.get("key") is None
+
+    def test_disabled_cache(self):
+        """Test a zero-capacity cache stores nothing."""
+        cache = EvaluationCache(max_memory_entries=0)
+        cache.set("key", RESULT)
+
+        assert not cache.enabled
+        assert cache.get("key") is None
+
+    @patch("src.services.evaluation_cache.metrics")
+    def test_disk_tier_survives_restart(self, mock_metrics):
+        """Test entries written to disk are found by a fresh cache instance."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = EvaluationCache(cache_dir=Path(temp_dir))
+            cache.set("key", RESULT)
+            cache.flush()
+
+            assert EvaluationCache(cache_dir=Path(temp_dir)).get("key") == RESULT
+            mock_metrics.increment.assert_called_with("evaluation_cache_hits", labels={"tier": "disk"})
+
+    def test_disk_size_eviction(self):
+        """Test the disk tier evicts the oldest files over its size budget."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = EvaluationCache(cache_dir=Path(temp_dir), max_disk_bytes=150)
+            for key in ("a", "b", "c"):
+                cache.set(key, RESULT)
+            cache.flush()
+
+            assert 0 < len(list(Path(temp_dir).glob("*.json"))) < 3
+
+    def test_corrupt_disk_entry_is_discarded(self):
+        """Test unreadable disk entries are treated as misses and removed."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            (Path(temp_dir) / "key.json").write_text("{not json", encoding="utf-8")
+
+            assert EvaluationCache(cache_dir=Path(temp_dir)).get("key") is None
+            assert not (Path(temp_dir) / "key.json").exists()
+
+    @pytest.mark.asyncio
+    async def test_get_async_reads_disk_tier(self):
+        """Test async lookups find entries written to disk by another instance."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = EvaluationCache(cache_dir=Path(temp_dir))
+            cache.set("key", RESULT)
+            cache.flush()
+
+            fresh = EvaluationCache(cache_dir=Path(temp_dir))
+            assert await fresh.get_async("key") == RESULT
+            assert await fresh.get_async("missing") is None
+
+    def test_disk_scanned_only_over_size_limit(self):
+        """Test the disk tier directory is scanned on the first write and then only once over the limit."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = EvaluationCache(cache_dir=Path(temp_dir), max_disk_bytes=1024 * 1024)
+            with patch.object(cache, "_scan_disk", wraps=cache._scan_disk) as scan:
+                for index in range(20):
+                    cache.set(f"key-{index}", RESULT)
+                cache.flush()
+
+            assert scan.call_count == 1
+            assert len(list(Path(temp_dir).glob("*.json"))) == 20
+
+    def test_unwritable_disk_tier_is_disabled(self):
+        """Test a cache directory that cannot be created turns the disk tier off and keeps the memory tier."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            blocker = Path(temp_dir) / "file"
+            blocker.write_text("", encoding="utf-8")
+            cache = EvaluationCache(cache_dir=blocker / "cache")
+            cache.set("key", RESULT)
+            cache.flush()
+
+            assert cache.cache_dir is None
+            assert cache.get("key") == RESULT
@@ -0,0 +1,81 @@
+"""Tests for the evaluation_stream module."""
+
+import json
+
+from src.services.evaluation_stream import (
+    EvaluationStreamParser,
+    IncrementalJsonParser,
+    evaluation_event,
+    format_sse,
+)
+
+EVALUATION = {
+    "speaking_tone_style": {"professional_tone": 8, "active_listening": 7, "engagement_quality": 9, "total": 24},
+    "conversation_content": {"needs_assessment": 20, "value_proposition": 22, "objection_handling": 18, "total": 60},
+    "overall_score": 84,
+    "strengths": ['Built "rapport" early', "Clear\nvalue é"],
+    "improvements": ["Ask more questions"],
+    "specific_feedback": "Solid call.",
+}
+
+
+class TestIncrementalJsonParser:
+    """Test cases for IncrementalJsonParser."""
+
+    def test_values_reported_with_paths(self):
+        """Test scalars are reported with their object keys and array indexes."""
+        parser = IncrementalJsonParser()
+
+        values = parser.feed('{"a": [1, {"b": null}, true, -1.5e3], "c": "x\\u00e9"}')
+
+        assert values == [(("a", 0), 1), (("a", 1, "b"), None), (("a", 2), True), (("a", 3), -1500.0), (("c",), "xé")]
+
+    def test_chunk_boundaries_do_not_matter(self):
+        """Test feeding one character at a time yields the same values as feeding the whole document."""
+        text = json.dumps(EVALUATION, indent=2)
+        expected = IncrementalJsonParser().feed(text)
+
+        parser = IncrementalJsonParser()
+        values = [value for char in text for value in parser.feed(char)]
+
+        assert values == expected
+
+    def test_value_reported_as_soon_as_complete(self):
+        """Test a string is reported when its closing quote arrives, before the document ends."""
+        parser = IncrementalJsonParser()
+
+        assert not parser.feed('{"strengths": ["Good ope')
+        assert parser.feed('ning", ') == [(("strengths", 0), "Good opening")]
+
+
+class TestEvaluationStreamParser:
+    """Test cases for EvaluationStreamParser."""
+
+    def test_events_for_evaluation_schema(self):
+        """Test scores, list items and feedback become events and totals are skipped."""
+        parser = EvaluationStreamParser()
+        text = json.dumps(EVALUATION)
+
+        events = list(parser.feed(text[:60])) + list(parser.feed(text[60:]))
+
+        assert events[0] == {
+            "type": "score",
+            "section": "speaking_tone_style",
+            "field": "professional_tone",
+            "value": 8,
+        }
+        assert [event["type"] for event in events].count("score") == 6
+        assert {"type": "strength", "index": 1, "value": "Clear\nvalue é"} in events
+        assert {"type": "improvement", "index": 0, "value": "Ask more questions"} in events
+        assert {"type": "overall_score", "value": 84} in events
+        assert events[-1] == {"type": "specific_feedback", "value": "Solid call."}
+        assert json.loads(parser.text) == EVALUATION
+
+    def test_unknown_paths_are_ignored(self):
+        """Test values outside the evaluation schema do not produce events."""
+        assert evaluation_event(("speaking_tone_style", "total"), 24) is None
+        assert evaluation_event(("unexpected",), 1) is None
+
+    def test_format_sse(self):
+        """Test events are framed as Server-Sent Events."""
+        assert format_sse({"type": "done"}) == 'event: done\ndata: {"type": "done"}\n\n'
@@ -1,63 +1,38 @@
 """Tests for the graph_scenario_generator module."""
 
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
 
 from src.services.graph_scenario_generator import GraphScenarioGenerator
+from src.services.model_call_guard import CircuitBreaker, ModelCallGuard
+from src.services.rate_limiter import AdaptiveConcurrencyLimiter
 
 
 class TestGraphScenarioGenerator:
     """Test cases for GraphScenarioGenerator."""
 
+    @pytest.mark.asyncio
     @patch("src.services.graph_scenario_generator.config")
-    def test_initialization_missing_config(self, mock_config):
-        """Test initialization with missing OpenAI configuration."""
-        mock_config.__getitem__.side_effect = lambda key: {
-            "azure_openai_endpoint": "",
-            "azure_openai_api_key": "",
-        }.get(key, "")
-
-        generator = GraphScenarioGenerator()
-        assert generator.openai_client is None
-
-    @patch("src.services.graph_scenario_generator.AzureOpenAI")
-    @patch("src.services.graph_scenario_generator.config")
-    def test_initialization_success(self, mock_config, mock_azure_openai):
-        """Test successful initialization with proper config."""
-        mock_config.__getitem__.side_effect = lambda key: {
-            "azure_openai_endpoint": "https://test.openai.azure.com",
-            "azure_openai_api_key": "test-key",
-            "api_version": "2024-02-01",
-        }.get(key, "test-value")
-
-        generator = GraphScenarioGenerator()
-        assert generator.openai_client is not None
-        mock_azure_openai.assert_called_once()
-
-    @patch("src.services.graph_scenario_generator.config")
-    def test_initialization_exception(self, mock_config):
-        """Test initialization with configuration exception."""
-        mock_config.__getitem__.side_effect = Exception("Config error")
-
-        generator = GraphScenarioGenerator()
-        assert generator.openai_client is None
-
-    @patch("src.services.graph_scenario_generator.config")
-    def test_generate_scenario_from_graph_empty_data(self, mock_config):
+    async def test_generate_scenario_from_graph_empty_data(self, mock_config):
         """Test scenario generation with empty graph data."""
         mock_config.__getitem__.side_effect = lambda key: {
             "model_deployment_name": "gpt-4",
         }.get(key, "test-value")
 
         generator = GraphScenarioGenerator()
-        result = generator.generate_scenario_from_graph({})
+        result = await generator.generate_scenario_from_graph({})
 
         assert result["id"] == "graph-generated"
         assert result["name"] == "Your Personalized Sales Scenario"
         assert "generated_from_graph" in result
         assert result["generated_from_graph"] is True
 
-    def test_generate_scenario_from_graph_with_meetings(self):
+    @pytest.mark.asyncio
+    @patch("src.services.graph_scenario_generator.openai_clients")
+    async def test_generate_scenario_from_graph_with_meetings(self, mock_clients):
         """Test scenario generation with meeting data."""
+        mock_clients.get_client.return_value = None  # Force use of fallback
         with patch("src.services.graph_scenario_generator.config") as mock_config:
             mock_config.__getitem__.side_effect = lambda key: {
                 "model_deployment_name": "gpt-4",
@@ -82,8 +57,7 @@ class TestGraphScenarioGenerator:
             }
 
             generator = GraphScenarioGenerator()
-            generator.openai_client = None  # Force use of fallback
-            result = generator.generate_scenario_from_graph(graph_data)
+            result = await generator.generate_scenario_from_graph(graph_data)
 
             assert result["id"] == "graph-generated"
             assert result["name"] == "Your Personalized Sales Scenario"
@@ -111,30 +85,35 @@ class TestGraphScenarioGenerator:
         expected = "- Team Standup with Alice, Bob\n" + "- Client Call with Charlie, Diana, Eve"
         assert result == expected
 
-    def test_create_graph_scenario_content_no_meetings(self):
+    @pytest.mark.asyncio
+    async def test_create_graph_scenario_content_no_meetings(self):
         """Test scenario content creation with no meetings."""
         generator = GraphScenarioGenerator()
-        result = generator._create_graph_scenario_content([])
+        result = await generator._create_graph_scenario_content([])
 
         # Should return fallback content
         assert "Jordan Martinez" in result
         assert "TechCorp Solutions" in result
 
-    def test_create_graph_scenario_content_no_openai_client(self):
+    @pytest.mark.asyncio
+    @patch("src.services.graph_scenario_generator.openai_clients")
+    async def test_create_graph_scenario_content_no_openai_client(self, mock_clients):
         """Test scenario content creation with no OpenAI client."""
+        mock_clients.get_client.return_value = None
         generator = GraphScenarioGenerator()
-        generator.openai_client = None
 
         meetings = [{"subject": "Test Meeting", "attendees": ["John"]}]
-        result = generator._create_graph_scenario_content(meetings)
+        result = await generator._create_graph_scenario_content(meetings)
 
         # Should return fallback content
         assert "Jordan Martinez" in result
         assert "TechCorp Solutions" in result
 
     # pylint: disable=R0801
+    @pytest.mark.asyncio
+    @patch("src.services.graph_scenario_generator.openai_clients")
     @patch("src.services.graph_scenario_generator.config")
-    def test_create_graph_scenario_content_with_openai(self, mock_config):
+    async def test_create_graph_scenario_content_with_openai(self, mock_config, mock_clients):
         """Test scenario content creation with OpenAI client."""
         mock_config.__getitem__.side_effect = lambda key: {
             "model_deployment_name": "gpt-4",
@@ -145,21 +124,23 @@ class TestGraphScenarioGenerator:
         mock_response = Mock()
         mock_response.choices = [Mock()]
         mock_response.choices[0].message.content = "Generated scenario content"
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+        mock_clients.get_client.return_value = mock_client
 
         generator = GraphScenarioGenerator()
-        generator.openai_client = mock_client
 
         meetings = [{"subject": "Sales Call", "attendees": ["Alice", "Bob"]}]
-        result = generator._create_graph_scenario_content(meetings)
+        result = await generator._create_graph_scenario_content(meetings)
 
         assert result == "Generated scenario content"
         mock_client.chat.completions.create.assert_called_once()
 
     # pylint: enable=R0801
 
+    @pytest.mark.asyncio
+    @patch("src.services.graph_scenario_generator.openai_clients")
     @patch("src.services.graph_scenario_generator.config")
-    def test_create_graph_scenario_content_openai_none_response(self, mock_config):
+    async def test_create_graph_scenario_content_openai_none_response(self, mock_config, mock_clients):
         """Test scenario content creation when OpenAI returns None content."""
         mock_config.__getitem__.side_effect = lambda key: {
             "model_deployment_name": "gpt-4",
@@ -170,16 +151,33 @@ class TestGraphScenarioGenerator:
         mock_response = Mock()
         mock_response.choices = [Mock()]
         mock_response.choices[0].message.content = None
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+        mock_clients.get_client.return_value = mock_client
 
         generator = GraphScenarioGenerator()
-        generator.openai_client = mock_client
 
         meetings = [{"subject": "Sales Call", "attendees": ["Alice"]}]
-        result = generator._create_graph_scenario_content(meetings)
+        result = await generator._create_graph_scenario_content(meetings)
 
         assert result == ""
 
+    @pytest.mark.asyncio
+    @patch("src.services.graph_scenario_generator.openai_clients")
+    async def test_create_graph_scenario_content_circuit_open(self, mock_clients):
+        """Test the fallback scenario is served without calling the model while the circuit is open."""
+        mock_client = Mock()
+        mock_client.chat.completions.create = AsyncMock()
+        mock_clients.get_client.return_value = mock_client
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=30)
+        breaker.record_failure()
+        guard = ModelCallGuard(AdaptiveConcurrencyLimiter(4), breaker, deadline_seconds=5)
+        generator = GraphScenarioGenerator(call_guard=guard)
+
+        result = await generator._create_graph_scenario_content([{"subject": "Sales Call", "attendees": ["Alice"]}])
+
+        assert "Jordan Martinez" in result
+        mock_client.chat.completions.create.assert_not_called()
+
     def test_build_scenario_generation_prompt(self):
         """Test building the scenario generation prompt."""
         generator = GraphScenarioGenerator()
@@ -207,8 +205,11 @@ class TestGraphScenarioGenerator:
         assert "YOUR CHARACTER PROFILE" in result
         assert "KEY CONCERNS TO RAISE" in result
 
-    def test_generate_scenario_truncated_description(self):
+    @pytest.mark.asyncio
+    @patch("src.services.graph_scenario_generator.openai_clients")
+    async def test_generate_scenario_truncated_description(self, mock_clients):
         """Test scenario generation with long description that gets truncated."""
+        mock_clients.get_client.return_value = None  # Force use of fallback
         with patch("src.services.graph_scenario_generator.config") as mock_config:
             mock_config.__getitem__.side_effect = lambda key: {
                 "model_deployment_name": "gpt-4",
@@ -216,7 +217,6 @@ class TestGraphScenarioGenerator:
 
             # Create a long scenario content that will be truncated
             generator = GraphScenarioGenerator()
-            generator.openai_client = None  # Force use of fallback
 
             # Patch the fallback method to return long content
             long_content = (
@@ -225,13 +225,14 @@ class TestGraphScenarioGenerator:
             )
             generator._get_fallback_scenario_content = lambda: long_content
 
-            result = generator.generate_scenario_from_graph({})
+            result = await generator.generate_scenario_from_graph({})
 
             # Description should be truncated to 100 characters + "..."
             assert len(result["description"]) <= 103
             assert result["description"].endswith("...")
 
-    def test_generate_scenario_multiple_meetings_limit(self):
+    @pytest.mark.asyncio
+    async def test_generate_scenario_multiple_meetings_limit(self):
         """Test scenario generation limits meetings to first 3."""
         with patch("src.services.graph_scenario_generator.config") as mock_config:
             mock_config.__getitem__.side_effect = lambda key: {
@@ -248,7 +249,7 @@ class TestGraphScenarioGenerator:
             with patch.object(generator, "_create_graph_scenario_content") as mock_create:
                 mock_create.return_value = "Test scenario content"
 
-                generator.generate_scenario_from_graph(graph_data)
+                await generator.generate_scenario_from_graph(graph_data)
 
                 # Verify the method was called with limited meetings
                 assert mock_create.called
@@ -258,7 +259,8 @@ class TestGraphScenarioGenerator:
                 assert called_meetings[1]["subject"] == "Meeting 1"
                 assert called_meetings[2]["subject"] == "Meeting 2"
 
-    def test_generate_scenario_attendees_limit(self):
+    @pytest.mark.asyncio
+    async def test_generate_scenario_attendees_limit(self):
         """Test scenario generation limits attendees to first 3 per meeting."""
         with patch("src.services.graph_scenario_generator.config") as mock_config:
             mock_config.__getitem__.side_effect = lambda key: {
@@ -281,7 +283,7 @@ class TestGraphScenarioGenerator:
             with patch.object(generator, "_create_graph_scenario_content") as mock_create:
                 mock_create.return_value = "Test scenario content"
 
-                generator.generate_scenario_from_graph(graph_data)
+                await generator.generate_scenario_from_graph(graph_data)
 
                 # Verify the method was called with limited attendees
                 assert mock_create.called
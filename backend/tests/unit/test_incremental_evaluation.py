@@ -0,0 +1,143 @@
+"""Tests for incremental evaluation of live sessions."""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+from unittest.mock import Mock
+
+import pytest
+
+from src.services.incremental_evaluation import IncrementalEvaluator
+
+
+class FakeAnalyzer:
+    """Analyzer stand-in that records running evaluation updates."""
+
+    def __init__(self, results: Optional[List[Optional[Dict[str, Any]]]] = None):
+        self.evaluation_scenarios = {"scenario1": {}}
+        self.calls: List[str] = []
+        self.results = results
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def update_running_evaluation(
+        self, _scenario_id: str, _running_evaluation: Optional[Dict[str, Any]], new_turns: str
+    ) -> Optional[Dict[str, Any]]:
+        """Record the new turns and return the next result once released."""
+        self.calls.append(new_turns)
+        await self.release.wait()
+        if self.results is not None:
+            return self.results.pop(0)
+        return {"overall_score": len(self.calls), "dimension_notes": {"active_listening": "asks questions"}}
+
+
+async def settle():
+    """Let callbacks scheduled with call_soon_threadsafe and update tasks run."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def create_evaluator(analyzer: FakeAnalyzer, **kwargs: Any) -> IncrementalEvaluator:
+    """Create an evaluator bound to the running test loop."""
+    return IncrementalEvaluator(analyzer, asyncio.get_running_loop, **kwargs)  # type: ignore[arg-type]
+
+
+class TestIncrementalEvaluator:
+    """Test incremental evaluation."""
+
+    @pytest.mark.asyncio
+    async def test_user_turns_update_running_evaluation(self):
+        """Test each user turn triggers an update and consolidation reuses the running evaluation."""
+        analyzer = FakeAnalyzer()
+        evaluator = create_evaluator(analyzer)
+
+        session_id = evaluator.start_session("scenario1")
+        assert session_id is not None
+        evaluator.record_turn(session_id, "user", "Hello")
+        await settle()
+        evaluator.record_turn(session_id, "assistant", "Hi there")
+        evaluator.record_turn(session_id, "user", "What are your challenges?")
+        await settle()
+        evaluator.record_turn(session_id, "assistant", "Integration.")
+        await settle()
+
+        result = await evaluator.consolidate(session_id, "scenario1")
+
+        assert analyzer.calls == ["user: Hello", "assistant: Hi there\nuser: What are your challenges?"]
+        assert result == {"overall_score": 2}
+
+    @pytest.mark.asyncio
+    async def test_turns_are_batched_while_update_in_flight(self):
+        """Test turns completed during an update are folded into a single follow-up update."""
+        analyzer = FakeAnalyzer()
+        analyzer.release.clear()
+        evaluator = create_evaluator(analyzer)
+        session_id = evaluator.start_session("scenario1")
+        assert session_id is not None
+
+        evaluator.record_turn(session_id, "user", "One")
+        await settle()
+        evaluator.record_turn(session_id, "user", "Two")
+        evaluator.record_turn(session_id, "user", "Three")
+        await settle()
+        analyzer.release.set()
+
+        result = await evaluator.consolidate(session_id, "scenario1")
+
+        assert analyzer.calls == ["user: One", "user: Two\nuser: Three"]
+        assert result == {"overall_score": 2}
+
+    @pytest.mark.asyncio
+    async def test_end_session_folds_pending_turns_after_failure(self):
+        """Test ending a session retries turns a failed update left pending."""
+        analyzer = FakeAnalyzer(results=[None, {"overall_score": 70}])
+        evaluator = create_evaluator(analyzer)
+        session_id = evaluator.start_session("scenario1")
+        assert session_id is not None
+
+        evaluator.record_turn(session_id, "user", "Hello")
+        await settle()
+        evaluator.end_session(session_id)
+        await settle()
+
+        assert analyzer.calls == ["user: Hello", "user: Hello"]
+        assert await evaluator.consolidate(session_id, "scenario1") == {"overall_score": 70}
+
+    @pytest.mark.asyncio
+    async def test_consolidate_returns_none_when_incomplete(self):
+        """Test consolidation signals a fallback for failed, unknown and mismatched sessions."""
+        analyzer = FakeAnalyzer(results=[None, None])
+        evaluator = create_evaluator(analyzer)
+        session_id = evaluator.start_session("scenario1")
+        assert session_id is not None
+
+        evaluator.record_turn(session_id, "user", "Hello")
+        await settle()
+
+        assert await evaluator.consolidate(session_id, "other-scenario") is None
+        assert await evaluator.consolidate(session_id, "scenario1") is None
+        assert await evaluator.consolidate("unknown", "scenario1") is None
+
+    def test_start_session_requires_evaluation_scenario(self):
+        """Test sessions are only tracked for scenarios with an evaluation when enabled."""
+        loop_provider = Mock()
+        evaluator = IncrementalEvaluator(FakeAnalyzer(), loop_provider)  # type: ignore[arg-type]
+        disabled = IncrementalEvaluator(FakeAnalyzer(), loop_provider, enabled=False)  # type: ignore[arg-type]
+
+        assert evaluator.start_session("unknown") is None
+        assert evaluator.start_session(None) is None
+        assert disabled.start_session("scenario1") is None
+        loop_provider.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_sessions_are_pruned_over_capacity(self):
+        """Test the least recently active sessions are dropped over capacity."""
+        evaluator = create_evaluator(FakeAnalyzer(), max_sessions=2)
+
+        first = evaluator.start_session("scenario1")
+        await settle()
+        evaluator.start_session("scenario1")
+        evaluator.start_session("scenario1")
+        await settle()
+
+        assert len(evaluator._sessions) == 2
+        assert first not in evaluator._sessions
@@ -0,0 +1,139 @@
+"""Tests for live pronunciation assessment of voice sessions."""
+
+import asyncio
+import base64
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+
+from src.services.live_pronunciation import LivePronunciationAssessor
+from src.services.pronunciation_assessment import PronunciationAssessor
+
+BYTES_PER_MS = 48
+
+
+class FakeAssessor(PronunciationAssessor):
+    """Assessor stand-in that records the audio and reference text of each call."""
+
+    def __init__(self, scores: Optional[List[Optional[float]]] = None):
+        super().__init__()
+        self.calls: List[Tuple[bytes, Optional[str]]] = []
+        self.scores = scores
+
+    async def assess_pronunciation(
+        self,
+        audio_data: Any,
+        reference_text: Optional[str] = None,
+        reference_turns: Optional[List[str]] = None,
+        latency_budget_ms: Optional[float] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Record the call and return the next score, None to fail it."""
+        self.calls.append((bytes(audio_data), reference_text))
+        score = self.scores.pop(0) if self.scores else 80.0
+        if score is None:
+            return None
+        words = [{"word": word, "accuracy": score, "error_type": "None"} for word in (reference_text or "").split()]
+        return {"accuracy_score": score, "pronunciation_score": score, "words": words}
+
+
+async def settle():
+    """Let callbacks scheduled with call_soon_threadsafe and assessment tasks run."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def send_turn(live: LivePronunciationAssessor, item_id: str, start_ms: int, end_ms: int, transcript: str) -> None:
+    """Report a user turn's speech and transcription events."""
+    live.record_event(
+        "session-1", {"type": "input_audio_buffer.speech_started", "item_id": item_id, "audio_start_ms": start_ms}
+    )
+    live.record_event(
+        "session-1", {"type": "input_audio_buffer.speech_stopped", "item_id": item_id, "audio_end_ms": end_ms}
+    )
+    live.record_event(
+        "session-1",
+        {"type": "conversation.item.input_audio_transcription.completed", "item_id": item_id, "transcript": transcript},
+    )
+
+
+def audio_chunk(value: int, milliseconds: int) -> str:
+    """A base64 chunk of constant PCM bytes."""
+    return base64.b64encode(bytes([value]) * milliseconds * BYTES_PER_MS).decode("ascii")
+
+
+class TestLivePronunciationAssessor:
+    """Test live pronunciation assessment."""
+
+    @pytest.mark.asyncio
+    async def test_turns_assessed_as_they_end_and_merged(self):
+        """Test each turn's audio is assessed with its transcript and the report combines the turns."""
+        assessor = FakeAssessor([90.0, 60.0])
+        pushed: List[Tuple[str, Dict[str, Any]]] = []
+        live = LivePronunciationAssessor(
+            assessor,
+            asyncio.get_running_loop,
+            on_turn_assessed=lambda session_id, turn: pushed.append((session_id, turn)),
+        )
+
+        assert live.start_session("session-1")
+        live.record_audio("session-1", audio_chunk(1, 1000))
+        live.record_audio("session-1", audio_chunk(2, 1000))
+        send_turn(live, "item-1", 0, 1000, "hello there")
+        send_turn(live, "item-2", 1000, 2000, "how are you")
+        await settle()
+
+        assert assessor.calls == [
+            (bytes([1]) * 1000 * BYTES_PER_MS, "hello there"),
+            (bytes([2]) * 1000 * BYTES_PER_MS, "how are you"),
+        ]
+        assert [(session_id, turn["turn"], turn["item_id"]) for session_id, turn in pushed] == [
+            ("session-1", 0, "item-1"),
+            ("session-1", 1, "item-2"),
+        ]
+
+        result = await live.consolidate("session-1", 2)
+
+        assert result["pronunciation_score"] == 75.0
+        assert [turn["reference_text"] for turn in result["turns"]] == ["hello there", "how are you"]
+        assert [word["word"] for word in result["words"]] == ["hello", "there", "how", "are", "you"]
+
+    @pytest.mark.asyncio
+    async def test_consolidate_returns_none_when_incomplete(self):
+        """Test a session with a failed or missing turn, or an unknown session, has no live result."""
+        live = LivePronunciationAssessor(FakeAssessor([None, 80.0]), asyncio.get_running_loop)
+
+        live.start_session("session-1")
+        live.record_audio("session-1", audio_chunk(1, 2000))
+        send_turn(live, "item-1", 0, 1000, "hello")
+        send_turn(live, "item-2", 1000, 2000, "goodbye")
+        await settle()
+
+        assert await live.consolidate("session-1", 2) is None
+        assert await live.consolidate("unknown", 1) is None
+
+    @pytest.mark.asyncio
+    async def test_audio_before_pending_turns_is_dropped(self):
+        """Test captured audio is only kept for turns still waiting and a short retention window."""
+        live = LivePronunciationAssessor(FakeAssessor(), asyncio.get_running_loop)
+
+        live.start_session("session-1")
+        live.record_audio("session-1", audio_chunk(1, 13000))
+        send_turn(live, "item-1", 1000, 3000, "hello")
+        live.record_event(
+            "session-1", {"type": "input_audio_buffer.speech_started", "item_id": "item-2", "audio_start_ms": 12000}
+        )
+        live.record_audio("session-1", audio_chunk(1, 10000))
+        live.record_event(
+            "session-1", {"type": "input_audio_buffer.speech_stopped", "item_id": "item-2", "audio_end_ms": 22000}
+        )
+        await settle()
+
+        session = live._sessions["session-1"]
+        assert session.audio_offset == 12000 * BYTES_PER_MS
+        assert len(session.audio) == 11000 * BYTES_PER_MS
+
+        live.end_session("session-1")
+        await settle()
+
+        assert not session.audio
+        assert not LivePronunciationAssessor(FakeAssessor(), asyncio.get_running_loop, enabled=False).start_session("s")
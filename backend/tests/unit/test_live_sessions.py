@@ -0,0 +1,29 @@
+"""Tests for bounded live session tracking."""
+
+from unittest.mock import patch
+
+from src.services.live_sessions import evict_sessions
+
+
+class _Session:
+    """A session last active at the given time."""
+
+    def __init__(self, last_activity: float):
+        self.last_activity = last_activity
+
+
+class TestEvictSessions:
+    """Test evicting idle and excess sessions."""
+
+    @patch("src.services.live_sessions.metrics")
+    @patch("src.services.live_sessions.time.monotonic", return_value=1000.0)
+    def test_idle_and_least_recently_active_sessions_evicted(self, _mock_monotonic, mock_metrics):
+        """Test sessions idle past the TTL and the oldest ones over capacity are removed and returned."""
+        idle, old, recent, newest = _Session(100.0), _Session(900.0), _Session(950.0), _Session(990.0)
+        sessions = {"idle": idle, "old": old, "recent": recent, "newest": newest}
+
+        evicted = evict_sessions(sessions, max_sessions=2, session_ttl_seconds=600.0, gauge="sessions")
+
+        assert evicted == [idle, old]
+        assert list(sessions) == ["recent", "newest"]
+        mock_metrics.set_gauge.assert_called_once_with("sessions", 2)
@@ -0,0 +1,64 @@
+"""Tests for the metrics module."""
+
+from src.services.metrics import MetricsRegistry
+
+
+class TestMetricsRegistry:
+    """Test cases for MetricsRegistry."""
+
+    def test_counters_and_gauges(self):
+        """Test counters accumulate and gauges overwrite."""
+        registry = MetricsRegistry()
+
+        registry.increment("requests")
+        registry.increment("requests", 2)
+        registry.set_gauge("queue_depth", 5)
+        registry.set_gauge("queue_depth", 3)
+
+        snapshot = registry.snapshot()
+        assert snapshot["counters"]["requests"] == 3
+        assert snapshot["gauges"]["queue_depth"] == 3
+
+    def test_labels_create_separate_series(self):
+        """Test labelled metrics are keyed separately."""
+        registry = MetricsRegistry()
+
+        registry.increment("calls", labels={"tier": "fast"})
+        registry.increment("calls", labels={"tier": "large"})
+
+        counters = registry.snapshot()["counters"]
+        assert counters["calls{tier=fast}"] == 1
+        assert counters["calls{tier=large}"] == 1
+
+    def test_histogram_summary(self):
+        """Test histogram summaries and percentiles."""
+        registry = MetricsRegistry()
+
+        for value in range(1, 101):
+            registry.observe("latency_ms", value)
+
+        summary = registry.snapshot()["histograms"]["latency_ms"]
+        assert summary["count"] == 100
+        assert summary["max"] == 100
+        assert summary["p50"] == 50
+        assert summary["p90"] == 90
+        assert registry.percentile("latency_ms", 90) == 90
+        assert registry.percentile("missing", 90) is None
+
+    def test_timer_records_duration(self):
+        """Test the timer context manager records a sample."""
+        registry = MetricsRegistry()
+
+        with registry.timer("block_ms"):
+            pass
+
+        assert registry.snapshot()["histograms"]["block_ms"]["count"] == 1
+
+    def test_reset(self):
+        """Test reset clears all metrics."""
+        registry = MetricsRegistry()
+        registry.increment("requests")
+
+        registry.reset()
+
+        assert registry.snapshot() == {"counters": {}, "gauges": {}, "histograms": {}}
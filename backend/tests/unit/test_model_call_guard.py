@@ -0,0 +1,254 @@
+"""Tests for the adaptive concurrency limiter, circuit breaker and model call guard."""
+
+import asyncio
+import random
+from typing import Dict, Optional
+
+import httpx
+import openai
+import pytest
+
+from src.services.metrics import metrics
+from src.services.model_call_guard import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    ModelCallGuard,
+)
+from src.services.rate_limiter import AdaptiveConcurrencyLimiter
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _rate_limit_error(headers: Optional[Dict[str, str]] = None) -> openai.RateLimitError:
+    """Build the error the SDK raises for a throttled call."""
+    request = httpx.Request("POST", "https://test.openai.azure.com")
+    response = httpx.Response(429, headers=headers or {}, request=request)
+    return openai.RateLimitError("Too many requests", response=response, body=None)
+
+
+class ThrottlingBackend:
+    """Stand-in for a deployment that answers 429 above a concurrency it can sustain."""
+
+    def __init__(self, capacity: int, retry_after_ms: str = "5"):
+        self.capacity = capacity
+        self.retry_after_ms = retry_after_ms
+        self.in_flight = 0
+        self.throttled = 0
+        self.completed = 0
+
+    async def complete(self) -> str:
+        """Complete a call, or raise a throttling error when over capacity."""
+        self.in_flight += 1
+        try:
+            if self.in_flight > self.capacity:
+                self.throttled += 1
+                raise _rate_limit_error({"retry-after-ms": self.retry_after_ms})
+            await asyncio.sleep(0.005)
+            self.completed += 1
+            return "ok"
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    """Start each test with empty metrics."""
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """Test cases for AdaptiveConcurrencyLimiter."""
+
+    @pytest.mark.asyncio
+    async def test_limit_bounds_concurrency_and_adapts(self):
+        """Test waiters queue at the limit, throttling halves it once per interval and success grows it."""
+        clock = FakeClock()
+        limiter = AdaptiveConcurrencyLimiter(2, min_limit=1, max_limit=4, clock=clock)
+
+        await limiter.acquire()
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        assert metrics.snapshot()["gauges"]["model_concurrency_waiting"] == 1
+
+        limiter.release()
+        await asyncio.wait_for(waiter, timeout=1)
+        assert limiter.in_flight == 2
+
+        limiter.on_throttle()
+        limiter.on_throttle()
+        assert limiter.limit == 1
+        clock.now += 1
+        limiter.on_throttle()
+        assert limiter.limit == 1
+
+        for _ in range(3):
+            limiter.on_success()
+        assert limiter.limit == 2
+        assert metrics.snapshot()["gauges"]["model_concurrency_limit"] == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        """Test a waiter cancelled while queued leaves the in-flight count unchanged."""
+        limiter = AdaptiveConcurrencyLimiter(1)
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        limiter.release()
+
+        assert limiter.in_flight == 0
+        await asyncio.wait_for(limiter.acquire(), timeout=1)
+
+
+class TestCircuitBreaker:
+    """Test cases for CircuitBreaker."""
+
+    def test_opens_after_threshold_and_probes_after_reset(self):
+        """Test the circuit opens on repeated failures and a single successful probe closes it."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout_seconds=10, clock=clock)
+
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == CIRCUIT_OPEN
+        assert not breaker.allow()
+
+        clock.now += 10
+        assert breaker.allow()
+        assert breaker.state == CIRCUIT_HALF_OPEN
+        assert not breaker.allow()
+
+        breaker.record_failure()
+        assert breaker.state == CIRCUIT_OPEN
+        clock.now += 10
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CIRCUIT_CLOSED
+        assert metrics.snapshot()["counters"]["model_circuit_rejections"] == 2
+
+
+class TestModelCallGuard:
+    """Test cases for ModelCallGuard."""
+
+    def _guard(self, limit: int = 8, deadline_seconds: float = 5.0, threshold: int = 100) -> ModelCallGuard:
+        limiter = AdaptiveConcurrencyLimiter(limit, min_limit=1, max_limit=limit, decrease_interval_seconds=0)
+        breaker = CircuitBreaker(failure_threshold=threshold, reset_timeout_seconds=30)
+        return ModelCallGuard(limiter, breaker, deadline_seconds, base_delay_seconds=0.001, rng=random.Random(0))
+
+    @pytest.mark.asyncio
+    async def test_throttling_backend_drives_limit_down_and_all_calls_succeed(self):
+        """Test 429s from an overloaded stand-in shrink the limit and calls succeed after retry-after."""
+        backend = ThrottlingBackend(capacity=2)
+        guard = self._guard(limit=8)
+
+        results = await asyncio.gather(*(guard.call(backend.complete) for _ in range(16)))
+
+        assert results == ["ok"] * 16
+        assert backend.throttled > 0
+        assert guard.limiter.limit < 8
+        counters = metrics.snapshot()["counters"]
+        assert counters["model_throttled_calls"] == backend.throttled
+        assert counters["model_call_retries"] == backend.throttled
+
+    @pytest.mark.asyncio
+    async def test_retry_after_beyond_deadline_gives_up(self):
+        """Test a retry-after hint past the deadline raises the throttling error instead of waiting."""
+        guard = self._guard(deadline_seconds=0.5)
+        attempts = 0
+
+        async def throttled():
+            nonlocal attempts
+            attempts += 1
+            raise _rate_limit_error({"retry-after": "2"})
+
+        with pytest.raises(openai.RateLimitError):
+            await guard.call(throttled)
+
+        assert attempts == 1
+        assert metrics.snapshot()["counters"]["model_call_deadline_exceeded"] == 1
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self):
+        """Test each call that runs out of retries counts once and later calls never reach the model."""
+        guard = self._guard(deadline_seconds=0.05, threshold=2)
+        attempts = 0
+
+        async def unavailable():
+            nonlocal attempts
+            attempts += 1
+            raise _rate_limit_error({"retry-after-ms": "1"})
+
+        # Running out of time can end a call on its last attempt's timeout rather than the throttle
+        with pytest.raises((openai.RateLimitError, asyncio.TimeoutError)):
+            await guard.call(unavailable)
+        assert attempts > 1
+        assert guard.breaker.state == CIRCUIT_CLOSED
+
+        with pytest.raises((openai.RateLimitError, asyncio.TimeoutError)):
+            await guard.call(unavailable)
+        reached = attempts
+        assert guard.breaker.state == CIRCUIT_OPEN
+
+        with pytest.raises(CircuitOpenError):
+            await guard.call(unavailable)
+        assert attempts == reached
+
+    @pytest.mark.asyncio
+    async def test_only_backend_responses_close_half_open_circuit(self):
+        """Test an error response from the model closes the circuit while a local error leaves it half-open."""
+        clock = FakeClock()
+        guard = self._guard(threshold=1)
+        guard.breaker.clock = clock
+        guard.breaker.record_failure()
+        clock.now += guard.breaker.reset_timeout_seconds
+        request = httpx.Request("POST", "https://test.openai.azure.com")
+
+        async def unconfigured():
+            raise RuntimeError("No Azure OpenAI deployment configured")
+
+        async def invalid():
+            raise openai.BadRequestError("Bad request", response=httpx.Response(400, request=request), body=None)
+
+        with pytest.raises(RuntimeError):
+            await guard.call(unconfigured)
+        assert guard.breaker.state == CIRCUIT_HALF_OPEN
+
+        with pytest.raises(openai.BadRequestError):
+            await guard.call(invalid)
+        assert guard.breaker.state == CIRCUIT_CLOSED
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_errors_raised_without_retry(self):
+        """Test errors other than throttling, server and connection errors are not retried."""
+        guard = self._guard()
+        attempts = 0
+
+        async def invalid():
+            nonlocal attempts
+            attempts += 1
+            raise ValueError("bad request")
+
+        with pytest.raises(ValueError):
+            await guard.call(invalid)
+        assert attempts == 1
+        assert guard.breaker.state == CIRCUIT_CLOSED
+        assert guard.breaker.allow()
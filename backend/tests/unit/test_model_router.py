@@ -0,0 +1,50 @@
+"""Tests for the model router."""
+
+from src.services.metrics import metrics
+from src.services.model_router import ModelRouter
+
+
+def _router(**overrides) -> ModelRouter:
+    """Build an enabled router with small thresholds."""
+    settings = {
+        "fast_deployment": "gpt-4o-mini",
+        "large_deployment": "gpt-4o",
+        "enabled": True,
+        "fast_max_tokens": 100,
+        "fast_latency_slo_ms": 2000.0,
+    }
+    settings.update(overrides)
+    return ModelRouter(**settings)
+
+
+class TestModelRouter:
+    """Test cases for ModelRouter."""
+
+    def test_routes_by_input_size_complexity_and_slo(self):
+        """Test short inputs and tight SLOs go to the fast tier unless the scenario is complex."""
+        router = _router()
+
+        assert router.route(50) == ("fast", "short_input")
+        assert router.route(500) == ("large", "long_input")
+        assert router.route(500, latency_slo_ms=1500) == ("fast", "latency_slo")
+        assert router.route(50, {"complexity": "complex"}, latency_slo_ms=1500) == ("large", "complex_scenario")
+        assert router.deployment_for("fast") == "gpt-4o-mini"
+        assert router.deployment_for("large") == "gpt-4o"
+
+    def test_disabled_without_fast_deployment(self):
+        """Test everything goes to the large tier when routing is off or no fast deployment exists."""
+        assert _router(enabled=False).route(10) == ("large", "disabled")
+        assert _router(fast_deployment="").route(10) == ("large", "disabled")
+
+    def test_shadow_mode_serves_large_tier_and_counts_disagreements(self):
+        """Test shadow mode keeps the large tier serving and flags large score differences."""
+        router = _router(shadow_mode=True, disagreement_threshold=10)
+        metrics.reset()
+
+        assert router.serving_tier("fast") == "large"
+        assert router.compare({"overall_score": 80}, {"overall_score": 75}, "scenario1") == 5
+        assert router.compare({"overall_score": 80}, {"overall_score": 62}, "scenario1") == 18
+
+        counters = metrics.snapshot()["counters"]
+        assert counters["model_router_shadow_comparisons"] == 2
+        assert counters["model_router_shadow_disagreements"] == 1
@@ -0,0 +1,123 @@
+"""Tests for the openai_clients module."""
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest.mock import patch
+
+import pytest
+from openai import AsyncAzureOpenAI
+
+from src.services.metrics import metrics
+from src.services.openai_clients import AsyncOpenAIClientRegistry
+
+TEST_CONFIG = {
+    "azure_openai_endpoint": "https://test.openai.azure.com",
+    "azure_openai_api_key": "test-key",
+    "api_version": "2024-12-01-preview",
+    "openai_max_connections": 20,
+    "openai_max_keepalive_connections": 10,
+    "openai_keepalive_expiry_seconds": 60.0,
+    "openai_timeout_seconds": 60.0,
+    "openai_max_retries": 0,
+}
+
+
+class TestAsyncOpenAIClientRegistry:
+    """Test cases for AsyncOpenAIClientRegistry."""
+
+    @pytest.mark.asyncio
+    @patch("src.services.openai_clients.config")
+    async def test_missing_config_returns_none(self, mock_config):
+        """Test no client is created without an endpoint and key."""
+        mock_config.__getitem__.side_effect = lambda key: ""
+        registry = AsyncOpenAIClientRegistry()
+
+        assert not registry.configured
+        assert registry.get_client() is None
+
+    @pytest.mark.asyncio
+    @patch("src.services.openai_clients.config")
+    async def test_client_shared_within_loop(self, mock_config):
+        """Test callers on the same loop share one pooled client."""
+        mock_config.__getitem__.side_effect = TEST_CONFIG.__getitem__
+        registry = AsyncOpenAIClientRegistry()
+
+        client = registry.get_client()
+
+        assert isinstance(client, AsyncAzureOpenAI)
+        assert registry.get_client() is client
+        pool = client._client._transport._pool  # pyright: ignore[reportAttributeAccessIssue]
+        assert pool._max_connections == 20
+        assert pool._max_keepalive_connections == 10
+        await registry.aclose()
+
+    @patch("src.services.openai_clients.config")
+    def test_client_per_event_loop(self, mock_config):
+        """Test each event loop gets its own client and closing releases it."""
+        mock_config.__getitem__.side_effect = TEST_CONFIG.__getitem__
+        registry = AsyncOpenAIClientRegistry()
+
+        async def get_and_close():
+            client = registry.get_client()
+            await registry.aclose()
+            return client
+
+        first = asyncio.run(get_and_close())
+        second = asyncio.run(get_and_close())
+
+        assert first is not second
+        assert first.is_closed()
+        assert not registry._clients
+
+    @pytest.mark.asyncio
+    @patch("src.services.openai_clients.config")
+    async def test_client_per_endpoint(self, mock_config):
+        """Test each endpoint of a deployment pool gets its own shared client."""
+        mock_config.__getitem__.side_effect = TEST_CONFIG.__getitem__
+        registry = AsyncOpenAIClientRegistry()
+
+        default = registry.get_client()
+        other = registry.get_client("https://other.openai.azure.com", "other-key")
+
+        assert other is not default
+        assert registry.get_client("https://other.openai.azure.com", "other-key") is other
+        await registry.aclose()
+        assert default.is_closed() and other.is_closed()
+
+    @pytest.mark.asyncio
+    @patch("src.services.openai_clients.config")
+    async def test_connection_reuse_counted(self, mock_config):
+        """Test requests on a shared client are counted and reuse the connection they opened."""
+
+        class Handler(BaseHTTPRequestHandler):
+            """Answers every GET with an empty JSON object on a kept-alive connection."""
+
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                """Send the empty JSON object."""
+                self.send_response(200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        endpoint = f"http://127.0.0.1:{server.server_address[1]}"
+        mock_config.__getitem__.side_effect = TEST_CONFIG.__getitem__
+        registry = AsyncOpenAIClientRegistry()
+        metrics.reset()
+
+        client = registry.get_client(endpoint, "test-key")
+        for _ in range(3):
+            await client._client.get(f"{endpoint}/ping")  # pyright: ignore[reportPrivateUsage]
+
+        counters = metrics.snapshot()["counters"]
+        assert counters[f"openai_http_requests{{endpoint={endpoint}}}"] == 3
+        assert counters[f"openai_connections_opened{{endpoint={endpoint}}}"] == 1
+        await registry.aclose()
+        server.shutdown()
@@ -0,0 +1,319 @@
+"""Tests for pronunciation assessment."""
+
+import asyncio
+import base64
+import json
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from src.services.evaluation_cache import EvaluationCache
+from src.services.pronunciation_assessment import (
+    DEFAULT_ASSESSMENT_SETTINGS,
+    PRONUNCIATION_REMOVED_SECONDS_METRIC,
+    PronunciationAssessor,
+)
+
+
+class TestPronunciationAssessor:
+    """Test pronunciation assessor functionality."""
+
+    def test_pronunciation_assessor_initialization(self):
+        """Test assessor initialization."""
+        assessor = PronunciationAssessor()
+        # Test that it initializes with config values
+        assert hasattr(assessor, "speech_key")
+        assert hasattr(assessor, "speech_region")
+
+    @pytest.mark.asyncio
+    async def test_assess_pronunciation_no_speech_key(self):
+        """Test pronunciation assessment with no speech key configured."""
+        assessor = PronunciationAssessor()
+        assessor.speech_key = None
+
+        result = await assessor.assess_pronunciation([], "test text")
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_prepare_audio_data_empty_list(self):
+        """Test preparing audio data with empty list."""
+        assessor = PronunciationAssessor()
+        result = await assessor._prepare_audio_data([])
+        assert len(result) == 0
+
+    @pytest.mark.asyncio
+    async def test_prepare_audio_data_with_user_chunks(self):
+        """Test preparing audio data with user chunks."""
+        assessor = PronunciationAssessor()
+
+        # Create test audio data
+        test_audio = b"test audio data"
+        encoded_audio = base64.b64encode(test_audio).decode("utf-8")
+
+        audio_data = [
+            {"type": "user", "data": encoded_audio},
+            {"type": "assistant", "data": "should be ignored"},
+        ]
+
+        result = await assessor._prepare_audio_data(audio_data)
+        assert len(result) > 0
+        assert test_audio in result
+
+    @patch("src.services.pronunciation_assessment.speechsdk")
+    def test_recognize_streams_pcm_with_shared_config(self, mock_speechsdk):
+        """Test recognition starts before the raw PCM is written in chunks and configs are built once."""
+        assessor = PronunciationAssessor()
+        assessor.speech_key = "test-key"
+        push_stream = mock_speechsdk.audio.PushAudioInputStream.return_value
+        recognizer = mock_speechsdk.SpeechRecognizer.return_value
+        calls = []
+        recognizer.recognize_once_async.side_effect = lambda: calls.append("recognize") or Mock()
+        push_stream.write.side_effect = calls.append
+        pcm = bytearray(range(256)) * 40
+
+        with patch.object(assessor, "_build_assessment_result", return_value={"pronunciation_score": 80.0}):
+            assert assessor._recognize(memoryview(pcm)[256:], "hello") == {"pronunciation_score": 80.0}
+            assessor._recognize(pcm, "hello again")
+
+        first_chunks = calls[1 : calls.index("recognize", 1)]
+        assert calls[0] == "recognize"
+        assert b"".join(first_chunks) == bytes(pcm[256:])
+        assert all(len(chunk) <= 4800 for chunk in first_chunks)
+        assert push_stream.close.call_count == 2
+        mock_speechsdk.SpeechConfig.assert_called_once_with(subscription="test-key", region=assessor.speech_region)
+        mock_speechsdk.audio.AudioStreamFormat.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_assess_pronunciation_merges_segments(self):
+        """Test segments are assessed with bounded concurrency and merged by duration per turn."""
+        assessor = PronunciationAssessor()
+        assessor.speech_key = "test-key"
+        tone = b"\x00\x40\x00\xc0" * 12000  # one second of a loud square wave
+        silence = b"\x00\x00" * 24000
+        pcm = bytearray(silence + tone + silence * 2 + tone + silence * 3 + tone + silence)
+        running = []
+        scores = {"hello there": 90.0, "how are you": 60.0}
+
+        async def perform_assessment(_wav_audio, reference_text, _settings):
+            running.append(reference_text)
+            assert len(running) <= 1
+            await asyncio.sleep(0)
+            running.remove(reference_text)
+            if reference_text not in scores:
+                raise RuntimeError("Recognition failed")
+            score = scores[reference_text]
+            return {
+                "accuracy_score": score,
+                "fluency_score": score,
+                "completeness_score": score,
+                "prosody_score": None,
+                "pronunciation_score": score,
+                "words": [{"word": word, "accuracy": score, "error_type": "None"} for word in reference_text.split()],
+            }
+
+        assessor.segmentation_enabled = True
+        assessor.segment_concurrency = 1
+        with patch.object(assessor, "_perform_assessment", side_effect=perform_assessment):
+            result = await assessor.assess_pronunciation(pcm, None, ["hello there", "how are you", "bye"])
+
+        assert result["segment_count"] == 3
+        assert result["assessed_segment_count"] == 2
+        assert result["pronunciation_score"] == 75.0
+        assert result["prosody_score"] is None
+        assert [turn["turn"] for turn in result["turns"]] == [0, 1]
+        assert [word["word"] for word in result["turns"][1]["words"]] == ["how", "are", "you"]
+
+    @pytest.mark.asyncio
+    async def test_result_cache_invalidated_when_settings_change(self):
+        """Test identical assessments are served from the cache until an assessment setting changes."""
+        fake_assessor = Mock()
+        fake_assessor.assess = AsyncMock(return_value={"pronunciation_score": 80.0, "words": []})
+        assessor = PronunciationAssessor(fake_assessor, EvaluationCache(name="pronunciation_cache"))
+        pcm = bytearray(b"\x01\x02" * 24000)
+
+        with patch("src.services.pronunciation_assessment.metrics") as mock_metrics:
+            result = await assessor._perform_assessment(pcm, "hello")
+            assert result == {
+                "pronunciation_score": 80.0,
+                "words": [],
+                "removed_audio_seconds": 0.0,
+                "assessment_settings": DEFAULT_ASSESSMENT_SETTINGS,
+            }
+            assert await assessor._perform_assessment(memoryview(pcm), "hello") == result
+            assert fake_assessor.assess.await_count == 1
+            mock_metrics.set_gauge.assert_called_with("pronunciation_cache_hit_rate", 0.5)
+
+            await assessor._perform_assessment(pcm, "hello again")
+            assessor.assessment_settings["granularity"] = "Word"
+            await assessor._perform_assessment(pcm, "hello")
+
+        assert fake_assessor.assess.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_preprocessing(self):
+        """Test a cached assessment is served before the audio is preprocessed or removed silence counted."""
+        fake_assessor = Mock()
+        fake_assessor.assess = AsyncMock(return_value={"pronunciation_score": 80.0, "words": []})
+        assessor = PronunciationAssessor(fake_assessor, EvaluationCache(name="pronunciation_cache"))
+        assessor.preprocessing_enabled = True
+        pcm = bytearray(b"\x01\x02" * 24000)
+
+        with patch("src.services.pronunciation_assessment.preprocess_audio") as preprocess:
+            preprocess.return_value = Mock(pcm=b"\x01\x02" * 12000, removed_seconds=0.5)
+            with patch("src.services.pronunciation_assessment.metrics") as mock_metrics:
+                first = await assessor._perform_assessment(pcm, "hello")
+                assert await assessor._perform_assessment(pcm, "hello") == first
+
+        preprocess.assert_called_once()
+        assert first["removed_audio_seconds"] == 0.5
+        mock_metrics.increment.assert_any_call(PRONUNCIATION_REMOVED_SECONDS_METRIC, 0.5)
+        assert [call.args[0] for call in mock_metrics.increment.call_args_list].count(
+            PRONUNCIATION_REMOVED_SECONDS_METRIC
+        ) == 1
+
+    @pytest.mark.asyncio
+    async def test_latency_budget_assesses_long_segments_cheaper(self):
+        """Test a tight budget keeps phoneme detail for the short turn and records the settings used."""
+        fake_assessor = Mock()
+        fake_assessor.assess = AsyncMock(return_value={"pronunciation_score": 80.0, "words": []})
+        assessor = PronunciationAssessor(fake_assessor, EvaluationCache(max_memory_entries=0))
+        assessor.segmentation_enabled = True
+        assessor.preprocessing_enabled = False
+        assessor.planner.initial_seconds_per_audio_second = 1.0
+        tone = b"\x00\x40\x00\xc0" * 12000
+        silence = b"\x00\x00" * 24000
+        pcm = bytearray(silence + tone + silence * 3 + tone * 6 + silence)
+
+        result = await assessor.assess_pronunciation(pcm, None, ["hi", "a long answer"], latency_budget_ms=5000)
+
+        settings = {call.args[1]: call.args[2] for call in fake_assessor.assess.await_args_list}
+        assert settings["hi"]["granularity"] == "Phoneme"
+        assert settings["a long answer"]["granularity"] == "Word"
+        assert [(entry["granularity"], entry["segments"]) for entry in result["assessment_plan"]] == [
+            ("Phoneme", 1),
+            ("Word", 1),
+        ]
+
+    def test_extract_word_details_empty_result(self):
+        """Test extracting word details from empty result."""
+        assessor = PronunciationAssessor()
+
+        # Mock result object
+        mock_result = Mock()
+        mock_result.properties.get.return_value = "{}"
+
+        words = assessor._extract_word_details(mock_result)
+        assert not words
+
+    def test_extract_word_details_with_words(self):
+        """Test extracting word details with actual words."""
+        assessor = PronunciationAssessor()
+
+        # Mock result with word data
+        mock_result = Mock()
+        test_response = {
+            "NBest": [
+                {
+                    "Words": [
+                        {
+                            "Word": "hello",
+                            "PronunciationAssessment": {
+                                "AccuracyScore": 85,
+                                "ErrorType": "None",
+                            },
+                        },
+                        {
+                            "Word": "world",
+                            "PronunciationAssessment": {
+                                "AccuracyScore": 90,
+                                "ErrorType": "None",
+                            },
+                        },
+                    ]
+                }
+            ]
+        }
+        mock_result.properties.get.return_value = json.dumps(test_response)
+
+        words = assessor._extract_word_details(mock_result)
+
+        assert len(words) == 2
+        assert words[0]["word"] == "hello"
+        assert words[0]["accuracy"] == 85
+        assert words[1]["word"] == "world"
+        assert words[1]["accuracy"] == 90
+
+    def test_extract_word_details_with_error_types(self):
+        """Test extracting word details with different error types."""
+        assessor = PronunciationAssessor()
+
+        mock_result = Mock()
+        test_response = {
+            "NBest": [
+                {
+                    "Words": [
+                        {
+                            "Word": "mispronounced",
+                            "PronunciationAssessment": {
+                                "AccuracyScore": 45,
+                                "ErrorType": "Mispronunciation",
+                            },
+                        },
+                        {
+                            "Word": "omitted",
+                            "PronunciationAssessment": {
+                                "AccuracyScore": 0,
+                                "ErrorType": "Omission",
+                            },
+                        },
+                    ]
+                }
+            ]
+        }
+        mock_result.properties.get.return_value = json.dumps(test_response)
+
+        words = assessor._extract_word_details(mock_result)
+
+        assert len(words) == 2
+        assert words[0]["error_type"] == "Mispronunciation"
+        assert words[1]["error_type"] == "Omission"
+
+    def test_extract_word_details_malformed_json(self):
+        """Test extracting word details with malformed JSON."""
+        assessor = PronunciationAssessor()
+
+        mock_result = Mock()
+        mock_result.properties.get.return_value = "invalid json"
+
+        words = assessor._extract_word_details(mock_result)
+
+        assert not words
+
+    def test_assess_pronunciation_with_valid_audio(self):
+        """Test pronunciation assessment with valid audio data setup."""
+        assessor = PronunciationAssessor()
+
+        # Mock the speech services
+        assessor.speech_key = "test-key"
+        assessor.speech_region = "test-region"
+
+        # Test that the method exists and can handle basic setup
+        assert hasattr(assessor, "assess_pronunciation")
+        assert callable(assessor.assess_pronunciation)
+
+    @pytest.mark.asyncio
+    async def test_prepare_audio_data_mixed_speakers(self):
+        """Test preparing audio data with mixed user and assistant chunks."""
+        assessor = PronunciationAssessor()
+
+        audio_data = [
+            {"chunk": base64.b64encode(b"user audio").decode(), "user": True},
+            {"chunk": base64.b64encode(b"assistant audio").decode(), "user": False},
+            {"chunk": base64.b64encode(b"more user audio").decode(), "user": True},
+        ]
+
+        result = await assessor._prepare_audio_data(audio_data)
+
+        # Should include some audio data (user chunks are processed)
+        assert isinstance(result, (bytes, bytearray))
+        # The actual filtering logic depends on implementation details
@@ -0,0 +1,123 @@
+"""Tests for the provider fakes."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import openai
+import pytest
+
+from src.services.analyzers import ConversationAnalyzer
+from src.services.pronunciation_assessment import PronunciationAssessor
+from src.services.providers import (
+    SERVICE_LLM,
+    SERVICE_SPEECH,
+    FakeBackend,
+    FakeChatClient,
+    FakeProjectClient,
+    FakeSpeechAssessor,
+    ProviderUnavailableError,
+)
+
+INSTANT = {"median_ms": 0, "p95_ms": 0, "per_unit_ms": 0, "max_concurrency": 0, "error_rate": 0}
+
+
+class TestFakeBackend:
+    """Test cases for FakeBackend."""
+
+    def test_latency_deterministic_for_seed(self):
+        """Test the same seed draws the same latencies, around the profile's median and p95."""
+        profile = {**INSTANT, "median_ms": 100, "p95_ms": 300, "per_unit_ms": 2}
+        first = FakeBackend(SERVICE_LLM, profile, seed=7)
+        second = FakeBackend(SERVICE_LLM, profile, seed=7)
+
+        samples = [first.latency_seconds() for _ in range(2000)]
+        assert samples[:20] == [second.latency_seconds() for _ in range(20)]
+        samples.sort()
+        assert 0.09 < samples[1000] < 0.11
+        assert 0.25 < samples[1900] < 0.35
+        assert FakeBackend(SERVICE_LLM, {**profile, "median_ms": 0}).latency_seconds(50) == pytest.approx(0.1)
+
+    def test_concurrency_cap_and_errors(self):
+        """Test calls beyond the cap are throttled and the error rate fails calls."""
+        backend = FakeBackend(SERVICE_SPEECH, {**INSTANT, "max_concurrency": 1})
+        with backend.admit():
+            with pytest.raises(ProviderUnavailableError) as error:
+                with backend.admit():
+                    pass
+        assert error.value.throttled
+        with backend.admit():
+            assert backend.in_flight == 1
+
+        failing = FakeBackend(SERVICE_SPEECH, {**INSTANT, "error_rate": 1})
+        with pytest.raises(ProviderUnavailableError) as error:
+            with failing.admit():
+                pass
+        assert not error.value.throttled
+
+
+class TestFakeChatClient:
+    """Test cases for FakeChatClient."""
+
+    @pytest.mark.asyncio
+    async def test_structured_output_deterministic_and_streamed(self):
+        """Test schema responses are valid, repeatable and streamed as the same content."""
+        client = FakeChatClient(FakeBackend(SERVICE_LLM, INSTANT))
+        analyzer = ConversationAnalyzer()
+        request = {
+            "model": "gpt-4o",
+            "messages": [{"role": "user", "content": "user: Hello"}],
+            "response_format": analyzer._get_response_format(),
+        }
+
+        first = await client.chat.completions.create(**request)
+        second = await client.chat.completions.create(**request)
+        content = first.choices[0].message.content
+        assert content == second.choices[0].message.content
+        assert set(json.loads(content)) == set(request["response_format"]["json_schema"]["schema"]["required"])
+
+        stream = await client.chat.completions.create(**request, stream=True)
+        assert "".join([chunk.choices[0].delta.content async for chunk in stream]) == content
+
+    @pytest.mark.asyncio
+    async def test_throttling_raises_sdk_errors(self):
+        """Test over-capacity calls raise the SDK's rate limit error with a retry-after hint."""
+        client = FakeChatClient(FakeBackend(SERVICE_LLM, {**INSTANT, "median_ms": 50, "max_concurrency": 1}))
+        request = {"model": "gpt-4o", "messages": [{"role": "user", "content": "Hi"}]}
+
+        results = await asyncio.gather(
+            client.chat.completions.create(**request),
+            client.chat.completions.create(**request),
+            return_exceptions=True,
+        )
+
+        assert isinstance(results[1], openai.RateLimitError)
+        assert results[1].response.headers["retry-after-ms"] == "50"
+
+
+class TestFakeServices:
+    """Test cases for the fake speech and agent services."""
+
+    @pytest.mark.asyncio
+    async def test_pronunciation_assessed_without_speech_key(self):
+        """Test the assessor uses the fake when given one, with the Azure result fields."""
+        with patch("src.services.pronunciation_assessment.config") as mock_config:
+            mock_config.__getitem__.side_effect = lambda key: ""
+            assessor = PronunciationAssessor(FakeSpeechAssessor(FakeBackend(SERVICE_SPEECH, INSTANT)))
+
+        audio = [{"type": "user", "data": "AAAAAAAA" * 100}]
+        result = await assessor.assess_pronunciation(audio, "thanks for your time")
+
+        assert result == await assessor.assess_pronunciation(audio, "thanks for your time")
+        assert [word["word"] for word in result["words"]] == ["thanks", "for", "your", "time"]
+        assert 0 <= result["pronunciation_score"] <= 100
+
+    def test_fake_agent_service(self):
+        """Test agents are created and deleted like with the project client."""
+        client = FakeProjectClient(FakeBackend("agent", INSTANT))
+        with client:
+            agent = client.agents.create_agent(model="gpt-4o", name="agent-1", instructions="Be a buyer", tools=[])
+        assert agent.id in client.created
+
+        client.agents.delete_agent(agent.id)
+        assert not client.created
@@ -0,0 +1,79 @@
+"""Tests for the quota rate limiter."""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.services.rate_limiter import QuotaLimiter, TokenBucket
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenBucket:
+    """Test the token bucket."""
+
+    def test_refills_up_to_capacity(self):
+        """Test consumed units refill at the configured rate without exceeding capacity."""
+        clock = FakeClock()
+        bucket = TokenBucket(capacity=100, refill_per_second=10, clock=clock)
+
+        bucket.consume(60)
+        assert bucket.available == 40
+        assert bucket.wait_time(70) == pytest.approx(3.0)
+
+        clock.now = 2.0
+        assert bucket.available == 60
+
+        clock.now = 100.0
+        assert bucket.available == 100
+
+    def test_wait_time_capped_at_capacity(self):
+        """Test requests larger than the bucket only wait for a full bucket instead of forever."""
+        clock = FakeClock()
+        bucket = TokenBucket(capacity=100, refill_per_second=10, clock=clock)
+        bucket.consume(100)
+
+        assert bucket.wait_time(500) == pytest.approx(10.0)
+
+
+class TestQuotaLimiter:
+    """Test the tokens and requests per minute limiter."""
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_for_token_budget(self):
+        """Test a call waits until the token bucket has refilled enough for its estimate."""
+        clock = FakeClock()
+        limiter = QuotaLimiter(tokens_per_minute=6000, requests_per_minute=600, clock=clock)
+
+        async def advance(delay: float) -> None:
+            clock.now += delay
+
+        with patch("src.services.rate_limiter.asyncio.sleep", side_effect=advance):
+            assert await limiter.acquire(6000) == 0
+            waited = await limiter.acquire(1000)
+
+        assert waited == pytest.approx(10.0)
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_for_request_budget(self):
+        """Test the request quota paces calls even when tokens are plentiful."""
+        clock = FakeClock()
+        limiter = QuotaLimiter(tokens_per_minute=1_000_000, requests_per_minute=2, clock=clock)
+
+        async def advance(delay: float) -> None:
+            clock.now += delay
+
+        with patch("src.services.rate_limiter.asyncio.sleep", side_effect=advance):
+            await limiter.acquire(10)
+            await limiter.acquire(10)
+            waited = await limiter.acquire(10)
+
+        assert waited == pytest.approx(30.0)
@@ -0,0 +1,26 @@
+"""Tests for cached Speech authorization tokens."""
+
+from unittest.mock import Mock, patch
+
+from src.services.speech_auth import SpeechTokenCache
+
+
+class TestSpeechTokenCache:
+    """Test Speech token caching."""
+
+    def test_token_reused_until_expired(self):
+        """Test a token is issued once, shared until its lifetime ends, then issued again."""
+        now = [0.0]
+        cache = SpeechTokenCache("test-key", "swedencentral", lifetime_seconds=540, clock=lambda: now[0])
+        responses = [Mock(text="token-1"), Mock(text="token-2")]
+
+        with patch("src.services.speech_auth.httpx.post", side_effect=responses) as mock_post:
+            assert cache.get_token() == "token-1"
+            now[0] = 539.0
+            assert cache.get_token() == "token-1"
+            now[0] = 540.0
+            assert cache.get_token() == "token-2"
+
+        assert mock_post.call_count == 2
+        assert mock_post.call_args.args[0] == "https://swedencentral.api.cognitive.microsoft.com/sts/v1.0/issueToken"
+        assert mock_post.call_args.kwargs["headers"] == {"Ocp-Apim-Subscription-Key": "test-key"}
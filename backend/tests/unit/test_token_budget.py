@@ -0,0 +1,65 @@
+"""Tests for transcript token budgeting."""
+
+from src.services.token_budget import TokenBudget, estimate_tokens
+
+
+def _transcript(turns: int) -> str:
+    """Build a transcript of numbered 10-token turns."""
+    return "\n".join(f"user: turn {index:03d} {'x' * 25}" for index in range(turns))
+
+
+class TestTokenBudget:
+    """Test the transcript token budget."""
+
+    def test_estimate_tokens(self):
+        """Test tokens are estimated from the character count."""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("x" * 40) == 10
+
+    def test_requires_chunking(self):
+        """Test only transcripts over a positive budget are chunked."""
+        budget = TokenBudget(max_transcript_tokens=100, chunk_tokens=50, overlap_turns=0)
+
+        assert not budget.requires_chunking(100)
+        assert budget.requires_chunking(101)
+        assert not TokenBudget(max_transcript_tokens=0, chunk_tokens=50, overlap_turns=0).requires_chunking(10**6)
+
+    def test_split_respects_turn_boundaries(self):
+        """Test chunks hold whole turns, stay within the chunk size and cover the transcript in order."""
+        transcript = _transcript(10)
+        budget = TokenBudget(max_transcript_tokens=50, chunk_tokens=30, overlap_turns=0)
+
+        chunks = budget.split(transcript)
+
+        assert len(chunks) == 4
+        assert all(estimate_tokens(chunk) <= 30 for chunk in chunks)
+        assert "\n".join(chunks) == transcript
+
+    def test_split_repeats_overlap_turns(self):
+        """Test each chunk starts with the last turns of the previous one and no chunk is only overlap."""
+        budget = TokenBudget(max_transcript_tokens=50, chunk_tokens=40, overlap_turns=1)
+
+        chunks = budget.split(_transcript(8))
+
+        for previous, current in zip(chunks, chunks[1:]):
+            assert current.splitlines()[0] == previous.splitlines()[-1]
+        assert "turn 007" in chunks[-1]
+        assert len(chunks[-1].splitlines()) > 1
+
+    def test_split_cuts_long_turns(self):
+        """Test a turn longer than a chunk is cut into chunk-sized pieces."""
+        budget = TokenBudget(max_transcript_tokens=10, chunk_tokens=10, overlap_turns=0)
+
+        chunks = budget.split("user: " + "y" * 100)
+
+        assert len(chunks) == 3
+        assert all(len(chunk) <= 40 for chunk in chunks)
+
+    def test_for_scenario_overrides_configuration(self):
+        """Test a scenario's tokenBudget block overrides the configured defaults."""
+        budget = TokenBudget.for_scenario({"tokenBudget": {"maxTranscriptTokens": 500, "chunkOverlapTurns": 0}})
+        default = TokenBudget.for_scenario({})
+
+        assert budget.max_transcript_tokens == 500
+        assert budget.overlap_turns == 0
+        assert budget.chunk_tokens == default.chunk_tokens
@@ -0,0 +1,37 @@
+"""Tests for evaluating long transcripts in chunks."""
+
+from src.services.transcript_chunking import merge_chunk_evaluations
+
+
+class TestMergeChunkEvaluations:
+    """Test merging chunk evaluations into one evaluation."""
+
+    def test_merge_chunk_evaluations(self):
+        """Test chunk results merge into one schema: weighted tone, best content, unique capped items."""
+        first = {
+            "speaking_tone_style": {"professional_tone": 9, "active_listening": 6, "engagement_quality": 8},
+            "conversation_content": {"needs_assessment": 22, "value_proposition": 10, "objection_handling": 5},
+            "strengths": ["Clear discovery", "Good rapport"],
+            "improvements": ["Quantify value"],
+            "specific_feedback": "Strong opening.",
+        }
+        second = {
+            "speaking_tone_style": {"professional_tone": 5, "active_listening": 6, "engagement_quality": 4},
+            "conversation_content": {"needs_assessment": 8, "value_proposition": 20, "objection_handling": 15},
+            "strengths": ["Good rapport", "Handled cost", "Booked a next step"],
+            "improvements": ["Quantify value", "Confirm decision makers"],
+            "specific_feedback": "Solid close.",
+        }
+
+        result = merge_chunk_evaluations([first, second], [300, 100])
+
+        assert result["speaking_tone_style"] == {"professional_tone": 8, "active_listening": 6, "engagement_quality": 7}
+        assert result["conversation_content"] == {
+            "needs_assessment": 22,
+            "value_proposition": 20,
+            "objection_handling": 15,
+        }
+        assert result["overall_score"] == 21 + 57
+        assert result["strengths"] == ["Clear discovery", "Good rapport", "Handled cost"]
+        assert result["improvements"] == ["Quantify value", "Confirm decision makers"]
+        assert result["specific_feedback"] == "Strong opening. Solid close."
@@ -1,11 +1,14 @@
 """Tests for the websocket_handler module."""
 
+import asyncio
 import json
+import threading
+import time
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
-from src.services.websocket_handler import VoiceProxyHandler
+from src.services.websocket_handler import BargeInController, VoiceProxyHandler
 
 
 class TestVoiceProxyHandler:
@@ -139,5 +142,247 @@ class TestVoiceProxyHandler:
             mock_loop.return_value.run_in_executor.assert_called_once()
             args = mock_loop.return_value.run_in_executor.call_args[0]
             assert args[0] is None  # executor
-            assert args[1] == mock_ws.send  # function
-            assert json.loads(args[2]) == message  # message
+            args[1](*args[2:])  # function, sending under the connection's lock
+            assert json.loads(mock_ws.send.call_args[0][0]) == message  # message
+
+    def test_sends_from_two_threads_do_not_overlap(self):
+        """Test a push from another thread waits for the connection's send in progress."""
+        handler = VoiceProxyHandler(Mock())
+        in_flight = 0
+        peak = 0
+
+        def send(_data):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            time.sleep(0.005)
+            in_flight -= 1
+
+        client_ws = Mock()
+        client_ws.send.side_effect = send
+
+        def send_messages():
+            for index in range(20):
+                asyncio.run(handler._send_message(client_ws, {"type": "test", "index": index}))
+
+        threads = [threading.Thread(target=send_messages) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert client_ws.send.call_count == 40
+        assert peak == 1
+
+    @pytest.mark.asyncio
+    async def test_forward_azure_to_client_sends_compaction_events(self):
+        """Test compaction events from the context manager are sent upstream."""
+        handler = VoiceProxyHandler(Mock())
+        client_ws = Mock()
+        azure_ws = Mock()
+        azure_ws.send = AsyncMock()
+
+        async def messages():
+            yield json.dumps({"type": "response.done"})
+
+        azure_ws.__aiter__ = lambda self: messages()
+        context_manager = Mock(enabled=True)
+        context_manager.observe_event.return_value = [{"type": "conversation.item.delete", "item_id": "item-1"}]
+
+        await handler._forward_azure_to_client(azure_ws, client_ws, context_manager)
+
+        client_ws.send.assert_called_once()
+        context_manager.observe_event.assert_called_once_with({"type": "response.done"})
+        azure_ws.send.assert_called_once_with(json.dumps({"type": "conversation.item.delete", "item_id": "item-1"}))
+
+    @pytest.mark.asyncio
+    async def test_forward_azure_to_client_records_evaluation_turns(self):
+        """Test completed transcripts are reported to the incremental evaluator."""
+        evaluator = Mock()
+        handler = VoiceProxyHandler(Mock(), evaluator)
+        client_ws = Mock()
+        azure_ws = Mock()
+        events = [
+            {"type": "conversation.item.input_audio_transcription.completed", "transcript": "Hello"},
+            {"type": "response.audio_transcript.delta", "delta": "Hi"},
+            {"type": "response.audio_transcript.done", "transcript": "Hi there"},
+        ]
+
+        async def messages():
+            for event in events:
+                yield json.dumps(event)
+
+        azure_ws.__aiter__ = lambda self: messages()
+
+        await handler._forward_azure_to_client(azure_ws, client_ws, None, None, "session-1")
+
+        assert client_ws.send.call_count == 3
+        assert [call.args for call in evaluator.record_turn.call_args_list] == [
+            ("session-1", "user", "Hello"),
+            ("session-1", "assistant", "Hi there"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_live_pronunciation_gets_user_audio_and_turn_events(self):
+        """Test appended user audio and Azure events are reported to the live pronunciation assessor."""
+        live_pronunciation = Mock()
+        handler = VoiceProxyHandler(Mock(), None, live_pronunciation)
+        client_ws = Mock()
+        client_ws.receive.side_effect = [
+            json.dumps({"type": "input_audio_buffer.append", "audio": "AAAA"}),
+            json.dumps({"type": "session.update", "session": {}}),
+            None,
+        ]
+        azure_ws = Mock()
+        azure_ws.send = AsyncMock()
+
+        async def messages():
+            yield json.dumps({"type": "input_audio_buffer.speech_stopped", "item_id": "item-1", "audio_end_ms": 900})
+
+        azure_ws.__aiter__ = lambda self: messages()
+
+        await handler._forward_client_to_azure(client_ws, azure_ws, "session-1")
+        await handler._forward_azure_to_client(azure_ws, client_ws, None, None, None, "session-1")
+
+        assert azure_ws.send.await_count == 2
+        live_pronunciation.record_audio.assert_called_once_with("session-1", "AAAA")
+        live_pronunciation.record_event.assert_called_once_with(
+            "session-1", {"type": "input_audio_buffer.speech_stopped", "item_id": "item-1", "audio_end_ms": 900}
+        )
+
+    def test_start_evaluation_session_uses_agent_scenario(self):
+        """Test evaluation sessions are started for the scenario behind the connected agent."""
+        agent_manager = Mock()
+        agent_manager.get_agent.return_value = {"scenario_id": "scenario1"}
+        evaluator = Mock()
+        evaluator.start_session.return_value = "session-1"
+        handler = VoiceProxyHandler(agent_manager, evaluator)
+
+        assert handler._start_evaluation_session("agent-1") == "session-1"
+        evaluator.start_session.assert_called_once_with("scenario1")
+        assert handler._start_evaluation_session(None) is None
+        assert VoiceProxyHandler(agent_manager)._start_evaluation_session("agent-1") is None
+
+    def test_parse_event(self):
+        """Test parsing forwarded events."""
+        handler = VoiceProxyHandler(Mock())
+
+        assert handler._parse_event('{"type": "response.done"}') == {"type": "response.done"}
+        assert handler._parse_event(b"binary") is None
+        assert handler._parse_event("not json") is None
+        assert handler._parse_event("[1, 2]") is None
+
+    def test_parse_client_event_only_parses_audio_appends(self):
+        """Test only client audio append events are parsed for live pronunciation."""
+        handler = VoiceProxyHandler(Mock())
+        append = {"type": "input_audio_buffer.append", "audio": "AAAA"}
+
+        assert handler._parse_client_event(json.dumps(append)) == append
+        with patch.object(handler, "_parse_event") as parse_event:
+            assert handler._parse_client_event(json.dumps({"type": "session.update"})) is None
+        parse_event.assert_not_called()
+
+    def test_parse_upstream_event_only_parses_consumed_events(self):
+        """Test Azure events no consumer handles are skipped and deltas are read without parsing them."""
+        handler = VoiceProxyHandler(Mock())
+        audio_delta = {
+            "type": "response.audio.delta",
+            "event_id": "event-1",
+            "response_id": "resp-1",
+            "item_id": "item-1",
+            "delta": "AAAA+/==",
+        }
+        transcription = {"type": "conversation.item.input_audio_transcription.completed", "transcript": "Hello"}
+
+        with patch.object(handler, "_parse_event") as parse_event:
+            assert handler._parse_upstream_event(json.dumps(audio_delta)) == {
+                "type": "response.audio.delta",
+                "response_id": "resp-1",
+                "item_id": "item-1",
+                "delta": "AAAA+/==",
+            }
+            assert handler._parse_upstream_event(json.dumps({"type": "response.text.delta", "delta": "Hi"})) == {
+                "type": "response.text.delta"
+            }
+            assert handler._parse_upstream_event(json.dumps({"type": "rate_limits.updated"})) is None
+        parse_event.assert_not_called()
+        assert handler._parse_upstream_event(json.dumps(transcription)) == transcription
+        assert handler._parse_upstream_event(b"binary") is None
+
+    @pytest.mark.asyncio
+    async def test_forward_azure_to_client_flushes_on_barge_in(self):
+        """Test interrupted response audio is dropped after a flush is sent to the client."""
+        handler = VoiceProxyHandler(Mock())
+        client_ws = Mock()
+        azure_ws = Mock()
+        events = [
+            {"type": "response.created", "response": {"id": "resp-1"}},
+            {"type": "response.audio.delta", "response_id": "resp-1", "delta": "AAAA"},
+            {"type": "input_audio_buffer.speech_started", "audio_start_ms": 1200},
+            {"type": "response.audio.delta", "response_id": "resp-1", "delta": "BBBB"},
+            {"type": "response.done", "response": {"id": "resp-1"}},
+        ]
+
+        async def messages():
+            for event in events:
+                yield json.dumps(event)
+
+        azure_ws.__aiter__ = lambda self: messages()
+
+        await handler._forward_azure_to_client(azure_ws, client_ws, None, BargeInController())
+
+        sent_types = [json.loads(call.args[0])["type"] for call in client_ws.send.call_args_list]
+        assert sent_types == [
+            "response.created",
+            "response.audio.delta",
+            "proxy.audio.flush",
+            "input_audio_buffer.speech_started",
+            "response.done",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_push_analysis_job_to_connected_session(self):
+        """Test finished analysis jobs are pushed to their session's client and ignored for other sessions."""
+        handler = VoiceProxyHandler(Mock())
+        client_ws = Mock()
+        handler._clients["session-1"] = client_ws
+
+        handler.push_analysis_job({"job_id": "job-1", "session_id": "session-1", "status": "completed"})
+        handler.push_analysis_job({"job_id": "job-2", "session_id": "session-2", "status": "completed"})
+        await asyncio.gather(*handler._push_tasks)
+
+        client_ws.send.assert_called_once()
+        message = json.loads(client_ws.send.call_args.args[0])
+        assert message["type"] == "proxy.analysis.completed"
+        assert message["job"]["job_id"] == "job-1"
+
+
+class TestBargeInController:
+    """Test cases for BargeInController."""
+
+    def test_flush_without_active_response(self):
+        """Test speech start still flushes client playback when no response is in flight."""
+        controller = BargeInController()
+
+        forward, flush_event = controller.process({"type": "input_audio_buffer.speech_started", "audio_start_ms": 10})
+
+        assert forward
+        assert flush_event is not None
+        assert flush_event["type"] == "proxy.audio.flush"
+        assert flush_event["response_id"] is None
+        assert not controller.interrupted_response_ids
+
+    def test_only_interrupted_response_audio_is_dropped(self):
+        """Test audio for a new response is forwarded after an interruption."""
+        controller = BargeInController()
+
+        controller.process({"type": "response.created", "response": {"id": "resp-1"}})
+        controller.process({"type": "input_audio_buffer.speech_started"})
+        dropped, _ = controller.process({"type": "response.audio.delta", "response_id": "resp-1"})
+        controller.process({"type": "response.done", "response": {"id": "resp-1"}})
+        controller.process({"type": "response.created", "response": {"id": "resp-2"}})
+        forwarded, _ = controller.process({"type": "response.audio.delta", "response_id": "resp-2"})
+
+        assert not dropped
+        assert forwarded
+        assert not controller.interrupted_response_ids
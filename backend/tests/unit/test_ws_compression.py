@@ -0,0 +1,141 @@
+"""Tests for the ws_compression module."""
+
+import json
+from unittest.mock import Mock
+
+import wsproto.extensions
+from websockets.extensions.permessage_deflate import PerMessageDeflate
+from websockets.frames import OP_BINARY, OP_TEXT, Frame
+from wsproto.frame_protocol import Opcode, RsvBits
+
+from src.services.ws_compression import (
+    CompressionPolicy,
+    SelectiveClientPerMessageDeflateFactory,
+    SelectiveDeflate,
+    SelectiveServerDeflate,
+    apply_downstream_policy,
+    build_upstream_connect_options,
+)
+
+AUDIO_TYPES = ["input_audio_buffer.append", "response.audio.delta"]
+
+
+def _message(event_type: str, size: int = 1000) -> bytes:
+    """Build a JSON event of roughly the given size."""
+    return json.dumps({"type": event_type, "payload": "abc " * (size // 4)}).encode("utf-8")
+
+
+class TestCompressionPolicy:
+    """Test cases for CompressionPolicy."""
+
+    def test_classify(self):
+        """Test frames are classified by event type and opcode."""
+        policy = CompressionPolicy(skip_types=AUDIO_TYPES)
+
+        assert policy.classify(_message("response.audio.delta"), False) == "audio"
+        assert policy.classify(_message("response.audio_transcript.done"), False) == "control"
+        assert policy.classify(b'{"event_id": "e1", "type": "input_audio_buffer.append"}', False) == "audio"
+        assert policy.classify(b"\x00\x01", True) == "binary"
+
+    def test_selective_mode(self):
+        """Test selective mode only compresses large control messages."""
+        policy = CompressionPolicy(mode="selective", skip_types=AUDIO_TYPES, min_bytes=128)
+
+        assert policy.should_compress("control", 1000)
+        assert not policy.should_compress("control", 64)
+        assert not policy.should_compress("audio", 1000)
+        assert not policy.should_compress("binary", 1000)
+
+    def test_all_and_none_modes(self):
+        """Test the all and none modes ignore the message category."""
+        assert CompressionPolicy(mode="all").should_compress("audio", 1)
+        assert not CompressionPolicy(mode="none").should_compress("control", 10000)
+        assert not CompressionPolicy(mode="none").enabled
+
+    def test_build_upstream_connect_options(self):
+        """Test websockets connect options for each mode."""
+        assert build_upstream_connect_options(CompressionPolicy(mode="none")) == {"compression": None}
+
+        options = build_upstream_connect_options(CompressionPolicy(mode="selective"))
+        assert options["compression"] is None
+        assert isinstance(options["extensions"][0], SelectiveClientPerMessageDeflateFactory)
+
+
+class TestSelectiveDeflate:
+    """Test cases for the websockets client-side wrapper."""
+
+    def test_skips_audio_and_compresses_control(self):
+        """Test audio frames pass through while control frames are compressed and still decodable."""
+        policy = CompressionPolicy(skip_types=AUDIO_TYPES, min_bytes=128)
+        encoder = SelectiveDeflate(PerMessageDeflate(False, False, 15, 15), policy)
+        decoder = PerMessageDeflate(False, False, 15, 15)
+
+        control = _message("session.update")
+        audio = _message("input_audio_buffer.append")
+
+        for payload in (control, audio, control):
+            encoded = encoder.encode(Frame(OP_TEXT, payload))
+            assert encoded.rsv1 == (payload is control)
+            assert decoder.decode(encoded).data == payload
+
+        compressed = encoder.encode(Frame(OP_TEXT, control))
+        assert len(compressed.data) < len(control)
+
+    def test_factory_applies_policy_to_negotiated_extension(self):
+        """Test the client factory returns a permessage-deflate extension with the negotiated parameters."""
+        factory = SelectiveClientPerMessageDeflateFactory(CompressionPolicy(), client_max_window_bits=True)
+
+        extension = factory.process_response_params([("client_max_window_bits", "10")], [])
+
+        assert isinstance(extension, SelectiveDeflate)
+        assert isinstance(extension, PerMessageDeflate)
+        assert extension.local_max_window_bits == 10
+
+    def test_binary_frames_are_not_compressed(self):
+        """Test binary frames are never compressed in selective mode."""
+        encoder = SelectiveDeflate(PerMessageDeflate(False, False, 15, 15), CompressionPolicy())
+
+        encoded = encoder.encode(Frame(OP_BINARY, b"\x00" * 1000))
+
+        assert not encoded.rsv1
+        assert encoded.data == b"\x00" * 1000
+
+
+class TestSelectiveServerDeflate:
+    """Test cases for the wsproto server-side wrapper."""
+
+    def test_frame_outbound(self):
+        """Test the server wrapper skips audio and compresses control events."""
+        policy = CompressionPolicy(skip_types=AUDIO_TYPES, min_bytes=128)
+        extension = SelectiveServerDeflate(wsproto.extensions.PerMessageDeflate(), policy)
+        proto = Mock(client=False)
+        rsv = RsvBits(False, False, False)
+
+        audio = _message("response.audio.delta")
+        audio_rsv, audio_data = extension.frame_outbound(proto, Opcode.TEXT, rsv, audio, True)
+        control = _message("response.audio_transcript.done")
+        control_rsv, control_data = extension.frame_outbound(proto, Opcode.TEXT, rsv, control, True)
+
+        assert not audio_rsv.rsv1
+        assert audio_data == audio
+        assert control_rsv.rsv1
+        assert len(control_data) < len(control)
+
+    def test_apply_downstream_policy(self):
+        """Test the negotiated extension on a client connection is wrapped in place."""
+        deflate = wsproto.extensions.PerMessageDeflate()
+        client_ws = Mock()
+        client_ws.ws.connection._proto.extensions = [deflate]
+
+        assert apply_downstream_policy(client_ws, CompressionPolicy())
+        wrapped = client_ws.ws.connection._proto.extensions[0]
+        assert isinstance(wrapped, SelectiveServerDeflate)
+        assert wrapped.inner is deflate
+
+    def test_apply_downstream_policy_without_extensions(self):
+        """Test connections without negotiated compression are left untouched."""
+        client_ws = Mock()
+        client_ws.ws.connection._proto.extensions = []
+
+        assert not apply_downstream_policy(client_ws, CompressionPolicy())
+        assert not apply_downstream_policy(Mock(spec=[]), CompressionPolicy())
@@ -23,6 +23,7 @@ import { useWebRTC } from '../hooks/useWebRTC'
 import { useRecorder } from '../hooks/useRecorder'
 import { useAudioPlayer } from '../hooks/useAudioPlayer'
 import { api } from '../services/api'
+import { applyAssessmentEvent } from '../services/assessmentStream'
 import { Assessment } from '../types'
 
 const useStyles = makeStyles({
@@ -68,7 +69,7 @@ export default function App() {
 
   const { scenarios, selectedScenario, setSelectedScenario, loading } =
     useScenarios()
-  const { playAudio } = useAudioPlayer()
+  const { playAudio, flushAudio } = useAudioPlayer()
   const activeScenario =
     selectedScenarioData ||
     scenarios.find(s => s.id === selectedScenario) ||
@@ -103,12 +104,19 @@ export default function App() {
     }
   }, [])
 
-  const { connected, messages, send, clearMessages, getRecordings } =
-    useRealtime({
-      agentId: currentAgent,
-      onMessage: handleWebRTCMessage,
-      onAudioDelta: playAudio,
-    })
+  const {
+    connected,
+    messages,
+    send,
+    clearMessages,
+    getRecordings,
+    getSessionId,
+  } = useRealtime({
+    agentId: currentAgent,
+    onMessage: handleWebRTCMessage,
+    onAudioDelta: playAudio,
+    onAudioFlush: flushAudio,
+  })
 
   const sendOffer = useCallback(
     (sdp: string) => {
@@ -150,23 +158,34 @@ export default function App() {
     if (!recordings.conversation.length) return
 
     setShowLoading(true)
+    setAssessment({ streaming: true, received: [] })
+
+    const showPartialResults = () => {
+      setShowLoading(false)
+      setShowAssessment(true)
+    }
 
     try {
       const transcript = recordings.conversation
         .map((m: any) => `${m.role}: ${m.content}`)
         .join('\n')
 
-      const result = await api.analyzeConversation(
+      await api.analyzeConversationStream(
         selectedScenario,
         transcript,
         [...audioData, ...recordings.audio],
-        recordings.conversation
+        recordings.conversation,
+        event => {
+          setAssessment(prev =>
+            applyAssessmentEvent(prev ?? { streaming: true }, event)
+          )
+          showPartialResults()
+        },
+        getSessionId()
       )
-
-      setAssessment(result)
-      setShowAssessment(true)
     } catch (error) {
       console.error('Analysis failed:', error)
+      setAssessment(prev => prev && { ...prev, streaming: false })
     } finally {
       setShowLoading(false)
     }
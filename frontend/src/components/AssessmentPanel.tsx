@@ -20,8 +20,15 @@ import {
   TabList,
   Tab,
   TabValue,
+  Spinner,
 } from '@fluentui/react-components'
-import { Assessment } from '../types'
+import {
+  AcousticAnalytics,
+  Assessment,
+  ConversationMetrics,
+  PronunciationAssessment,
+  ScoreSection,
+} from '../types'
 import { useState } from 'react'
 
 const useStyles = makeStyles({
@@ -138,6 +145,74 @@ const useStyles = makeStyles({
   },
 })
 
+function conversationMetricRows(
+  metrics: ConversationMetrics
+): Array<[string, string]> {
+  const rows: Array<[string, string]> = [
+    [
+      'Talk share',
+      metrics.talk_share === null
+        ? '–'
+        : `${Math.round(metrics.talk_share * 100)}%`,
+    ],
+    ['Questions asked', String(metrics.questions_asked)],
+    [
+      'Filler words',
+      `${metrics.filler_words} (${metrics.filler_rate_per_100_words}/100 words)`,
+    ],
+    ['Longest monologue', `${metrics.longest_monologue_words} words`],
+  ]
+  if (metrics.words_per_minute !== null) {
+    rows.push(['Speaking pace', `${metrics.words_per_minute} wpm`])
+  }
+  if (metrics.average_response_latency_ms !== null) {
+    rows.push([
+      'Average response time',
+      `${(metrics.average_response_latency_ms / 1000).toFixed(1)}s`,
+    ])
+  }
+  return rows
+}
+
+function pronunciationScoreRows(
+  pronunciation: PronunciationAssessment
+): Array<[string, number]> {
+  const rows: Array<[string, number]> = []
+  if (typeof pronunciation.accuracy_score === 'number') {
+    rows.push(['Accuracy', pronunciation.accuracy_score])
+  }
+  if (typeof pronunciation.fluency_score === 'number') {
+    rows.push(['Fluency', pronunciation.fluency_score])
+  }
+  return rows
+}
+
+function acousticRows(acoustics: AcousticAnalytics): Array<[string, string]> {
+  const rows: Array<[string, string]> = []
+  if (acoustics.speaking_rate_wpm !== null) {
+    rows.push([
+      'Speaking rate',
+      `${Math.round(acoustics.speaking_rate_wpm)} wpm`,
+    ])
+  }
+  if (acoustics.pause_ratio !== null) {
+    rows.push(['Time paused', `${Math.round(acoustics.pause_ratio * 100)}%`])
+  }
+  if (acoustics.pitch_variability_semitones !== null) {
+    rows.push([
+      'Pitch variation',
+      `${acoustics.pitch_variability_semitones.toFixed(1)} semitones`,
+    ])
+  }
+  if (acoustics.volume_variability_db !== null) {
+    rows.push([
+      'Volume variation',
+      `${acoustics.volume_variability_db.toFixed(1)} dB`,
+    ])
+  }
+  return rows
+}
+
 interface Props {
   open: boolean
   assessment: Assessment | null
@@ -156,6 +231,21 @@ export function AssessmentPanel({ open, assessment, onClose }: Props) {
     return 'danger'
   }
 
+  const isPending = (key: string): boolean =>
+    !!assessment.streaming &&
+    !!assessment.received &&
+    !assessment.received.includes(key)
+
+  const scoreText = (section: ScoreSection, field: string): string => {
+    if (isPending(`${section}.${field}`)) return '…'
+    const scores = assessment.ai_assessment?.[section] as
+      | Record<string, number>
+      | undefined
+    return String(scores?.[field] ?? 0)
+  }
+
+  const overallPending = isPending('overall_score')
+
   return (
     <Dialog open={open} onOpenChange={(_, data) => !data.open && onClose()}>
       <DialogSurface
@@ -171,22 +261,40 @@ export function AssessmentPanel({ open, assessment, onClose }: Props) {
               </Text>
               <div className={styles.scoreRow}>
                 <span className={styles.scoreValue}>
-                  {assessment.ai_assessment.overall_score}
+                  {overallPending
+                    ? '…'
+                    : assessment.ai_assessment.overall_score}
                 </span>
-                <Badge
-                  color={getScoreColor(assessment.ai_assessment.overall_score)}
-                  appearance="filled"
-                  size="large"
-                >
-                  {assessment.ai_assessment.overall_score >= 80
-                    ? 'Great'
-                    : assessment.ai_assessment.overall_score >= 60
-                      ? 'Good'
-                      : 'Needs Work'}
-                </Badge>
+                {!overallPending && (
+                  <Badge
+                    color={getScoreColor(
+                      assessment.ai_assessment.overall_score
+                    )}
+                    appearance="filled"
+                    size="large"
+                  >
+                    {assessment.ai_assessment.overall_score >= 80
+                      ? 'Great'
+                      : assessment.ai_assessment.overall_score >= 60
+                        ? 'Good'
+                        : 'Needs Work'}
+                  </Badge>
+                )}
+                {assessment.ai_assessment.degraded && (
+                  <Badge appearance="outline" size="large">
+                    Estimated from conversation metrics
+                  </Badge>
+                )}
+                {assessment.streaming && (
+                  <Spinner size="tiny" label="Scoring in progress..." />
+                )}
               </div>
               <ProgressBar
-                value={assessment.ai_assessment.overall_score / 100}
+                value={
+                  overallPending
+                    ? undefined
+                    : assessment.ai_assessment.overall_score / 100
+                }
                 thickness="large"
               />
             </div>
@@ -229,10 +337,7 @@ export function AssessmentPanel({ open, assessment, onClose }: Props) {
                     <div className={styles.metricHeader}>
                       <Text size={300}>Professional Tone</Text>
                       <Badge appearance="tint">
-                        {
-                          assessment.ai_assessment.speaking_tone_style
-                            .professional_tone
-                        }
+                        {scoreText('speaking_tone_style', 'professional_tone')}
                         /10
                       </Badge>
                     </div>
@@ -248,10 +353,7 @@ export function AssessmentPanel({ open, assessment, onClose }: Props) {
                     <div className={styles.metricHeader}>
                       <Text size={300}>Active Listening</Text>
                       <Badge appearance="tint">
-                        {
-                          assessment.ai_assessment.speaking_tone_style
-                            .active_listening
-                        }
+                        {scoreText('speaking_tone_style', 'active_listening')}
                         /10
                       </Badge>
                     </div>
@@ -267,10 +369,7 @@ export function AssessmentPanel({ open, assessment, onClose }: Props) {
                     <div className={styles.metricHeader}>
                       <Text size={300}>Engagement Quality</Text>
                       <Badge appearance="tint">
-                        {
-                          assessment.ai_assessment.speaking_tone_style
-                            .engagement_quality
-                        }
+                        {scoreText('speaking_tone_style', 'engagement_quality')}
                         /10
                       </Badge>
                     </div>
@@ -293,10 +392,7 @@ export function AssessmentPanel({ open, assessment, onClose }: Props) {
                     <div className={styles.metricHeader}>
                       <Text size={300}>Needs Assessment</Text>
                       <Badge appearance="tint">
-                        {
-                          assessment.ai_assessment.conversation_content
-                            .needs_assessment
-                        }
+                        {scoreText('conversation_content', 'needs_assessment')}
                         /25
                       </Badge>
                     </div>
@@ -312,10 +408,7 @@ export function AssessmentPanel({ open, assessment, onClose }: Props) {
                     <div className={styles.metricHeader}>
                       <Text size={300}>Value Proposition</Text>
                       <Badge appearance="tint">
-                        {
-                          assessment.ai_assessment.conversation_content
-                            .value_proposition
-                        }
+                        {scoreText('conversation_content', 'value_proposition')}
                         /25
                       </Badge>
                     </div>
@@ -331,10 +424,10 @@ export function AssessmentPanel({ open, assessment, onClose }: Props) {
                     <div className={styles.metricHeader}>
                       <Text size={300}>Objection Handling</Text>
                       <Badge appearance="tint">
-                        {
-                          assessment.ai_assessment.conversation_content
-                            .objection_handling
-                        }
+                        {scoreText(
+                          'conversation_content',
+                          'objection_handling'
+                        )}
                         /20
                       </Badge>
                     </div>
@@ -358,47 +451,37 @@ export function AssessmentPanel({ open, assessment, onClose }: Props) {
                     }
                   />
 
-                  <div className={styles.metric}>
-                    <div className={styles.metricHeader}>
-                      <Text size={300}>Accuracy</Text>
-                      <Badge
-                        color={getScoreColor(
-                          assessment.pronunciation_assessment.accuracy_score
-                        )}
-                        appearance="filled"
-                      >
-                        {assessment.pronunciation_assessment.accuracy_score.toFixed(
-                          1
-                        )}
-                      </Badge>
+                  {pronunciationScoreRows(
+                    assessment.pronunciation_assessment
+                  ).map(([label, score]) => (
+                    <div className={styles.metric} key={label}>
+                      <div className={styles.metricHeader}>
+                        <Text size={300}>{label}</Text>
+                        <Badge color={getScoreColor(score)} appearance="filled">
+                          {score.toFixed(1)}
+                        </Badge>
+                      </div>
+                      <ProgressBar value={score / 100} />
                     </div>
-                    <ProgressBar
-                      value={
-                        assessment.pronunciation_assessment.accuracy_score / 100
-                      }
-                    />
-                  </div>
+                  ))}
 
-                  <div className={styles.metric}>
-                    <div className={styles.metricHeader}>
-                      <Text size={300}>Fluency</Text>
-                      <Badge
-                        color={getScoreColor(
-                          assessment.pronunciation_assessment.fluency_score
-                        )}
-                        appearance="filled"
-                      >
-                        {assessment.pronunciation_assessment.fluency_score.toFixed(
-                          1
-                        )}
-                      </Badge>
-                    </div>
-                    <ProgressBar
-                      value={
-                        assessment.pronunciation_assessment.fluency_score / 100
-                      }
-                    />
-                  </div>
+                  {assessment.pronunciation_assessment.acoustics && (
+                    <>
+                      <div className={styles.sectionTitle}>
+                        <Text size={400} weight="semibold">
+                          Delivery
+                        </Text>
+                      </div>
+                      {acousticRows(
+                        assessment.pronunciation_assessment.acoustics
+                      ).map(([label, value]) => (
+                        <div className={styles.metricHeader} key={label}>
+                          <Text size={300}>{label}</Text>
+                          <Badge appearance="tint">{value}</Badge>
+                        </div>
+                      ))}
+                    </>
+                  )}
 
                   {assessment.pronunciation_assessment.words && (
                     <>
@@ -425,6 +508,26 @@ export function AssessmentPanel({ open, assessment, onClose }: Props) {
                   )}
                 </Card>
               )}
+
+              {assessment.conversation_metrics && (
+                <Card className={styles.card}>
+                  <CardHeader
+                    header={
+                      <Text size={500} weight="semibold">
+                        📊 Conversation Metrics
+                      </Text>
+                    }
+                  />
+                  {conversationMetricRows(assessment.conversation_metrics).map(
+                    ([label, value]) => (
+                      <div className={styles.metricHeader} key={label}>
+                        <Text size={300}>{label}</Text>
+                        <Badge appearance="tint">{value}</Badge>
+                      </div>
+                    )
+                  )}
+                </Card>
+              )}
             </div>
           )}
 
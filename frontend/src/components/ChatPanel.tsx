@@ -63,6 +63,9 @@ const useStyles = makeStyles({
     backgroundColor: tokens.colorNeutralBackground2,
     marginRight: '20%',
   },
+  pronunciationScore: {
+    color: tokens.colorNeutralForeground3,
+  },
   controls: {
     display: 'flex',
     gap: tokens.spacingHorizontalM,
@@ -137,6 +140,15 @@ export function ChatPanel({
                   }`}
                 >
                   <Text size={300}>{msg.content}</Text>
+                  {msg.pronunciationScore !== undefined && (
+                    <Text
+                      size={200}
+                      block
+                      className={styles.pronunciationScore}
+                    >
+                      Pronunciation {Math.round(msg.pronunciationScore)}
+                    </Text>
+                  )}
                 </div>
               ))}
           </>
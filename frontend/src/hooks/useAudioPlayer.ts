@@ -8,6 +8,7 @@ import { useRef, useCallback } from 'react'
 export function useAudioPlayer() {
   const audioCtxRef = useRef<AudioContext | null>(null)
   const nextPlayTimeRef = useRef(0)
+  const scheduledSourcesRef = useRef<Set<AudioBufferSourceNode>>(new Set())
 
   const initAudio = useCallback(() => {
     if (!audioCtxRef.current) {
@@ -42,9 +43,28 @@ export function useAudioPlayer() {
       )
       src.start(nextPlayTimeRef.current)
       nextPlayTimeRef.current += buffer.duration
+
+      scheduledSourcesRef.current.add(src)
+      src.onended = () => scheduledSourcesRef.current.delete(src)
     },
     [initAudio]
   )
 
-  return { playAudio }
+  const flushAudio = useCallback(() => {
+    const audioCtx = audioCtxRef.current
+    if (!audioCtx) return
+
+    scheduledSourcesRef.current.forEach(src => {
+      src.onended = null
+      try {
+        src.stop()
+      } catch {
+        // Source already finished
+      }
+    })
+    scheduledSourcesRef.current.clear()
+    nextPlayTimeRef.current = audioCtx.currentTime
+  }, [])
+
+  return { playAudio, flushAudio }
 }
@@ -4,12 +4,13 @@
  *--------------------------------------------------------------------------------------------*/
 
 import { useEffect, useRef, useState, useCallback } from 'react'
-import { Message } from '../types'
+import { ConversationTurn, Message } from '../types'
 
 interface RealtimeOptions {
   agentId?: string | null
   onMessage?: (msg: any) => void
   onAudioDelta?: (delta: string) => void
+  onAudioFlush?: () => void
   onTranscript?: (role: 'user' | 'assistant', text: string) => void
 }
 
@@ -18,7 +19,10 @@ export function useRealtime(options: RealtimeOptions) {
   const [messages, setMessages] = useState<Message[]>([])
   const wsRef = useRef<WebSocket | null>(null)
   const audioRecording = useRef<any[]>([])
-  const conversationRecording = useRef<any[]>([])
+  const conversationRecording = useRef<ConversationTurn[]>([])
+  const userSpeech = useRef<{ started_at?: number; ended_at?: number }>({})
+  const assistantStartedAt = useRef<number | undefined>(undefined)
+  const sessionIdRef = useRef<string | null>(null)
 
   const connect = useCallback(async () => {
     const config = await fetch('/api/config').then(r => r.json())
@@ -44,7 +48,35 @@ export function useRealtime(options: RealtimeOptions) {
       options.onMessage?.(msg)
 
       switch (msg.type) {
+        case 'proxy.connected':
+          sessionIdRef.current = msg.session_id ?? null
+          break
+        case 'proxy.audio.flush':
+          options.onAudioFlush?.()
+          break
+        case 'proxy.pronunciation.turn': {
+          const score = msg.assessment?.pronunciation_score
+          if (typeof score === 'number') {
+            setMessages(prev =>
+              prev.map(m =>
+                m.itemId === msg.item_id
+                  ? { ...m, pronunciationScore: score }
+                  : m
+              )
+            )
+          }
+          break
+        }
+        case 'input_audio_buffer.speech_started':
+          userSpeech.current = { started_at: Date.now() }
+          break
+        case 'input_audio_buffer.speech_stopped':
+          userSpeech.current = { ...userSpeech.current, ended_at: Date.now() }
+          break
         case 'response.audio.delta':
+          if (assistantStartedAt.current === undefined) {
+            assistantStartedAt.current = Date.now()
+          }
           if (msg.delta) {
             options.onAudioDelta?.(msg.delta)
             audioRecording.current.push({
@@ -61,12 +93,15 @@ export function useRealtime(options: RealtimeOptions) {
               role: 'user',
               content: msg.transcript,
               timestamp: new Date(),
+              itemId: msg.item_id,
             }
             setMessages(prev => [...prev, message])
             conversationRecording.current.push({
               role: 'user',
               content: msg.transcript,
+              ...userSpeech.current,
             })
+            userSpeech.current = {}
             options.onTranscript?.('user', msg.transcript)
           }
           break
@@ -82,7 +117,10 @@ export function useRealtime(options: RealtimeOptions) {
             conversationRecording.current.push({
               role: 'assistant',
               content: msg.transcript,
+              started_at: assistantStartedAt.current,
+              ended_at: Date.now(),
             })
+            assistantStartedAt.current = undefined
             options.onTranscript?.('assistant', msg.transcript)
           }
           break
@@ -113,6 +151,8 @@ export function useRealtime(options: RealtimeOptions) {
     []
   )
 
+  const getSessionId = useCallback(() => sessionIdRef.current, [])
+
   useEffect(() => {
     connect()
     return () => wsRef.current?.close()
@@ -124,5 +164,6 @@ export function useRealtime(options: RealtimeOptions) {
     send,
     clearMessages,
     getRecordings,
+    getSessionId,
   }
 }
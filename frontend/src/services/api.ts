@@ -3,7 +3,7 @@
  *  Licensed under the MIT License. See LICENSE in the project root for license information.
  *--------------------------------------------------------------------------------------------*/
 
-import { Scenario, Assessment } from '../types'
+import { Scenario, Assessment, AssessmentStreamEvent } from '../types'
 
 function extractUserText(conversationMessages: any[]): string {
   return conversationMessages
@@ -13,6 +13,14 @@ function extractUserText(conversationMessages: any[]): string {
     .trim()
 }
 
+function parseSSEData(message: string): string {
+  return message
+    .split('\n')
+    .filter(line => line.startsWith('data: '))
+    .map(line => line.slice('data: '.length))
+    .join('\n')
+}
+
 export const api = {
   async getConfig() {
     const res = await fetch('/api/config')
@@ -38,7 +46,8 @@ export const api = {
     scenarioId: string,
     transcript: string,
     audioData: any[],
-    conversationMessages: any[]
+    conversationMessages: any[],
+    sessionId?: string | null
   ): Promise<Assessment> {
     const referenceText = extractUserText(conversationMessages)
 
@@ -50,12 +59,57 @@ export const api = {
         transcript,
         audio_data: audioData,
         reference_text: referenceText,
+        session_id: sessionId,
+        turns: conversationMessages,
       }),
     })
     if (!res.ok) throw new Error('Analysis failed')
     return res.json()
   },
 
+  async analyzeConversationStream(
+    scenarioId: string,
+    transcript: string,
+    audioData: any[],
+    conversationMessages: any[],
+    onEvent: (event: AssessmentStreamEvent) => void,
+    sessionId?: string | null
+  ): Promise<void> {
+    const referenceText = extractUserText(conversationMessages)
+
+    const res = await fetch('/api/analyze/stream', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({
+        scenario_id: scenarioId,
+        transcript,
+        audio_data: audioData,
+        reference_text: referenceText,
+        session_id: sessionId,
+        turns: conversationMessages,
+      }),
+    })
+    if (!res.ok || !res.body) throw new Error('Analysis failed')
+
+    const reader = res.body.getReader()
+    const decoder = new TextDecoder()
+    let buffer = ''
+
+    while (true) {
+      const { done, value } = await reader.read()
+      if (done) break
+
+      buffer += decoder.decode(value, { stream: true })
+      let boundary = buffer.indexOf('\n\n')
+      while (boundary !== -1) {
+        const data = parseSSEData(buffer.slice(0, boundary))
+        buffer = buffer.slice(boundary + 2)
+        if (data) onEvent(JSON.parse(data))
+        boundary = buffer.indexOf('\n\n')
+      }
+    }
+  },
+
   async generateGraphScenario(): Promise<Scenario> {
     const res = await fetch('/api/scenarios/graph', {
       method: 'POST',
@@ -0,0 +1,137 @@
+/*---------------------------------------------------------------------------------------------
+ *  Copyright (c) Microsoft Corporation. All rights reserved.
+ *  Licensed under the MIT License. See LICENSE in the project root for license information.
+ *--------------------------------------------------------------------------------------------*/
+
+import {
+  AIAssessment,
+  Assessment,
+  AssessmentStreamEvent,
+  PronunciationAssessment,
+} from '../types'
+
+function emptyAIAssessment(): AIAssessment {
+  return {
+    speaking_tone_style: {
+      professional_tone: 0,
+      active_listening: 0,
+      engagement_quality: 0,
+      total: 0,
+    },
+    conversation_content: {
+      needs_assessment: 0,
+      value_proposition: 0,
+      objection_handling: 0,
+      total: 0,
+    },
+    overall_score: 0,
+    strengths: [],
+    improvements: [],
+  }
+}
+
+function emptyPronunciationAssessment(): PronunciationAssessment {
+  return {
+    accuracy_score: null,
+    fluency_score: null,
+    completeness_score: null,
+    prosody_score: null,
+    pronunciation_score: null,
+    words: [],
+  }
+}
+
+function withItem(items: string[], index: number, value: string): string[] {
+  const next = [...items]
+  next[index] = value
+  return next
+}
+
+function markReceived(assessment: Assessment, key: string): string[] {
+  return [...(assessment.received ?? []), key]
+}
+
+export function applyAssessmentEvent(
+  assessment: Assessment,
+  event: AssessmentStreamEvent
+): Assessment {
+  const ai = assessment.ai_assessment ?? emptyAIAssessment()
+
+  switch (event.type) {
+    case 'score': {
+      const section: Record<string, number> = {
+        ...ai[event.section],
+        [event.field]: event.value,
+      }
+      section.total = Object.entries(section)
+        .filter(([field]) => field !== 'total')
+        .reduce((sum, [, value]) => sum + value, 0)
+      return {
+        ...assessment,
+        ai_assessment: { ...ai, [event.section]: section } as AIAssessment,
+        received: markReceived(assessment, `${event.section}.${event.field}`),
+      }
+    }
+    case 'overall_score':
+      return {
+        ...assessment,
+        ai_assessment: { ...ai, overall_score: event.value },
+        received: markReceived(assessment, 'overall_score'),
+      }
+    case 'strength':
+      return {
+        ...assessment,
+        ai_assessment: {
+          ...ai,
+          strengths: withItem(ai.strengths, event.index, event.value),
+        },
+      }
+    case 'improvement':
+      return {
+        ...assessment,
+        ai_assessment: {
+          ...ai,
+          improvements: withItem(ai.improvements, event.index, event.value),
+        },
+      }
+    case 'specific_feedback':
+      return {
+        ...assessment,
+        ai_assessment: { ...ai, specific_feedback: event.value },
+      }
+    case 'ai_assessment':
+      return {
+        ...assessment,
+        ai_assessment: event.value ?? undefined,
+        received: undefined,
+      }
+    case 'pronunciation_assessment':
+      return {
+        ...assessment,
+        pronunciation_assessment: event.value ?? undefined,
+      }
+    case 'conversation_metrics':
+      return { ...assessment, conversation_metrics: event.value }
+    case 'acoustic_analytics':
+      // Computed locally, so it usually arrives before the pronunciation scores
+      return {
+        ...assessment,
+        pronunciation_assessment: {
+          ...(assessment.pronunciation_assessment ??
+            emptyPronunciationAssessment()),
+          acoustics: event.value,
+        },
+      }
+    case 'error':
+      // The analysis was cancelled, so a partially streamed AI assessment is dropped
+      return {
+        ...assessment,
+        ai_assessment: assessment.received
+          ? undefined
+          : assessment.ai_assessment,
+        received: undefined,
+      }
+    case 'done':
+      return { ...assessment, streaming: false }
+  }
+}
@@ -16,6 +16,8 @@ export interface Message {
   role: 'user' | 'assistant'
   content: string
   timestamp: Date
+  itemId?: string
+  pronunciationScore?: number
 }
 
 export interface Assessment {
@@ -36,21 +38,94 @@ export interface Assessment {
     strengths: string[]
     improvements: string[]
     specific_feedback?: string
+    degraded?: boolean
   }
   pronunciation_assessment?: {
-    accuracy_score: number
-    fluency_score: number
-    completeness_score: number
-    prosody_score?: number
-    pronunciation_score: number
+    accuracy_score: number | null
+    fluency_score: number | null
+    completeness_score: number | null
+    prosody_score?: number | null
+    pronunciation_score: number | null
     words?: Array<{
       word: string
       accuracy: number
       error_type: string
     }>
+    acoustics?: AcousticAnalytics
+    assessment_plan?: Array<{
+      granularity: string
+      enable_miscue: boolean
+      enable_prosody: boolean
+      segments: number
+      audio_seconds: number
+    }>
   }
+  conversation_metrics?: ConversationMetrics
+  streaming?: boolean
+  received?: string[]
+}
+
+export interface ConversationMetrics {
+  user_words: number
+  assistant_words: number
+  talk_share: number | null
+  talk_listen_ratio: number | null
+  questions_asked: number
+  filler_words: number
+  filler_rate_per_100_words: number
+  longest_monologue_words: number
+  words_per_minute: number | null
+  average_response_latency_ms: number | null
+  max_response_latency_ms: number | null
+}
+
+export interface AcousticValues {
+  speaking_rate_wpm: number | null
+  pause_ratio: number
+  pitch_mean_hz: number | null
+  pitch_variability_semitones: number | null
+  volume_variability_db: number
+}
+
+export interface AcousticAnalytics
+  extends Omit<AcousticValues, 'pause_ratio' | 'volume_variability_db'> {
+  pause_ratio: number | null
+  volume_variability_db: number | null
+  turns: Array<
+    AcousticValues & {
+      turn: number | null
+      duration_seconds: number
+      speech_seconds: number
+      pause_count: number
+    }
+  >
 }
 
+export interface ConversationTurn {
+  role: 'user' | 'assistant'
+  content: string
+  started_at?: number
+  ended_at?: number
+}
+
+export type AIAssessment = NonNullable<Assessment['ai_assessment']>
+export type PronunciationAssessment = NonNullable<
+  Assessment['pronunciation_assessment']
+>
+export type ScoreSection = 'speaking_tone_style' | 'conversation_content'
+
+export type AssessmentStreamEvent =
+  | { type: 'score'; section: ScoreSection; field: string; value: number }
+  | { type: 'overall_score'; value: number }
+  | { type: 'strength' | 'improvement'; index: number; value: string }
+  | { type: 'specific_feedback'; value: string }
+  | { type: 'ai_assessment'; value: AIAssessment | null }
+  | { type: 'pronunciation_assessment'; value: PronunciationAssessment | null }
+  | { type: 'conversation_metrics'; value: ConversationMetrics }
+  | { type: 'acoustic_analytics'; value: AcousticAnalytics }
+  | { type: 'error'; value: string }
+  | { type: 'done' }
+
 export interface AgentConfig {
   agent_id: string
   scenario_id: string